@@ -6,6 +6,7 @@ import ssl
 from pathlib import Path
 
 import environ
+from corsheaders.defaults import default_headers
 from django.utils.translation import gettext_lazy as _
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
@@ -372,6 +373,9 @@ REST_FRAMEWORK = {
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
+# Cross-origin clients revalidate readings with If-None-Match and read ETag.
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
 
 # By Default swagger ui is available only to admin user(s). You can change permission classes to change that
 # See more configuration options at https://drf-spectacular.readthedocs.io/en/latest/settings.html#settings
@@ -401,6 +405,30 @@ from .settings_addons import (
     EKOH_CELERY_BEAT_SCHEDULE,
     KAFKA_BOOTSTRAP_SERVERS,
     EKOH_DB_SEARCH_PATH,
+    EKOH_EVIDENCE_COLLECTOR_WORKERS,
+    EKOH_EVIDENCE_FREQUENCY_DAYS,
+    EKOH_EVIDENCE_FREQUENCY_SATURATION,
+    EKOH_RECALC_MAX_ATTEMPTS,
+    EKOH_LEADERBOARD_SIZE,
+    EKOH_LEADERBOARD_MAX,
+    SMART_VOTE_READING_CACHE_ENABLED,
+    SMART_VOTE_ARRAY_ENGINE_THRESHOLD,
+    SMART_VOTE_READING_LENSES,
+    SMART_VOTE_READING_INLINE_PARTICIPANTS,
+    SMART_VOTE_PARTICIPANT_PAGE_SIZE,
+    SMART_VOTE_PARTICIPANT_PAGE_MAX,
+    SMART_VOTE_PARTICIPANT_STREAM_CHUNK,
+    SMART_VOTE_WEIGHT_CACHE_ALIAS,
+    SMART_VOTE_WEIGHT_CACHE_TIMEOUT,
+    SMART_VOTE_AGGREGATE_SETTLE_SECONDS,
+    SMART_VOTE_PARTITION_MONTHS_AHEAD,
+    SMART_VOTE_PARTITION_RETENTION_MONTHS,
+    SMART_VOTE_PARTITION_ARCHIVE_DIR,
+    SMART_VOTE_BULK_CAST_MAX_BALLOTS,
+    SMART_VOTE_EVENT_BUS,
+    SMART_VOTE_EVENT_TOPIC,
+    SMART_VOTE_EVENT_REDELIVER_SECONDS,
+    SMART_VOTE_EVENT_BUS_SINGLE_PROCESS,
 )
 
 
@@ -412,6 +440,30 @@ from .settings_addons import (
     EKOH_CELERY_BEAT_SCHEDULE,
     KAFKA_BOOTSTRAP_SERVERS,
     EKOH_DB_SEARCH_PATH,
+    EKOH_EVIDENCE_COLLECTOR_WORKERS,
+    EKOH_EVIDENCE_FREQUENCY_DAYS,
+    EKOH_EVIDENCE_FREQUENCY_SATURATION,
+    EKOH_RECALC_MAX_ATTEMPTS,
+    EKOH_LEADERBOARD_SIZE,
+    EKOH_LEADERBOARD_MAX,
+    SMART_VOTE_READING_CACHE_ENABLED,
+    SMART_VOTE_ARRAY_ENGINE_THRESHOLD,
+    SMART_VOTE_READING_LENSES,
+    SMART_VOTE_READING_INLINE_PARTICIPANTS,
+    SMART_VOTE_PARTICIPANT_PAGE_SIZE,
+    SMART_VOTE_PARTICIPANT_PAGE_MAX,
+    SMART_VOTE_PARTICIPANT_STREAM_CHUNK,
+    SMART_VOTE_WEIGHT_CACHE_ALIAS,
+    SMART_VOTE_WEIGHT_CACHE_TIMEOUT,
+    SMART_VOTE_AGGREGATE_SETTLE_SECONDS,
+    SMART_VOTE_PARTITION_MONTHS_AHEAD,
+    SMART_VOTE_PARTITION_RETENTION_MONTHS,
+    SMART_VOTE_PARTITION_ARCHIVE_DIR,
+    SMART_VOTE_BULK_CAST_MAX_BALLOTS,
+    SMART_VOTE_EVENT_BUS,
+    SMART_VOTE_EVENT_TOPIC,
+    SMART_VOTE_EVENT_REDELIVER_SECONDS,
+    SMART_VOTE_EVENT_BUS_SINGLE_PROCESS,
 )
 
 # Merge Apps
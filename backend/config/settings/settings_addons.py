@@ -29,11 +29,26 @@ EKOH_INSTALLED_APPS = [
 # ---------------------------------------------------------------------------
 
 EKOH_CELERY_BEAT_SCHEDULE = {
-    # Nightly full score recomputation
+    # Nightly full score recomputation (safety net for the dirty set)
     "ekoh-score-recalc": {
         "task": "ekoh_score_recalc",
         "schedule": crontab(hour=2, minute=0),
     },
+    # Incremental rescoring of pairs with new evidence
+    "ekoh-score-recalc-dirty": {
+        "task": "ekoh_score_recalc_dirty",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Nightly re-ranking of every expert leaderboard (after the rebuild)
+    "ekoh-ranking-refresh": {
+        "task": "ekoh_ranking_refresh",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Re-rank leaderboards of categories whose scores changed
+    "ekoh-ranking-refresh-stale": {
+        "task": "ekoh_ranking_refresh_stale",
+        "schedule": crontab(minute="*"),
+    },
     # Periodic contextual analysis batch (every 30 minutes)
     "ekoh-contextual-analysis": {
         "task": "contextual_analysis_batch",
@@ -44,6 +59,31 @@ EKOH_CELERY_BEAT_SCHEDULE = {
         "task": "vote_aggregate",
         "schedule": timedelta(minutes=1),
     },
+    # Vote-event bus consumer (no-op until SMART_VOTE_EVENT_BUS is set)
+    "smartvote-vote-events": {
+        "task": "vote_events_consume",
+        "schedule": timedelta(seconds=5),
+    },
+    # Hash settled votes into the Merkle-batched vote ledger
+    "smartvote-vote-ledger": {
+        "task": "vote_ledger_write",
+        "schedule": timedelta(minutes=1),
+    },
+    # Materialise advisory weights of newly opened/invalidated consultations
+    "smartvote-consultation-weights": {
+        "task": "consultation_weights_build",
+        "schedule": timedelta(minutes=1),
+    },
+    # Write immutable final results of consultations past closes_at
+    "smartvote-consultation-finalise": {
+        "task": "consultation_finalise",
+        "schedule": timedelta(minutes=1),
+    },
+    # Pre-create upcoming vote/vote_ledger partitions, archive expired ones
+    "smartvote-partition-maintenance": {
+        "task": "vote_partition_maintenance",
+        "schedule": crontab(hour=3, minute=30),
+    },
 }
 
 # ---------------------------------------------------------------------------
@@ -55,6 +95,112 @@ EKOH_CELERY_BEAT_SCHEDULE = {
 # as: -c search_path=ekoh_smartvote,public
 EKOH_DB_SEARCH_PATH = "ekoh_smartvote,public"
 
+# ---------------------------------------------------------------------------
+# EkoH evidence
+# ---------------------------------------------------------------------------
+
+# Evidence collectors of the score rebuild run side by side on this many
+# threads (each with its own connection); 1 runs them in the calling task.
+EKOH_EVIDENCE_COLLECTOR_WORKERS = int(
+    os.getenv("EKOH_EVIDENCE_COLLECTOR_WORKERS", "4")
+)
+
+# The frequency axis counts evidence from the last N days and is full at
+# this many items.
+EKOH_EVIDENCE_FREQUENCY_DAYS = int(os.getenv("EKOH_EVIDENCE_FREQUENCY_DAYS", "365"))
+EKOH_EVIDENCE_FREQUENCY_SATURATION = int(
+    os.getenv("EKOH_EVIDENCE_FREQUENCY_SATURATION", "10")
+)
+
+# A rebuild chunk still pending after being queued this many times is marked
+# failed, so the nightly rebuild plans a new run instead of resuming it.
+EKOH_RECALC_MAX_ATTEMPTS = int(os.getenv("EKOH_RECALC_MAX_ATTEMPTS", "3"))
+
+# ---------------------------------------------------------------------------
+# EkoH leaderboards
+# ---------------------------------------------------------------------------
+
+# Top-expert leaderboards: default and maximum K per request.
+EKOH_LEADERBOARD_SIZE = int(os.getenv("EKOH_LEADERBOARD_SIZE", "10"))
+EKOH_LEADERBOARD_MAX = int(os.getenv("EKOH_LEADERBOARD_MAX", "100"))
+
+# ---------------------------------------------------------------------------
+# Smart-Vote ballots
+# ---------------------------------------------------------------------------
+
+# Consultations are finalised this many seconds after ``closes_at``, so that
+# ballots cast just before the close have committed.  (Vote aggregation and
+# the ledger follow transaction visibility instead of a time window.)
+SMART_VOTE_AGGREGATE_SETTLE_SECONDS = int(
+    os.getenv("SMART_VOTE_AGGREGATE_SETTLE_SECONDS", "5")
+)
+
+# Monthly vote/vote_ledger partitions: how many months to create ahead, how
+# many to keep attached, and where expired months are dumped (gzip COPY).
+# Nothing is archived while the archive directory is unset.
+SMART_VOTE_PARTITION_MONTHS_AHEAD = int(
+    os.getenv("SMART_VOTE_PARTITION_MONTHS_AHEAD", "3")
+)
+SMART_VOTE_PARTITION_RETENTION_MONTHS = int(
+    os.getenv("SMART_VOTE_PARTITION_RETENTION_MONTHS", "24")
+)
+SMART_VOTE_PARTITION_ARCHIVE_DIR = os.getenv("SMART_VOTE_PARTITION_ARCHIVE_DIR", "")
+
+# Upper bound on ballots accepted by one POST to the bulk cast endpoint.
+SMART_VOTE_BULK_CAST_MAX_BALLOTS = int(
+    os.getenv("SMART_VOTE_BULK_CAST_MAX_BALLOTS", "5000")
+)
+
+# ---------------------------------------------------------------------------
+# Smart-Vote readings
+# ---------------------------------------------------------------------------
+
+# Serve declared readings from the materialized ReadingSnapshot table until
+# one of their inputs (stances, EkoH scores, relevance, binding) changes.
+SMART_VOTE_READING_CACHE_ENABLED = (
+    os.getenv("SMART_VOTE_READING_CACHE_ENABLED", "true").lower() != "false"
+)
+
+# Topics with at least this many participants are read with the array-backed
+# (NumPy) engine when NumPy is installed; smaller topics use exact Decimals.
+SMART_VOTE_ARRAY_ENGINE_THRESHOLD = int(
+    os.getenv("SMART_VOTE_ARRAY_ENGINE_THRESHOLD", "5000")
+)
+
+# Registered reading lenses published side by side for every topic, in order
+# (comma-separated keys; see smart_vote.services.reading_lenses).
+SMART_VOTE_READING_LENSES = [
+    key.strip()
+    for key in os.getenv("SMART_VOTE_READING_LENSES", "ekoh_weighted_v1").split(",")
+    if key.strip()
+]
+
+# The reading endpoint returns aggregates only; participant detail comes from
+# the keyset-paginated / NDJSON participants endpoint.  "true" restores the
+# former inline ``participants`` lists (same as ``?participants=inline``).
+SMART_VOTE_READING_INLINE_PARTICIPANTS = (
+    os.getenv("SMART_VOTE_READING_INLINE_PARTICIPANTS", "false").lower() == "true"
+)
+
+# Participant detail pages (default / maximum ``limit``) and NDJSON chunk size
+SMART_VOTE_PARTICIPANT_PAGE_SIZE = int(
+    os.getenv("SMART_VOTE_PARTICIPANT_PAGE_SIZE", "100")
+)
+SMART_VOTE_PARTICIPANT_PAGE_MAX = int(
+    os.getenv("SMART_VOTE_PARTICIPANT_PAGE_MAX", "1000")
+)
+SMART_VOTE_PARTICIPANT_STREAM_CHUNK = int(
+    os.getenv("SMART_VOTE_PARTICIPANT_STREAM_CHUNK", "2000")
+)
+
+# Django cache shared by all workers for EkoH weight inputs (Redis in
+# production).  Entries are versioned by generation counters, so the timeout
+# only bounds memory held by superseded generations.
+SMART_VOTE_WEIGHT_CACHE_ALIAS = os.getenv("SMART_VOTE_WEIGHT_CACHE_ALIAS", "default")
+SMART_VOTE_WEIGHT_CACHE_TIMEOUT = int(
+    os.getenv("SMART_VOTE_WEIGHT_CACHE_TIMEOUT", "86400")
+)
+
 # ---------------------------------------------------------------------------
 # Kafka (for Smart-Vote streaming / ledger flows)
 # ---------------------------------------------------------------------------
@@ -62,4 +208,25 @@ EKOH_DB_SEARCH_PATH = "ekoh_smartvote,public"
 KAFKA_BOOTSTRAP_SERVERS = os.getenv(
     "KAFKA_BOOTSTRAP_SERVERS",
     "localhost:9092",
+)
+
+# Vote-event bus: "" (poll the vote table), "memory", "redis" or "kafka".
+# With a bus configured, ballot writes publish events and the
+# ``vote_events_consume`` task / ``consume_vote_events`` command fold them
+# into VoteResult instead of ``vote_aggregate``.
+SMART_VOTE_EVENT_BUS = os.getenv("SMART_VOTE_EVENT_BUS", "")
+
+# Kafka topic / Redis stream name of the vote events
+SMART_VOTE_EVENT_TOPIC = os.getenv("SMART_VOTE_EVENT_TOPIC", "smart_vote.votes")
+
+# Outbox rows published this long ago but not yet consumed are published
+# again (duplicates are applied once).
+SMART_VOTE_EVENT_REDELIVER_SECONDS = int(
+    os.getenv("SMART_VOTE_EVENT_REDELIVER_SECONDS", "300")
+)
+
+# The "memory" bus keeps events inside one process; it is refused unless the
+# whole deployment (web and Celery) runs in a single process, e.g. tests.
+SMART_VOTE_EVENT_BUS_SINGLE_PROCESS = (
+    os.getenv("SMART_VOTE_EVENT_BUS_SINGLE_PROCESS", "false").lower() == "true"
 )
\ No newline at end of file
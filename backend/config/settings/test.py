@@ -23,6 +23,27 @@ TEST_RUNNER = "django.test.runner.DiscoverRunner"
 DATABASES["default"].setdefault("OPTIONS", {})
 DATABASES["default"]["OPTIONS"].pop("options", None)
 
+# CACHES
+# ------------------------------------------------------------------------------
+# Local-memory stand-in for the Redis cache (shared EkoH weight inputs).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "konnaxion-tests",
+    },
+}
+
+# EKOH
+# ------------------------------------------------------------------------------
+# Collector threads use their own connections and cannot see the data of the
+# test transaction.
+EKOH_EVIDENCE_COLLECTOR_WORKERS = 1
+
+# SMART VOTE
+# ------------------------------------------------------------------------------
+# Tests publish and consume vote events in one process (memory bus).
+SMART_VOTE_EVENT_BUS_SINGLE_PROCESS = True
+
 # PASSWORDS
 # ------------------------------------------------------------------------------
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
@@ -51,8 +51,9 @@ urlpatterns += [
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="api-schema"), name="api-docs"),
 
     # ------------------------------------------------------------------
-    # Ekoh – expertise & ethics profiles
+    # Ekoh – expertise & ethics profiles, top-expert leaderboards
     #   /api/v1/ekoh/profile/<uid>/
+    #   /api/v1/ekoh/leaderboard/<code>/
     # ------------------------------------------------------------------
     path("api/v1/ekoh/", include("konnaxion.ekoh.urls")),
 
@@ -10,6 +10,14 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _weight_cache() -> None:
+    # The locmem cache outlives each test's rolled-back database.
+    from konnaxion.smart_vote.services.weight_calculator import clear_weight_caches
+
+    clear_weight_caches()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -87,3 +87,7 @@ class ScoreHistoryAdmin(admin.ModelAdmin):
     list_display = ("merit_score", "old_value", "new_value", "changed_at")
     readonly_fields = ("merit_score", "old_value", "new_value", "change_reason", "changed_at")
     list_filter = ("changed_at",)
+
+
+# Partition catalogue (read-only view)
+from konnaxion.ekoh import admin_partition  # noqa: E402,F401
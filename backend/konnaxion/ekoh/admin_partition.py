@@ -3,25 +3,30 @@ Admin interface to inspect month-based partitions in ekoh_smartvote schema.
 """
 
 from django.contrib import admin
-from django.db import connection
+from django.template.defaultfilters import filesizeformat
 
-
-class PartitionInfo:
-    """Dummy object representing one partition table."""
-    def __init__(self, name):
-        self.table_name = name
+from konnaxion.ekoh.models.partition import PartitionInfo
 
 
 @admin.register(PartitionInfo)
 class PartitionInfoAdmin(admin.ModelAdmin):
-    list_display = ("table_name",)
-
-    def get_queryset(self, request):
-        with connection.cursor() as cur:
-            cur.execute("""
-                SELECT tablename FROM pg_tables
-                WHERE schemaname = 'ekoh_smartvote'
-                  AND tablename ~ '^(vote_|vote_ledger_|score_history_)';
-            """)
-            names = [row[0] for row in cur.fetchall()]
-        return [PartitionInfo(name) for name in names]
+    list_display = ("table_name", "parent_table", "bounds", "rows", "size")
+    list_filter = ("parent_table",)
+    search_fields = ("table_name",)
+
+    @admin.display(description="Rows (estimated)", ordering="row_estimate")
+    def rows(self, obj):
+        return obj.row_estimate
+
+    @admin.display(description="Size on disk", ordering="total_bytes")
+    def size(self, obj):
+        return filesizeformat(obj.total_bytes)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -35,3 +35,6 @@ class EkohConfig(AppConfig):
         except Exception:
             # Log but do not block app startup.
             LOGGER.exception("EkoH app failed to import models during ready().")
+
+        # Evidence receivers feeding the incremental score recalculation.
+        from . import signals  # noqa: F401
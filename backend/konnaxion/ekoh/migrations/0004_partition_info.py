@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+PARTITION_INFO_VIEW = """
+CREATE OR REPLACE VIEW ekoh_smartvote.partition_info AS
+SELECT child.relname::varchar(128) AS table_name,
+       parent.relname::varchar(128) AS parent_table,
+       pg_get_expr(child.relpartbound, child.oid) AS bounds,
+       GREATEST(child.reltuples, 0)::bigint AS row_estimate,
+       pg_total_relation_size(child.oid) AS total_bytes
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+WHERE ns.nspname = 'ekoh_smartvote'
+  AND parent.relkind = 'p'
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0003_rating_visibility_and_access"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=PARTITION_INFO_VIEW,
+            reverse_sql="DROP VIEW IF EXISTS ekoh_smartvote.partition_info",
+        ),
+        migrations.CreateModel(
+            name="PartitionInfo",
+            fields=[
+                ("table_name", models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ("parent_table", models.CharField(max_length=128)),
+                ("bounds", models.TextField()),
+                ("row_estimate", models.BigIntegerField()),
+                ("total_bytes", models.BigIntegerField()),
+            ],
+            options={
+                "verbose_name": "partition",
+                "db_table": "partition_info",
+                "ordering": ("parent_table", "table_name"),
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0004_partition_info"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ScoreRecalcChunk",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("run_id", models.UUIDField()),
+                ("lower_user_id", models.BigIntegerField()),
+                ("upper_user_id", models.BigIntegerField()),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("done", "Done")], default="pending", max_length=16)),
+                ("pair_count", models.IntegerField(default=0)),
+                ("changed_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "ekoh_score_recalc_chunk",
+                "indexes": [models.Index(condition=models.Q(("status", "pending")), fields=["created_at"], name="idx_ekoh_recalc_pending")],
+                "constraints": [models.UniqueConstraint(fields=("run_id", "lower_user_id"), name="uq_ekoh_recalc_chunk")],
+            },
+        ),
+    ]
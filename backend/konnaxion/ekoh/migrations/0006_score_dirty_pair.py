@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0005_score_recalc_chunk"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ScoreDirtyPair",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("user_id", models.BigIntegerField()),
+                ("category_id", models.BigIntegerField(blank=True, null=True)),
+                ("marked_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "ekoh_score_dirty",
+                "indexes": [models.Index(fields=["marked_at"], name="idx_ekoh_score_dirty_marked")],
+                "constraints": [models.UniqueConstraint(condition=models.Q(("category_id__isnull", False)), fields=("user_id", "category_id"), name="uq_ekoh_score_dirty_pair"), models.UniqueConstraint(condition=models.Q(("category_id__isnull", True)), fields=("user_id",), name="uq_ekoh_score_dirty_user")],
+            },
+        ),
+    ]
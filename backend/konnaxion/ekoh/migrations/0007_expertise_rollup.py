@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Roll existing leaf scores up into every non-leaf ancestor (see
+# konnaxion.ekoh.services.rollups for the incremental refresh).
+BACKFILL_ROLLUPS_SQL = """
+INSERT INTO user_expertise_rollup (user_id, category_id, score, domain_count, updated_at)
+SELECT score.user_id,
+       ancestor.id,
+       MAX(LEAST(GREATEST(
+           CASE WHEN score.weighted_score > 1 THEN score.weighted_score / 100
+                ELSE score.weighted_score END, 0), 1)),
+       COUNT(*),
+       now()
+FROM user_expertise_score score
+JOIN expertise_category scored ON scored.id = score.category_id
+JOIN expertise_category ancestor ON ancestor.path @> scored.path
+WHERE EXISTS (SELECT 1 FROM expertise_category child WHERE child.parent_id = ancestor.id)
+GROUP BY score.user_id, ancestor.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0006_score_dirty_pair"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="UserExpertiseRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("score", models.DecimalField(decimal_places=6, max_digits=7)),
+                ("domain_count", models.IntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("category", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="ekoh.expertisecategory")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "db_table": "user_expertise_rollup",
+                "indexes": [models.Index(fields=["category", "-score"], name="idx_rollup_top")],
+                "unique_together": {("user", "category")},
+            },
+        ),
+        migrations.RunSQL(sql=BACKFILL_ROLLUPS_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0007_expertise_rollup"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="RankingStaleCategory",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("category_id", models.BigIntegerField(unique=True)),
+                ("marked_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "ekoh_ranking_stale",
+            },
+        ),
+        migrations.CreateModel(
+            name="ExpertRanking",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("category_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField()),
+                ("score", models.DecimalField(decimal_places=6, max_digits=7)),
+                ("rank", models.IntegerField()),
+                ("percentile", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "ekoh_expert_ranking",
+                "indexes": [models.Index(fields=["category_id", "rank", "user_id"], name="idx_ranking_top")],
+                "constraints": [models.UniqueConstraint(fields=("category_id", "user_id"), name="uq_ekoh_expert_ranking")],
+            },
+        ),
+    ]
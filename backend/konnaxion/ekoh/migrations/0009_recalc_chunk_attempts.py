@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0008_expert_ranking"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name="scorerecalcchunk",
+            name="attempts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="scorerecalcchunk",
+            name="status",
+            field=models.CharField(choices=[("pending", "Pending"), ("done", "Done"), ("failed", "Failed")], default="pending", max_length=16),
+        ),
+    ]
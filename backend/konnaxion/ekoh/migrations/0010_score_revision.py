@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ekoh", "0009_recalc_chunk_attempts"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ScoreRevision",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("expertise", "Expertise"), ("ethics", "Ethics")], max_length=16)),
+                ("user_id", models.BigIntegerField()),
+                ("category_id", models.BigIntegerField(blank=True, null=True)),
+                ("value", models.DecimalField(blank=True, decimal_places=4, max_digits=12, null=True)),
+                ("replaced_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "ekoh_score_revision",
+                "indexes": [models.Index(fields=["user_id", "replaced_at"], name="idx_ekoh_revision_user"), models.Index(fields=["replaced_at"], name="idx_ekoh_revision_prune")],
+            },
+        ),
+    ]
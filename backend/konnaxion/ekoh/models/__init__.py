@@ -1,12 +1,16 @@
 """Expose public models for import convenience."""
 from .taxonomy import ExpertiseCategory  # noqa: F401
-from .scores import UserExpertiseScore, UserEthicsScore  # noqa: F401
+from .scores import UserExpertiseScore, UserExpertiseRollup, UserEthicsScore  # noqa: F401
 from .config import ScoreConfiguration  # noqa: F401
 from .privacy import ConfidentialitySetting  # noqa: F401
-from .audit import ContextAnalysisLog, ScoreHistory  # noqa: F401
+from .audit import ContextAnalysisLog, ScoreHistory, ScoreRevision  # noqa: F401
 from .access import (  # noqa: F401
     RatingAccessGrant,
     RatingAccessScope,
     RatingScopeSubject,
     RatingVisibilitySetting,
 )
+from .partition import PartitionInfo  # noqa: F401
+from .recalc import ScoreRecalcChunk  # noqa: F401
+from .dirty import ScoreDirtyPair  # noqa: F401
+from .ranking import ExpertRanking, RankingStaleCategory  # noqa: F401
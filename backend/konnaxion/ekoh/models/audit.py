@@ -28,3 +28,33 @@ class ScoreHistory(models.Model):
     class Meta:
         db_table = "score_history"
         indexes = [models.Index(fields=["changed_at"])]
+
+
+class ScoreRevision(models.Model):
+    """The value a user's score had before one change.
+
+    ``value`` is ``None`` when the score did not exist yet.  With these rows
+    the scores in force at any recent time can be reconstructed
+    (``services.score_revisions``); they are pruned once no consultation
+    awaits finalisation from before them.
+    """
+
+    KIND_EXPERTISE = "expertise"
+    KIND_ETHICS = "ethics"
+
+    kind = models.CharField(
+        max_length=16,
+        choices=[(KIND_EXPERTISE, "Expertise"), (KIND_ETHICS, "Ethics")],
+    )
+    user_id = models.BigIntegerField()
+    # The expertise category; ``None`` for ethics.
+    category_id = models.BigIntegerField(null=True, blank=True)
+    value = models.DecimalField(max_digits=12, decimal_places=4, null=True, blank=True)
+    replaced_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "ekoh_score_revision"
+        indexes = [
+            models.Index(fields=["user_id", "replaced_at"], name="idx_ekoh_revision_user"),
+            models.Index(fields=["replaced_at"], name="idx_ekoh_revision_prune"),
+        ]
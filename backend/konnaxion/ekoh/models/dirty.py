@@ -0,0 +1,38 @@
+"""Dirty set for the incremental EkoH score recalculation.
+
+New evidence for a user marks ``(user_id, category_id)`` pairs dirty; a
+frequent task rescoring only those pairs keeps profiles fresh between the
+nightly rebuilds.  ``category_id`` is null when the evidence cannot be tied
+to a domain: every domain of that user is then rescored.
+
+Rows are plain ids rather than foreign keys so that marking a pair is one
+``INSERT … ON CONFLICT DO NOTHING`` with no extra lookups; a pair is stored
+at most once however often it is marked.
+"""
+
+from django.db import models
+
+
+class ScoreDirtyPair(models.Model):
+    user_id = models.BigIntegerField()
+    category_id = models.BigIntegerField(null=True, blank=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "ekoh_score_dirty"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user_id", "category_id"],
+                name="uq_ekoh_score_dirty_pair",
+                condition=models.Q(category_id__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=["user_id"],
+                name="uq_ekoh_score_dirty_user",
+                condition=models.Q(category_id__isnull=True),
+            ),
+        ]
+        indexes = [models.Index(fields=["marked_at"], name="idx_ekoh_score_dirty_marked")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.user_id}/{self.category_id or '*'}"
@@ -0,0 +1,26 @@
+"""Read-only catalogue of the monthly partitions in ``ekoh_smartvote``."""
+
+from django.db import models
+
+
+class PartitionInfo(models.Model):
+    """One partition of a partitioned EkoH/Smart Vote table.
+
+    Backed by the ``partition_info`` view (migration 0004); row counts come
+    from the planner statistics and are refreshed by (auto)vacuum/analyze.
+    """
+
+    table_name = models.CharField(max_length=128, primary_key=True)
+    parent_table = models.CharField(max_length=128)
+    bounds = models.TextField()
+    row_estimate = models.BigIntegerField()
+    total_bytes = models.BigIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "partition_info"
+        ordering = ("parent_table", "table_name")
+        verbose_name = "partition"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.table_name
@@ -0,0 +1,44 @@
+"""Materialised expert rankings per ISCED category.
+
+``ExpertRanking`` holds, for every category at any depth, the users with a
+positive effective score (direct score or roll-up), their rank and
+percentile, so that a top-K lookup reads K rows of ``idx_ranking_top``.
+Score changes mark their categories in ``RankingStaleCategory``; a frequent
+task re-ranks only those categories and a nightly task re-ranks all of them.
+"""
+
+from django.db import models
+
+
+class ExpertRanking(models.Model):
+    category_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    score = models.DecimalField(max_digits=7, decimal_places=6)
+    rank = models.IntegerField()
+    percentile = models.DecimalField(max_digits=5, decimal_places=2)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "ekoh_expert_ranking"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category_id", "user_id"], name="uq_ekoh_expert_ranking"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["category_id", "rank", "user_id"], name="idx_ranking_top")
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.category_id} #{self.rank}: {self.user_id}"
+
+
+class RankingStaleCategory(models.Model):
+    category_id = models.BigIntegerField(unique=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "ekoh_ranking_stale"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return str(self.category_id)
@@ -0,0 +1,54 @@
+"""Resumable progress of the nightly EkoH score rebuild.
+
+A rebuild run splits the users into contiguous id ranges, one
+``ScoreRecalcChunk`` row each.  A chunk task marks its row done in the same
+transaction as the chunk's score upsert, so a run interrupted by a worker
+crash or time limit resumes with the chunks still pending and never
+rewrites finished ones.  ``attempts`` counts how often a chunk was queued; a
+chunk still pending after ``EKOH_RECALC_MAX_ATTEMPTS`` is marked failed so it
+no longer holds back new runs.
+"""
+
+from django.db import models
+
+
+class ScoreRecalcChunk(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    run_id = models.UUIDField()
+    lower_user_id = models.BigIntegerField()
+    upper_user_id = models.BigIntegerField()
+    status = models.CharField(
+        max_length=16,
+        default=STATUS_PENDING,
+        choices=[
+            (STATUS_PENDING, "Pending"),
+            (STATUS_DONE, "Done"),
+            (STATUS_FAILED, "Failed"),
+        ],
+    )
+    attempts = models.IntegerField(default=0)
+    pair_count = models.IntegerField(default=0)
+    changed_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "ekoh_score_recalc_chunk"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["run_id", "lower_user_id"], name="uq_ekoh_recalc_chunk"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                name="idx_ekoh_recalc_pending",
+                condition=models.Q(status="pending"),
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.run_id} [{self.lower_user_id}..{self.upper_user_id}] {self.status}"
@@ -24,6 +24,28 @@ class UserExpertiseScore(models.Model):
         ]
 
 
+class UserExpertiseRollup(models.Model):
+    """Best normalized score of a user within one ISCED subtree.
+
+    One row per user and non-leaf category (broad or narrow field) whose
+    subtree holds at least one of the user's scores; ``domain_count`` is the
+    number of those scores.  Maintained by ``services.rollups``.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey(ExpertiseCategory, on_delete=models.CASCADE)
+    score = models.DecimalField(max_digits=7, decimal_places=6)
+    domain_count = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "user_expertise_rollup"
+        unique_together = ("user", "category")
+        indexes = [
+            models.Index(fields=["category", "-score"], name="idx_rollup_top"),
+        ]
+
+
 class UserEthicsScore(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, primary_key=True, on_delete=models.CASCADE
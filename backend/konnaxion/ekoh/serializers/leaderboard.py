@@ -0,0 +1,35 @@
+"""Read-only serializers of the EkoH top-expert leaderboard.
+
+Surfaced by ``GET /api/v1/ekoh/leaderboard/<code>/``.  Entries carry the
+viewer-appropriate display name (see ``display_name_for``); experts whose
+ratings or identity the viewer may not see are already left out by
+``services.leaderboard.top_experts``.
+"""
+
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from konnaxion.ekoh.serializers.profile import display_name_for
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(source="user.pk")
+    display_name = serializers.SerializerMethodField()
+    rank = serializers.IntegerField()
+    percentile = serializers.DecimalField(max_digits=5, decimal_places=2)
+    score = serializers.DecimalField(max_digits=7, decimal_places=6)
+
+    def get_display_name(self, entry) -> str:
+        request = self.context.get("request")
+        return display_name_for(
+            entry.user, entry.confidentiality_level, getattr(request, "user", None)
+        )
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    domain_code = serializers.CharField(source="category.code")
+    domain_name = serializers.CharField(source="category.name")
+    depth = serializers.IntegerField(source="category.depth")
+    refreshed_at = serializers.DateTimeField(allow_null=True)
+    experts = LeaderboardEntrySerializer(source="entries", many=True)
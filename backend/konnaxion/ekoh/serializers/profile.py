@@ -17,17 +17,61 @@ from konnaxion.ekoh.models.access import RatingAccessGrant, RatingVisibilitySett
 from konnaxion.ekoh.models.audit import ScoreHistory
 from konnaxion.ekoh.models.privacy import ConfidentialitySetting
 from konnaxion.ekoh.models.scores import UserExpertiseScore
-from konnaxion.ekoh.services.rating_access import resolve_rating_access
+from konnaxion.ekoh.services.rating_access import (
+    resolve_rating_access,
+    resolve_rating_access_many,
+)
 
 User = get_user_model()
 
 
+def display_name_for(user: User, level: str, requester) -> str:
+    """Name of ``user`` as ``requester`` may see it under identity ``level``."""
+    is_self = bool(
+        requester
+        and getattr(requester, "is_authenticated", False)
+        and requester.pk == user.pk
+    )
+    is_staff = bool(requester and getattr(requester, "is_staff", False))
+
+    if level == ConfidentialitySetting.ANONYMOUS and not (is_self or is_staff):
+        return "Anonymous"
+    if level == ConfidentialitySetting.PSEUDONYM and not (is_self or is_staff):
+        return user.get_username()
+
+    display_name = (getattr(user, "name", "") or "").strip()
+    if display_name:
+        return display_name
+
+    full_name = (user.get_full_name() or "").strip()
+    if full_name and all(part.casefold() != "none" for part in full_name.split()):
+        return full_name
+
+    return user.get_username()
+
+
 class ExpertiseScoreNested(serializers.Serializer):
     domain_code = serializers.CharField()
     domain_name = serializers.CharField()
     weighted_score = serializers.DecimalField(max_digits=12, decimal_places=4)
 
 
+class ProfileListSerializer(serializers.ListSerializer):
+    """Resolve rating access for a whole page of profiles at once."""
+
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, "all") else data)
+        request = self.context.get("request")
+        viewer = getattr(request, "user", None)
+        cache = getattr(self.child, "_rating_access_cache", None)
+        if cache is None:
+            cache = {}
+            self.child._rating_access_cache = cache
+        missing = [user for user in users if user.pk not in cache]
+        cache.update(resolve_rating_access_many(viewer, missing))
+        return super().to_representation(users)
+
+
 class ProfileSerializer(serializers.Serializer):
     user_id = serializers.IntegerField(source="pk")
     display_name = serializers.SerializerMethodField()
@@ -39,6 +83,9 @@ class ProfileSerializer(serializers.Serializer):
     expertise = serializers.SerializerMethodField()
     score_history = serializers.SerializerMethodField()
 
+    class Meta:
+        list_serializer_class = ProfileListSerializer
+
     def _privacy(self, user: User) -> ConfidentialitySetting | None:
         return getattr(user, "confidentialitysetting", None)
 
@@ -72,30 +119,10 @@ class ProfileSerializer(serializers.Serializer):
         return self._access(user).as_dict()
 
     def get_display_name(self, user: User) -> str:
-        level = self.get_confidentiality_level(user)
         request = self.context.get("request")
-        requester = getattr(request, "user", None)
-        is_self = bool(
-            requester
-            and getattr(requester, "is_authenticated", False)
-            and requester.pk == user.pk
+        return display_name_for(
+            user, self.get_confidentiality_level(user), getattr(request, "user", None)
         )
-        is_staff = bool(requester and getattr(requester, "is_staff", False))
-
-        if level == ConfidentialitySetting.ANONYMOUS and not (is_self or is_staff):
-            return "Anonymous"
-        if level == ConfidentialitySetting.PSEUDONYM and not (is_self or is_staff):
-            return user.get_username()
-
-        display_name = (getattr(user, "name", "") or "").strip()
-        if display_name:
-            return display_name
-
-        full_name = (user.get_full_name() or "").strip()
-        if full_name and all(part.casefold() != "none" for part in full_name.split()):
-            return full_name
-
-        return user.get_username()
 
     def get_ethics_score(self, user: User):
         if not self._access(user).allowed:
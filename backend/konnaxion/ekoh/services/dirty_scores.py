@@ -0,0 +1,49 @@
+"""Dirty-set bookkeeping for the incremental EkoH score recalculation.
+
+Evidence writers call ``mark_dirty``; the ``ekoh_score_recalc_dirty`` task
+drains the set with ``claim_dirty`` and rescores only those pairs.  The
+nightly full rebuild stays as a safety net for evidence written without
+model signals.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.dirty import ScoreDirtyPair
+
+ALL_DOMAINS = None
+
+
+def mark_dirty(
+    user_id: int,
+    category_ids: Iterable[int] | None = ALL_DOMAINS,
+) -> None:
+    """Queue ``user_id`` for rescoring in ``category_ids`` (default: all).
+
+    Idempotent: pairs already queued are left as they are.
+    """
+    keys = [None] if category_ids is ALL_DOMAINS else sorted(set(category_ids))
+    with ekoh_smartvote_db_scope():
+        ScoreDirtyPair.objects.bulk_create(
+            [ScoreDirtyPair(user_id=user_id, category_id=key) for key in keys],
+            ignore_conflicts=True,
+        )
+
+
+def claim_dirty(limit: int) -> list[tuple[int, int | None]]:
+    """Remove up to ``limit`` of the oldest pairs and return them.
+
+    Must run inside ``ekoh_smartvote_db_scope()``: the rows are locked with
+    ``SKIP LOCKED`` and deleted in the caller's transaction, so concurrent
+    drains never share a pair and a failed drain leaves its pairs queued.
+    """
+    rows = list(
+        ScoreDirtyPair.objects.select_for_update(skip_locked=True)
+        .order_by("marked_at")
+        .values_list("pk", "user_id", "category_id")[:limit]
+    )
+    if rows:
+        ScoreDirtyPair.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+    return [(user_id, category_id) for _, user_id, category_id in rows]
@@ -0,0 +1,332 @@
+"""Evidence collectors feeding the EkoH score rebuild.
+
+A collector reads one kind of evidence for many users and domains at once
+and yields ``Evidence`` rows, already grouped in SQL per user and evidence
+target, so its cost follows the amount of evidence rather than
+users × domains.  ``collect_metrics`` runs the registered collectors side by
+side and merges their rows by ``(user_id, domain_id)`` into the axes that
+``multidimensional_scoring.score_metrics`` expects:
+
+``quality``
+    Share of positive items: approved peer validations, arguments still
+    visible after moderation.
+``expertise``
+    Mean of demonstrated knowledge: evaluation scores (0..1 or 0..100),
+    verified credentials (1 each).
+``frequency``
+    Items from the last ``EKOH_EVIDENCE_FREQUENCY_DAYS`` days, saturating at
+    ``EKOH_EVIDENCE_FREQUENCY_SATURATION``.
+
+Evidence reaches an ISCED domain through declared links only:
+
+* KonnectED certification paths through an ``InteropMapping`` with
+  ``external_system="isced"`` whose ``external_id`` is the domain code;
+* Ethikos topics through their Smart Vote consultation's relevance.
+
+Trust credentials name no domain; they are added to every domain in which
+the user already has domain evidence.  Pairs without any domain evidence are
+left out, so the stored score of such a pair is kept.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosArgument
+from konnaxion.konnected.models import Evaluation, InteropMapping, PeerValidation
+from konnaxion.smart_vote.models import ConsultationRelevance, SourceConsultationBinding
+from konnaxion.trust.models import Credential
+
+ISCED_SYSTEM = "isced"
+SOURCE_TYPE_ETHIKOS_TOPIC = "ethikos_topic"
+QUALITY = "quality"
+EXPERTISE = "expertise"
+
+PairKey = tuple[int, int]
+
+
+class Evidence(NamedTuple):
+    """Grouped evidence of one user for one domain (``None``: user-wide).
+
+    ``total`` is the sum of the item values (each in 0..1), ``count`` the
+    number of items and ``recent`` how many of them fall in the frequency
+    window.
+    """
+
+    user_id: int
+    domain_id: int | None
+    axis: str
+    total: float
+    count: int
+    recent: int
+
+
+class EvidenceCollector:
+    """Base class of evidence collectors; subclasses set ``key``."""
+
+    key = ""
+
+    def collect(
+        self,
+        user_ids: Sequence[int],
+        domains: Sequence[ExpertiseCategory],
+        since: datetime,
+    ) -> Iterable[Evidence]:
+        raise NotImplementedError
+
+
+_REGISTRY: dict[str, EvidenceCollector] = {}
+
+
+def register_collector(collector: EvidenceCollector) -> EvidenceCollector:
+    """Add ``collector`` to the registry under its ``key``."""
+    if not collector.key:
+        raise ValueError("Evidence collectors need a key.")
+    _REGISTRY[collector.key] = collector
+    return collector
+
+
+def registered_collectors() -> list[EvidenceCollector]:
+    return list(_REGISTRY.values())
+
+
+def _unit_interval(field: str):
+    """SQL for a score on a 0..1 or legacy 0..100 scale, clamped to 0..1."""
+    value = Case(
+        When(**{f"{field}__gt": 1}, then=F(field) / 100.0),
+        default=F(field),
+        output_field=FloatField(),
+    )
+    return Least(Greatest(value, Value(0.0)), Value(1.0))
+
+
+def _path_domains(domains: Sequence[ExpertiseCategory]) -> dict[int, list[int]]:
+    """Certification path id -> domain ids, through ISCED interop mappings."""
+    domain_ids_by_code = {domain.code: domain.pk for domain in domains}
+    path_domains: dict[int, list[int]] = defaultdict(list)
+    for path_id, code in InteropMapping.objects.filter(
+        external_system=ISCED_SYSTEM, external_id__in=domain_ids_by_code
+    ).values_list("local_certification_id", "external_id"):
+        path_domains[path_id].append(domain_ids_by_code[code])
+    return path_domains
+
+
+def _topic_domains(domains: Sequence[ExpertiseCategory]) -> dict[int, list[int]]:
+    """Ethikos topic id -> domain ids, through consultation relevance."""
+    consultation_domains: dict[int, list[int]] = defaultdict(list)
+    for consultation_id, domain_id in ConsultationRelevance.objects.filter(
+        category_id__in=[domain.pk for domain in domains], weight__gt=0
+    ).values_list("consultation_id", "category_id"):
+        consultation_domains[consultation_id].append(domain_id)
+
+    topic_domains: dict[int, list[int]] = {}
+    for source_id, consultation_id in SourceConsultationBinding.objects.filter(
+        source_type=SOURCE_TYPE_ETHIKOS_TOPIC, consultation_id__in=consultation_domains
+    ).values_list("source_id", "consultation_id"):
+        if source_id.isdigit():
+            topic_domains[int(source_id)] = consultation_domains[consultation_id]
+    return topic_domains
+
+
+class EvaluationCollector(EvidenceCollector):
+    """KonnectED evaluation scores (``expertise``)."""
+
+    key = "konnected_evaluations"
+
+    def collect(self, user_ids, domains, since):
+        path_domains = _path_domains(domains)
+        if not path_domains:
+            return
+        rows = (
+            Evaluation.objects.filter(user_id__in=user_ids, path_id__in=path_domains)
+            .values_list("user_id", "path_id")
+            .annotate(
+                total=Sum(_unit_interval("raw_score")),
+                count=Count("id"),
+                recent=Count("id", filter=Q(created_at__gte=since)),
+            )
+        )
+        for user_id, path_id, total, count, recent in rows.iterator():
+            for domain_id in path_domains[path_id]:
+                yield Evidence(user_id, domain_id, EXPERTISE, total, count, recent)
+
+
+class PeerValidationCollector(EvidenceCollector):
+    """Peer decisions on KonnectED evaluations (``quality``).
+
+    Validations of one's own evaluation are ignored.
+    """
+
+    key = "konnected_peer_validations"
+
+    def collect(self, user_ids, domains, since):
+        path_domains = _path_domains(domains)
+        if not path_domains:
+            return
+        rows = (
+            PeerValidation.objects.filter(
+                evaluation__user_id__in=user_ids,
+                evaluation__path_id__in=path_domains,
+            )
+            .exclude(peer_id=F("evaluation__user_id"))
+            .values_list("evaluation__user_id", "evaluation__path_id")
+            .annotate(
+                total=Count("id", filter=Q(decision=PeerValidation.Decision.APPROVED)),
+                count=Count("id"),
+                recent=Count("id", filter=Q(created_at__gte=since)),
+            )
+        )
+        for user_id, path_id, total, count, recent in rows.iterator():
+            for domain_id in path_domains[path_id]:
+                yield Evidence(user_id, domain_id, QUALITY, total, count, recent)
+
+
+class ArgumentCollector(EvidenceCollector):
+    """Ethikos arguments on topics relevant to a domain (``quality``)."""
+
+    key = "ethikos_arguments"
+
+    def collect(self, user_ids, domains, since):
+        topic_domains = _topic_domains(domains)
+        if not topic_domains:
+            return
+        rows = (
+            EthikosArgument.objects.filter(user_id__in=user_ids, topic_id__in=topic_domains)
+            .values_list("user_id", "topic_id")
+            .annotate(
+                total=Count("id", filter=Q(is_hidden=False)),
+                count=Count("id"),
+                recent=Count("id", filter=Q(created_at__gte=since)),
+            )
+        )
+        for user_id, topic_id, total, count, recent in rows.iterator():
+            for domain_id in topic_domains[topic_id]:
+                yield Evidence(user_id, domain_id, QUALITY, total, count, recent)
+
+
+class CredentialCollector(EvidenceCollector):
+    """Verified Trust credentials (user-wide ``expertise``)."""
+
+    key = "trust_credentials"
+
+    def collect(self, user_ids, domains, since):
+        rows = (
+            Credential.objects.filter(
+                user_id__in=user_ids, status=Credential.Status.VERIFIED
+            )
+            .values_list("user_id")
+            .annotate(count=Count("id"))
+        )
+        for user_id, count in rows.iterator():
+            yield Evidence(user_id, None, EXPERTISE, count, count, 0)
+
+
+class _Axes:
+    __slots__ = ("quality_total", "quality_count", "expertise_total", "expertise_count", "recent")
+
+    def __init__(self) -> None:
+        self.quality_total = self.expertise_total = 0.0
+        self.quality_count = self.expertise_count = self.recent = 0
+
+    def add(self, evidence: Evidence) -> None:
+        if evidence.axis == QUALITY:
+            self.quality_total += evidence.total
+            self.quality_count += evidence.count
+        else:
+            self.expertise_total += evidence.total
+            self.expertise_count += evidence.count
+        self.recent += evidence.recent
+
+    def metrics(self, saturation: int) -> dict[str, Decimal]:
+        return {
+            "quality": _mean(self.quality_total, self.quality_count),
+            "expertise": _mean(self.expertise_total, self.expertise_count),
+            "frequency": min(Decimal(1), Decimal(self.recent) / max(saturation, 1)),
+        }
+
+
+def _mean(total: float, count: int) -> Decimal:
+    return Decimal(str(total)) / count if count else Decimal(0)
+
+
+def _collect_isolated(collector, user_ids, domains, since) -> list[Evidence]:
+    # Runs on a pool thread, i.e. on its own database connection.
+    try:
+        with ekoh_smartvote_db_scope():
+            return list(collector.collect(user_ids, domains, since))
+    finally:
+        connection.close()
+
+
+def _run_collectors(
+    collectors: Sequence[EvidenceCollector],
+    user_ids: Sequence[int],
+    domains: Sequence[ExpertiseCategory],
+    since: datetime,
+) -> Iterator[Evidence]:
+    workers = min(len(collectors), getattr(settings, "EKOH_EVIDENCE_COLLECTOR_WORKERS", 4))
+    if workers <= 1:
+        with ekoh_smartvote_db_scope():
+            for collector in collectors:
+                yield from collector.collect(user_ids, domains, since)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ekoh-evidence") as pool:
+        futures = [
+            pool.submit(_collect_isolated, collector, user_ids, domains, since)
+            for collector in collectors
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def collect_metrics(
+    user_ids: Sequence[int],
+    domains: Sequence[ExpertiseCategory],
+    collectors: Sequence[EvidenceCollector] | None = None,
+) -> dict[PairKey, dict[str, Decimal]]:
+    """Metrics by ``(user_id, domain_id)`` for every pair with domain evidence."""
+    if not user_ids or not domains:
+        return {}
+    if collectors is None:
+        collectors = registered_collectors()
+    since = timezone.now() - timedelta(
+        days=getattr(settings, "EKOH_EVIDENCE_FREQUENCY_DAYS", 365)
+    )
+
+    pairs: dict[PairKey, _Axes] = defaultdict(_Axes)
+    user_wide: list[Evidence] = []
+    for evidence in _run_collectors(collectors, user_ids, domains, since):
+        if evidence.domain_id is None:
+            user_wide.append(evidence)
+        else:
+            pairs[(evidence.user_id, evidence.domain_id)].add(evidence)
+
+    if user_wide:
+        domains_by_user: dict[int, list[_Axes]] = defaultdict(list)
+        for (user_id, _), axes in pairs.items():
+            domains_by_user[user_id].append(axes)
+        for evidence in user_wide:
+            for axes in domains_by_user.get(evidence.user_id, ()):
+                axes.add(evidence)
+
+    saturation = getattr(settings, "EKOH_EVIDENCE_FREQUENCY_SATURATION", 10)
+    return {pair: axes.metrics(saturation) for pair, axes in pairs.items()}
+
+
+register_collector(EvaluationCollector())
+register_collector(PeerValidationCollector())
+register_collector(ArgumentCollector())
+register_collector(CredentialCollector())
@@ -0,0 +1,219 @@
+"""Top-expert leaderboards per ISCED category.
+
+Rankings are materialised in ``ExpertRanking`` from the effective scores of
+``services.rollups`` (a leaf's own score, or the roll-up of a broad or
+narrow field's subtree):
+
+* ``rank_categories`` re-ranks some categories, or all of them, with window
+  functions in two statements;
+* ``mark_stale`` records categories whose scores changed (called from the
+  score signals); ``refresh_stale_rankings`` re-ranks only those;
+* ``top_experts`` serves a leaderboard by walking ``idx_ranking_top`` in rank
+  order, so it reads about K rows.
+
+Rank and percentile are computed over every expert of the category;
+``top_experts`` then leaves out the users whose ratings the viewer may not
+see and, unless the viewer is themself or staff, the users with an
+anonymous identity.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.privacy import ConfidentialitySetting
+from konnaxion.ekoh.models.ranking import ExpertRanking, RankingStaleCategory
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.services.rating_access import resolve_rating_access_many
+
+User = get_user_model()
+
+CATEGORY_FILTER = "category_id = ANY(%(category_ids)s)"
+
+DELETE_RANKINGS_SQL = "DELETE FROM ekoh_expert_ranking WHERE {where}"
+
+# Effective score per user and category (see ``rollups.effective_scores``),
+# ranked best first; the percentile is the share of the category's experts
+# scoring at or below the user.
+RANK_SQL = """
+INSERT INTO ekoh_expert_ranking
+    (category_id, user_id, score, rank, percentile, refreshed_at)
+SELECT category_id,
+       user_id,
+       score,
+       RANK() OVER (PARTITION BY category_id ORDER BY score DESC),
+       ROUND((100 * CUME_DIST() OVER (PARTITION BY category_id ORDER BY score))::numeric, 2),
+       now()
+FROM (
+    SELECT user_id, category_id, MAX(score) AS score
+    FROM (
+        SELECT user_id,
+               category_id,
+               LEAST(GREATEST(
+                   CASE WHEN weighted_score > 1 THEN weighted_score / 100
+                        ELSE weighted_score END, 0), 1) AS score
+        FROM user_expertise_score
+        WHERE {where}
+        UNION ALL
+        SELECT user_id, category_id, score
+        FROM user_expertise_rollup
+        WHERE {where}
+    ) AS candidates
+    GROUP BY user_id, category_id
+) AS effective
+WHERE score > 0
+"""
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    user: object
+    confidentiality_level: str
+    rank: int
+    percentile: Decimal
+    score: Decimal
+
+
+@dataclass(frozen=True)
+class Leaderboard:
+    category: ExpertiseCategory
+    refreshed_at: datetime | None
+    entries: list[LeaderboardEntry]
+
+
+def leaderboard_size(requested: int | None = None) -> int:
+    """``requested`` bounded by ``EKOH_LEADERBOARD_MAX``."""
+    default = int(getattr(settings, "EKOH_LEADERBOARD_SIZE", 10))
+    maximum = int(getattr(settings, "EKOH_LEADERBOARD_MAX", 100))
+    if requested is None:
+        return default
+    if requested < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(requested, maximum)
+
+
+def rank_categories(category_ids: Iterable[int] | None = None) -> int:
+    """Re-rank ``category_ids`` (default: every category); return rows written.
+
+    Must run inside ``ekoh_smartvote_db_scope()``; readers keep seeing the
+    previous ranking until the transaction commits.
+    """
+    params: dict[str, list[int]] = {}
+    where = "TRUE"
+    if category_ids is not None:
+        params["category_ids"] = sorted(set(category_ids))
+        if not params["category_ids"]:
+            return 0
+        where = CATEGORY_FILTER
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_RANKINGS_SQL.format(where=where), params)
+        cursor.execute(RANK_SQL.format(where=where), params)
+        return cursor.rowcount
+
+
+def mark_stale(category_ids: Iterable[int]) -> None:
+    """Queue categories for re-ranking; already queued ones are kept."""
+    stale = [RankingStaleCategory(category_id=pk) for pk in sorted(set(category_ids))]
+    if stale:
+        with ekoh_smartvote_db_scope():
+            RankingStaleCategory.objects.bulk_create(stale, ignore_conflicts=True)
+
+
+def refresh_stale_rankings(limit: int = 200) -> int:
+    """Re-rank up to ``limit`` stale categories; return how many.
+
+    Claimed categories are removed in the same transaction as their new
+    ranking, so a failed refresh leaves them queued.
+    """
+    with ekoh_smartvote_db_scope():
+        rows = list(
+            RankingStaleCategory.objects.select_for_update(skip_locked=True)
+            .order_by("marked_at")
+            .values_list("pk", "category_id")[:limit]
+        )
+        if not rows:
+            return 0
+        RankingStaleCategory.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+        rank_categories(category_id for _, category_id in rows)
+    return len(rows)
+
+
+def rebuild_rankings() -> int:
+    """Re-rank every category; return rows written."""
+    with ekoh_smartvote_db_scope():
+        return rank_categories()
+
+
+def top_experts(code: str, *, viewer=None, limit: int | None = None) -> Leaderboard | None:
+    """The ``limit`` best-ranked experts of category ``code`` visible to ``viewer``.
+
+    Returns ``None`` for an unknown category.
+    """
+    limit = leaderboard_size(limit)
+    viewer_is_authenticated = bool(
+        viewer is not None and getattr(viewer, "is_authenticated", False)
+    )
+    viewer_is_staff = viewer_is_authenticated and getattr(viewer, "is_staff", False)
+
+    with ekoh_smartvote_db_scope():
+        category = ExpertiseCategory.objects.filter(code=code).first()
+        if category is None:
+            return None
+
+        ranking = ExpertRanking.objects.filter(category_id=category.pk).order_by(
+            "rank", "user_id"
+        )
+        entries: list[LeaderboardEntry] = []
+        refreshed_at = None
+        cursor = None
+        while len(entries) < limit:
+            page = ranking
+            if cursor is not None:
+                rank, user_id = cursor
+                page = page.filter(Q(rank__gt=rank) | Q(rank=rank, user_id__gt=user_id))
+            # Over-fetch a little: some experts may be hidden from the viewer.
+            rows = list(page[: 2 * limit])
+            if not rows:
+                break
+            cursor = (rows[-1].rank, rows[-1].user_id)
+            refreshed_at = refreshed_at or rows[0].refreshed_at
+
+            user_ids = [row.user_id for row in rows]
+            access = resolve_rating_access_many(viewer, user_ids)
+            levels = dict(
+                ConfidentialitySetting.objects.filter(user_id__in=user_ids).values_list(
+                    "user_id", "level"
+                )
+            )
+            users = User.objects.in_bulk(user_ids)
+            for row in rows:
+                level = levels.get(row.user_id, ConfidentialitySetting.PUBLIC)
+                is_self = viewer_is_authenticated and viewer.pk == row.user_id
+                if row.user_id not in users or not access[row.user_id].allowed:
+                    continue
+                if level == ConfidentialitySetting.ANONYMOUS and not (
+                    is_self or viewer_is_staff
+                ):
+                    continue
+                entries.append(
+                    LeaderboardEntry(
+                        user=users[row.user_id],
+                        confidentiality_level=level,
+                        rank=row.rank,
+                        percentile=row.percentile,
+                        score=row.score,
+                    )
+                )
+                if len(entries) == limit:
+                    break
+
+    return Leaderboard(category=category, refreshed_at=refreshed_at, entries=entries)
@@ -6,6 +6,10 @@ these scores later in a declared contextual reading.
 
 Inputs are expected on either a 0..1 or 0..100 scale.  Each axis is normalized
 independently and then combined using runtime RAW_WEIGHT_* configuration.
+
+``compute_user_domain_score`` scores and stores one pair; the nightly rebuild
+scores whole chunks with ``score_metrics`` and writes them with
+``upsert_scores``.
 """
 
 from __future__ import annotations
@@ -13,7 +17,9 @@ from __future__ import annotations
 import logging
 from decimal import Decimal
 from functools import lru_cache
-from typing import Mapping
+from typing import Iterable, Mapping
+
+from django.db import connection
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
 from konnaxion.ekoh.models.config import ScoreConfiguration
@@ -26,6 +32,45 @@ AXES = ("quality", "expertise", "frequency")
 ZERO = Decimal("0")
 ONE = Decimal("1")
 HUNDRED = Decimal("100")
+QUANTUM = Decimal("0.0001")
+
+# One statement per chunk.  Only rows whose scores actually change are
+# written and returned, so unchanged pairs cost no row version and no
+# downstream invalidation.  The previous score of each written row is kept
+# as a ``ScoreRevision`` (every CTE reads the pre-statement snapshot).
+UPSERT_SCORES_SQL = """
+WITH input AS (
+    SELECT * FROM unnest(
+        %(user_ids)s::bigint[],
+        %(category_ids)s::bigint[],
+        %(raw_scores)s::numeric[],
+        %(weighted_scores)s::numeric[]
+    ) AS input(user_id, category_id, raw_score, weighted_score)
+),
+previous AS (
+    SELECT score.user_id, score.category_id, score.weighted_score
+    FROM user_expertise_score score
+    JOIN input USING (user_id, category_id)
+),
+written AS (
+    INSERT INTO user_expertise_score AS current
+        (user_id, category_id, raw_score, weighted_score)
+    SELECT user_id, category_id, raw_score, weighted_score FROM input
+    ON CONFLICT (user_id, category_id) DO UPDATE
+    SET raw_score = EXCLUDED.raw_score,
+        weighted_score = EXCLUDED.weighted_score
+    WHERE (current.raw_score, current.weighted_score)
+        IS DISTINCT FROM (EXCLUDED.raw_score, EXCLUDED.weighted_score)
+    RETURNING current.user_id, current.category_id
+),
+revised AS (
+    INSERT INTO ekoh_score_revision (kind, user_id, category_id, value, replaced_at)
+    SELECT 'expertise', written.user_id, written.category_id, previous.weighted_score, now()
+    FROM written
+    LEFT JOIN previous USING (user_id, category_id)
+)
+SELECT user_id, category_id FROM written
+"""
 
 
 @lru_cache(maxsize=1)
@@ -65,6 +110,63 @@ def _normalised_axis_weights() -> Mapping[str, Decimal]:
     return {axis: value / total for axis, value in values.items()}
 
 
+def score_metrics(
+    metrics: Mapping[str, Decimal],
+    axis_weights: Mapping[str, Decimal] | None = None,
+) -> tuple[Decimal, Decimal]:
+    """Return ``(raw_score, weighted_score)`` for one user/domain's metrics.
+
+    Required metrics:
+      quality    evidence quality / peer validation
+      expertise  demonstrated knowledge / credentials / work
+      frequency  recency or sustained relevant participation
+
+    ``weighted_score`` is in 0..1; lack of expertise never creates negative
+    merit.  ``raw_score`` remains an explainable aggregate of the normalized
+    evidence axes.  Pass ``axis_weights`` to score many pairs against one
+    configuration read.
+    """
+    missing = [axis for axis in AXES if axis not in metrics]
+    if missing:
+        raise ValueError(f"Missing metric(s): {', '.join(missing)}")
+
+    normalized = {axis: _normalise_metric(metrics[axis]) for axis in AXES}
+    if axis_weights is None:
+        axis_weights = _normalised_axis_weights()
+    score = sum(
+        axis_weights[axis] * normalized[axis]
+        for axis in AXES
+    ).quantize(QUANTUM)
+    raw_score = sum(normalized.values(), ZERO).quantize(QUANTUM)
+    return raw_score, score
+
+
+def upsert_scores(
+    rows: Iterable[tuple[int, int, Decimal, Decimal]],
+) -> list[tuple[int, int]]:
+    """Write ``(user_id, category_id, raw_score, weighted_score)`` rows at once.
+
+    Returns the ``(user_id, category_id)`` pairs whose stored scores changed.
+    Model signals do not fire; callers notify ``expertise_scores_changed``.
+    Must run inside ``ekoh_smartvote_db_scope()``.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    user_ids, category_ids, raw_scores, weighted_scores = map(list, zip(*rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT_SCORES_SQL,
+            {
+                "user_ids": user_ids,
+                "category_ids": category_ids,
+                "raw_scores": raw_scores,
+                "weighted_scores": weighted_scores,
+            },
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+
 def compute_user_domain_score(
     user_id: int,
     domain: ExpertiseCategory,
@@ -88,29 +190,13 @@ def _compute_user_domain_score_core(
 ) -> Decimal:
     """Compute normalized EkoH expertise for one user and one domain.
 
-    Required metrics:
-      quality    evidence quality / peer validation
-      expertise  demonstrated knowledge / credentials / work
-      frequency  recency or sustained relevant participation
-
-    Returns a Decimal in 0..1.  Lack of expertise never creates negative merit.
+    See ``score_metrics`` for the required metrics.  Returns a Decimal in
+    0..1.
     """
-    missing = [axis for axis in AXES if axis not in metrics]
-    if missing:
-        raise ValueError(f"Missing metric(s): {', '.join(missing)}")
-
-    normalized = {axis: _normalise_metric(metrics[axis]) for axis in AXES}
-    axis_weights = _normalised_axis_weights()
-
-    score = sum(
-        axis_weights[axis] * normalized[axis]
-        for axis in AXES
-    ).quantize(Decimal("0.0001"))
+    raw_score, score = score_metrics(metrics)
 
     if flush:
-        # raw_score remains an explainable aggregate of normalized evidence
-        # axes; weighted_score is the canonical normalized domain score.
-        raw_score = sum(normalized.values(), ZERO).quantize(Decimal("0.0001"))
+        # weighted_score is the canonical normalized domain score.
         UserExpertiseScore.objects.update_or_create(
             user_id=user_id,
             category=domain,
@@ -121,11 +207,11 @@ def _compute_user_domain_score_core(
         )
 
     LOGGER.debug(
-        "EkoH domain score user=%s domain=%s metrics=%s normalized=%s score=%s",
+        "EkoH domain score user=%s domain=%s metrics=%s raw=%s score=%s",
         user_id,
         getattr(domain, "code", domain),
         dict(metrics),
-        normalized,
+        raw_score,
         score,
     )
     return score
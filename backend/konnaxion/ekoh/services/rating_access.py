@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
 from konnaxion.ekoh.models.access import (
@@ -75,6 +75,33 @@ def _scope_is_within(subject_scope: RatingAccessScope, grant_scope: RatingAccess
     return False
 
 
+def _best_scope_grant(subject_scopes, grants, is_within) -> RatingAccessDecision | None:
+    """Pick the highest-ranked grant covering one of ``subject_scopes``.
+
+    Both inputs must already be ordered by scope key; ties keep the first
+    match so single and bulk resolution agree.
+    """
+    best: RatingAccessDecision | None = None
+    for subject_scope in subject_scopes:
+        for grant in grants:
+            applies = subject_scope.pk == grant.scope_id
+            if not applies and grant.include_descendants:
+                applies = is_within(subject_scope, grant.scope)
+            if not applies:
+                continue
+
+            candidate = RatingAccessDecision(
+                True,
+                grant.access_level,
+                "scope_grant",
+                scope_key=grant.scope.key,
+                scope_name=grant.scope.name,
+            )
+            if best is None or _access_rank(candidate.level) > _access_rank(best.level):
+                best = candidate
+    return best
+
+
 def resolve_rating_access(*, viewer, subject) -> RatingAccessDecision:
     """Resolve the maximum EkoH rating detail visible to ``viewer``.
 
@@ -118,24 +145,11 @@ def resolve_rating_access(*, viewer, subject) -> RatingAccessDecision:
                 .order_by("scope__key")
             )
 
-            for membership in subject_scopes:
-                subject_scope = membership.scope
-                for grant in grants:
-                    applies = subject_scope.pk == grant.scope_id
-                    if not applies and grant.include_descendants:
-                        applies = _scope_is_within(subject_scope, grant.scope)
-                    if not applies:
-                        continue
-
-                    candidate = RatingAccessDecision(
-                        True,
-                        grant.access_level,
-                        "scope_grant",
-                        scope_key=grant.scope.key,
-                        scope_name=grant.scope.name,
-                    )
-                    if best is None or _access_rank(candidate.level) > _access_rank(best.level):
-                        best = candidate
+            best = _best_scope_grant(
+                [membership.scope for membership in subject_scopes],
+                grants,
+                _scope_is_within,
+            )
 
         if best is not None:
             return best
@@ -144,3 +158,131 @@ def resolve_rating_access(*, viewer, subject) -> RatingAccessDecision:
             return RatingAccessDecision(True, RatingAccessGrant.RATINGS, "public_policy")
 
         return RatingAccessDecision(False, None, "outside_authorized_scope")
+
+
+def _load_scope_parents(scope_ids: Iterable[int]) -> dict[int, int | None]:
+    """Load the parent chain of every scope in ``scope_ids``.
+
+    One query per hierarchy level rather than one per scope.
+    """
+    parents: dict[int, int | None] = {}
+    frontier = set(scope_ids)
+    while frontier:
+        rows = RatingAccessScope.objects.filter(pk__in=frontier).values_list(
+            "id", "parent_id"
+        )
+        parents.update(rows)
+        frontier = {
+            parent_id
+            for parent_id in parents.values()
+            if parent_id is not None and parent_id not in parents
+        }
+    return parents
+
+
+def resolve_rating_access_many(viewer, subjects) -> dict[int, RatingAccessDecision]:
+    """Resolve rating access for many subjects with a bounded query count.
+
+    ``subjects`` may be user instances or user primary keys. Returns
+    ``{subject_pk: RatingAccessDecision}`` with exactly the decisions
+    ``resolve_rating_access`` would return one subject at a time. The viewer's
+    grants, every subject's visibility policy and scope memberships are each
+    loaded once; scope ancestry costs one query per hierarchy level.
+    """
+    subjects_by_pk = {getattr(subject, "pk", subject): subject for subject in subjects}
+    if not subjects_by_pk:
+        return {}
+
+    viewer_is_authenticated = bool(
+        viewer is not None and getattr(viewer, "is_authenticated", False)
+    )
+
+    decisions: dict[int, RatingAccessDecision] = {}
+    if viewer_is_authenticated and viewer.pk in subjects_by_pk:
+        decisions[viewer.pk] = RatingAccessDecision(
+            True, RatingAccessGrant.HISTORY, "self"
+        )
+
+    if viewer_is_authenticated and getattr(viewer, "is_staff", False):
+        for pk in subjects_by_pk:
+            decisions.setdefault(
+                pk, RatingAccessDecision(True, RatingAccessGrant.HISTORY, "staff")
+            )
+        return decisions
+
+    pending = [pk for pk in subjects_by_pk if pk not in decisions]
+    if not pending:
+        return decisions
+
+    with ekoh_smartvote_db_scope():
+        visibility_by_user = dict(
+            RatingVisibilitySetting.objects.filter(user_id__in=pending).values_list(
+                "user_id", "visibility"
+            )
+        )
+
+        scopes_by_user: dict[int, list[RatingAccessScope]] = {}
+        grants: list[RatingAccessGrant] = []
+        parents: dict[int, int | None] = {}
+        if viewer_is_authenticated:
+            grants = list(
+                RatingAccessGrant.objects.select_related("scope")
+                .filter(viewer_id=viewer.pk, active=True, scope__active=True)
+                .order_by("scope__key")
+            )
+            if grants:
+                memberships = (
+                    RatingScopeSubject.objects.select_related("scope")
+                    .filter(
+                        user_id__in=[
+                            pk
+                            for pk in pending
+                            if visibility_by_user.get(pk)
+                            != RatingVisibilitySetting.PRIVATE
+                        ],
+                        active=True,
+                        scope__active=True,
+                    )
+                    .order_by("scope__key")
+                )
+                for membership in memberships:
+                    scopes_by_user.setdefault(membership.user_id, []).append(
+                        membership.scope
+                    )
+                if any(grant.include_descendants for grant in grants):
+                    parents = _load_scope_parents(
+                        {
+                            scope.pk
+                            for scopes in scopes_by_user.values()
+                            for scope in scopes
+                        }
+                    )
+
+    def is_within(subject_scope: RatingAccessScope, grant_scope: RatingAccessScope) -> bool:
+        current = subject_scope.pk
+        seen: set[int] = set()
+        while current is not None and current not in seen:
+            seen.add(current)
+            if current == grant_scope.pk:
+                return True
+            current = parents.get(current)
+        return False
+
+    for pk in pending:
+        # Missing policy means public ratings; see ``_visibility_for``.
+        visibility = visibility_by_user.get(pk, RatingVisibilitySetting.PUBLIC)
+        if visibility == RatingVisibilitySetting.PRIVATE:
+            decisions[pk] = RatingAccessDecision(False, None, "private_policy")
+            continue
+
+        best = _best_scope_grant(scopes_by_user.get(pk, []), grants, is_within)
+        if best is not None:
+            decisions[pk] = best
+        elif visibility == RatingVisibilitySetting.PUBLIC:
+            decisions[pk] = RatingAccessDecision(
+                True, RatingAccessGrant.RATINGS, "public_policy"
+            )
+        else:
+            decisions[pk] = RatingAccessDecision(False, None, "outside_authorized_scope")
+
+    return decisions
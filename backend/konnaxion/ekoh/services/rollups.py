@@ -0,0 +1,178 @@
+"""Expertise roll-ups over the ISCED ``ltree`` hierarchy.
+
+Scores are computed for leaf domains (detailed fields).  ``UserExpertiseRollup``
+keeps, for every broad and narrow field above them, the user's best
+normalized score in that subtree: expertise in one narrow field counts fully
+towards its broad field, while breadth alone does not dilute it.
+
+``refresh_rollups`` recomputes only the ancestors of the changed
+``(user_id, category_id)`` pairs, in one statement that walks the hierarchy
+with the ``path`` GiST index (``@>`` / ``<@``).  It runs from the
+``UserExpertiseScore`` signals and after each chunk of the nightly rebuild.
+
+``effective_scores`` is what consumers read: for any category, at any depth,
+the larger of the user's own score there and the roll-up of its subtree.
+Consultations may therefore declare relevance for a broad or narrow field
+and be aligned against the roll-ups without walking the tree in Python.
+With ``as_of`` it recomputes the same values from the leaf scores in force
+at that time (``services.score_revisions``).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+from django.db import connection
+
+from konnaxion.ekoh.models.scores import UserExpertiseRollup, UserExpertiseScore
+from konnaxion.ekoh.services.multidimensional_scoring import _normalise_metric
+from konnaxion.ekoh.services.score_revisions import expertise_scores_as_of
+
+# Ancestors (including the category itself) that have children, per changed
+# pair; then the best normalized score of the user inside each ancestor's
+# subtree.  Empty subtrees are deleted, changed ones upserted, and every
+# touched roll-up is returned.
+REFRESH_ROLLUPS_SQL = """
+WITH changed AS (
+    SELECT DISTINCT pair.user_id, ancestor.id AS category_id, ancestor.path
+    FROM unnest(%(user_ids)s::bigint[], %(category_ids)s::bigint[])
+        AS pair(user_id, category_id)
+    JOIN expertise_category scored ON scored.id = pair.category_id
+    JOIN expertise_category ancestor ON ancestor.path @> scored.path
+    WHERE EXISTS (
+        SELECT 1 FROM expertise_category child WHERE child.parent_id = ancestor.id
+    )
+),
+rolled AS (
+    SELECT changed.user_id,
+           changed.category_id,
+           MAX(LEAST(GREATEST(
+               CASE WHEN score.weighted_score > 1 THEN score.weighted_score / 100
+                    ELSE score.weighted_score END, 0), 1)) AS score,
+           COUNT(score.id) AS domain_count
+    FROM changed
+    LEFT JOIN (
+        user_expertise_score score
+        JOIN expertise_category scored ON scored.id = score.category_id
+    ) ON score.user_id = changed.user_id AND scored.path <@ changed.path
+    GROUP BY changed.user_id, changed.category_id
+),
+removed AS (
+    DELETE FROM user_expertise_rollup AS current
+    USING rolled
+    WHERE current.user_id = rolled.user_id
+      AND current.category_id = rolled.category_id
+      AND rolled.domain_count = 0
+    RETURNING current.user_id, current.category_id
+),
+written AS (
+    INSERT INTO user_expertise_rollup AS current
+        (user_id, category_id, score, domain_count, updated_at)
+    SELECT user_id, category_id, score, domain_count, now()
+    FROM rolled
+    WHERE domain_count > 0
+    ON CONFLICT (user_id, category_id) DO UPDATE
+    SET score = EXCLUDED.score,
+        domain_count = EXCLUDED.domain_count,
+        updated_at = EXCLUDED.updated_at
+    WHERE (current.score, current.domain_count)
+        IS DISTINCT FROM (EXCLUDED.score, EXCLUDED.domain_count)
+    RETURNING current.user_id, current.category_id
+)
+SELECT user_id, category_id FROM removed
+UNION ALL
+SELECT user_id, category_id FROM written
+"""
+
+
+def refresh_rollups(pairs: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Refresh the roll-ups above changed ``(user_id, category_id)`` pairs.
+
+    Returns the ``(user_id, category_id)`` roll-ups that were written or
+    removed.  Must run inside ``ekoh_smartvote_db_scope()``.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return []
+    user_ids, category_ids = map(list, zip(*pairs))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            REFRESH_ROLLUPS_SQL, {"user_ids": user_ids, "category_ids": category_ids}
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+# Every category of a subtree, including its root, per requested root.
+SUBTREE_MEMBERS_SQL = """
+SELECT root.id, member.id
+FROM expertise_category root
+JOIN expertise_category member ON member.path <@ root.path
+WHERE %(category_ids)s::bigint[] IS NULL OR root.id = ANY(%(category_ids)s::bigint[])
+"""
+
+
+def effective_scores(
+    user_ids: Sequence[int],
+    category_ids: Sequence[int] | None = None,
+    *,
+    as_of: datetime | None = None,
+) -> dict[int, dict[int, Decimal]]:
+    """Normalized 0..1 expertise by user and category, at any depth.
+
+    ``category_ids`` restricts the categories (default: all); ``as_of``
+    reads the scores in force at that time.  Must run inside
+    ``ekoh_smartvote_db_scope()``.
+    """
+    if as_of is not None:
+        return _effective_scores_as_of(user_ids, category_ids, as_of)
+
+    scores = UserExpertiseScore.objects.filter(user_id__in=user_ids)
+    rollups = UserExpertiseRollup.objects.filter(user_id__in=user_ids)
+    if category_ids is not None:
+        scores = scores.filter(category_id__in=category_ids)
+        rollups = rollups.filter(category_id__in=category_ids)
+
+    by_user: dict[int, dict[int, Decimal]] = {}
+    for user_id, category_id, score in scores.values_list(
+        "user_id", "category_id", "weighted_score"
+    ):
+        by_user.setdefault(user_id, {})[category_id] = _normalise_metric(score)
+    for user_id, category_id, score in rollups.values_list("user_id", "category_id", "score"):
+        vector = by_user.setdefault(user_id, {})
+        vector[category_id] = max(vector.get(category_id, score), score)
+    return by_user
+
+
+def _effective_scores_as_of(
+    user_ids: Sequence[int],
+    category_ids: Sequence[int] | None,
+    as_of: datetime,
+) -> dict[int, dict[int, Decimal]]:
+    leaf_scores: dict[int, dict[int, Decimal]] = defaultdict(dict)
+    for (user_id, category_id), score in expertise_scores_as_of(user_ids, as_of).items():
+        leaf_scores[user_id][category_id] = _normalise_metric(score)
+    if not leaf_scores:
+        return {}
+
+    members: dict[int, list[int]] = defaultdict(list)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SUBTREE_MEMBERS_SQL,
+            {"category_ids": None if category_ids is None else list(category_ids)},
+        )
+        for root_id, member_id in cursor.fetchall():
+            members[root_id].append(member_id)
+
+    by_user: dict[int, dict[int, Decimal]] = {}
+    for user_id, scores in leaf_scores.items():
+        vector = {}
+        for root_id, member_ids in members.items():
+            found = [scores[member_id] for member_id in member_ids if member_id in scores]
+            if found:
+                vector[root_id] = max(found)
+        if vector:
+            by_user[user_id] = vector
+    return by_user
@@ -0,0 +1,94 @@
+"""EkoH scores as they were at a past time.
+
+Every change of a ``UserExpertiseScore`` or ``UserEthicsScore`` leaves a
+``ScoreRevision`` holding the previous value: ``upsert_scores`` writes them
+in the same statement as the scores, the model signals
+(``konnaxion.ekoh.signals``) on save and delete.  The score in force at
+``as_of`` is the value of the earliest revision after ``as_of`` or, without
+one, the current score.  Roll-ups are derived from the leaf scores, so
+``rollups.effective_scores(..., as_of=...)`` recomputes them from these.
+
+Revisions are only needed while a consultation that closed before them
+awaits finalisation; Smart Vote's finaliser drops older ones with
+``prune_revisions``.  All functions must run inside
+``ekoh_smartvote_db_scope()``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Sequence
+
+from django.utils import timezone
+
+from konnaxion.ekoh.models.audit import ScoreRevision
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+
+
+def record_revision(kind: str, user_id: int, category_id: int | None, value) -> None:
+    """Keep ``value`` as the score ``kind`` had before a change made now."""
+    ScoreRevision.objects.create(
+        kind=kind,
+        user_id=user_id,
+        category_id=category_id,
+        value=value,
+        replaced_at=timezone.now(),
+    )
+
+
+def _revised(
+    kind: str, user_ids: Sequence[int], as_of: datetime
+) -> dict[tuple[int, int | None], Decimal | None]:
+    """Value at ``as_of`` of every score changed since, by (user, category)."""
+    revisions = ScoreRevision.objects.filter(
+        kind=kind, user_id__in=user_ids, replaced_at__gt=as_of
+    ).order_by("-replaced_at", "-pk")
+    values: dict[tuple[int, int | None], Decimal | None] = {}
+    # The earliest revision of each score comes last and wins.
+    for user_id, category_id, value in revisions.values_list(
+        "user_id", "category_id", "value"
+    ).iterator():
+        values[(user_id, category_id)] = value
+    return values
+
+
+def expertise_scores_as_of(
+    user_ids: Sequence[int], as_of: datetime
+) -> dict[tuple[int, int], Decimal]:
+    """``weighted_score`` by ``(user_id, category_id)`` in force at ``as_of``."""
+    scores = {
+        (user_id, category_id): score
+        for user_id, category_id, score in UserExpertiseScore.objects.filter(
+            user_id__in=user_ids
+        ).values_list("user_id", "category_id", "weighted_score")
+    }
+    for pair, value in _revised(ScoreRevision.KIND_EXPERTISE, user_ids, as_of).items():
+        if value is None:
+            scores.pop(pair, None)
+        else:
+            scores[pair] = value
+    return scores
+
+
+def ethics_scores_as_of(user_ids: Sequence[int], as_of: datetime) -> dict[int, Decimal]:
+    """``ethical_score`` by user in force at ``as_of``."""
+    scores = dict(
+        UserEthicsScore.objects.filter(user_id__in=user_ids).values_list(
+            "user_id", "ethical_score"
+        )
+    )
+    for (user_id, _category_id), value in _revised(
+        ScoreRevision.KIND_ETHICS, user_ids, as_of
+    ).items():
+        if value is None:
+            scores.pop(user_id, None)
+        else:
+            scores[user_id] = value
+    return scores
+
+
+def prune_revisions(before: datetime) -> int:
+    """Drop the revisions of changes made before ``before``; return how many."""
+    deleted, _ = ScoreRevision.objects.filter(replaced_at__lt=before).delete()
+    return deleted
@@ -0,0 +1,121 @@
+"""Signals sent by EkoH services, and the evidence receivers of EkoH.
+
+``expertise_scores_changed``
+    Sent after a set-based write to ``UserExpertiseScore`` (which bypasses
+    model signals) has committed, and after ISCED roll-ups were refreshed,
+    with ``pairs``: the ``(user_id, category_id)`` pairs whose stored score
+    or roll-up changed.
+
+Every score write refreshes the roll-ups above it (``services.rollups``)
+and marks the expert rankings of the changed categories stale
+(``services.leaderboard``).  Saving or deleting a score, expertise or
+ethics, first keeps its previous value as a ``ScoreRevision``
+(``services.score_revisions``).
+
+Saving or deleting evidence (KonnectED evaluations and peer validations,
+Trust credentials, Ethikos arguments) marks its author dirty so that the
+``ekoh_score_recalc_dirty`` task rescores them.  None of these records names
+an ISCED domain, so the whole user is marked.
+"""
+
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.audit import ScoreRevision
+from konnaxion.ekoh.models.scores import (
+    UserEthicsScore,
+    UserExpertiseRollup,
+    UserExpertiseScore,
+)
+from konnaxion.ekoh.services import leaderboard
+from konnaxion.ekoh.services.dirty_scores import mark_dirty
+from konnaxion.ekoh.services.rollups import refresh_rollups
+from konnaxion.ekoh.services.score_revisions import record_revision
+from konnaxion.ethikos.models import EthikosArgument
+from konnaxion.konnected.models import Evaluation, PeerValidation
+from konnaxion.trust.models import Credential
+
+expertise_scores_changed = Signal()
+
+
+def _record_previous(kind, instance, field: str, category_id, *, deleting: bool) -> None:
+    with ekoh_smartvote_db_scope():
+        previous = None
+        if instance.pk is not None:
+            previous = (
+                type(instance)
+                .objects.filter(pk=instance.pk)
+                .values_list(field, flat=True)
+                .first()
+            )
+        if deleting and previous is None:
+            return
+        if not deleting and previous == Decimal(str(getattr(instance, field))):
+            return
+        record_revision(kind, instance.user_id, category_id, previous)
+
+
+@receiver(pre_save, sender=UserExpertiseScore)
+@receiver(pre_delete, sender=UserExpertiseScore)
+def _expertise_score_replaced(sender, instance, signal, **kwargs) -> None:
+    _record_previous(
+        ScoreRevision.KIND_EXPERTISE,
+        instance,
+        "weighted_score",
+        instance.category_id,
+        deleting=signal is pre_delete,
+    )
+
+
+@receiver(pre_save, sender=UserEthicsScore)
+@receiver(pre_delete, sender=UserEthicsScore)
+def _ethics_score_replaced(sender, instance, signal, **kwargs) -> None:
+    _record_previous(
+        ScoreRevision.KIND_ETHICS,
+        instance,
+        "ethical_score",
+        None,
+        deleting=signal is pre_delete,
+    )
+
+
+@receiver(post_save, sender=UserExpertiseScore)
+@receiver(post_delete, sender=UserExpertiseScore)
+def _score_changed(sender, instance, **kwargs) -> None:
+    with ekoh_smartvote_db_scope():
+        changed = refresh_rollups([(instance.user_id, instance.category_id)])
+    leaderboard.mark_stale([instance.category_id])
+    if changed:
+        expertise_scores_changed.send(sender=UserExpertiseRollup, pairs=changed)
+
+
+@receiver(expertise_scores_changed)
+def _rankings_changed(sender, pairs, **kwargs) -> None:
+    leaderboard.mark_stale(category_id for _user_id, category_id in pairs)
+
+
+@receiver(post_save, sender=Evaluation)
+@receiver(post_delete, sender=Evaluation)
+@receiver(post_save, sender=Credential)
+@receiver(post_delete, sender=Credential)
+@receiver(post_save, sender=EthikosArgument)
+@receiver(post_delete, sender=EthikosArgument)
+def _evidence_changed(sender, instance, **kwargs) -> None:
+    if instance.user_id is not None:
+        mark_dirty(instance.user_id)
+
+
+@receiver(post_save, sender=PeerValidation)
+@receiver(post_delete, sender=PeerValidation)
+def _validation_changed(sender, instance, **kwargs) -> None:
+    # The validated author gains or loses evidence, not the peer.
+    user_id = (
+        Evaluation.objects.filter(pk=instance.evaluation_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    if user_id is not None:
+        mark_dirty(user_id)
@@ -1 +1,17 @@
+"""
+Celery entrypoints for EkoH tasks.
 
+Celery autodiscovers ``konnaxion.ekoh.tasks``; importing the task modules
+here registers their tasks.
+"""
+
+from .contextual import contextual_analysis_batch  # noqa: F401
+from .ranking import (  # noqa: F401
+    refresh_expert_rankings,
+    refresh_stale_expert_rankings,
+)
+from .recalc import (  # noqa: F401
+    recalc_all_scores,
+    recalc_dirty_scores,
+    recalc_score_chunk,
+)
@@ -0,0 +1,28 @@
+"""Celery tasks keeping the materialised expert rankings current.
+
+``ekoh_ranking_refresh_stale`` re-ranks the categories whose scores changed
+since its last run; ``ekoh_ranking_refresh`` re-ranks every category nightly,
+after the score rebuild, as a safety net.
+"""
+
+import logging
+
+from celery import shared_task
+
+from konnaxion.ekoh.services.leaderboard import rebuild_rankings, refresh_stale_rankings
+
+LOGGER = logging.getLogger(__name__)
+
+
+@shared_task(name="ekoh_ranking_refresh")
+def refresh_expert_rankings() -> int:
+    """Re-rank every category; returns the number of ranking rows."""
+    rows = rebuild_rankings()
+    LOGGER.info("EkoH expert rankings rebuilt: %s rows", rows)
+    return rows
+
+
+@shared_task(name="ekoh_ranking_refresh_stale")
+def refresh_stale_expert_rankings() -> int:
+    """Re-rank stale categories; returns the number of categories."""
+    return refresh_stale_rankings()
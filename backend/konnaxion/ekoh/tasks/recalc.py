@@ -1,26 +1,66 @@
-"""Celery task for EkoH score recalculation.
-
-Recalculation is fail-safe: no profile is overwritten until a real evidence
-collector returns complete metrics for a user/domain pair.
+"""Celery tasks for the EkoH score rebuild and its incremental updates.
+
+The nightly rebuild is set-based and fans out across workers:
+
+1. ``ekoh_score_recalc`` (nightly beat) resumes the newest run that still has
+   pending chunks, or plans a new one: users are split into contiguous id
+   ranges of ``CHUNK_SIZE``, one ``ScoreRecalcChunk`` row each.  It then
+   queues one ``ekoh_score_recalc_chunk`` task per pending chunk.  A chunk
+   queued ``EKOH_RECALC_MAX_ATTEMPTS`` times without finishing is marked
+   failed first, so a chunk that keeps failing cannot block every rebuild.
+2. ``ekoh_score_recalc_chunk`` claims its chunk (``FOR UPDATE SKIP LOCKED``),
+   collects the metrics of every user/domain pair of the chunk at once,
+   scores them in memory and writes them with a single upsert, then
+   refreshes the ISCED roll-ups above the changed pairs.  The chunk
+   is marked done in the same transaction, so a crashed or timed-out chunk
+   stays pending and is picked up by the next run.
+
+Metrics come from the evidence collectors (``services.evidence``).
+Recalculation is fail-safe: a user/domain pair without evidence is left out
+and keeps its stored score.  Pairs whose stored score or roll-up changed are
+announced with ``expertise_scores_changed`` so Smart Vote can refresh what it
+derived from them.
+
+Between rebuilds, ``ekoh_score_recalc_dirty`` (every few minutes) drains the
+dirty set filled by the evidence receivers and rescores only those pairs
+through ``compute_user_domain_score``.  The nightly rebuild is the safety
+net for evidence that reached the database without model signals.
 """
 
 from __future__ import annotations
 
 import logging
+import uuid
 from itertools import islice
-from typing import Iterable, Iterator, Mapping
+from typing import Iterable, Iterator, Mapping, Sequence
 
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import QuerySet
+from django.db.models import F
+from django.utils import timezone
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.recalc import ScoreRecalcChunk
 from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
-from konnaxion.ekoh.services.multidimensional_scoring import compute_user_domain_score
+from konnaxion.ekoh.services.dirty_scores import claim_dirty
+from konnaxion.ekoh.services.evidence import collect_metrics
+from konnaxion.ekoh.services.multidimensional_scoring import (
+    _normalised_axis_weights,
+    compute_user_domain_score,
+    score_metrics,
+    upsert_scores,
+)
+from konnaxion.ekoh.services.rollups import refresh_rollups
+from konnaxion.ekoh.signals import expertise_scores_changed
 
 LOGGER = logging.getLogger(__name__)
 User = get_user_model()
 CHUNK_SIZE = 1_000
+DIRTY_BATCH_SIZE = 500
+DEFAULT_MAX_ATTEMPTS = 3
+
+PairMetrics = Mapping[tuple[int, int], Mapping[str, float]]
 
 
 def chunked(iterable: Iterable[int], size: int) -> Iterator[list[int]]:
@@ -30,46 +70,159 @@ def chunked(iterable: Iterable[int], size: int) -> Iterator[list[int]]:
 
 
 def _collect_metrics(
-    user_id: int,
-    domain: ExpertiseCategory,
-) -> Mapping[str, float] | None:
-    """Return verified scoring metrics, or ``None`` when none are available.
-
-    A placeholder must never return synthetic zeros: doing so would erase
-    imported or previously verified EkoH expertise during the nightly task.
-    Replace this function with the governed evidence aggregation pipeline.
+    user_ids: Sequence[int],
+    domains: Sequence[ExpertiseCategory],
+) -> PairMetrics:
+    """Return metrics by ``(user_id, domain_id)`` from the evidence collectors.
+
+    Pairs without domain evidence are left out, so imported or previously
+    verified EkoH expertise is never replaced by synthetic zeros.
     """
-    return None
+    return collect_metrics(user_ids, domains)
+
+
+def _plan_run(chunk_size: int) -> uuid.UUID:
+    """Record the chunks of a new run; must run inside the DB scope."""
+    run_id = uuid.uuid4()
+    user_ids = User.objects.order_by("id").values_list("id", flat=True)
+    ScoreRecalcChunk.objects.bulk_create(
+        [
+            ScoreRecalcChunk(
+                run_id=run_id, lower_user_id=chunk[0], upper_user_id=chunk[-1]
+            )
+            for chunk in chunked(user_ids.iterator(chunk_size=chunk_size), chunk_size)
+        ]
+    )
+    return run_id
 
 
-@shared_task(name="ekoh_score_recalc")
-def recalc_all_scores() -> dict[str, int]:
-    LOGGER.info("EkoH score rebuild started")
-    processed = 0
-    skipped = 0
+def _fail_exhausted_chunks() -> int:
+    """Mark pending chunks queued too often as failed; return how many."""
+    max_attempts = int(getattr(settings, "EKOH_RECALC_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+    exhausted = ScoreRecalcChunk.objects.filter(
+        status=ScoreRecalcChunk.STATUS_PENDING, attempts__gte=max_attempts
+    )
+    for run_id, lower, upper in exhausted.values_list(
+        "run_id", "lower_user_id", "upper_user_id"
+    ):
+        LOGGER.error(
+            "EkoH score chunk %s..%s of run %s failed %s times; giving up",
+            lower,
+            upper,
+            run_id,
+            max_attempts,
+        )
+    return exhausted.update(status=ScoreRecalcChunk.STATUS_FAILED, finished_at=timezone.now())
 
+
+def _resumable_run() -> uuid.UUID | None:
+    return (
+        ScoreRecalcChunk.objects.filter(status=ScoreRecalcChunk.STATUS_PENDING)
+        .order_by("-created_at")
+        .values_list("run_id", flat=True)
+        .first()
+    )
+
+
+@shared_task(name="ekoh_score_recalc")
+def recalc_all_scores(chunk_size: int = CHUNK_SIZE, resume: bool = True) -> dict[str, object]:
+    """Plan (or resume) a rebuild run and queue its pending chunks."""
     with ekoh_smartvote_db_scope():
-        domains: QuerySet[ExpertiseCategory] = ExpertiseCategory.objects.filter(
-            depth__gte=1
+        _fail_exhausted_chunks()
+        run_id = _resumable_run() if resume else None
+        resumed = run_id is not None
+        if run_id is None:
+            run_id = _plan_run(chunk_size)
+        pending = ScoreRecalcChunk.objects.filter(
+            run_id=run_id, status=ScoreRecalcChunk.STATUS_PENDING
         )
-        domain_rows = list(domains)
-
-        for user_chunk in chunked(
-            User.objects.values_list("id", flat=True).order_by("id"),
-            CHUNK_SIZE,
-        ):
-            for uid in user_chunk:
-                for domain in domain_rows:
-                    metrics = _collect_metrics(uid, domain)
-                    if metrics is None:
-                        skipped += 1
-                        continue
-                    compute_user_domain_score(uid, domain, metrics, flush=True)
-                    processed += 1
+        chunk_ids = list(pending.order_by("lower_user_id").values_list("pk", flat=True))
+        pending.update(attempts=F("attempts") + 1)
+
+    for chunk_id in chunk_ids:
+        recalc_score_chunk.delay(chunk_id)
 
     LOGGER.info(
-        "EkoH score rebuild completed: processed=%s skipped=%s",
-        processed,
-        skipped,
+        "EkoH score rebuild %s %s: %s chunks queued",
+        run_id,
+        "resumed" if resumed else "started",
+        len(chunk_ids),
     )
-    return {"processed": processed, "skipped": skipped}
+    return {"run_id": str(run_id), "resumed": resumed, "queued": len(chunk_ids)}
+
+
+@shared_task(name="ekoh_score_recalc_chunk")
+def recalc_score_chunk(chunk_id: int) -> dict[str, int]:
+    """Score and upsert every user/domain pair of one pending chunk."""
+    with ekoh_smartvote_db_scope():
+        chunk = (
+            ScoreRecalcChunk.objects.select_for_update(skip_locked=True)
+            .filter(pk=chunk_id, status=ScoreRecalcChunk.STATUS_PENDING)
+            .first()
+        )
+        if chunk is None:
+            # Done already, or claimed by another worker.
+            return {"pairs": 0, "changed": 0}
+
+        user_ids = list(
+            User.objects.filter(
+                id__gte=chunk.lower_user_id, id__lte=chunk.upper_user_id
+            ).values_list("id", flat=True)
+        )
+        domains = list(ExpertiseCategory.objects.filter(depth__gte=1))
+        metrics = _collect_metrics(user_ids, domains)
+        axis_weights = _normalised_axis_weights()
+        changed = upsert_scores(
+            (user_id, domain_id, *score_metrics(pair_metrics, axis_weights))
+            for (user_id, domain_id), pair_metrics in metrics.items()
+        )
+        rolled_up = refresh_rollups(changed)
+
+        chunk.status = ScoreRecalcChunk.STATUS_DONE
+        chunk.pair_count = len(metrics)
+        chunk.changed_count = len(changed)
+        chunk.finished_at = timezone.now()
+        chunk.save(update_fields=["status", "pair_count", "changed_count", "finished_at"])
+
+    if changed or rolled_up:
+        expertise_scores_changed.send(sender=ScoreRecalcChunk, pairs=changed + rolled_up)
+    LOGGER.debug(
+        "EkoH score chunk %s: pairs=%s changed=%s", chunk_id, len(metrics), len(changed)
+    )
+    return {"pairs": len(metrics), "changed": len(changed)}
+
+
+@shared_task(name="ekoh_score_recalc_dirty")
+def recalc_dirty_scores(limit: int = DIRTY_BATCH_SIZE) -> dict[str, int]:
+    """Rescore the oldest ``limit`` dirty pairs.
+
+    Claimed pairs are removed in the same transaction as their new scores,
+    so a failed batch is retried by the next beat.  Pairs without collected
+    evidence keep their stored score, as in the nightly rebuild.
+    """
+    with ekoh_smartvote_db_scope():
+        claimed = claim_dirty(limit)
+        if not claimed:
+            return {"pairs": 0, "scored": 0}
+
+        domains = {
+            domain.pk: domain for domain in ExpertiseCategory.objects.filter(depth__gte=1)
+        }
+        wanted: set[tuple[int, int]] = set()
+        for user_id, category_id in claimed:
+            if category_id is None:
+                wanted.update((user_id, domain_id) for domain_id in domains)
+            elif category_id in domains:
+                wanted.add((user_id, category_id))
+
+        user_ids = sorted({user_id for user_id, _ in wanted})
+        wanted_domains = [domains[pk] for pk in sorted({pk for _, pk in wanted})]
+        metrics = _collect_metrics(user_ids, wanted_domains)
+        scored = 0
+        for pair, pair_metrics in metrics.items():
+            if pair in wanted:
+                compute_user_domain_score(pair[0], domains[pair[1]], pair_metrics)
+                scored += 1
+
+    LOGGER.debug("EkoH dirty recalc: pairs=%s scored=%s", len(wanted), scored)
+    return {"pairs": len(wanted), "scored": scored}
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.services.evidence import ISCED_SYSTEM, collect_metrics
+from konnaxion.ethikos.models import EthikosArgument, EthikosCategory, EthikosTopic
+from konnaxion.konnected.models import (
+    CertificationPath,
+    Evaluation,
+    InteropMapping,
+    PeerValidation,
+)
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    SourceConsultationBinding,
+)
+from konnaxion.trust.models import Credential
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def test_collectors_merge_evidence_by_user_and_domain():
+    author, peer, outsider = (
+        User.objects.create_user(username=f"evidence_{name}")
+        for name in ("author", "peer", "outsider")
+    )
+    with ekoh_smartvote_db_scope():
+        broad = ExpertiseCategory.objects.create(code="05", name="Sciences", depth=0, path="05")
+        domain = ExpertiseCategory.objects.create(
+            code="0521", name="Environmental sciences", depth=1, path="05.0521", parent=broad
+        )
+        consultation = Consultation.objects.create(title="Wetlands")
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("0.8")
+        )
+
+    path = CertificationPath.objects.create(name="Soil analysis")
+    InteropMapping.objects.create(
+        local_certification=path, external_system=ISCED_SYSTEM, external_id="0521"
+    )
+    evaluation = Evaluation.objects.create(user=author, path=path, raw_score=80, metadata={})
+    PeerValidation.objects.create(
+        evaluation=evaluation, peer=peer, decision=PeerValidation.Decision.APPROVED
+    )
+    PeerValidation.objects.create(
+        evaluation=evaluation, peer=author, decision=PeerValidation.Decision.APPROVED
+    )
+    for user in (author, outsider):
+        Credential.objects.create(
+            user=user, title="MSc", issuer="University", status=Credential.Status.VERIFIED
+        )
+
+    topic = EthikosTopic.objects.create(
+        title="Wetlands",
+        description="",
+        category=EthikosCategory.objects.create(name="Environment", description=""),
+        created_by=author,
+    )
+    with ekoh_smartvote_db_scope():
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic", source_id=str(topic.pk), consultation=consultation
+        )
+    EthikosArgument.objects.create(topic=topic, user=peer, content="Restore", side="pro")
+    EthikosArgument.objects.create(topic=topic, user=peer, content="Spam", is_hidden=True)
+
+    metrics = collect_metrics([author.pk, peer.pk, outsider.pk], [domain])
+
+    # The self-validation is ignored; the credential joins the evaluation.
+    assert metrics == {
+        (author.pk, domain.pk): {
+            "quality": Decimal("1"),
+            "expertise": Decimal("0.9"),
+            "frequency": Decimal("0.2"),
+        },
+        (peer.pk, domain.pk): {
+            "quality": Decimal("0.5"),
+            "expertise": Decimal("0"),
+            "frequency": Decimal("0.2"),
+        },
+    }
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.access import RatingVisibilitySetting
+from konnaxion.ekoh.models.privacy import ConfidentialitySetting
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.services.leaderboard import refresh_stale_rankings, top_experts
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def experts():
+    users = {
+        name: User.objects.create_user(username=f"leader_{name}")
+        for name in ("public", "private", "anonymous", "novice")
+    }
+    with ekoh_smartvote_db_scope():
+        broad = ExpertiseCategory.objects.create(code="05", name="Sciences", depth=0, path="05")
+        ecology = ExpertiseCategory.objects.create(
+            code="0521", name="Environmental sciences", depth=1, path="05.0521", parent=broad
+        )
+        wildlife = ExpertiseCategory.objects.create(
+            code="0522", name="Natural environments", depth=1, path="05.0522", parent=broad
+        )
+        RatingVisibilitySetting.objects.create(user=users["private"], visibility="private")
+        ConfidentialitySetting.objects.create(
+            user=users["anonymous"], level=ConfidentialitySetting.ANONYMOUS
+        )
+        for name, category, score in (
+            ("public", ecology, "0.9"),
+            ("private", wildlife, "0.6"),
+            ("anonymous", ecology, "0.3"),
+            ("novice", ecology, "0"),
+        ):
+            UserExpertiseScore.objects.create(
+                user=users[name],
+                category=category,
+                raw_score=Decimal(score),
+                weighted_score=Decimal(score),
+            )
+    return users
+
+
+def _ranked(leaderboard):
+    return [(entry.user.username, entry.rank, entry.percentile) for entry in leaderboard.entries]
+
+
+def test_leaderboard_ranks_subtrees_and_hides_experts(experts):
+    staff = User.objects.create_user(username="leader_staff", is_staff=True)
+    assert refresh_stale_rankings() == 3
+
+    assert _ranked(top_experts("05", viewer=staff)) == [
+        ("leader_public", 1, Decimal("100.00")),
+        ("leader_private", 2, Decimal("66.67")),
+        ("leader_anonymous", 3, Decimal("33.33")),
+    ]
+    assert _ranked(top_experts("05")) == [("leader_public", 1, Decimal("100.00"))]
+    assert top_experts("99") is None
+
+    # A score change re-ranks only the categories it touched.
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.filter(user=experts["anonymous"]).update(
+            weighted_score=Decimal("0.95")
+        )
+        UserExpertiseScore.objects.get(user=experts["anonymous"]).save()
+    assert refresh_stale_rankings() == 2
+    assert [name for name, _, _ in _ranked(top_experts("0521", viewer=staff, limit=1))] == [
+        "leader_anonymous"
+    ]
+
+
+def test_leaderboard_endpoint(experts):
+    refresh_stale_rankings()
+    client = APIClient()
+
+    response = client.get("/api/v1/ekoh/leaderboard/0521/", {"limit": 5})
+    assert response.status_code == 200
+    assert response.data["domain_code"] == "0521"
+    assert [(row["display_name"], row["rank"]) for row in response.data["experts"]] == [
+        ("leader_public", 1)
+    ]
+    assert client.get("/api/v1/ekoh/leaderboard/0521/", {"limit": 0}).status_code == 400
+    assert client.get("/api/v1/ekoh/leaderboard/99/").status_code == 404
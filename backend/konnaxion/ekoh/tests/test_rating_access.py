@@ -14,7 +14,10 @@ from konnaxion.ekoh.models.access import (
 )
 from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
 from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
-from konnaxion.ekoh.services.rating_access import resolve_rating_access
+from konnaxion.ekoh.services.rating_access import (
+    resolve_rating_access,
+    resolve_rating_access_many,
+)
 
 User = get_user_model()
 
@@ -123,6 +126,48 @@ def test_private_policy_does_not_accept_scope_grant(org_graph):
     assert decision.reason == "private_policy"
 
 
+@pytest.mark.django_db
+def test_bulk_resolution_matches_single_subject_resolution(org_graph):
+    boss, supervisor_a, employee_a, employee_b = org_graph
+    public_subject = User.objects.create(username="public_subject_bulk")
+    unset_subject = User.objects.create(username="unset_subject_bulk")
+    private_subject = User.objects.create(username="private_subject_bulk")
+    with ekoh_smartvote_db_scope():
+        RatingVisibilitySetting.objects.create(user=public_subject, visibility="public")
+        RatingVisibilitySetting.objects.create(user=private_subject, visibility="private")
+
+    subjects = [
+        employee_a,
+        employee_b,
+        public_subject,
+        unset_subject,
+        private_subject,
+        supervisor_a,
+    ]
+    for viewer in (boss, supervisor_a, employee_a, AnonymousUser(), None):
+        bulk = resolve_rating_access_many(viewer, subjects)
+        assert set(bulk) == {subject.pk for subject in subjects}
+        for subject in subjects:
+            assert bulk[subject.pk] == resolve_rating_access(viewer=viewer, subject=subject)
+
+
+@pytest.mark.django_db
+def test_bulk_resolution_query_count_does_not_grow_with_subjects(
+    org_graph, django_assert_max_num_queries
+):
+    boss, _supervisor_a, _employee_a, _employee_b = org_graph
+    subjects = [User.objects.create(username=f"bulk_subject_{idx}") for idx in range(25)]
+    with ekoh_smartvote_db_scope():
+        scope = RatingAccessScope.objects.get(key="acme-department-b")
+        for subject in subjects:
+            RatingScopeSubject.objects.create(scope=scope, user=subject)
+            RatingVisibilitySetting.objects.create(user=subject, visibility="scoped")
+
+    with django_assert_max_num_queries(10):
+        decisions = resolve_rating_access_many(boss, subjects)
+    assert all(decision.reason == "scope_grant" for decision in decisions.values())
+
+
 @pytest.mark.django_db
 def test_profile_payload_redacts_scores_without_access(api_client):
     viewer = User.objects.create(username="viewer")
@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.dirty import ScoreDirtyPair
+from konnaxion.ekoh.models.recalc import ScoreRecalcChunk
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.services.dirty_scores import mark_dirty
+from konnaxion.ekoh.signals import expertise_scores_changed
+from konnaxion.ekoh.tasks import recalc
+from konnaxion.konnected.models import CertificationPath, Evaluation
+from konnaxion.trust.models import Credential
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def population(monkeypatch):
+    users = [User.objects.create_user(username=f"recalc_{index}") for index in range(5)]
+    with ekoh_smartvote_db_scope():
+        broad = ExpertiseCategory.objects.create(code="05", name="Sciences", depth=0, path="05")
+        domain = ExpertiseCategory.objects.create(
+            code="0521", name="Environmental sciences", depth=1, path="05.0521", parent=broad
+        )
+        UserExpertiseScore.objects.create(
+            user=users[0], category=domain, raw_score=Decimal("3"), weighted_score=Decimal("1")
+        )
+
+    # Evidence for every other user; user 0 keeps the imported score.
+    def collect(user_ids, domains):
+        return {
+            (user_id, domain.pk): {"quality": 1, "expertise": 0.5, "frequency": 0}
+            for user_id in user_ids
+            if user_id != users[0].pk
+            for domain in domains
+        }
+
+    monkeypatch.setattr(recalc, "_collect_metrics", collect)
+    queued = []
+    monkeypatch.setattr(recalc.recalc_score_chunk, "delay", queued.append)
+    return users, domain, queued
+
+
+def test_rebuild_upserts_per_chunk_and_resumes(population):
+    users, domain, queued = population
+    changed = []
+
+    def receiver(sender, pairs, **kwargs):
+        changed.extend(pairs)
+
+    expertise_scores_changed.connect(receiver)
+    try:
+        started = recalc.recalc_all_scores(chunk_size=2)
+        assert started["resumed"] is False
+        assert started["queued"] == len(queued) == 3
+
+        # The first chunk finishes; the run is then interrupted.
+        assert recalc.recalc_score_chunk(queued[0]) == {"pairs": 1, "changed": 1}
+        assert recalc.recalc_score_chunk(queued[0]) == {"pairs": 0, "changed": 0}
+
+        queued.clear()
+        resumed = recalc.recalc_all_scores(chunk_size=2)
+        assert resumed == {"run_id": started["run_id"], "resumed": True, "queued": 2}
+        for chunk_id in queued:
+            recalc.recalc_score_chunk(chunk_id)
+    finally:
+        expertise_scores_changed.disconnect(receiver)
+
+    with ekoh_smartvote_db_scope():
+        scores = dict(
+            UserExpertiseScore.objects.filter(category=domain).values_list(
+                "user_id", "weighted_score"
+            )
+        )
+        assert not ScoreRecalcChunk.objects.filter(
+            status=ScoreRecalcChunk.STATUS_PENDING
+        ).exists()
+    assert scores[users[0].pk] == Decimal("1.0000")
+    assert {scores[user.pk] for user in users[1:]} == {Decimal("0.5000")}
+    assert sorted(changed) == sorted((user.pk, domain.pk) for user in users[1:])
+
+    # Unchanged scores are not rewritten or announced again.
+    queued.clear()
+    recalc.recalc_all_scores(chunk_size=10)
+    assert recalc.recalc_score_chunk(queued[0]) == {"pairs": 4, "changed": 0}
+
+
+def test_chunk_that_keeps_failing_stops_blocking_new_runs(population, settings):
+    _users, _domain, queued = population
+    settings.EKOH_RECALC_MAX_ATTEMPTS = 2
+
+    started = recalc.recalc_all_scores(chunk_size=2)
+    failing, *others = queued
+    for chunk_id in others:
+        recalc.recalc_score_chunk(chunk_id)
+
+    # The failing chunk never finishes: resumed once more, then given up.
+    queued.clear()
+    resumed = recalc.recalc_all_scores(chunk_size=2)
+    assert resumed == {"run_id": started["run_id"], "resumed": True, "queued": 1}
+    assert queued == [failing]
+
+    queued.clear()
+    fresh = recalc.recalc_all_scores(chunk_size=2)
+    assert fresh["resumed"] is False
+    assert fresh["run_id"] != started["run_id"]
+    assert fresh["queued"] == len(queued) == 3
+    with ekoh_smartvote_db_scope():
+        chunk = ScoreRecalcChunk.objects.get(pk=failing)
+    assert chunk.status == ScoreRecalcChunk.STATUS_FAILED
+    assert chunk.attempts == 2
+
+
+def test_dirty_pairs_are_rescored_between_rebuilds(population):
+    users, domain, _ = population
+    path = CertificationPath.objects.create(name="Soil analysis", description="")
+    Evaluation.objects.create(user=users[1], path=path, raw_score=80, metadata={})
+    Credential.objects.create(user=users[0], title="MSc", issuer="University")
+    mark_dirty(users[2].pk, [domain.pk])
+    mark_dirty(users[2].pk, [domain.pk])
+
+    with ekoh_smartvote_db_scope():
+        assert ScoreDirtyPair.objects.count() == 3
+
+    # User 0 has no collected evidence and keeps the imported score.
+    assert recalc.recalc_dirty_scores(limit=10) == {"pairs": 3, "scored": 2}
+    assert recalc.recalc_dirty_scores(limit=10) == {"pairs": 0, "scored": 0}
+
+    with ekoh_smartvote_db_scope():
+        scores = dict(
+            UserExpertiseScore.objects.filter(category=domain).values_list(
+                "user_id", "weighted_score"
+            )
+        )
+        assert not ScoreDirtyPair.objects.exists()
+    assert scores == {
+        users[0].pk: Decimal("1.0000"),
+        users[1].pk: Decimal("0.5000"),
+        users[2].pk: Decimal("0.5000"),
+    }
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserExpertiseRollup, UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.services.rollups import effective_scores
+from konnaxion.smart_vote.models import Consultation, ConsultationRelevance
+from konnaxion.smart_vote.services.weight_calculator import get_weights_bulk
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def _rollups(user):
+    with ekoh_smartvote_db_scope():
+        return {
+            code: (score, count)
+            for code, score, count in UserExpertiseRollup.objects.filter(user=user).values_list(
+                "category__code", "score", "domain_count"
+            )
+        }
+
+
+def test_rollups_follow_leaf_scores_and_feed_alignment():
+    user = User.objects.create_user(username="rollup_user")
+    with ekoh_smartvote_db_scope():
+        broad = ExpertiseCategory.objects.create(code="05", name="Sciences", depth=0, path="05")
+        narrow = ExpertiseCategory.objects.create(
+            code="052", name="Environment", depth=1, path="05.052", parent=broad
+        )
+        ecology = ExpertiseCategory.objects.create(
+            code="0521", name="Environmental sciences", depth=2, path="05.052.0521", parent=narrow
+        )
+        wildlife = ExpertiseCategory.objects.create(
+            code="0522", name="Natural environments", depth=2, path="05.052.0522", parent=narrow
+        )
+        UserExpertiseScore.objects.create(
+            user=user, category=ecology, raw_score=Decimal("1"), weighted_score=Decimal("0.4")
+        )
+        # Legacy 0..100 rows are normalized before rolling up.
+        legacy = UserExpertiseScore.objects.create(
+            user=user, category=wildlife, raw_score=Decimal("90"), weighted_score=Decimal("90")
+        )
+        consultation = Consultation.objects.create(title="Wetlands")
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=broad, weight=Decimal("0.5")
+        )
+
+    expected = (Decimal("0.900000"), 2)
+    assert _rollups(user) == {"05": expected, "052": expected}
+    with ekoh_smartvote_db_scope():
+        assert effective_scores([user.pk], [broad.pk, ecology.pk]) == {
+            user.pk: {broad.pk: Decimal("0.9"), ecology.pk: Decimal("0.4")}
+        }
+    assert get_weights_bulk([user.pk], consultation.pk)[user.pk].alignment == Decimal("0.4500")
+
+    with ekoh_smartvote_db_scope():
+        legacy.delete()
+    assert _rollups(user) == {"05": (Decimal("0.4"), 1), "052": (Decimal("0.4"), 1)}
+    assert get_weights_bulk([user.pk], consultation.pk)[user.pk].alignment == Decimal("0.2000")
+
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.filter(user=user).delete()
+    assert _rollups(user) == {}
@@ -7,10 +7,12 @@ Import this in the project-level urls:
 
 from django.urls import path
 
+from konnaxion.ekoh.views.leaderboard import LeaderboardView
 from konnaxion.ekoh.views.profile import ProfileView
 
 app_name = "ekoh"
 
 urlpatterns = [
     path("profile/<int:uid>/", ProfileView.as_view(), name="profile"),
+    path("leaderboard/<str:code>/", LeaderboardView.as_view(), name="leaderboard"),
 ]
@@ -0,0 +1,43 @@
+"""Rating-access-aware EkoH top-expert leaderboard endpoint."""
+
+from __future__ import annotations
+
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from konnaxion.ekoh.serializers.leaderboard import LeaderboardSerializer
+from konnaxion.ekoh.services.leaderboard import top_experts
+
+
+class LeaderboardView(APIView):
+    """Top experts of an ISCED category at any depth, best first.
+
+    ``?limit=<n>`` sets K (``EKOH_LEADERBOARD_SIZE`` by default, at most
+    ``EKOH_LEADERBOARD_MAX``).  Rank and percentile come from the
+    materialised ranking; experts hidden from the viewer are left out.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, code: str):
+        limit = request.query_params.get("limit")
+        try:
+            leaderboard = top_experts(
+                code,
+                viewer=request.user,
+                limit=int(limit) if limit not in (None, "") else None,
+            )
+        except ValueError:
+            return Response(
+                {"detail": "limit must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if leaderboard is None:
+            return Response(
+                {"detail": "Unknown expertise category."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(
+            LeaderboardSerializer(leaderboard, context={"request": request}).data
+        )
@@ -1,9 +1,12 @@
 # FILE: backend/konnaxion/ethikos/api_views.py
 from __future__ import annotations
 
+import logging
+from datetime import datetime
 from typing import Optional
 
-from django.db.models import Count
+from django.db import DatabaseError, transaction
+from django.db.models import Count, F, Func, OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
@@ -38,6 +41,8 @@ from .permissions import (
     OwnerOrEthikosAdminOrReadOnly,
     OwnerOrEthikosModeratorOrReadOnly,
 )
+from konnaxion.utils.http import make_etag, not_modified, set_validators
+
 from .serializers import (
     ArgumentImpactVoteSerializer,
     ArgumentSourceSerializer,
@@ -50,6 +55,8 @@ from .serializers import (
     EthikosTopicSerializer,
 )
 
+LOGGER = logging.getLogger(__name__)
+
 
 # ---- Shared helpers ---------------------------------------------------------
 
@@ -107,6 +114,71 @@ def _touch_argument_topic(argument: EthikosArgument) -> None:
     _touch_topic_activity(_topic_from_argument(argument))
 
 
+def _subquery_aggregate(queryset, function: str, field: str) -> Subquery:
+    """Scalar subquery applying ``function`` (COUNT, MAX, ...) to ``queryset``."""
+    return Subquery(
+        queryset.order_by()
+        .annotate(aggregate_value=Func(F(field), function=function))
+        .values("aggregate_value")[:1]
+    )
+
+
+def _preview_validators(topic: EthikosTopic) -> tuple[str, datetime]:
+    """
+    ETag and Last-Modified of a topic preview, from a single query.
+
+    Covers the topic row, its category name, and the count and latest
+    timestamp of every related record the preview summarises, so an
+    unchanged preview is answered with 304 without recounting anything.
+    """
+    activity = {
+        "stances": (EthikosStance.objects.filter(topic=OuterRef("pk")), "timestamp"),
+        "arguments": (
+            EthikosArgument.objects.filter(topic=OuterRef("pk")),
+            "updated_at",
+        ),
+        "sources": (
+            ArgumentSource.objects.filter(argument__topic=OuterRef("pk")),
+            "updated_at",
+        ),
+        "impact_votes": (
+            ArgumentImpactVote.objects.filter(argument__topic=OuterRef("pk")),
+            "updated_at",
+        ),
+        "suggestions": (
+            ArgumentSuggestion.objects.filter(topic=OuterRef("pk")),
+            "updated_at",
+        ),
+    }
+    annotations = {"category_label": F("category__name")}
+    for name, (queryset, timestamp) in activity.items():
+        annotations[f"{name}_count"] = _subquery_aggregate(queryset, "COUNT", "pk")
+        annotations[f"{name}_latest"] = _subquery_aggregate(queryset, "MAX", timestamp)
+
+    row = (
+        EthikosTopic.objects.filter(pk=topic.pk)
+        .annotate(**annotations)
+        .values(*annotations)
+        .get()
+    )
+    etag = make_etag(
+        "topic-preview",
+        topic.pk,
+        topic.title,
+        topic.description,
+        topic.status,
+        topic.category_id,
+        topic.total_votes,
+        topic.created_at,
+        topic.last_activity,
+        *(row[key] for key in sorted(row)),
+    )
+    timestamps = [topic.last_activity] + [
+        row[f"{name}_latest"] for name in activity
+    ]
+    return etag, max(value for value in timestamps if value is not None)
+
+
 # ---- Categories -------------------------------------------------------------
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -217,9 +289,26 @@ class TopicViewSet(viewsets.ModelViewSet):
         - return topic metadata when the topic exists;
         - never return an empty shape for an existing topic;
         - tolerate related argument/stance aggregation failures.
+
+        Responses carry ETag/Last-Modified validators; a matching
+        If-None-Match is answered with 304 before any aggregation runs.
         """
         topic = self.get_object()
 
+        # Without validators the preview is still served, just never as 304.
+        # The savepoint keeps the request transaction usable after a
+        # database error.
+        try:
+            with transaction.atomic():
+                validators = _preview_validators(topic)
+        except (DatabaseError, EthikosTopic.DoesNotExist):
+            LOGGER.warning("No preview validators for topic %s", topic.pk, exc_info=True)
+            validators = None
+        if validators is not None:
+            unchanged = not_modified(request, *validators)
+            if unchanged is not None:
+                return unchanged
+
         description = topic.description or ""
         preview_description = (
             description if len(description) <= 280 else f"{description[:280]}…"
@@ -308,7 +397,10 @@ class TopicViewSet(viewsets.ModelViewSet):
             "latest": latest,
         }
 
-        return Response(data, status=status.HTTP_200_OK)
+        response = Response(data, status=status.HTTP_200_OK)
+        if validators is not None:
+            set_validators(response, *validators)
+        return response
 
 
 # ---- Stances ----------------------------------------------------------------
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 from http import HTTPStatus
 from typing import Any
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APITestCase
 
 from konnaxion.ethikos.constants import (
@@ -873,4 +875,44 @@ class EthikosKintsugiKorumAPITests(APITestCase):
 
         self.assertEqual(response.status_code, HTTPStatus.OK)
         ids = {row["id"] for row in self._results(response.data)}
-        self.assertEqual(ids, {setting.id})
\ No newline at end of file
+        self.assertEqual(ids, {setting.id})
+
+    # ------------------------------------------------------------------ #
+    # Topic preview conditional GET
+    # ------------------------------------------------------------------ #
+
+    def test_topic_preview_answers_304_until_activity_changes(self) -> None:
+        url = f"/api/ethikos/topics/{self.topic.id}/preview/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        unchanged = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, HTTPStatus.NOT_MODIFIED)
+
+        EthikosStance.objects.create(topic=self.topic, user=self.other_user, value=2)
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, HTTPStatus.OK)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(changed.data["stats"]["stance_count"], 1)
+
+    def test_topic_preview_is_served_without_validators_after_database_error(
+        self,
+    ) -> None:
+        def failing_validators(topic):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 / 0")
+
+        EthikosStance.objects.create(topic=self.topic, user=self.other_user, value=2)
+        url = f"/api/ethikos/topics/{self.topic.id}/preview/"
+        with mock.patch(
+            "konnaxion.ethikos.api_views._preview_validators", failing_validators
+        ):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(response.has_header("ETag"))
+        # Later preview queries still run in a usable transaction.
+        self.assertEqual(response.data["stats"]["stance_count"], 1)
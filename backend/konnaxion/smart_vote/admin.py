@@ -6,6 +6,8 @@ from konnaxion.smart_vote.models.core import (
     VoteResult,
     VoteLedger,
 )
+from konnaxion.smart_vote.models.consultation_option import ConsultationOption
+from konnaxion.smart_vote.models.ledger_batch import LedgerBatch
 
 
 @admin.register(VoteModality)
@@ -27,5 +29,17 @@ class VoteResultAdmin(admin.ModelAdmin):
 
 @admin.register(VoteLedger)
 class LedgerAdmin(admin.ModelAdmin):
-    list_display = ("ledger_id", "vote", "block_height", "logged_at")
-    readonly_fields = ("sha256_hash",)
+    list_display = ("ledger_id", "vote", "block_height", "leaf_index", "logged_at")
+    readonly_fields = ("sha256_hash", "merkle_proof")
+
+
+@admin.register(LedgerBatch)
+class LedgerBatchAdmin(admin.ModelAdmin):
+    list_display = ("height", "leaf_count", "first_vote_id", "last_vote_id", "created_at")
+    readonly_fields = ("merkle_root", "chain_hash")
+
+
+@admin.register(ConsultationOption)
+class ConsultationOptionAdmin(admin.ModelAdmin):
+    list_display = ("label", "consultation", "position", "target_id")
+    search_fields = ("label", "target_id")
@@ -23,4 +23,6 @@ class SmartVoteConfig(AppConfig):
         Django forbids sync DB access in this context.
         All schema creation and partition setup is handled by migrations.
         """
+        from . import signals  # noqa: F401
+
         LOGGER.debug("Smart-Vote app ready; DB schema handled via migrations.")
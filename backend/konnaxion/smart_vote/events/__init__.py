@@ -0,0 +1,63 @@
+"""Pluggable vote-event bus.
+
+Ballot writes queue one ``VoteEvent`` per vote in the ``VoteEventOutbox``
+table, in the ballot transaction, and publish them once it has committed;
+the relay task republishes whatever that missed (see ``outbox``).
+``consumer.consume_once`` folds events into ``vote_result``, deletes their
+outbox rows and records the consumed offsets in ``AggregationCheckpoint`` in
+the same transaction, so each committed vote is applied exactly once even
+across crashes, bus outages and duplicate deliveries.
+
+The backend is chosen with ``SMART_VOTE_EVENT_BUS``:
+
+``""`` (default)
+    No bus; ``vote_aggregate`` polls the ``vote`` table instead.
+``"memory"``
+    In-process stand-in for tests and single-process deployments; refused
+    unless ``SMART_VOTE_EVENT_BUS_SINGLE_PROCESS`` is set.
+``"redis"``
+    A Redis stream on ``REDIS_URL``; suits single-node deployments.
+``"kafka"``
+    A Kafka topic on ``KAFKA_BOOTSTRAP_SERVERS`` (needs ``confluent-kafka``).
+
+While a bus is configured the polling aggregator stands down: ``vote_result``
+has exactly one writer.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+
+from .backends import get_bus, reset_bus
+from .base import Record, VoteEvent, VoteEventBus
+from .outbox import relay_after_commit, relay_outbox, write_outbox
+
+__all__ = [
+    "Record",
+    "VoteEvent",
+    "VoteEventBus",
+    "event_bus_enabled",
+    "get_bus",
+    "publish_votes",
+    "relay_outbox",
+    "reset_bus",
+]
+
+
+def event_bus_enabled() -> bool:
+    return bool(getattr(settings, "SMART_VOTE_EVENT_BUS", ""))
+
+
+def publish_votes(votes: Iterable) -> None:
+    """Queue events for ``votes`` in the surrounding ballot transaction.
+
+    They are published after it commits, or by the relay task.
+    """
+    if not event_bus_enabled():
+        return
+    events = [VoteEvent.from_vote(vote) for vote in votes]
+    if events:
+        write_outbox(events)
+        relay_after_commit([event.vote_id for event in events])
@@ -0,0 +1,223 @@
+"""Vote-event bus backends: in-process, Redis stream and Kafka."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Sequence
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import Record, VoteEvent, VoteEventBus
+
+try:
+    import confluent_kafka
+except ImportError:  # pragma: no cover - optional dependency
+    confluent_kafka = None
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TOPIC = "smart_vote.votes"
+
+
+def event_topic() -> str:
+    return getattr(settings, "SMART_VOTE_EVENT_TOPIC", DEFAULT_TOPIC)
+
+
+class MemoryVoteEventBus(VoteEventBus):
+    """Single-partition, in-process log; offsets are list indexes.
+
+    Web and Celery worker processes would each get their own log, so the
+    consumer would never see events relayed by another process.  The backend
+    is only accepted when ``SMART_VOTE_EVENT_BUS_SINGLE_PROCESS`` declares
+    that everything runs in one process (tests).
+    """
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        if not getattr(settings, "SMART_VOTE_EVENT_BUS_SINGLE_PROCESS", False):
+            raise ImproperlyConfigured(
+                "SMART_VOTE_EVENT_BUS='memory' only works within a single process; "
+                "use 'redis' or 'kafka', or set SMART_VOTE_EVENT_BUS_SINGLE_PROCESS."
+            )
+        self._log: list[VoteEvent] = []
+        self._appended = threading.Condition()
+
+    def publish(self, events: Sequence[VoteEvent]) -> None:
+        with self._appended:
+            self._log.extend(events)
+            self._appended.notify_all()
+
+    def partitions(self) -> list[str]:
+        return ["0"]
+
+    def read(self, partition, start, limit, timeout=0):
+        with self._appended:
+            if start >= len(self._log) and timeout:
+                self._appended.wait(timeout)
+            return [
+                Record(partition="0", offset=offset, event=self._log[offset])
+                for offset in range(start, min(len(self._log), start + limit))
+            ]
+
+
+# Redis stream ids are "<ms>-<seq>"; pack them into one increasing integer.
+_SEQ_BITS = 20
+
+
+def encode_stream_id(stream_id: bytes | str) -> int:
+    if isinstance(stream_id, bytes):
+        stream_id = stream_id.decode()
+    ms, seq = stream_id.split("-")
+    return (int(ms) << _SEQ_BITS) | int(seq)
+
+
+def decode_stream_id(offset: int) -> str:
+    return f"{offset >> _SEQ_BITS}-{offset & ((1 << _SEQ_BITS) - 1)}"
+
+
+class RedisStreamVoteEventBus(VoteEventBus):
+    """Single Redis stream (``XADD``/``XREAD``) on ``REDIS_URL``.
+
+    The consumer trims the stream up to its committed position after each
+    batch (``XTRIM MINID``), so Redis only holds events not yet applied.
+    """
+
+    name = "redis"
+
+    def __init__(self) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(settings.REDIS_URL)
+        self._stream = event_topic()
+
+    def publish(self, events):
+        with self._client.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(self._stream, {"event": event.to_json()})
+            pipe.execute()
+
+    def partitions(self):
+        return ["0"]
+
+    def read(self, partition, start, limit, timeout=0):
+        # XREAD is exclusive of the id it is given.
+        after = decode_stream_id(start - 1) if start > 0 else "0-0"
+        response = self._client.xread(
+            {self._stream: after},
+            count=limit,
+            block=int(timeout * 1000) or None,
+        )
+        records = []
+        for _stream, entries in response or []:
+            for stream_id, fields in entries:
+                records.append(
+                    Record(
+                        partition="0",
+                        offset=encode_stream_id(stream_id),
+                        event=VoteEvent.from_json(fields[b"event"]),
+                    )
+                )
+        return records
+
+    def trim(self, partition, before):
+        # Approximate trimming frees whole stream nodes; a few consumed
+        # entries may stay until a later trim.
+        self._client.xtrim(self._stream, minid=decode_stream_id(before), approximate=True)
+
+    def close(self):
+        self._client.close()
+
+
+class KafkaVoteEventBus(VoteEventBus):
+    """Kafka topic on ``KAFKA_BOOTSTRAP_SERVERS``; one shard per partition.
+
+    Consumers assign partitions explicitly at the offset stored in the
+    database, so broker-side consumer-group commits are not relied upon.
+    """
+
+    name = "kafka"
+
+    def __init__(self) -> None:
+        if confluent_kafka is None:
+            raise ImproperlyConfigured(
+                "SMART_VOTE_EVENT_BUS='kafka' requires the confluent-kafka package."
+            )
+        servers = settings.KAFKA_BOOTSTRAP_SERVERS
+        self._topic = event_topic()
+        self._producer = confluent_kafka.Producer(
+            {"bootstrap.servers": servers, "enable.idempotence": True}
+        )
+        self._consumer = confluent_kafka.Consumer(
+            {
+                "bootstrap.servers": servers,
+                "group.id": "konnaxion-smart-vote",
+                "enable.auto.commit": False,
+            }
+        )
+
+    def publish(self, events):
+        for event in events:
+            self._producer.produce(self._topic, key=event.key, value=event.to_json())
+        self._producer.flush()
+
+    def partitions(self):
+        metadata = self._consumer.list_topics(self._topic, timeout=10)
+        return sorted(str(p) for p in metadata.topics[self._topic].partitions)
+
+    def read(self, partition, start, limit, timeout=0):
+        self._consumer.assign(
+            [confluent_kafka.TopicPartition(self._topic, int(partition), start)]
+        )
+        records = []
+        for message in self._consumer.consume(num_messages=limit, timeout=timeout or 0.1):
+            if message.error():
+                LOGGER.warning("Kafka read error on %s: %s", partition, message.error())
+                continue
+            records.append(
+                Record(
+                    partition=partition,
+                    offset=message.offset(),
+                    event=VoteEvent.from_json(message.value()),
+                )
+            )
+        return records
+
+    def close(self):
+        self._producer.flush()
+        self._consumer.close()
+
+
+BACKENDS = {
+    MemoryVoteEventBus.name: MemoryVoteEventBus,
+    RedisStreamVoteEventBus.name: RedisStreamVoteEventBus,
+    KafkaVoteEventBus.name: KafkaVoteEventBus,
+}
+
+_bus: VoteEventBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> VoteEventBus:
+    """Process-wide bus instance for ``SMART_VOTE_EVENT_BUS``."""
+    global _bus
+    name = getattr(settings, "SMART_VOTE_EVENT_BUS", "")
+    with _bus_lock:
+        if _bus is None or _bus.name != name:
+            if name not in BACKENDS:
+                raise ImproperlyConfigured(f"Unknown SMART_VOTE_EVENT_BUS {name!r}.")
+            if _bus is not None:
+                _bus.close()
+            _bus = BACKENDS[name]()
+        return _bus
+
+
+def reset_bus() -> None:
+    """Drop the process-wide bus (tests, settings changes)."""
+    global _bus
+    with _bus_lock:
+        if _bus is not None:
+            _bus.close()
+        _bus = None
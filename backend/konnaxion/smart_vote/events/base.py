@@ -0,0 +1,81 @@
+"""Vote-event payload and the backend contract."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class VoteEvent:
+    """One accepted ballot, as published on the bus."""
+
+    vote_id: int
+    user_id: int
+    target_type: str
+    target_id: str
+    weighted_value: str
+
+    @classmethod
+    def from_vote(cls, vote) -> "VoteEvent":
+        return cls(
+            vote_id=vote.pk,
+            user_id=vote.user_id,
+            target_type=vote.target_type,
+            target_id=str(vote.target_id),
+            weighted_value=str(vote.weighted_value),
+        )
+
+    @property
+    def key(self) -> bytes:
+        # Events for one target stay in one partition, in order.
+        return f"{self.target_type}:{self.target_id}".encode()
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self), separators=(",", ":")).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "VoteEvent":
+        return cls(**json.loads(data))
+
+
+@dataclass(frozen=True)
+class Record:
+    """An event read back from the bus with its position."""
+
+    partition: str
+    offset: int
+    event: VoteEvent
+
+
+class VoteEventBus:
+    """Backend contract.
+
+    Offsets are integers that increase within a partition.  Consumers keep
+    their own position (the next offset to read) in the database and pass it
+    to ``read``; backends never track consumer progress themselves.
+    """
+
+    name = ""
+
+    def publish(self, events: Sequence[VoteEvent]) -> None:
+        raise NotImplementedError
+
+    def partitions(self) -> list[str]:
+        raise NotImplementedError
+
+    def read(
+        self, partition: str, start: int, limit: int, timeout: float = 0
+    ) -> list[Record]:
+        """Return up to ``limit`` records with ``offset >= start``."""
+        raise NotImplementedError
+
+    def trim(self, partition: str, before: int) -> None:
+        """Drop records with ``offset < before``, which the consumer committed.
+
+        Backends with their own retention (Kafka) keep this no-op.
+        """
+
+    def close(self) -> None:
+        pass
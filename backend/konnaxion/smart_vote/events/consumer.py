@@ -0,0 +1,136 @@
+"""Fold vote events into ``vote_result`` with exactly-once offsets.
+
+Each bus partition has an ``AggregationCheckpoint`` row (stream
+``vote_events``, shard = partition) holding the next offset to read.  A
+worker locks the row, reads from that offset, applies the batch and stores
+the new position in one transaction: a crash before commit replays the
+batch, a crash after commit never sees it again.  Once committed, the bus
+may drop everything before that position (``VoteEventBus.trim``).
+
+An event is applied only if its ``VoteEventOutbox`` row still exists, and
+the row is deleted in the same transaction, so events the relay published
+twice are applied once.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.models.checkpoint import AggregationCheckpoint
+from konnaxion.smart_vote.services import reading_cache
+
+from .backends import get_bus
+from .base import Record
+
+LOGGER = logging.getLogger(__name__)
+STREAM = "vote_events"
+
+APPLY_SQL = """
+INSERT INTO vote_result (target_type, target_id, sum_weighted_value, vote_count)
+VALUES {rows}
+ON CONFLICT (target_type, target_id) DO UPDATE
+SET sum_weighted_value = vote_result.sum_weighted_value + EXCLUDED.sum_weighted_value,
+    vote_count = vote_result.vote_count + EXCLUDED.vote_count
+"""
+
+
+CLAIM_OUTBOX_SQL = """
+DELETE FROM smart_vote_vote_event_outbox
+WHERE vote_id = ANY(%s)
+RETURNING vote_id
+"""
+
+
+def _claim(records: list[Record]) -> list[Record]:
+    """The records whose outbox row this call deleted (first deliveries)."""
+    with connection.cursor() as cur:
+        cur.execute(CLAIM_OUTBOX_SQL, [[record.event.vote_id for record in records]])
+        pending = {row[0] for row in cur.fetchall()}
+    fresh = []
+    for record in records:
+        if record.event.vote_id in pending:
+            pending.discard(record.event.vote_id)
+            fresh.append(record)
+    return fresh
+
+
+def _apply(records: list[Record]) -> tuple[int, int]:
+    """Add the records' new votes to ``vote_result``.
+
+    Returns (events applied, targets touched).
+    """
+    records = _claim(records)
+    if not records:
+        return 0, 0
+
+    totals: dict[tuple[str, str], list] = defaultdict(lambda: [Decimal("0"), 0])
+    for record in records:
+        event = record.event
+        total = totals[(event.target_type, event.target_id)]
+        total[0] += Decimal(event.weighted_value)
+        total[1] += 1
+
+    params = []
+    for (target_type, target_id), (weighted_sum, count) in totals.items():
+        params.extend([target_type, target_id, weighted_sum, count])
+    rows = ", ".join(["(%s, %s::uuid, %s, %s)"] * len(totals))
+    with connection.cursor() as cur:
+        cur.execute(APPLY_SQL.format(rows=rows), params)
+
+    for target_type, target_id in totals:
+        if target_type == "consultation":
+            reading_cache.invalidate_consultation(target_id)
+    return len(records), len(totals)
+
+
+def consume_once(max_events: int = 10_000, timeout: float = 0) -> int:
+    """Consume up to ``max_events`` per partition; return events applied.
+
+    Partitions locked by another worker are skipped.
+    """
+    bus = get_bus()
+    partitions = bus.partitions()
+    with transaction.atomic():
+        set_local_ekoh_smartvote_search_path()
+        AggregationCheckpoint.objects.bulk_create(
+            [AggregationCheckpoint(stream=STREAM, shard=name) for name in partitions],
+            ignore_conflicts=True,
+        )
+
+    applied = 0
+    for partition in partitions:
+        with transaction.atomic():
+            set_local_ekoh_smartvote_search_path()
+            checkpoint = (
+                AggregationCheckpoint.objects.select_for_update(skip_locked=True)
+                .filter(stream=STREAM, shard=partition)
+                .first()
+            )
+            if checkpoint is None:
+                continue
+            records = bus.read(partition, checkpoint.position, max_events, timeout)
+            if not records:
+                continue
+            events, targets = _apply(records)
+            checkpoint.position = records[-1].offset + 1
+            checkpoint.save(update_fields=["position", "updated_at"])
+
+        bus.trim(partition, checkpoint.position)
+        applied += events
+        LOGGER.debug(
+            "Applied %s of %s vote events of partition %s to %s targets (next=%s)",
+            events,
+            len(records),
+            partition,
+            targets,
+            checkpoint.position,
+        )
+
+    if applied:
+        LOGGER.info("Applied %s vote events", applied)
+    return applied
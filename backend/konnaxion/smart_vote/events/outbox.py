@@ -0,0 +1,86 @@
+"""Write vote events to the outbox and relay them to the bus.
+
+``write_outbox`` runs inside the ballot transaction.  ``relay_outbox``
+claims unpublished rows (and rows published more than
+``SMART_VOTE_EVENT_REDELIVER_SECONDS`` ago that the consumer has not applied
+yet) with ``SELECT ... FOR UPDATE SKIP LOCKED``, publishes them and stamps
+``published_at`` in one transaction.  A crash or bus outage leaves the rows
+to the next relay run; the resulting duplicates are dropped by the consumer.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.models.event_outbox import VoteEventOutbox
+
+from .backends import get_bus
+from .base import VoteEvent
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REDELIVER_SECONDS = 300
+
+
+def redeliver_seconds() -> int:
+    return int(
+        getattr(settings, "SMART_VOTE_EVENT_REDELIVER_SECONDS", DEFAULT_REDELIVER_SECONDS)
+    )
+
+
+def write_outbox(events: Sequence[VoteEvent]) -> None:
+    """Queue ``events`` in the caller's transaction."""
+    with ekoh_smartvote_db_scope():
+        VoteEventOutbox.objects.bulk_create(
+            [VoteEventOutbox(vote_id=event.vote_id, payload=asdict(event)) for event in events]
+        )
+
+
+def relay_outbox(vote_ids: Sequence[int] | None = None, limit: int = 10_000) -> int:
+    """Publish up to ``limit`` due outbox rows; return how many.
+
+    ``vote_ids`` restricts the relay to those votes (the post-commit fast
+    path of ``publish_votes``).
+    """
+    now = timezone.now()
+    with ekoh_smartvote_db_scope():
+        due = VoteEventOutbox.objects.select_for_update(skip_locked=True).filter(
+            Q(published_at__isnull=True)
+            | Q(published_at__lt=now - timedelta(seconds=redeliver_seconds()))
+        )
+        if vote_ids is not None:
+            due = due.filter(vote_id__in=vote_ids)
+        rows = list(due.order_by("vote_id")[:limit])
+        if not rows:
+            return 0
+        get_bus().publish([VoteEvent(**row.payload) for row in rows])
+        VoteEventOutbox.objects.filter(vote_id__in=[row.vote_id for row in rows]).update(
+            published_at=now
+        )
+    return len(rows)
+
+
+def relay_after_commit(vote_ids: Sequence[int]) -> None:
+    """Publish ``vote_ids`` once the current transaction commits.
+
+    Failures are logged; the rows stay in the outbox for the relay task.
+    """
+
+    def relay() -> None:
+        try:
+            relay_outbox(vote_ids)
+        except Exception:
+            LOGGER.warning(
+                "Vote events of %s votes left in the outbox", len(vote_ids), exc_info=True
+            )
+
+    transaction.on_commit(relay)
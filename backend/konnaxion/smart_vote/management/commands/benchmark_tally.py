@@ -0,0 +1,42 @@
+"""Time the tally engines on synthetic elections."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from konnaxion.smart_vote.models.core import VoteModality
+from konnaxion.smart_vote.services.tally_benchmark import run_benchmark
+
+MODALITIES = [name for name, _label in VoteModality._meta.get_field("name").choices]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the Smart-Vote tally engines on seeded synthetic ballots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modality",
+            action="append",
+            choices=MODALITIES,
+            help="Modality to benchmark (repeatable). Default: all.",
+        )
+        parser.add_argument("--ballots", type=int, default=100_000)
+        parser.add_argument("--options", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        for modality in options["modality"] or MODALITIES:
+            runs = run_benchmark(
+                modality,
+                options["ballots"],
+                options["options"],
+                repeat=options["repeat"],
+                seed=options["seed"],
+            )
+            best = min(runs, key=lambda run: run.seconds)
+            self.stdout.write(
+                f"{modality:<13} {best.ballots} ballots x {best.options} options: "
+                f"best {best.seconds * 1000:.1f} ms of {len(runs)} "
+                f"({best.ballots_per_second:,.0f} ballots/s)"
+            )
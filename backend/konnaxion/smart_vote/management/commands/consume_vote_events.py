@@ -0,0 +1,52 @@
+"""Long-running vote-event consumer."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from konnaxion.smart_vote.events import event_bus_enabled, relay_outbox
+from konnaxion.smart_vote.events.consumer import consume_once
+
+
+class Command(BaseCommand):
+    help = (
+        "Relay the vote-event outbox and consume vote events from "
+        "SMART_VOTE_EVENT_BUS into VoteResult, committing offsets with each batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-events",
+            type=int,
+            default=10_000,
+            help="Events applied per partition and transaction.",
+        )
+        parser.add_argument(
+            "--poll-timeout",
+            type=float,
+            default=1.0,
+            help="Seconds to wait for new events on an idle partition.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Consume what is available and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if not event_bus_enabled():
+            raise CommandError("SMART_VOTE_EVENT_BUS is not set.")
+
+        total = 0
+        while True:
+            relay_outbox()
+            applied = consume_once(
+                max_events=options["max_events"], timeout=options["poll_timeout"]
+            )
+            total += applied
+            if options["once"] and not applied:
+                break
+            if applied and options["verbosity"] > 1:
+                self.stdout.write(f"applied {applied} events")
+
+        self.stdout.write(self.style.SUCCESS(f"Applied {total} vote event(s)."))
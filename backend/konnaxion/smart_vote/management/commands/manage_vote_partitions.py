@@ -0,0 +1,85 @@
+"""Pre-create upcoming vote partitions and archive expired ones."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.services import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create monthly vote/vote_ledger partitions ahead of time and archive "
+        "partitions older than the retention window as compressed COPY dumps."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=None,
+            help="Months to pre-create after the current one. "
+            "Default: SMART_VOTE_PARTITION_MONTHS_AHEAD.",
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=None,
+            help="Months to keep attached. Default: SMART_VOTE_PARTITION_RETENTION_MONTHS.",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=None,
+            help="Directory for archive dumps. Default: SMART_VOTE_PARTITION_ARCHIVE_DIR.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List what would be created or archived without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        ahead = options["months_ahead"]
+        retention = options["retention_months"]
+
+        if options["dry_run"]:
+            with transaction.atomic():
+                set_local_ekoh_smartvote_search_path()
+                missing = partitions.missing_partitions(ahead=ahead)
+                expired = partitions.expired_partitions(retention=retention)
+                transaction.set_rollback(True)
+            for table, month in missing:
+                name = partitions.partition_name(table, month)
+                self.stdout.write(
+                    f"would create {name} ({table}) with BRIN index "
+                    f"{partitions.brin_index_name(table, name)}"
+                )
+            for table, name in expired:
+                self.stdout.write(f"would archive {name} ({table})")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(missing)} partition(s) to create, {len(expired)} past "
+                    "retention (dry run, nothing written)."
+                )
+            )
+            return
+
+        with transaction.atomic():
+            set_local_ekoh_smartvote_search_path()
+            created = partitions.ensure_future_partitions(ahead=ahead)
+        for name in created:
+            self.stdout.write(f"created {name}")
+
+        archived = partitions.archive_expired_partitions(
+            retention=retention, directory=options["archive_dir"]
+        )
+        for result in archived:
+            self.stdout.write(f"archived {result.table_name} ({result.rows} rows) -> {result.path}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(created)} partition(s); archived {len(archived)}."
+            )
+        )
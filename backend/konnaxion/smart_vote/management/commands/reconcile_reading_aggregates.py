@@ -0,0 +1,92 @@
+"""Rebuild running topic reading aggregates and report drift."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.models import SourceConsultationBinding
+from konnaxion.smart_vote.models.reading_aggregate import TopicReadingAggregate
+from konnaxion.smart_vote.services.reading_aggregates import (
+    compute_topic_totals,
+    store_topic_totals,
+)
+from konnaxion.smart_vote.services.reading_service import SOURCE_TYPE_ETHIKOS_TOPIC
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Ethikos topic reading aggregates from their stances, "
+        "report any drift from the running totals and store the rebuilt values."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--topic",
+            action="append",
+            dest="topics",
+            default=[],
+            help="Topic id to reconcile. Repeatable. Default: every bound topic.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing rebuilt aggregates.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        checked = 0
+        drifted = 0
+
+        with ekoh_smartvote_db_scope():
+            bindings = SourceConsultationBinding.objects.filter(
+                source_type=SOURCE_TYPE_ETHIKOS_TOPIC
+            ).order_by("source_id")
+            if options["topics"]:
+                bindings = bindings.filter(source_id__in=options["topics"])
+
+            for binding in bindings.iterator():
+                checked += 1
+                totals, contributions = compute_topic_totals(binding)
+                aggregate = (
+                    TopicReadingAggregate.objects.select_for_update()
+                    .filter(
+                        source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+                        source_id=binding.source_id,
+                    )
+                    .first()
+                )
+                drift = {}
+                if aggregate is not None and not aggregate.stale:
+                    drift = {
+                        field: (getattr(aggregate, field), expected)
+                        for field, expected in totals.items()
+                        if getattr(aggregate, field) != expected
+                    }
+                if drift:
+                    drifted += 1
+                    details = ", ".join(
+                        f"{field}: {stored} -> {expected}"
+                        for field, (stored, expected) in drift.items()
+                    )
+                    self.stdout.write(
+                        self.style.WARNING(f"topic {binding.source_id}: {details}")
+                    )
+
+                if dry_run:
+                    continue
+
+                if aggregate is None:
+                    aggregate = TopicReadingAggregate(
+                        source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+                        source_id=binding.source_id,
+                    )
+                store_topic_totals(aggregate, totals, contributions)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {checked} topic aggregate(s); {drifted} drifted"
+                + (" (dry run, nothing written)." if dry_run else ".")
+            )
+        )
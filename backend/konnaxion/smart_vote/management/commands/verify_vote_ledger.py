@@ -0,0 +1,57 @@
+"""Re-validate one monthly vote_ledger partition."""
+
+from __future__ import annotations
+
+import datetime as dt
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.services import ledger, partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a vote_ledger month partition and check every leaf against its "
+        "vote, every Merkle proof against its batch root and the batch chain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("month", help="Partition month as YYYY-MM.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5_000,
+            help="Rows fetched per round trip from the server-side cursor.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=100,
+            help="Problems listed in the output (all are counted).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            month = dt.datetime.strptime(options["month"], "%Y-%m").date()
+        except ValueError as exc:
+            raise CommandError("month must be given as YYYY-MM") from exc
+        name = partitions.partition_name("vote_ledger", month)
+
+        with transaction.atomic():
+            set_local_ekoh_smartvote_search_path()
+            if name not in partitions.list_partitions("vote_ledger"):
+                raise CommandError(f"Partition {name} does not exist.")
+            report = ledger.verify_partition(
+                name,
+                chunk_size=options["chunk_size"],
+                max_errors=options["max_errors"],
+            )
+
+        for error in report.errors:
+            self.stderr.write(error)
+        summary = f"{name}: {report.rows} row(s) in {report.batches} batch(es)"
+        if not report.ok:
+            raise CommandError(f"{summary}, {report.error_count} problem(s).")
+        self.stdout.write(self.style.SUCCESS(f"{summary} verified."))
@@ -0,0 +1,29 @@
+"""Report hit/miss counts of the shared EkoH weight-input cache."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from konnaxion.smart_vote.services import weight_cache
+
+
+class Command(BaseCommand):
+    help = "Show weight-input cache hits and misses per kind, across all workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the shared counters after reporting them.",
+        )
+
+    def handle(self, *args, **options):
+        shared = weight_cache.stats()["shared"]
+        for kind, counts in shared.items():
+            self.stdout.write(
+                f"{kind}: {counts['hits']} hit(s), {counts['misses']} miss(es), "
+                f"hit ratio {counts['hit_ratio']:.1%}"
+            )
+        if options["reset"]:
+            weight_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
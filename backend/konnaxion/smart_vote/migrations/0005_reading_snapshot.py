@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0004_source_consultation_binding"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ReadingSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source_type", models.CharField(max_length=64)),
+                ("source_id", models.CharField(max_length=128)),
+                ("lens_hash", models.CharField(max_length=80)),
+                ("snapshot_ref", models.CharField(max_length=96)),
+                ("payload_json", models.JSONField(default=dict)),
+                ("computed_at", models.DateTimeField()),
+                ("invalidated_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "smart_vote_reading_snapshot",
+                "indexes": [models.Index(condition=models.Q(("invalidated_at__isnull", True)), fields=["source_type", "source_id", "-computed_at"], name="idx_sv_reading_current")],
+                "constraints": [models.UniqueConstraint(fields=("source_type", "source_id", "lens_hash", "snapshot_ref"), name="uq_sv_reading_snapshot")],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0005_reading_snapshot"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="TopicReadingAggregate",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source_type", models.CharField(max_length=64)),
+                ("source_id", models.CharField(max_length=128)),
+                ("participant_count", models.IntegerField(default=0)),
+                ("value_sum", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("support_count", models.IntegerField(default=0)),
+                ("neutral_count", models.IntegerField(default=0)),
+                ("oppose_count", models.IntegerField(default=0)),
+                ("advisory_participant_count", models.IntegerField(default=0)),
+                ("covered_participant_count", models.IntegerField(default=0)),
+                ("weighted_sum", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("total_weight", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("support_weight", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("neutral_weight", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("oppose_weight", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("alignment_sum", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20)),
+                ("stale", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "smart_vote_topic_reading_aggregate",
+                "constraints": [models.UniqueConstraint(fields=("source_type", "source_id"), name="uq_sv_reading_aggregate")],
+            },
+        ),
+        migrations.CreateModel(
+            name="TopicReadingContribution",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source_type", models.CharField(max_length=64)),
+                ("source_id", models.CharField(max_length=128)),
+                ("user_id", models.IntegerField()),
+                ("stance_value", models.SmallIntegerField()),
+                ("alignment", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("weight", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("included_in_advisory", models.BooleanField(default=True)),
+            ],
+            options={
+                "db_table": "smart_vote_topic_reading_contribution",
+                "constraints": [models.UniqueConstraint(fields=("source_type", "source_id", "user_id"), name="uq_sv_reading_contribution")],
+            },
+        ),
+    ]
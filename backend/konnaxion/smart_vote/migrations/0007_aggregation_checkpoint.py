@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0006_topic_reading_aggregates"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="AggregationCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("stream", models.CharField(max_length=64)),
+                ("shard", models.CharField(max_length=128)),
+                ("position", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "smart_vote_aggregation_checkpoint",
+                "constraints": [models.UniqueConstraint(fields=("stream", "shard"), name="uq_sv_aggregation_checkpoint")],
+            },
+        ),
+        # vote_result was rebuilt from an in-transaction cursor that reset on
+        # every run.  Clear it so the durable checkpoints rebuild it from the
+        # first vote exactly once.
+        migrations.RunSQL(
+            sql="TRUNCATE vote_result",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
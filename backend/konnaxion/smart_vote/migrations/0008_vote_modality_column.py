@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0007_aggregation_checkpoint"),
+    ]
+
+    operations = [
+        # The ``vote`` table is created by raw DDL in 0001 with a
+        # ``modality_name`` column; align the ORM state with it.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="vote",
+                    name="modality",
+                    field=models.ForeignKey(
+                        db_column="modality_name",
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="smart_vote.votemodality",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0008_vote_modality_column"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name="consultation",
+            name="weights_built_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="ConsultationWeight",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("alignment", models.DecimalField(decimal_places=4, max_digits=8)),
+                ("weight", models.DecimalField(decimal_places=4, max_digits=8)),
+                ("computed_at", models.DateTimeField()),
+                ("consultation", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="weights", to="smart_vote.consultation")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "db_table": "consultation_weight",
+                "constraints": [models.UniqueConstraint(fields=("consultation", "user"), name="uq_consultation_weight")],
+            },
+        ),
+    ]
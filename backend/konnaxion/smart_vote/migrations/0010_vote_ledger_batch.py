@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0009_consultation_weight"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="LedgerBatch",
+            fields=[
+                ("height", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("merkle_root", models.BinaryField(max_length=32)),
+                ("chain_hash", models.BinaryField(max_length=32)),
+                ("leaf_count", models.IntegerField()),
+                ("first_vote_id", models.BigIntegerField()),
+                ("last_vote_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "vote_ledger_batch",
+                "ordering": ["height"],
+            },
+        ),
+        # ``vote_ledger`` is a partitioned table created by raw DDL in 0001.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        "ALTER TABLE vote_ledger "
+                        "ADD COLUMN IF NOT EXISTS leaf_index INTEGER, "
+                        "ADD COLUMN IF NOT EXISTS merkle_proof BYTEA"
+                    ),
+                    reverse_sql=(
+                        "ALTER TABLE vote_ledger "
+                        "DROP COLUMN IF EXISTS leaf_index, "
+                        "DROP COLUMN IF EXISTS merkle_proof"
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name="voteledger",
+                    name="leaf_index",
+                    field=models.IntegerField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name="voteledger",
+                    name="merkle_proof",
+                    field=models.BinaryField(blank=True, null=True),
+                ),
+            ],
+        ),
+    ]
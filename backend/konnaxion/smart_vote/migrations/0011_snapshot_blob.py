@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0010_vote_ledger_batch"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="SnapshotBlob",
+            fields=[
+                ("ref", models.CharField(max_length=96, primary_key=True, serialize=False)),
+                ("kind", models.CharField(choices=[("scores", "EkoH score snapshot"), ("inputs", "Reading inputs")], max_length=16)),
+                ("encoding", models.CharField(max_length=32)),
+                ("data", models.BinaryField()),
+                ("row_count", models.IntegerField()),
+                ("raw_size", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "smart_vote_snapshot_blob",
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0011_snapshot_blob"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ConsultationResult",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("tallies", "Modality tallies"), ("reading", "Source reading")], max_length=16)),
+                ("source_type", models.CharField(blank=True, default="", max_length=64)),
+                ("source_id", models.CharField(blank=True, default="", max_length=128)),
+                ("snapshot_at", models.DateTimeField()),
+                ("payload_json", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "smart_vote_consultation_result",
+            },
+        ),
+        migrations.AddField(
+            model_name="consultation",
+            name="finalised_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="consultation",
+            index=models.Index(condition=models.Q(("closes_at__isnull", False), ("finalised_at__isnull", True)), fields=["closes_at"], name="idx_consultation_due"),
+        ),
+        migrations.AddField(
+            model_name="consultationresult",
+            name="consultation",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="results", to="smart_vote.consultation"),
+        ),
+        migrations.AddIndex(
+            model_name="consultationresult",
+            index=models.Index(fields=["source_type", "source_id"], name="idx_sv_result_source"),
+        ),
+        migrations.AddConstraint(
+            model_name="consultationresult",
+            constraint=models.UniqueConstraint(fields=("consultation", "kind", "source_type", "source_id"), name="uq_sv_consultation_result"),
+        ),
+    ]
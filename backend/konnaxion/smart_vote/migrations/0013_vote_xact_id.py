@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+VOTE_XACT_ID_SQL = """
+-- Existing votes count as written before any running transaction.  A
+-- constant default keeps this a catalog-only change; new rows then record
+-- the id of the transaction that wrote them.
+ALTER TABLE vote ADD COLUMN IF NOT EXISTS xact_id bigint NOT NULL DEFAULT 0;
+ALTER TABLE vote ALTER COLUMN xact_id SET DEFAULT pg_current_xact_id()::text::bigint;
+CREATE INDEX IF NOT EXISTS idx_vote_xact ON vote (xact_id, id);
+"""
+
+VOTE_XACT_ID_REVERSE_SQL = """
+DROP INDEX IF EXISTS idx_vote_xact;
+ALTER TABLE vote DROP COLUMN IF EXISTS xact_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0012_consultation_result"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name="aggregationcheckpoint",
+            name="xact_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        # ``vote`` is the raw partitioned table of 0001; the column is filled
+        # by the database and stays out of the ORM model.
+        migrations.RunSQL(sql=VOTE_XACT_ID_SQL, reverse_sql=VOTE_XACT_ID_REVERSE_SQL),
+    ]
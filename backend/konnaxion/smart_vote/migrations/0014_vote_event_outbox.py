@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0013_vote_xact_id"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="VoteEventOutbox",
+            fields=[
+                ("vote_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("payload", models.JSONField()),
+                ("published_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "smart_vote_vote_event_outbox",
+                "indexes": [models.Index(fields=["published_at", "vote_id"], name="idx_sv_outbox_relay")],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0014_vote_event_outbox"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ConsultationOption",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("target_id", models.UUIDField(default=uuid.uuid4, unique=True)),
+                ("label", models.CharField(max_length=256)),
+                ("position", models.PositiveIntegerField(default=0)),
+                ("consultation", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="options", to="smart_vote.consultation")),
+            ],
+            options={
+                "db_table": "consultation_option",
+                "ordering": ["consultation", "position", "id"],
+                "indexes": [models.Index(fields=["consultation", "position"], name="idx_consultation_option")],
+            },
+        ),
+    ]
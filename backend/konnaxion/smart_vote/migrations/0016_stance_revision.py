@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0015_consultation_option"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="StanceRevision",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("topic_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField()),
+                ("value", models.SmallIntegerField(blank=True, null=True)),
+                ("replaced_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "stance_revision",
+                "indexes": [models.Index(fields=["topic_id", "replaced_at"], name="idx_stance_revision_topic"), models.Index(fields=["replaced_at"], name="idx_stance_revision_prune")],
+            },
+        ),
+    ]
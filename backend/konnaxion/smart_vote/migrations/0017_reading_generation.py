@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smart_vote", "0016_stance_revision"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="SET LOCAL search_path TO ekoh_smartvote, public",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="ReadingGeneration",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source_type", models.CharField(max_length=64)),
+                ("source_id", models.CharField(max_length=128)),
+                ("generation", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "smart_vote_reading_generation",
+                "constraints": [models.UniqueConstraint(fields=("source_type", "source_id"), name="uq_sv_reading_generation")],
+            },
+        ),
+    ]
@@ -11,8 +11,18 @@ from .core import (
     VoteLedger,
 )
 from .consultation import Consultation
+from .consultation_option import ConsultationOption
 from .consultation_relevance import ConsultationRelevance
+from .consultation_weight import ConsultationWeight
+from .consultation_result import ConsultationResult
 from .source_binding import SourceConsultationBinding
+from .reading_snapshot import ReadingGeneration, ReadingSnapshot
+from .reading_aggregate import TopicReadingAggregate, TopicReadingContribution
+from .checkpoint import AggregationCheckpoint
+from .event_outbox import VoteEventOutbox
+from .ledger_batch import LedgerBatch
+from .snapshot_blob import SnapshotBlob
+from .stance_revision import StanceRevision
 
 __all__ = [
     "Vote",
@@ -20,6 +30,18 @@ __all__ = [
     "VoteResult",
     "VoteLedger",
     "Consultation",
+    "ConsultationOption",
     "ConsultationRelevance",
+    "ConsultationWeight",
+    "ConsultationResult",
     "SourceConsultationBinding",
+    "ReadingSnapshot",
+    "ReadingGeneration",
+    "TopicReadingAggregate",
+    "TopicReadingContribution",
+    "AggregationCheckpoint",
+    "VoteEventOutbox",
+    "LedgerBatch",
+    "SnapshotBlob",
+    "StanceRevision",
 ]
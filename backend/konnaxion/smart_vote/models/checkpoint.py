@@ -0,0 +1,56 @@
+"""Durable progress markers for Smart Vote stream processors.
+
+Each row records how far one named processor (``stream``) has consumed one
+shard of its input (``shard``): for the vote aggregator a shard is a monthly
+``vote`` partition and ``(xact_id, position)`` is the last vote folded into
+``vote_result``.
+
+Workers claim rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` and advance
+``position`` in the same transaction as the work it covers, so concurrent
+workers process disjoint shards and progress is never lost or replayed.
+
+Vote readers walk ``vote`` in ``(xact_id, id)`` order, where ``xact_id`` is
+the id of the transaction that wrote the vote (filled in by the database,
+migration 0013), and stop at ``SETTLED_HORIZON_SQL``.  Every transaction
+below that horizon has finished, so no vote can still appear behind the
+checkpoint, however long a ballot transaction stays open.  A long-running
+transaction anywhere in the cluster delays the readers; it never makes them
+skip a vote.
+"""
+
+from django.db import models
+
+# The first transaction id that may still be running.  The caller's own
+# transaction counts as finished when it is the oldest one (its votes are
+# all visible to it), so a single transaction can cast and then read votes.
+SETTLED_HORIZON_SQL = """
+SELECT CASE
+           WHEN pg_snapshot_xmin(snapshot) = pg_current_xact_id_if_assigned()
+           THEN pg_snapshot_xmin(snapshot)::text::bigint + 1
+           ELSE pg_snapshot_xmin(snapshot)::text::bigint
+       END AS xmin
+FROM pg_current_snapshot() AS snapshot
+"""
+
+
+class AggregationCheckpoint(models.Model):
+    """Committed position of one stream processor within one shard."""
+
+    stream = models.CharField(max_length=64)
+    shard = models.CharField(max_length=128)
+    position = models.BigIntegerField(default=0)
+    # Writing transaction of the vote at ``position`` (vote readers only).
+    xact_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "smart_vote_aggregation_checkpoint"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["stream", "shard"],
+                name="uq_sv_aggregation_checkpoint",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.stream}[{self.shard}] @ {self.position}"
@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import Q
 
 class Consultation(models.Model):
     """
@@ -13,9 +14,21 @@ class Consultation(models.Model):
     title = models.CharField(max_length=256)
     opens_at = models.DateTimeField(null=True, blank=True)
     closes_at = models.DateTimeField(null=True, blank=True)
+    # Set when the ConsultationWeight rows are complete and current.
+    weights_built_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set when the close-time finaliser has written the ConsultationResult rows.
+    finalised_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         db_table = "consultation"
+        indexes = [
+            # Consultations still to finalise, by close time (finaliser scan).
+            models.Index(
+                fields=["closes_at"],
+                name="idx_consultation_due",
+                condition=Q(finalised_at__isnull=True, closes_at__isnull=False),
+            )
+        ]
 
     def __str__(self) -> str:
         return self.title
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""Options of a multi-option consultation.
+
+A voter's ballot on such a consultation is stored as one ``Vote`` per option
+they marked, with ``target_id`` set to the option's ``target_id``; what
+``raw_value`` holds depends on the modality:
+
+* ``approval``: 1 (approved) or 0;
+* ``rating``: the rating, 1..5;
+* ``budget_split``: the amount given to the option;
+* ``ranking`` / ``preferential``: the option's rank, 1 for the most
+  preferred.
+
+Options a ballot leaves out have no ``Vote`` row.  ``services.tally_engine``
+turns these rows back into columnar ballots.
+"""
+
+import uuid
+
+from django.db import models
+
+
+class ConsultationOption(models.Model):
+    consultation = models.ForeignKey(
+        "smart_vote.Consultation",
+        on_delete=models.CASCADE,
+        related_name="options",
+    )
+    target_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    label = models.CharField(max_length=256)
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "consultation_option"
+        ordering = ["consultation", "position", "id"]
+        indexes = [
+            models.Index(
+                fields=["consultation", "position"],
+                name="idx_consultation_option",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.consultation_id}: {self.label}"
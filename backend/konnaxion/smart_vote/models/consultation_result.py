@@ -0,0 +1,60 @@
+"""Final results of closed consultations.
+
+Written once, by the close-time finaliser (``services.finaliser``), from a
+snapshot taken at ``Consultation.closes_at``:
+
+``tallies``
+    Modality tallies of the ballots cast on the consultation.
+``reading``
+    One row per bound source (Ethikos topic): its baseline and every
+    registered reading lens, with the ``input_ref`` the reading was computed
+    from.
+
+Rows are immutable.  Once a consultation is finalised, readings of its
+sources are served from these rows and never recomputed from stances.
+"""
+
+from django.db import models
+
+from .consultation import Consultation
+
+
+class ConsultationResult(models.Model):
+    KIND_TALLIES = "tallies"
+    KIND_READING = "reading"
+
+    consultation = models.ForeignKey(
+        Consultation, on_delete=models.CASCADE, related_name="results"
+    )
+    kind = models.CharField(
+        max_length=16,
+        choices=[(KIND_TALLIES, "Modality tallies"), (KIND_READING, "Source reading")],
+    )
+    source_type = models.CharField(max_length=64, blank=True, default="")
+    source_id = models.CharField(max_length=128, blank=True, default="")
+    snapshot_at = models.DateTimeField()
+    payload_json = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "smart_vote_consultation_result"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["consultation", "kind", "source_type", "source_id"],
+                name="uq_sv_consultation_result",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["source_type", "source_id"],
+                name="idx_sv_result_source",
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Consultation results are immutable once written.")
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.consultation_id} {self.kind} {self.source_type}:{self.source_id}"
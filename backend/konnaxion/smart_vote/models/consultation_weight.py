@@ -0,0 +1,38 @@
+"""Materialised advisory weights per consultation.
+
+One row per user whose EkoH expertise overlaps the consultation's relevance
+vector.  Users without a row have alignment 0 and therefore weight 1.0, so
+the table stays proportional to the relevant expert population rather than
+to the whole user base.
+
+Rows are trusted only while ``Consultation.weights_built_at`` is set; any
+change that affects every row (relevance vector, bonus cap) clears it and
+the cast path falls back to the live calculator until the next build.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class ConsultationWeight(models.Model):
+    consultation = models.ForeignKey(
+        "smart_vote.Consultation",
+        on_delete=models.CASCADE,
+        related_name="weights",
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    alignment = models.DecimalField(max_digits=8, decimal_places=4)
+    weight = models.DecimalField(max_digits=8, decimal_places=4)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "consultation_weight"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["consultation", "user"],
+                name="uq_consultation_weight",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.consultation_id}:{self.user_id} = {self.weight}"
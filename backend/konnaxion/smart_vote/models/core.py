@@ -66,7 +66,10 @@ class Vote(models.Model):
     target_type = models.CharField(max_length=64)
     target_id = models.UUIDField(default=uuid.uuid4)
 
-    modality = models.ForeignKey(VoteModality, on_delete=models.PROTECT)
+    # Column name fixed by the partitioned-table DDL in migration 0001.
+    modality = models.ForeignKey(
+        VoteModality, on_delete=models.PROTECT, db_column="modality_name"
+    )
 
     raw_value = models.DecimalField(max_digits=12, decimal_places=4)
     weighted_value = models.DecimalField(max_digits=12, decimal_places=4)
@@ -110,13 +113,17 @@ class VoteLedger(models.Model):
     """
     Append-only log for on-chain anchoring.
 
-    Partitioned monthly on `logged_at`.
+    Partitioned monthly on `logged_at`.  `sha256_hash` is the vote's Merkle
+    leaf; `block_height` points at its `LedgerBatch`, and `merkle_proof`
+    holds the sibling hashes (32 bytes each) from leaf to batch root.
     """
 
     ledger_id = models.BigAutoField(primary_key=True)
     vote = models.ForeignKey(Vote, on_delete=models.CASCADE)
     sha256_hash = models.BinaryField()  # 32-byte SHA-256
     block_height = models.BigIntegerField(null=True, blank=True)
+    leaf_index = models.IntegerField(null=True, blank=True)
+    merkle_proof = models.BinaryField(null=True, blank=True)
     logged_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
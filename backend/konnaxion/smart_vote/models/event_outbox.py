@@ -0,0 +1,30 @@
+"""Transactional outbox of the vote-event bus.
+
+Ballot writes insert one row per vote in the same transaction as the vote,
+so an event exists exactly when its vote committed.  The relay
+(``events.outbox.relay_outbox``) publishes rows to the bus and stamps
+``published_at``; rows left unconsumed for too long are published again.
+The consumer deletes a row in the transaction that folds its event into
+``vote_result`` and ignores events whose row is already gone, so duplicate
+deliveries are applied once.
+"""
+
+from django.db import models
+
+
+class VoteEventOutbox(models.Model):
+    """One vote event not yet applied by the consumer."""
+
+    vote_id = models.BigIntegerField(primary_key=True)
+    payload = models.JSONField()
+    published_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "smart_vote_vote_event_outbox"
+        indexes = [
+            models.Index(fields=["published_at", "vote_id"], name="idx_sv_outbox_relay")
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"vote {self.vote_id} ({'published' if self.published_at else 'pending'})"
@@ -0,0 +1,30 @@
+"""Anchor records of the Merkle-batched vote ledger.
+
+Votes are hashed into ``vote_ledger`` in batches.  Each batch is one Merkle
+tree whose root is chained into the previous batch's ``chain_hash``; this row
+is the only thing that needs anchoring externally.  ``height`` is the
+``block_height`` carried by the batch's ``vote_ledger`` rows.
+"""
+
+from django.db import models
+
+
+class LedgerBatch(models.Model):
+    """One Merkle batch of ``vote_ledger`` rows."""
+
+    height = models.BigIntegerField(primary_key=True)
+    merkle_root = models.BinaryField(max_length=32)
+    # sha256(previous chain_hash || merkle_root); 32 zero bytes before height 0
+    chain_hash = models.BinaryField(max_length=32)
+    leaf_count = models.IntegerField()
+    # First and last vote of the batch in ledger order, ``(xact_id, id)``.
+    first_vote_id = models.BigIntegerField()
+    last_vote_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "vote_ledger_batch"
+        ordering = ["height"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"ledger batch {self.height} ({self.leaf_count} votes)"
@@ -0,0 +1,77 @@
+"""Running per-topic reading aggregates.
+
+``TopicReadingAggregate`` holds the sums a declared reading needs (baseline
+counts, advisory weighted sum, total weight, bucket weights, alignment sum)
+so the aggregate portion of a reading is an O(1) lookup.
+
+``TopicReadingContribution`` records what each stance last contributed, so a
+stance upsert can subtract the old contribution and add the new one in the
+same transaction as the stance write.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+
+def _sum_field():
+    return models.DecimalField(max_digits=20, decimal_places=4, default=Decimal("0"))
+
+
+class TopicReadingAggregate(models.Model):
+    source_type = models.CharField(max_length=64)
+    source_id = models.CharField(max_length=128)
+
+    participant_count = models.IntegerField(default=0)
+    value_sum = _sum_field()
+    support_count = models.IntegerField(default=0)
+    neutral_count = models.IntegerField(default=0)
+    oppose_count = models.IntegerField(default=0)
+
+    advisory_participant_count = models.IntegerField(default=0)
+    covered_participant_count = models.IntegerField(default=0)
+    weighted_sum = _sum_field()
+    total_weight = _sum_field()
+    support_weight = _sum_field()
+    neutral_weight = _sum_field()
+    oppose_weight = _sum_field()
+    alignment_sum = _sum_field()
+
+    # Set when an input affecting every contribution (relevance vector or
+    # binding lens configuration) changed; the next access rebuilds.
+    stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "smart_vote_topic_reading_aggregate"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_type", "source_id"],
+                name="uq_sv_reading_aggregate",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.source_type}:{self.source_id} ({self.participant_count})"
+
+
+class TopicReadingContribution(models.Model):
+    source_type = models.CharField(max_length=64)
+    source_id = models.CharField(max_length=128)
+    user_id = models.IntegerField()
+    stance_value = models.SmallIntegerField()
+    alignment = models.DecimalField(max_digits=12, decimal_places=4)
+    weight = models.DecimalField(max_digits=12, decimal_places=4)
+    included_in_advisory = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "smart_vote_topic_reading_contribution"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_type", "source_id", "user_id"],
+                name="uq_sv_reading_contribution",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.source_type}:{self.source_id} u={self.user_id}"
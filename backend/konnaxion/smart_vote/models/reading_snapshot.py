@@ -0,0 +1,67 @@
+"""Materialized Smart Vote readings.
+
+A declared reading is a pure function of the source stances, the lens
+configuration (``lens_hash``) and the EkoH score snapshot (``snapshot_ref``).
+Persisting the computed payload lets popular topics be served without
+recomputing baseline and advisory readings on every request.
+
+Stored payloads never contain viewer-specific data: rating disclosure is
+applied to the participant rows after the snapshot is loaded.
+
+``ReadingGeneration`` counts the invalidations of each source (and, under
+``source_id="*"``, of every source of a type).  A reading computed while the
+count moved is not stored (``services.reading_cache``).
+"""
+
+from django.db import models
+
+
+class ReadingSnapshot(models.Model):
+    """One computed reading for a source target under a lens and snapshot."""
+
+    source_type = models.CharField(max_length=64)
+    source_id = models.CharField(max_length=128)
+    lens_hash = models.CharField(max_length=80)
+    snapshot_ref = models.CharField(max_length=96)
+    payload_json = models.JSONField(default=dict)
+    computed_at = models.DateTimeField()
+    invalidated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "smart_vote_reading_snapshot"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_type", "source_id", "lens_hash", "snapshot_ref"],
+                name="uq_sv_reading_snapshot",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["source_type", "source_id", "-computed_at"],
+                name="idx_sv_reading_current",
+                condition=models.Q(invalidated_at__isnull=True),
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.source_type}:{self.source_id} @ {self.snapshot_ref}"
+
+
+class ReadingGeneration(models.Model):
+    """How many times the readings of one source were invalidated."""
+
+    source_type = models.CharField(max_length=64)
+    source_id = models.CharField(max_length=128)
+    generation = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "smart_vote_reading_generation"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_type", "source_id"],
+                name="uq_sv_reading_generation",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.source_type}:{self.source_id} #{self.generation}"
@@ -0,0 +1,39 @@
+"""Content-addressed store of the inputs behind declared readings.
+
+Two kinds of immutable blobs, each keyed by the hash of its content:
+
+``scores``
+    The per-participant EkoH snapshot (ethics, expertise per relevant domain,
+    advisory inclusion), keyed by the reading's ``snapshot_ref``.
+``inputs``
+    Everything else a reading depends on (stances, relevance vector, advisory
+    exclusions, resolved cap) plus the ``snapshot_ref`` it was read with,
+    keyed by ``input_ref``.
+
+Identical content is stored once, so the table grows with the number of
+distinct snapshots, not with the number of readings served.
+"""
+
+from django.db import models
+
+
+class SnapshotBlob(models.Model):
+    KIND_SCORES = "scores"
+    KIND_INPUTS = "inputs"
+
+    ref = models.CharField(max_length=96, primary_key=True)
+    kind = models.CharField(
+        max_length=16,
+        choices=[(KIND_SCORES, "EkoH score snapshot"), (KIND_INPUTS, "Reading inputs")],
+    )
+    encoding = models.CharField(max_length=32)
+    data = models.BinaryField()
+    row_count = models.IntegerField()
+    raw_size = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "smart_vote_snapshot_blob"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} {self.ref} ({len(self.data)} bytes)"
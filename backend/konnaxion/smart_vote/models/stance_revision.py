@@ -0,0 +1,29 @@
+"""The value an Ethikos stance had before one change.
+
+Recorded only while a consultation bound to the stance's topic is closed but
+not finalised (``services.stance_revisions``), so that the finaliser reads
+the stances in force at ``closes_at``.  ``value`` is ``None`` when the user
+had no stance yet.
+"""
+
+from django.db import models
+
+
+class StanceRevision(models.Model):
+    topic_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    value = models.SmallIntegerField(null=True, blank=True)
+    replaced_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "stance_revision"
+        indexes = [
+            models.Index(
+                fields=["topic_id", "replaced_at"],
+                name="idx_stance_revision_topic",
+            ),
+            models.Index(fields=["replaced_at"], name="idx_stance_revision_prune"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.topic_id}/{self.user_id} @ {self.replaced_at}"
@@ -9,15 +9,30 @@ POST body example
   "modality":      "approval",
   "raw_value":     1
 }
+
+Bulk casts (``BulkBallotSerializer``) post ``{"ballots": [<ballot>, ...]}``;
+each ballot may carry ``user_id`` when a staff kiosk casts on behalf of voters.
 """
 
 from uuid import UUID
-from decimal import Decimal
 
 from rest_framework import serializers
 
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.events import publish_votes
 from konnaxion.smart_vote.models.core import Vote, VoteModality
-from konnaxion.smart_vote.services.weight_calculator import get_weight
+from konnaxion.smart_vote.services.ballot_ingest import lock_ballots, weighted_value
+from konnaxion.smart_vote.services.consultation_weights import lookup_weight
+
+ALREADY_VOTED = "You have already voted on this target."
+
+
+def _has_voted(user, target_id) -> bool:
+    return Vote.objects.filter(
+        user=user,
+        target_type="consultation",
+        target_id=target_id,
+    ).exists()
 
 
 class BallotSerializer(serializers.Serializer):
@@ -28,26 +43,46 @@ class BallotSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         user = self.context["request"].user
-        if Vote.objects.filter(
-            user=user,
-            target_type="consultation",
-            target_id=attrs["target_id"],
-        ).exists():
-            raise serializers.ValidationError("You have already voted on this target.")
+        with ekoh_smartvote_db_scope():
+            if _has_voted(user, attrs["target_id"]):
+                raise serializers.ValidationError(ALREADY_VOTED)
         return attrs
 
     def create(self, validated_data):
         user = self.context["request"].user
-        weighted = get_weight(user.id, validated_data["consultation"])
-        return Vote.objects.create(
-            user=user,
-            target_type="consultation",
-            target_id=validated_data["target_id"],
-            modality_id=validated_data["modality"],
-            raw_value=validated_data["raw_value"],
-            weighted_value=Decimal(validated_data["raw_value"]) * weighted,
-        )
+        with ekoh_smartvote_db_scope():
+            lock_ballots([(user.id, validated_data["target_id"])])
+            # Checked again under the lock: a concurrent cast may have won.
+            if _has_voted(user, validated_data["target_id"]):
+                raise serializers.ValidationError(ALREADY_VOTED)
+            weight = lookup_weight(user.id, validated_data["consultation"]).weight
+            vote = Vote.objects.create(
+                user=user,
+                target_type="consultation",
+                target_id=validated_data["target_id"],
+                modality_id=validated_data["modality"],
+                raw_value=validated_data["raw_value"],
+                weighted_value=weighted_value(validated_data["raw_value"], weight),
+            )
+            publish_votes([vote])
+        return vote
 
     # Response body
     id = serializers.IntegerField(read_only=True)
     weighted_value = serializers.DecimalField(max_digits=12, decimal_places=4, read_only=True)
+
+
+class BulkBallotSerializer(serializers.Serializer):
+    """One ballot of a bulk cast; validation only, insertion is set-based."""
+
+    user_id = serializers.IntegerField(required=False)
+    consultation = serializers.UUIDField()
+    target_id = serializers.UUIDField()
+    modality = serializers.ChoiceField(choices=[m[0] for m in VoteModality._meta.get_field("name").choices])
+    raw_value = serializers.DecimalField(max_digits=12, decimal_places=4)
+
+    def validate_user_id(self, value):
+        user = self.context["request"].user
+        if value != user.pk and not user.is_staff:
+            raise serializers.ValidationError("Only staff may cast ballots for other users.")
+        return value
@@ -0,0 +1,158 @@
+"""Bulk ballot ingestion for kiosk and offline-sync clients.
+
+``cast_ballots`` accepts already-validated ballots and, for the whole batch,
+
+* resolves advisory weights with one set-based lookup per consultation
+  (``lookup_weights`` against the materialised ``consultation_weight``);
+* locks every ``(user, target)`` of the batch (``lock_ballots``), then
+  de-duplicates against existing ``(user, target_type, target_id)`` votes
+  with a single query, and against repeats inside the batch;
+* inserts the accepted ballots with ``bulk_create`` and publishes them on
+  the vote-event bus once committed.
+
+Every input ballot gets an outcome, in input order.
+
+``vote`` is partitioned by ``created_at`` and so cannot carry a unique
+constraint on ``(user, target)``.  Casts of the same ballot are serialised
+instead with a transaction-level advisory lock per ``(user, target)``, held
+until the vote is committed: a concurrent or retried cast waits, then finds
+the vote and reports ``already_voted``.  The single-ballot endpoint takes
+the same lock and computes ``weighted_value`` with the same helper.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Iterable, Mapping
+
+from django.db import connection
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.events import publish_votes
+from konnaxion.smart_vote.models.core import Vote
+from konnaxion.smart_vote.services.consultation_weights import lookup_weights
+from konnaxion.smart_vote.services.weight_calculator import QUANTUM
+
+LOGGER = logging.getLogger(__name__)
+
+TARGET_TYPE = "consultation"
+BULK_CREATE_BATCH_SIZE = 1_000
+
+STATUS_CREATED = "created"
+STATUS_ALREADY_VOTED = "already_voted"
+STATUS_DUPLICATE = "duplicate_in_request"
+
+# Keys are passed in ascending order, so concurrent casts cannot deadlock.
+LOCK_BALLOTS_SQL = "SELECT pg_advisory_xact_lock(key) FROM unnest(%s::bigint[]) AS key"
+
+
+def ballot_lock_key(user_id: int, target_id: Any) -> int:
+    """Advisory lock key of one ``(user, target)``, stable across processes."""
+    digest = hashlib.sha256(f"{user_id}:{target_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def lock_ballots(keys: Iterable[tuple[int, Any]]) -> None:
+    """Lock ``(user_id, target_id)`` pairs until the current transaction ends."""
+    lock_keys = sorted({ballot_lock_key(user_id, target_id) for user_id, target_id in keys})
+    if lock_keys:
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_BALLOTS_SQL, [lock_keys])
+
+
+def weighted_value(raw_value: Any, weight: Decimal) -> Decimal:
+    """``raw_value × weight`` at the 4 places of ``vote.weighted_value``, half-even."""
+    return (Decimal(raw_value) * weight).quantize(QUANTUM, rounding=ROUND_HALF_EVEN)
+
+
+@dataclass(frozen=True)
+class BallotOutcome:
+    """Result of one ballot in a bulk cast."""
+
+    index: int
+    status: str
+    vote_id: int | None = None
+    weighted_value: Decimal | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        row: dict[str, Any] = {"index": self.index, "status": self.status}
+        if self.status == STATUS_CREATED:
+            row["id"] = self.vote_id
+            row["weighted_value"] = str(self.weighted_value)
+        return row
+
+
+def cast_ballots(ballots: Iterable[tuple[int, Mapping[str, Any]]]) -> list[BallotOutcome]:
+    """Insert ``(index, ballot)`` pairs and return one outcome per ballot.
+
+    Each ballot mapping holds ``user_id``, ``consultation``, ``target_id``,
+    ``modality`` and ``raw_value``.
+    """
+    ballots = list(ballots)
+    if not ballots:
+        return []
+
+    outcomes: dict[int, BallotOutcome] = {}
+    with ekoh_smartvote_db_scope():
+        lock_ballots((ballot["user_id"], ballot["target_id"]) for _, ballot in ballots)
+        existing = set(
+            Vote.objects.filter(
+                target_type=TARGET_TYPE,
+                user_id__in={ballot["user_id"] for _, ballot in ballots},
+                target_id__in={ballot["target_id"] for _, ballot in ballots},
+            ).values_list("user_id", "target_id")
+        )
+
+        accepted: list[tuple[int, Mapping[str, Any]]] = []
+        seen: set[tuple[int, Any]] = set()
+        for index, ballot in ballots:
+            key = (ballot["user_id"], ballot["target_id"])
+            if key in existing:
+                outcomes[index] = BallotOutcome(index, STATUS_ALREADY_VOTED)
+            elif key in seen:
+                outcomes[index] = BallotOutcome(index, STATUS_DUPLICATE)
+            else:
+                seen.add(key)
+                accepted.append((index, ballot))
+
+        users_by_consultation: dict[Any, set[int]] = defaultdict(set)
+        for _, ballot in accepted:
+            users_by_consultation[ballot["consultation"]].add(ballot["user_id"])
+        weights = {
+            consultation_id: lookup_weights(user_ids, consultation_id)
+            for consultation_id, user_ids in users_by_consultation.items()
+        }
+
+        votes = [
+            Vote(
+                user_id=ballot["user_id"],
+                target_type=TARGET_TYPE,
+                target_id=ballot["target_id"],
+                modality_id=ballot["modality"],
+                raw_value=ballot["raw_value"],
+                weighted_value=weighted_value(
+                    ballot["raw_value"],
+                    weights[ballot["consultation"]][ballot["user_id"]].weight,
+                ),
+            )
+            for _, ballot in accepted
+        ]
+        Vote.objects.bulk_create(votes, batch_size=BULK_CREATE_BATCH_SIZE)
+        publish_votes(votes)
+
+    for (index, _), vote in zip(accepted, votes):
+        outcomes[index] = BallotOutcome(
+            index, STATUS_CREATED, vote_id=vote.pk, weighted_value=vote.weighted_value
+        )
+
+    LOGGER.info(
+        "Bulk cast: %s ballots, %s created, %s consultations",
+        len(ballots),
+        len(votes),
+        len(weights),
+    )
+    return [outcomes[index] for index, _ in ballots]
@@ -0,0 +1,226 @@
+"""Materialised per-consultation advisory weights (``ConsultationWeight``).
+
+* ``build_consultation_weights`` fills the table for one consultation when it
+  opens, from the users holding expertise (or a roll-up) in its relevant
+  categories;
+* ``refresh_user_weights`` keeps one user's rows current after an EkoH score
+  change, ``refresh_expertise_weights`` many users' after a bulk rescore;
+* ``invalidate_consultation_weights`` drops the "built" marker after changes
+  that affect every row, so cast falls back to the live calculator until the
+  next build;
+* ``lookup_weight``/``lookup_weights`` serve the cast paths.
+
+Weights are computed by ``get_weights_bulk`` so they are identical to the
+live calculator.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Mapping
+
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserExpertiseRollup, UserExpertiseScore
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    ConsultationWeight,
+)
+from konnaxion.smart_vote.services.weight_calculator import (
+    ONE,
+    QUANTUM,
+    ZERO,
+    AdvisoryWeight,
+    get_weights_bulk,
+)
+
+LOGGER = logging.getLogger(__name__)
+BUILD_CHUNK_SIZE = 5_000
+NEUTRAL = AdvisoryWeight(alignment=ZERO.quantize(QUANTUM), weight=ONE.quantize(QUANTUM))
+
+
+def open_consultations():
+    now = timezone.now()
+    return Consultation.objects.filter(
+        Q(opens_at__isnull=True) | Q(opens_at__lte=now),
+        Q(closes_at__isnull=True) | Q(closes_at__gt=now),
+    )
+
+
+def _store(consultation_id, weights: Dict[int, AdvisoryWeight]) -> None:
+    now = timezone.now()
+    ConsultationWeight.objects.bulk_create(
+        [
+            ConsultationWeight(
+                consultation_id=consultation_id,
+                user_id=user_id,
+                alignment=advisory.alignment,
+                weight=advisory.weight,
+                computed_at=now,
+            )
+            for user_id, advisory in weights.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["consultation", "user"],
+        update_fields=["alignment", "weight", "computed_at"],
+    )
+
+
+def build_consultation_weights(consultation_id) -> int:
+    """(Re)build every weight row of a consultation; return rows written."""
+    written = 0
+    with ekoh_smartvote_db_scope():
+        consultation = Consultation.objects.select_for_update().get(pk=consultation_id)
+        started_at = timezone.now()
+        relevant = ConsultationRelevance.objects.filter(
+            consultation_id=consultation_id
+        ).values("category_id")
+        # Relevance on a broad or narrow field reaches users through roll-ups.
+        experts = (
+            UserExpertiseScore.objects.filter(category_id__in=relevant)
+            .values_list("user_id", flat=True)
+            .union(
+                UserExpertiseRollup.objects.filter(category_id__in=relevant).values_list(
+                    "user_id", flat=True
+                )
+            )
+            .order_by("user_id")
+        )
+        user_ids = list(experts)
+        for start in range(0, len(user_ids), BUILD_CHUNK_SIZE):
+            chunk = user_ids[start : start + BUILD_CHUNK_SIZE]
+            _store(consultation_id, get_weights_bulk(chunk, consultation_id))
+            written += len(chunk)
+        # Rows of users who lost their relevant expertise fall back to 1.0.
+        ConsultationWeight.objects.filter(
+            consultation_id=consultation_id, computed_at__lt=started_at
+        ).delete()
+        consultation.weights_built_at = timezone.now()
+        consultation.save(update_fields=["weights_built_at"])
+
+    LOGGER.info("Built %s consultation weights for %s", written, consultation_id)
+    return written
+
+
+def build_pending_consultation_weights() -> int:
+    """Build weights for every open consultation that is not built yet."""
+    with ekoh_smartvote_db_scope():
+        pending = list(
+            open_consultations()
+            .filter(weights_built_at__isnull=True)
+            .values_list("pk", flat=True)
+        )
+    for consultation_id in pending:
+        build_consultation_weights(consultation_id)
+    return len(pending)
+
+
+def invalidate_consultation_weights(consultation_ids: Iterable | None = None) -> int:
+    """Mark consultations (default: all) as needing a rebuild."""
+    qs = Consultation.objects.filter(weights_built_at__isnull=False)
+    if consultation_ids is not None:
+        qs = qs.filter(pk__in=list(consultation_ids))
+    return qs.update(weights_built_at=None)
+
+
+def refresh_user_weights(user_id: int, *, category_id: int | None = None) -> int:
+    """Recompute ``user_id``'s rows in built, open consultations.
+
+    An expertise change (``category_id`` given) only affects consultations
+    declaring relevance for that category; an ethics change only affects
+    consultations where the user already has a row (alignment > 0).
+    Callers must be inside ``ekoh_smartvote_db_scope()``.
+    """
+    consultations = open_consultations().filter(weights_built_at__isnull=False)
+    if category_id is not None:
+        consultations = consultations.filter(
+            pk__in=ConsultationRelevance.objects.filter(
+                category_id=category_id
+            ).values("consultation_id")
+        )
+    else:
+        consultations = consultations.filter(weights__user_id=user_id)
+
+    refreshed = 0
+    for consultation_id in consultations.values_list("pk", flat=True).distinct():
+        _store(consultation_id, get_weights_bulk([user_id], consultation_id))
+        refreshed += 1
+    return refreshed
+
+
+def refresh_expertise_weights(categories_by_user: Mapping[int, Iterable[int]]) -> int:
+    """Recompute the rows of users whose expertise changed in some categories.
+
+    Each built, open consultation declaring relevance for a changed category
+    is refreshed once, for every user with a change in one of its categories.
+    Returns the number of consultations refreshed.  Callers must be inside
+    ``ekoh_smartvote_db_scope()``.
+    """
+    users_by_category: dict[int, set[int]] = defaultdict(set)
+    for user_id, category_ids in categories_by_user.items():
+        for category_id in category_ids:
+            users_by_category[category_id].add(user_id)
+    if not users_by_category:
+        return 0
+
+    users_by_consultation: dict[int, set[int]] = defaultdict(set)
+    for consultation_id, category_id in ConsultationRelevance.objects.filter(
+        category_id__in=list(users_by_category),
+        consultation__in=open_consultations().filter(weights_built_at__isnull=False),
+    ).values_list("consultation_id", "category_id"):
+        users_by_consultation[consultation_id] |= users_by_category[category_id]
+
+    for consultation_id, user_ids in users_by_consultation.items():
+        _store(consultation_id, get_weights_bulk(sorted(user_ids), consultation_id))
+    return len(users_by_consultation)
+
+
+def lookup_weights(user_ids: Iterable[int], consultation_id) -> Dict[int, AdvisoryWeight]:
+    """Materialised weights for ``user_ids``; live calculation when not built."""
+    user_ids = list(dict.fromkeys(user_ids))
+    with ekoh_smartvote_db_scope():
+        built = Consultation.objects.filter(
+            pk=consultation_id, weights_built_at__isnull=False
+        ).exists()
+        if not built:
+            return get_weights_bulk(user_ids, consultation_id)
+        rows = ConsultationWeight.objects.filter(
+            consultation_id=consultation_id, user_id__in=user_ids
+        ).values_list("user_id", "alignment", "weight")
+        found = {
+            user_id: AdvisoryWeight(alignment=alignment, weight=weight)
+            for user_id, alignment, weight in rows
+        }
+    return {user_id: found.get(user_id, NEUTRAL) for user_id in user_ids}
+
+
+def lookup_weight(user_id: int, consultation_id) -> AdvisoryWeight:
+    """Cast-path lookup: one indexed query against the materialised table."""
+    with ekoh_smartvote_db_scope():
+        row = (
+            Consultation.objects.filter(pk=consultation_id)
+            .annotate(
+                materialised=Subquery(
+                    ConsultationWeight.objects.filter(
+                        consultation_id=OuterRef("pk"), user_id=user_id
+                    ).values("weight")[:1]
+                ),
+                materialised_alignment=Subquery(
+                    ConsultationWeight.objects.filter(
+                        consultation_id=OuterRef("pk"), user_id=user_id
+                    ).values("alignment")[:1]
+                ),
+            )
+            .values_list("weights_built_at", "materialised", "materialised_alignment")
+            .first()
+        )
+    if row is None or row[0] is None:
+        return get_weights_bulk([user_id], consultation_id)[user_id]
+    _built_at, weight, alignment = row
+    if weight is None:
+        return NEUTRAL
+    return AdvisoryWeight(alignment=alignment, weight=weight)
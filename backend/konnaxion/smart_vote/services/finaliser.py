@@ -0,0 +1,212 @@
+"""Close-time finalisation of consultations.
+
+``finalise_due_consultations`` (beat task ``consultation_finalise``) picks the
+consultations whose ``closes_at`` passed at least
+``SMART_VOTE_AGGREGATE_SETTLE_SECONDS`` ago and that are not finalised yet,
+a scan of the partial ``idx_consultation_due`` index, and finalises each
+with ``finalise_consultation``:
+
+* everything is read in one REPEATABLE READ transaction, so the tallies and
+  readings come from the same database snapshot;
+* ballots cast up to ``closes_at`` are tallied per modality: those whose
+  target is the consultation itself (single-question consultations) by
+  count and sum, those on its options by the modality's engine
+  (``tally_engine.tally_consultation``), with the weights they were cast
+  with;
+* every bound Ethikos topic gets its baseline and all registered lenses,
+  computed once from the stances and EkoH scores in force at ``closes_at``
+  (changes made since are undone with their revisions); the inputs go to
+  the snapshot store, so the final reading can be replayed;
+* the ``ConsultationResult`` rows and ``finalised_at`` are written in that
+  same transaction.
+
+Afterwards, readings of the consultation's topics are served from the result
+rows (``reading_service.final_reading``).  Score and stance revisions older
+than the earliest ``closes_at`` still awaiting finalisation are no longer
+needed and are pruned after each run.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import Count, Min, Q, Sum
+from django.utils import timezone
+
+from konnaxion.ekoh.db import (
+    ekoh_smartvote_db_scope,
+    set_local_ekoh_smartvote_search_path,
+)
+from konnaxion.ekoh.services import score_revisions
+from konnaxion.smart_vote.models import Consultation, ConsultationResult, Vote
+from konnaxion.smart_vote.services import reading_cache, snapshot_store, stance_revisions
+from konnaxion.smart_vote.services.ballot_ingest import TARGET_TYPE
+from konnaxion.smart_vote.services.reading_lenses import registered_lenses
+from konnaxion.smart_vote.services.reading_service import (
+    SOURCE_TYPE_ETHIKOS_TOPIC,
+    _compute_readings,
+    _load_topic_inputs,
+)
+from konnaxion.smart_vote.services.tally_engine import tally_consultation
+
+LOGGER = logging.getLogger(__name__)
+SERIALIZATION_FAILURE = "40001"
+
+
+def _settle_seconds() -> int:
+    return int(getattr(settings, "SMART_VOTE_AGGREGATE_SETTLE_SECONDS", 5))
+
+
+def due_consultations(now=None):
+    """Unfinalised consultations closed at least the settle window ago."""
+    cutoff = (now or timezone.now()) - timedelta(seconds=_settle_seconds())
+    return Consultation.objects.filter(
+        finalised_at__isnull=True, closes_at__isnull=False, closes_at__lte=cutoff
+    )
+
+
+@contextmanager
+def _snapshot_scope():
+    """One transaction whose reads all see the same snapshot."""
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            # Must precede every query of the transaction.
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        set_local_ekoh_smartvote_search_path()
+        yield
+
+
+def modality_tallies(consultation_id, closes_at) -> dict[str, dict[str, Any]]:
+    """Per-modality counts and sums of the ballots cast up to ``closes_at``."""
+    rows = (
+        Vote.objects.filter(
+            target_type=TARGET_TYPE,
+            target_id=consultation_id,
+            created_at__lte=closes_at,
+        )
+        .values("modality_id")
+        .annotate(
+            vote_count=Count("pk"),
+            positive_count=Count("pk", filter=Q(raw_value__gt=0)),
+            raw_sum=Sum("raw_value"),
+            weighted_sum=Sum("weighted_value"),
+        )
+        .order_by("modality_id")
+    )
+    tallies = {}
+    for row in rows:
+        count = row["vote_count"]
+        tallies[row["modality_id"]] = {
+            "vote_count": count,
+            "positive_count": row["positive_count"],
+            "sum_raw_value": str(row["raw_sum"]),
+            "sum_weighted_value": str(row["weighted_sum"]),
+            "mean_raw_value": float(row["raw_sum"] / Decimal(count)),
+            "mean_weighted_value": float(row["weighted_sum"] / Decimal(count)),
+        }
+    return tallies
+
+
+def _topic_results(consultation: Consultation) -> list[ConsultationResult]:
+    results = []
+    lenses = registered_lenses()
+    for topic_id in reading_cache.topics_for_consultation(consultation.pk):
+        inputs = _load_topic_inputs(int(topic_id), as_of=consultation.closes_at)
+        if inputs is None:
+            continue
+        payload = _compute_readings(inputs, lenses=lenses)
+        snapshot_store.store_score_snapshot(inputs.score_rows)
+        snapshot_store.store_reading_inputs(inputs.document)
+        payload.update(final=True, closes_at=consultation.closes_at.isoformat())
+        results.append(
+            ConsultationResult(
+                consultation=consultation,
+                kind=ConsultationResult.KIND_READING,
+                source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+                source_id=str(topic_id),
+                snapshot_at=consultation.closes_at,
+                payload_json=payload,
+            )
+        )
+    return results
+
+
+def finalise_consultation(consultation_id) -> bool:
+    """Write the final results of one closed consultation.
+
+    Returns ``False`` when it is not due, already finalised, or being
+    finalised by another worker.
+    """
+    try:
+        with _snapshot_scope():
+            consultation = (
+                due_consultations()
+                .select_for_update(skip_locked=True)
+                .filter(pk=consultation_id)
+                .first()
+            )
+            if consultation is None:
+                return False
+            results = [
+                ConsultationResult(
+                    consultation=consultation,
+                    kind=ConsultationResult.KIND_TALLIES,
+                    snapshot_at=consultation.closes_at,
+                    payload_json={
+                        "closes_at": consultation.closes_at.isoformat(),
+                        "modalities": modality_tallies(
+                            consultation.pk, consultation.closes_at
+                        ),
+                        "options": tally_consultation(
+                            consultation.pk, until=consultation.closes_at
+                        ),
+                    },
+                ),
+                *_topic_results(consultation),
+            ]
+            ConsultationResult.objects.bulk_create(results)
+            consultation.finalised_at = timezone.now()
+            consultation.save(update_fields=["finalised_at"])
+    except OperationalError as exc:
+        if getattr(exc.__cause__, "sqlstate", None) != SERIALIZATION_FAILURE:
+            raise
+        # Finalised by a concurrent worker after this snapshot was taken.
+        return False
+
+    LOGGER.info(
+        "Finalised consultation %s (%s result rows)", consultation_id, len(results)
+    )
+    return True
+
+
+def prune_revisions(now=None) -> int:
+    """Drop the score and stance revisions no pending finalisation needs."""
+    horizon = now or timezone.now()
+    with ekoh_smartvote_db_scope():
+        pending = Consultation.objects.filter(
+            finalised_at__isnull=True, closes_at__isnull=False
+        ).aggregate(first=Min("closes_at"))["first"]
+        if pending is not None:
+            horizon = min(horizon, pending)
+        return score_revisions.prune_revisions(horizon) + stance_revisions.prune_revisions(
+            horizon
+        )
+
+
+def finalise_due_consultations(limit: int = 100) -> int:
+    """Finalise up to ``limit`` due consultations; return how many were."""
+    with ekoh_smartvote_db_scope():
+        due = list(
+            due_consultations().order_by("closes_at").values_list("pk", flat=True)[:limit]
+        )
+    finalised = sum(finalise_consultation(consultation_id) for consultation_id in due)
+    prune_revisions()
+    return finalised
@@ -0,0 +1,121 @@
+"""Scaled-integer (fixed-point) arithmetic for advisory weights and tallies.
+
+Every EkoH input has a known number of decimal places, so the weight formula
+
+    alignment = quantize(max(0, sum_d R[d] * S[d]))
+    weight    = quantize(1 + min(alignment, cap) * E)
+
+can run on plain integers and still round exactly like the ``Decimal`` code:
+
+=============  ======  =====================================================
+value          places  source
+=============  ======  =====================================================
+relevance R    4       ``ConsultationRelevance.weight``
+score S        6       0..1 scores (4 places), legacy 0..100 rows / 100
+ethics E       3       ``UserEthicsScore.ethical_score``
+cap            4       ``EKOH_MULTIPLIER_CAP`` (3 places) or a lens cap
+alignment, W   4       ``QUANTUM``
+stance value   4       ``Vote.raw_value`` (integers for Ethikos stances)
+=============  ======  =====================================================
+
+``R * S`` is exact at 10 places, ``min(alignment, cap) * E`` at 7; both are
+rounded half-even to 4 places, which is what ``Decimal.quantize`` does under
+the default context.  Values are converted back to ``Decimal`` only at the
+API boundary (``unscale``).
+
+``scale`` raises ``NotRepresentable`` for an input with more places than its
+slot (for example a hand-written cap of ``0.33333``); callers then fall back
+to the ``Decimal`` path, so results never depend on which path ran.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+WEIGHT_PLACES = 4
+RELEVANCE_PLACES = 4
+SCORE_PLACES = 6
+ETHICS_PLACES = 3
+VALUE_PLACES = 4
+
+ONE_WEIGHT = 10**WEIGHT_PLACES
+ONE_ETHICS = 10**ETHICS_PLACES
+
+
+class NotRepresentable(ValueError):
+    """An input has more decimal places than its fixed-point slot."""
+
+
+_POWERS = {places: Decimal(10) ** places for places in range(11)}
+
+
+def scale(value: Decimal, places: int) -> int:
+    """``value * 10**places`` as an int; it must be exact."""
+    scaled = value * _POWERS[places]
+    integral = int(scaled)
+    if integral != scaled:
+        raise NotRepresentable(f"{value} does not fit {places} decimal places.")
+    return integral
+
+
+def unscale(value: int, places: int) -> Decimal:
+    """Inverse of ``scale``: a ``Decimal`` with exponent ``-places``."""
+    return Decimal(value).scaleb(-places)
+
+
+class Scaled(dict):
+    """``scale(value, places)`` memoised for one computation.
+
+    Scores, ethics values and weights repeat heavily across a population, and
+    a dict hit is far cheaper than a ``Decimal`` conversion.
+    """
+
+    def __init__(self, places: int):
+        super().__init__()
+        self.places = places
+
+    def __missing__(self, value: Decimal) -> int:
+        result = self[value] = scale(value, self.places)
+        return result
+
+
+class Unscaled(dict):
+    """``unscale(value, places)`` memoised for one computation."""
+
+    def __init__(self, places: int):
+        super().__init__()
+        self.places = places
+
+    def __missing__(self, value: int) -> Decimal:
+        result = self[value] = unscale(value, self.places)
+        return result
+
+
+def round_half_even(value: int, drop_places: int) -> int:
+    """Drop ``drop_places`` decimal places from a scaled int, half to even."""
+    if drop_places <= 0:
+        return value * 10**-drop_places
+    step = 10**drop_places
+    quotient, remainder = divmod(value, step)
+    half = step // 2
+    if remainder > half or (remainder == half and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def clamp_relevance(weight: Decimal) -> int:
+    """Relevance clamped to 0..1, at ``RELEVANCE_PLACES``."""
+    return min(max(scale(weight, RELEVANCE_PLACES), 0), 10**RELEVANCE_PLACES)
+
+
+def alignment(dot: int) -> int:
+    """Quantized alignment from an exact ``sum R * S`` (10 places)."""
+    return round_half_even(
+        max(dot, 0), RELEVANCE_PLACES + SCORE_PLACES - WEIGHT_PLACES
+    )
+
+
+def weight(alignment_value: int, cap: int, multiplier: int) -> int:
+    """Quantized ``1 + min(alignment, cap) * multiplier`` (ethics places)."""
+    exact = ONE_WEIGHT * ONE_ETHICS + min(alignment_value, cap) * multiplier
+    return round_half_even(exact, ETHICS_PLACES)
@@ -0,0 +1,314 @@
+"""Merkle-batched vote ledger: writer and streaming verifier.
+
+``write_ledger`` hashes newly settled votes into ``vote_ledger`` in batches:
+
+* every vote becomes a leaf ``sha256(0x00 || canonical vote)``;
+* the batch's leaves form one Merkle tree (inner nodes
+  ``sha256(0x01 || left || right)``, an odd last node is carried up as is);
+* each ``vote_ledger`` row stores its leaf, ``block_height`` (the batch),
+  ``leaf_index`` and ``merkle_proof``, the concatenated sibling hashes from
+  leaf to root; whether a sibling sits left or right follows from
+  ``leaf_index`` and the batch's ``leaf_count``;
+* one ``LedgerBatch`` row per batch holds the root and
+  ``chain_hash = sha256(previous chain_hash || root)``, the only value that
+  needs anchoring.
+
+Rows are written with ``COPY``; a single writer holds the chain's
+``AggregationCheckpoint`` row, whose ``(xact_id, position)`` is the last vote
+ledgered.  As in the aggregator, votes are taken in ``(xact_id, id)`` order
+up to the oldest transaction that may still be running, so a vote committed
+late is ledgered in a later batch rather than skipped.
+
+``verify_partition`` re-validates one monthly ``vote_ledger`` partition
+through a server-side cursor, holding a single batch's state at a time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+
+from django.db import connection, transaction
+
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.models.checkpoint import (
+    SETTLED_HORIZON_SQL,
+    AggregationCheckpoint,
+)
+from konnaxion.smart_vote.models.ledger_batch import LedgerBatch
+
+LOGGER = logging.getLogger(__name__)
+
+STREAM = "vote_ledger"
+SHARD = "chain"
+HASH_SIZE = 32
+GENESIS = bytes(HASH_SIZE)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+FIELD_SEPARATOR = "\x1f"
+
+# Canonical text of a vote, independent of session settings.
+CANONICAL_VOTE_COLUMNS = """
+    {v}.id, {v}.user_id, {v}.target_type, {v}.target_id::text, {v}.modality_name,
+    {v}.raw_value::text, {v}.weighted_value::text,
+    to_char({v}.created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+"""
+
+NEXT_VOTES_SQL = """
+WITH horizon AS ({horizon})
+SELECT {columns}, v.xact_id
+FROM vote v, horizon
+WHERE (v.xact_id, v.id) > (%(last_xact_id)s, %(last_id)s)
+  AND v.xact_id < horizon.xmin
+ORDER BY v.xact_id, v.id
+LIMIT %(batch_size)s
+"""
+
+VERIFY_SQL = """
+SELECT l.block_height, l.leaf_index, l.sha256_hash, l.merkle_proof, l.vote_id,
+       {columns}
+FROM {partition} l
+LEFT JOIN vote v ON v.id = l.vote_id
+ORDER BY l.ledger_id
+"""
+
+
+# ------------------------------------------------------------------ #
+# Hashing                                                            #
+# ------------------------------------------------------------------ #
+def leaf_hash(vote_row) -> bytes:
+    """Leaf of a vote given its ``CANONICAL_VOTE_COLUMNS`` values."""
+    payload = FIELD_SEPARATOR.join(str(value) for value in vote_row).encode()
+    return hashlib.sha256(LEAF_PREFIX + payload).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def chain_hash(previous: bytes, root: bytes) -> bytes:
+    return hashlib.sha256(previous + root).digest()
+
+
+def merkle_levels(leaves: list[bytes]) -> list[list[bytes]]:
+    """All tree levels, leaves first and the one-element root level last."""
+    if not leaves:
+        raise ValueError("A Merkle tree needs at least one leaf.")
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: list[list[bytes]], index: int) -> bytes:
+    """Concatenated sibling hashes of leaf ``index``, bottom-up."""
+    siblings = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            siblings.append(level[sibling])
+        index //= 2
+    return b"".join(siblings)
+
+
+def root_from_proof(leaf: bytes, index: int, leaf_count: int, proof: bytes) -> bytes | None:
+    """Fold ``proof`` into ``leaf``; ``None`` when the proof is malformed."""
+    node, size, offset = leaf, leaf_count, 0
+    if not 0 <= index < leaf_count:
+        return None
+    while size > 1:
+        if index ^ 1 < size:
+            sibling = proof[offset : offset + HASH_SIZE]
+            if len(sibling) != HASH_SIZE:
+                return None
+            offset += HASH_SIZE
+            node = node_hash(sibling, node) if index & 1 else node_hash(node, sibling)
+        index //= 2
+        size = (size + 1) // 2
+    return node if offset == len(proof) else None
+
+
+# ------------------------------------------------------------------ #
+# Writer                                                             #
+# ------------------------------------------------------------------ #
+def _next_votes(checkpoint: AggregationCheckpoint, batch_size: int) -> list[tuple]:
+    """The next settled votes after ``checkpoint``, each ending with its ``xact_id``."""
+    sql = NEXT_VOTES_SQL.format(
+        horizon=SETTLED_HORIZON_SQL, columns=CANONICAL_VOTE_COLUMNS.format(v="v")
+    )
+    with connection.cursor() as cur:
+        cur.execute(
+            sql,
+            {
+                "last_xact_id": checkpoint.xact_id,
+                "last_id": checkpoint.position,
+                "batch_size": batch_size,
+            },
+        )
+        return cur.fetchall()
+
+
+def _write_batch(votes: list[tuple]) -> LedgerBatch:
+    leaves = [leaf_hash(vote) for vote in votes]
+    levels = merkle_levels(leaves)
+    root = levels[-1][0]
+
+    previous = LedgerBatch.objects.order_by("-height").first()
+    height = previous.height + 1 if previous else 0
+    batch = LedgerBatch.objects.create(
+        height=height,
+        merkle_root=root,
+        chain_hash=chain_hash(bytes(previous.chain_hash) if previous else GENESIS, root),
+        leaf_count=len(leaves),
+        first_vote_id=votes[0][0],
+        last_vote_id=votes[-1][0],
+    )
+
+    with connection.cursor() as cur, cur.cursor.copy(
+        "COPY vote_ledger (vote_id, sha256_hash, block_height, leaf_index, merkle_proof) "
+        "FROM STDIN"
+    ) as copy:
+        for index, (vote, leaf) in enumerate(zip(votes, leaves)):
+            copy.write_row((vote[0], leaf, height, index, merkle_proof(levels, index)))
+    return batch
+
+
+def write_ledger(batch_size: int = 10_000, max_batches: int = 100) -> int:
+    """Ledger up to ``max_batches`` batches of settled votes; return votes written.
+
+    Each batch is written in its own transaction together with its
+    ``LedgerBatch`` row and the checkpoint.  Returns 0 when another worker
+    holds the chain.
+    """
+    written = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            set_local_ekoh_smartvote_search_path()
+            AggregationCheckpoint.objects.get_or_create(stream=STREAM, shard=SHARD)
+            checkpoint = (
+                AggregationCheckpoint.objects.select_for_update(skip_locked=True)
+                .filter(stream=STREAM, shard=SHARD)
+                .first()
+            )
+            if checkpoint is None:
+                break
+            rows = _next_votes(checkpoint, batch_size)
+            if not rows:
+                break
+            votes = [row[:-1] for row in rows]
+            batch = _write_batch(votes)
+            checkpoint.xact_id = rows[-1][-1]
+            checkpoint.position = batch.last_vote_id
+            checkpoint.save(update_fields=["position", "xact_id", "updated_at"])
+
+        written += len(votes)
+        LOGGER.debug("Ledgered %s votes as batch %s", len(votes), batch.height)
+        if len(votes) < batch_size:
+            break
+
+    if written:
+        LOGGER.info("Ledgered %s votes", written)
+    return written
+
+
+# ------------------------------------------------------------------ #
+# Verifier                                                           #
+# ------------------------------------------------------------------ #
+@dataclass
+class LedgerVerification:
+    """Outcome of verifying one ``vote_ledger`` partition."""
+
+    partition: str
+    rows: int = 0
+    batches: int = 0
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+    max_errors: int = 100
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def fail(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+
+def _check_chain(batch: LedgerBatch, report: LedgerVerification) -> None:
+    if batch.height == 0:
+        previous = GENESIS
+    else:
+        previous = (
+            LedgerBatch.objects.filter(height=batch.height - 1)
+            .values_list("chain_hash", flat=True)
+            .first()
+        )
+        if previous is None:
+            report.fail(f"batch {batch.height}: previous batch is missing")
+            return
+    if chain_hash(bytes(previous), bytes(batch.merkle_root)) != bytes(batch.chain_hash):
+        report.fail(f"batch {batch.height}: chain hash mismatch")
+
+
+def verify_partition(
+    partition: str, *, chunk_size: int = 5_000, max_errors: int = 100
+) -> LedgerVerification:
+    """Stream ``partition`` and check leaves, proofs, batch sizes and the chain.
+
+    Callers must be inside ``transaction.atomic()`` with the Smart-Vote
+    search path set (the server-side cursor lives in that transaction).
+    """
+    report = LedgerVerification(partition=partition, max_errors=max_errors)
+    batch: LedgerBatch | None = None
+    height = None
+    expected_index = 0
+
+    def close_batch() -> None:
+        if batch is not None and expected_index != batch.leaf_count:
+            report.fail(
+                f"batch {batch.height}: {expected_index} of {batch.leaf_count} leaves present"
+            )
+
+    sql = VERIFY_SQL.format(
+        columns=CANONICAL_VOTE_COLUMNS.format(v="v"),
+        partition=connection.ops.quote_name(partition),
+    )
+    with connection.chunked_cursor() as cur:
+        cur.execute(sql)
+        while rows := cur.fetchmany(chunk_size):
+            for block_height, leaf_index, stored_leaf, proof, vote_id, *vote in rows:
+                report.rows += 1
+                if block_height != height:
+                    close_batch()
+                    height, expected_index = block_height, 0
+                    batch = LedgerBatch.objects.filter(height=block_height).first()
+                    if batch is None:
+                        report.fail(f"batch {block_height}: anchor record is missing")
+                    else:
+                        report.batches += 1
+                        _check_chain(batch, report)
+
+                where = f"batch {block_height} leaf {leaf_index} (vote {vote_id})"
+                if leaf_index != expected_index:
+                    report.fail(f"{where}: expected leaf {expected_index}")
+                expected_index = (leaf_index or 0) + 1
+
+                if vote[0] is None:
+                    report.fail(f"{where}: vote is missing")
+                elif leaf_hash(vote) != bytes(stored_leaf):
+                    report.fail(f"{where}: leaf does not match the vote")
+                if batch is not None and leaf_index is not None:
+                    root = root_from_proof(
+                        bytes(stored_leaf), leaf_index, batch.leaf_count, bytes(proof or b"")
+                    )
+                    if root != bytes(batch.merkle_root):
+                        report.fail(f"{where}: proof does not reach the batch root")
+        close_batch()
+
+    return report
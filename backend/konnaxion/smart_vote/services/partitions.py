@@ -0,0 +1,331 @@
+"""Monthly partition maintenance for ``vote`` and ``vote_ledger``.
+
+Both tables are range-partitioned by month on their timestamp column (see
+``smart_vote/migrations/0001_initial.py``).  This module
+
+* pre-creates the partitions for the current month and the next few months,
+  so inserts never hit a missing partition;
+* adds the per-partition indexes that are not inherited from the parent;
+* archives partitions older than the retention window as gzip-compressed
+  ``COPY`` dumps, then detaches and drops them so old months no longer cost
+  vacuum and index maintenance.
+
+A ``vote`` month is archived only once all its votes are aggregated and
+ledgered, and no remaining ``vote_ledger`` month holds one of them: votes are
+ledgered after they are cast, so a month's leaves may sit in the next ledger
+month, which expires later.  Expired ledger months are archived first, so a
+vote month goes together with, or after, the ledger months that reference
+it, and ``ledger.verify_partition`` never meets a ledger leaf whose vote was
+dropped.
+
+Indexes declared on the partitioned parents (primary keys, ``idx_vote_target``,
+``idx_ledger_vote``) are created on new partitions automatically by
+PostgreSQL.
+
+Callers must already be inside a transaction with the EkoH/Smart Vote search
+path set, except for ``archive_partition`` which manages its own.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.events import event_bus_enabled
+from konnaxion.smart_vote.models.checkpoint import AggregationCheckpoint
+from konnaxion.smart_vote.services import ledger
+
+LOGGER = logging.getLogger(__name__)
+
+# parent table -> partition key column
+PARTITIONED_TABLES = {
+    "vote": "created_at",
+    "vote_ledger": "logged_at",
+}
+AGGREGATE_STREAM = "vote_aggregate"
+# Archival order: ledger months go before the vote months they reference.
+ARCHIVE_ORDER = ("vote_ledger", "vote")
+_SUFFIX_RE = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+@dataclass(frozen=True)
+class ArchivedPartition:
+    table_name: str
+    path: Path
+    rows: int
+
+
+def months_ahead() -> int:
+    return int(getattr(settings, "SMART_VOTE_PARTITION_MONTHS_AHEAD", 3))
+
+
+def retention_months() -> int:
+    return int(getattr(settings, "SMART_VOTE_PARTITION_RETENTION_MONTHS", 24))
+
+
+def archive_dir() -> str:
+    return getattr(settings, "SMART_VOTE_PARTITION_ARCHIVE_DIR", "")
+
+
+def utc_today() -> dt.date:
+    """Today in UTC, the time zone of the partition bounds."""
+    return timezone.now().date()
+
+
+def month_start(day: dt.date) -> dt.date:
+    return day.replace(day=1)
+
+
+def add_months(month: dt.date, count: int) -> dt.date:
+    index = month.year * 12 + month.month - 1 + count
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: dt.date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str) -> dt.date | None:
+    """Month covered by partition ``name`` of ``table``, if it follows the scheme."""
+    if not name.startswith(f"{table}_"):
+        return None
+    match = _SUFFIX_RE.search(name)
+    if match is None or len(name) != len(table) + 8:
+        return None
+    return dt.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def list_partitions(table: str) -> list[str]:
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            ORDER BY child.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def brin_index_name(table: str, name: str) -> str:
+    """BRIN index on the partition key of partition ``name`` of ``table``."""
+    return f"{name}_{PARTITIONED_TABLES[table]}_brin"
+
+
+def create_partition(table: str, month: dt.date) -> str:
+    """Create (if missing) and index the partition of ``table`` for ``month``."""
+    name = partition_name(table, month)
+    qn = connection.ops.quote_name
+    column = PARTITIONED_TABLES[table]
+    with connection.cursor() as cur:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{add_months(month, 1).isoformat()}')"
+        )
+        # Time-range scans (archival, ledger verification) on a single month
+        # need only a tiny BRIN index; rows are appended in time order.
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS {qn(brin_index_name(table, name))} "
+            f"ON {qn(name)} USING brin ({qn(column)})"
+        )
+    return name
+
+
+def missing_partitions(
+    *, ahead: int | None = None, today: dt.date | None = None
+) -> list[tuple[str, dt.date]]:
+    """``(table, month)`` pairs from this month to ``ahead`` months out without a partition."""
+    ahead = months_ahead() if ahead is None else ahead
+    current = month_start(today or utc_today())
+    missing = []
+    for table in PARTITIONED_TABLES:
+        existing = set(list_partitions(table))
+        for offset in range(ahead + 1):
+            month = add_months(current, offset)
+            if partition_name(table, month) not in existing:
+                missing.append((table, month))
+    return missing
+
+
+def ensure_future_partitions(
+    *, ahead: int | None = None, today: dt.date | None = None
+) -> list[str]:
+    """Make sure every table has partitions from this month to ``ahead`` months out.
+
+    Returns the names of the partitions that had to be created.
+    """
+    created = [
+        create_partition(table, month)
+        for table, month in missing_partitions(ahead=ahead, today=today)
+    ]
+    if created:
+        LOGGER.info("Created partitions %s", ", ".join(created))
+    return created
+
+
+def expired_partitions(
+    *, retention: int | None = None, today: dt.date | None = None
+) -> list[tuple[str, str]]:
+    """``(table, partition)`` pairs whose whole month is past the retention window."""
+    retention = retention_months() if retention is None else retention
+    cutoff = add_months(month_start(today or utc_today()), -retention)
+    expired = []
+    for table in PARTITIONED_TABLES:
+        for name in list_partitions(table):
+            month = partition_month(table, name)
+            if month is not None and month < cutoff:
+                expired.append((table, name))
+    return expired
+
+
+def _votes_past(name: str, stream: str, shard: str) -> bool:
+    """True when partition ``name`` holds votes past checkpoint ``stream``/``shard``."""
+    xact_id, position = (
+        AggregationCheckpoint.objects.filter(stream=stream, shard=shard)
+        .values_list("xact_id", "position")
+        .first()
+    ) or (0, 0)
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {connection.ops.quote_name(name)} "
+            "WHERE (xact_id, id) > (%s, %s))",
+            [xact_id, position],
+        )
+        return cur.fetchone()[0]
+
+
+def _pending_ledger(name: str) -> bool:
+    """True when ``vote`` partition ``name`` holds votes not yet ledgered."""
+    return _votes_past(name, ledger.STREAM, ledger.SHARD)
+
+
+def _referenced_by_ledger(name: str) -> bool:
+    """True when a remaining ``vote_ledger`` month holds a vote of partition ``name``."""
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT EXISTS (SELECT 1 FROM vote_ledger ledger "
+            f"JOIN {connection.ops.quote_name(name)} vote ON vote.id = ledger.vote_id)"
+        )
+        return cur.fetchone()[0]
+
+
+def _pending_aggregation(name: str) -> bool:
+    """True when ``vote`` partition ``name`` holds votes not yet aggregated.
+
+    With an event bus that is any vote whose outbox row the consumer has not
+    deleted yet; otherwise any vote past the poller checkpoint.
+    """
+    if event_bus_enabled():
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT EXISTS (SELECT 1 FROM smart_vote_vote_event_outbox outbox "
+                f"JOIN {connection.ops.quote_name(name)} vote ON vote.id = outbox.vote_id)"
+            )
+            return cur.fetchone()[0]
+    return _votes_past(name, AGGREGATE_STREAM, name)
+
+
+def _archive_blocker(name: str) -> str | None:
+    """Why ``vote`` partition ``name`` cannot be archived yet, if it cannot."""
+    if _pending_aggregation(name):
+        return "votes not aggregated yet"
+    if _pending_ledger(name):
+        return "votes not ledgered yet"
+    if _referenced_by_ledger(name):
+        return "votes still referenced by a vote_ledger partition"
+    return None
+
+
+def _dump_partition(name: str, target: Path) -> int:
+    """Write ``name`` as a gzip-compressed CSV ``COPY`` dump; return its row count."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".partial")
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(name)}")
+        rows = cur.fetchone()[0]
+        with gzip.open(partial, "wb") as out, cur.cursor.copy(
+            f"COPY {connection.ops.quote_name(name)} TO STDOUT WITH (FORMAT csv, HEADER true)"
+        ) as copy:
+            for chunk in copy:
+                out.write(chunk)
+    with open(partial, "rb") as written:
+        os.fsync(written.fileno())
+    partial.replace(target)
+    return rows
+
+
+def archive_partition(table: str, name: str, directory: str | Path) -> ArchivedPartition | None:
+    """Dump, detach and drop one partition.
+
+    ``vote`` partitions holding votes not yet aggregated or ledgered, or
+    referenced by a remaining ``vote_ledger`` partition, are left in place.
+    The dump is complete and on disk before the partition is detached.
+    """
+    with transaction.atomic():
+        set_local_ekoh_smartvote_search_path()
+        if table == "vote":
+            blocker = _archive_blocker(name)
+            if blocker is not None:
+                LOGGER.warning("Not archiving %s: %s", name, blocker)
+                return None
+        target = Path(directory) / f"{name}.csv.gz"
+        rows = _dump_partition(name, target)
+
+    qn = connection.ops.quote_name
+    with transaction.atomic():
+        set_local_ekoh_smartvote_search_path()
+        with connection.cursor() as cur:
+            cur.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+            cur.execute(f"DROP TABLE {qn(name)}")
+        if table == "vote":
+            AggregationCheckpoint.objects.filter(
+                stream=AGGREGATE_STREAM, shard=name
+            ).delete()
+
+    LOGGER.info("Archived %s (%s rows) to %s", name, rows, target)
+    return ArchivedPartition(table_name=name, path=target, rows=rows)
+
+
+def archive_expired_partitions(
+    *,
+    retention: int | None = None,
+    directory: str | Path | None = None,
+    today: dt.date | None = None,
+) -> list[ArchivedPartition]:
+    """Archive every partition past the retention window.
+
+    Nothing is detached when no archive directory is configured: dropping
+    months without a dump would lose ballots.
+    """
+    directory = archive_dir() if directory is None else directory
+    with transaction.atomic():
+        set_local_ekoh_smartvote_search_path()
+        expired = expired_partitions(retention=retention, today=today)
+    if expired and not directory:
+        LOGGER.warning(
+            "%s partition(s) past retention but SMART_VOTE_PARTITION_ARCHIVE_DIR "
+            "is not set; nothing archived",
+            len(expired),
+        )
+        return []
+
+    archived = []
+    for table, name in sorted(expired, key=lambda item: ARCHIVE_ORDER.index(item[0])):
+        result = archive_partition(table, name, directory)
+        if result is not None:
+            archived.append(result)
+    return archived
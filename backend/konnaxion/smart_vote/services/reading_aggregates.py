@@ -0,0 +1,358 @@
+"""Incrementally maintained aggregates for Ethikos topic readings.
+
+Every stance write adjusts the topic's ``TopicReadingAggregate`` by the
+difference between the stance's previous and new contribution, inside the
+stance write's transaction (see ``konnaxion.smart_vote.signals``).  The
+aggregate portion of a reading is then an O(1) lookup; participant detail is
+only computed when requested.
+
+Inputs that change every contribution at once (relevance vector, binding lens
+configuration, EkoH score configuration) mark the aggregate stale; it is
+rebuilt on next use.  The
+``reconcile_reading_aggregates`` command rebuilds aggregates from scratch and
+reports drift.
+"""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Any
+
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ethikos.models import EthikosStance
+from konnaxion.smart_vote.models import SourceConsultationBinding
+from konnaxion.smart_vote.models.reading_aggregate import (
+    TopicReadingAggregate,
+    TopicReadingContribution,
+)
+from konnaxion.smart_vote.services.reading_lenses import get_lens
+from konnaxion.smart_vote.services.reading_service import (
+    READING_KEY,
+    SOURCE_TYPE_ETHIKOS_TOPIC,
+    _declared_lens,
+    _normalise_advisory_exclusions,
+    _relevance_rows,
+    _stance_bucket,
+    _without_participants,
+    final_reading,
+)
+from konnaxion.smart_vote.services.weight_calculator import get_weights_bulk
+
+LOGGER = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+
+AGGREGATE_FIELDS = (
+    "participant_count",
+    "value_sum",
+    "support_count",
+    "neutral_count",
+    "oppose_count",
+    "advisory_participant_count",
+    "covered_participant_count",
+    "weighted_sum",
+    "total_weight",
+    "support_weight",
+    "neutral_weight",
+    "oppose_weight",
+    "alignment_sum",
+)
+
+
+def _binding_for_topic(topic_id) -> SourceConsultationBinding | None:
+    return (
+        SourceConsultationBinding.objects.select_related("consultation")
+        .filter(source_type=SOURCE_TYPE_ETHIKOS_TOPIC, source_id=str(topic_id))
+        .first()
+    )
+
+
+def _apply_contribution(
+    totals: dict[str, Any],
+    *,
+    value: int,
+    alignment: Decimal,
+    weight: Decimal,
+    included: bool,
+    sign: int,
+) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) one stance's contribution."""
+    value_dec = Decimal(value)
+    bucket = _stance_bucket(value_dec)
+    totals["participant_count"] += sign
+    totals["value_sum"] += sign * value_dec
+    totals[f"{bucket}_count"] += sign
+    if not included:
+        return
+    totals["advisory_participant_count"] += sign
+    if alignment > 0:
+        totals["covered_participant_count"] += sign
+    totals["weighted_sum"] += sign * value_dec * weight
+    totals["total_weight"] += sign * weight
+    totals[f"{bucket}_weight"] += sign * weight
+    totals["alignment_sum"] += sign * alignment
+
+
+def _empty_totals() -> dict[str, Any]:
+    return {
+        field: ZERO if field.endswith(("_sum", "_weight")) else 0
+        for field in AGGREGATE_FIELDS
+    }
+
+
+def _contributions_for(
+    binding: SourceConsultationBinding,
+    stance_values: dict[int, int],
+) -> list[TopicReadingContribution]:
+    excluded = {
+        row["user_id"] for row in _normalise_advisory_exclusions(binding)
+    }
+    weights = get_weights_bulk(list(stance_values), binding.consultation_id)
+    rows = []
+    for user_id, value in stance_values.items():
+        included = user_id not in excluded
+        rows.append(
+            TopicReadingContribution(
+                source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+                source_id=binding.source_id,
+                user_id=user_id,
+                stance_value=value,
+                alignment=weights[user_id].alignment,
+                weight=weights[user_id].weight if included else ZERO,
+                included_in_advisory=included,
+            )
+        )
+    return rows
+
+
+def compute_topic_totals(
+    binding: SourceConsultationBinding,
+) -> tuple[dict[str, Any], list[TopicReadingContribution]]:
+    """Compute aggregate totals and contributions from scratch."""
+    stance_values = dict(
+        EthikosStance.objects.filter(topic_id=binding.source_id)
+        .order_by("user_id")
+        .values_list("user_id", "value")
+    )
+    contributions = _contributions_for(binding, stance_values)
+    totals = _empty_totals()
+    for row in contributions:
+        _apply_contribution(
+            totals,
+            value=row.stance_value,
+            alignment=row.alignment,
+            weight=row.weight,
+            included=row.included_in_advisory,
+            sign=1,
+        )
+    return totals, contributions
+
+
+def store_topic_totals(
+    aggregate: TopicReadingAggregate,
+    totals: dict[str, Any],
+    contributions: list[TopicReadingContribution],
+) -> TopicReadingAggregate:
+    """Replace an aggregate's totals and contributions with rebuilt values."""
+    TopicReadingContribution.objects.filter(
+        source_type=aggregate.source_type,
+        source_id=aggregate.source_id,
+    ).delete()
+    TopicReadingContribution.objects.bulk_create(contributions, batch_size=5_000)
+    for field in AGGREGATE_FIELDS:
+        setattr(aggregate, field, totals[field])
+    aggregate.stale = False
+    aggregate.save()
+    return aggregate
+
+
+def _rebuild(
+    aggregate: TopicReadingAggregate,
+    binding: SourceConsultationBinding,
+) -> TopicReadingAggregate:
+    totals, contributions = compute_topic_totals(binding)
+    return store_topic_totals(aggregate, totals, contributions)
+
+
+def rebuild_topic_aggregate(topic_id) -> TopicReadingAggregate | None:
+    """Rebuild one topic's aggregate and contributions from its stances."""
+    with ekoh_smartvote_db_scope():
+        binding = _binding_for_topic(topic_id)
+        if binding is None:
+            return None
+        aggregate, _created = TopicReadingAggregate.objects.select_for_update().get_or_create(
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+            source_id=str(topic_id),
+        )
+        return _rebuild(aggregate, binding)
+
+
+def apply_stance_change(topic_id, user_id: int, value: int | None) -> None:
+    """Move one stance's contribution from its previous to its new value.
+
+    ``value=None`` removes the stance.  Must run in the stance write's
+    transaction so the aggregate never disagrees with committed stances.
+    """
+    with ekoh_smartvote_db_scope():
+        binding = _binding_for_topic(topic_id)
+        if binding is None:
+            return
+
+        aggregate, created = TopicReadingAggregate.objects.select_for_update().get_or_create(
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+            source_id=str(topic_id),
+        )
+        if created or aggregate.stale:
+            # The stance row is already written, so a rebuild includes it.
+            _rebuild(aggregate, binding)
+            return
+
+        totals = {field: getattr(aggregate, field) for field in AGGREGATE_FIELDS}
+        previous = (
+            TopicReadingContribution.objects.select_for_update()
+            .filter(
+                source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+                source_id=str(topic_id),
+                user_id=user_id,
+            )
+            .first()
+        )
+        if previous is not None:
+            _apply_contribution(
+                totals,
+                value=previous.stance_value,
+                alignment=previous.alignment,
+                weight=previous.weight,
+                included=previous.included_in_advisory,
+                sign=-1,
+            )
+            previous.delete()
+
+        if value is not None:
+            (contribution,) = _contributions_for(binding, {user_id: value})
+            contribution.save()
+            _apply_contribution(
+                totals,
+                value=contribution.stance_value,
+                alignment=contribution.alignment,
+                weight=contribution.weight,
+                included=contribution.included_in_advisory,
+                sign=1,
+            )
+
+        for field, total in totals.items():
+            setattr(aggregate, field, total)
+        aggregate.save()
+
+
+def refresh_user_contributions(user_id: int, topic_ids) -> None:
+    """Re-weight ``user_id``'s stance in ``topic_ids`` after an EkoH score change."""
+    current = dict(
+        EthikosStance.objects.filter(user_id=user_id, topic_id__in=list(topic_ids))
+        .values_list("topic_id", "value")
+    )
+    for topic_id, value in current.items():
+        apply_stance_change(topic_id, user_id, value)
+
+
+def mark_stale(source_ids=None) -> int:
+    """Mark the aggregates of ``source_ids`` (default: all) for rebuild."""
+    aggregates = TopicReadingAggregate.objects.filter(source_type=SOURCE_TYPE_ETHIKOS_TOPIC)
+    if source_ids is not None:
+        aggregates = aggregates.filter(
+            source_id__in=[str(source_id) for source_id in source_ids]
+        )
+    return aggregates.update(stale=True)
+
+
+def build_ethikos_topic_reading_summary(topic_id: int) -> dict[str, Any] | None:
+    """Return the reading without participant detail, from the running aggregate.
+
+    The shape matches ``build_ethikos_topic_reading`` minus ``participants``.
+    ``snapshot_ref`` is ``None`` because deriving it requires every
+    participant's score snapshot.  Finalised topics return their final
+    reading instead.
+    """
+    with ekoh_smartvote_db_scope():
+        final = final_reading(topic_id, [get_lens(READING_KEY)])
+        if final is not None:
+            return _without_participants(final)
+        binding = _binding_for_topic(topic_id)
+        if binding is None:
+            return None
+        aggregate = TopicReadingAggregate.objects.filter(
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC, source_id=str(topic_id)
+        ).first()
+        if aggregate is None or aggregate.stale:
+            aggregate = rebuild_topic_aggregate(topic_id)
+
+        relevance_payload, lens_hash = _declared_lens(
+            topic_id,
+            _relevance_rows(binding.consultation),
+            _normalise_advisory_exclusions(binding),
+        )
+
+    count = aggregate.participant_count
+    advisory_count = aggregate.advisory_participant_count
+    total_weight = aggregate.total_weight
+    baseline_score = aggregate.value_sum / Decimal(count) if count else ZERO
+    computed_at = timezone.now().isoformat()
+
+    def share(part, whole) -> float:
+        return float(part / whole) if whole else 0.0
+
+    return {
+        "target_type": SOURCE_TYPE_ETHIKOS_TOPIC,
+        "target_id": str(topic_id),
+        "smart_vote_consultation_id": str(binding.consultation_id),
+        "baseline": {
+            "reading_key": "baseline",
+            "lens_hash": None,
+            "snapshot_ref": None,
+            "computed_at": computed_at,
+            "results_payload": {
+                "score": float(baseline_score),
+                "participant_count": count,
+                "support_count": aggregate.support_count,
+                "neutral_count": aggregate.neutral_count,
+                "oppose_count": aggregate.oppose_count,
+                "support_share": aggregate.support_count / count if count else 0.0,
+                "neutral_share": aggregate.neutral_count / count if count else 0.0,
+                "oppose_share": aggregate.oppose_count / count if count else 0.0,
+            },
+        },
+        "readings": [
+            {
+                "reading_key": READING_KEY,
+                "lens_hash": lens_hash,
+                "snapshot_ref": None,
+                "computed_at": computed_at,
+                "results_payload": {
+                    "score": float(
+                        aggregate.weighted_sum / total_weight
+                        if total_weight > 0
+                        else baseline_score
+                    ),
+                    "participant_count": count,
+                    "advisory_participant_count": advisory_count,
+                    "excluded_participant_count": count - advisory_count,
+                    "total_advisory_weight": float(total_weight),
+                    "average_expertise_alignment": share(
+                        aggregate.alignment_sum, Decimal(advisory_count)
+                    ),
+                    "expertise_coverage": share(
+                        Decimal(aggregate.covered_participant_count),
+                        Decimal(advisory_count),
+                    ),
+                    "domains": relevance_payload,
+                    "participants_included": False,
+                    "support_share": share(aggregate.support_weight, total_weight),
+                    "neutral_share": share(aggregate.neutral_weight, total_weight),
+                    "oppose_share": share(aggregate.oppose_weight, total_weight),
+                },
+            }
+        ],
+    }
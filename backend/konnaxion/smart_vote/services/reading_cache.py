@@ -0,0 +1,325 @@
+"""Materialized reading cache keyed by source, lens hash and score snapshot.
+
+Readings are served from ``ReadingSnapshot`` until one of their inputs
+changes.  Invalidation is driven by ``konnaxion.smart_vote.signals`` and is
+deliberately narrow: only sources whose stances, score snapshot, relevance
+vector or binding configuration actually changed are marked stale.
+
+Every invalidation also bumps the source's ``ReadingGeneration``, whether or
+not a reading is stored yet, before marking the stored readings.  A reader
+captures the generation (``source_generation``) before computing and passes
+it to ``store_reading``, which share-locks the generation rows and stores
+nothing if they moved.  A change committed while the reading was computed
+is therefore caught, and one still in flight either waits for the store to
+commit, then marks the new row stale, or makes the store wait, then skip.
+
+Callers must already be inside ``ekoh_smartvote_db_scope()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from konnaxion.ethikos.models import EthikosStance
+from konnaxion.smart_vote.models import (
+    ConsultationRelevance,
+    ReadingSnapshot,
+    SourceConsultationBinding,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+SOURCE_TYPE_ETHIKOS_TOPIC = "ethikos_topic"
+# ``ReadingGeneration.source_id`` of invalidations covering every source.
+ALL_SOURCES = "*"
+
+BUMP_GENERATIONS_SQL = """
+INSERT INTO smart_vote_reading_generation AS current (source_type, source_id, generation)
+SELECT %(source_type)s, source_id, 1
+FROM unnest(%(source_ids)s::varchar[]) AS source_id
+ORDER BY source_id
+ON CONFLICT (source_type, source_id) DO UPDATE
+SET generation = current.generation + 1
+"""
+
+GENERATION_SQL = """
+SELECT COALESCE(SUM(generation), 0)::bigint
+FROM smart_vote_reading_generation
+WHERE source_type = %(source_type)s AND source_id = ANY(%(source_ids)s)
+"""
+
+ENSURE_GENERATIONS_SQL = """
+INSERT INTO smart_vote_reading_generation (source_type, source_id, generation)
+SELECT %(source_type)s, source_id, 0
+FROM unnest(%(source_ids)s::varchar[]) AS source_id
+ORDER BY source_id
+ON CONFLICT (source_type, source_id) DO NOTHING
+"""
+
+# Waits for uncommitted invalidations and blocks new ones until commit.
+LOCK_GENERATION_SQL = """
+SELECT COALESCE(SUM(generation), 0)::bigint
+FROM (
+    SELECT generation
+    FROM smart_vote_reading_generation
+    WHERE source_type = %(source_type)s AND source_id = ANY(%(source_ids)s)
+    ORDER BY source_id
+    FOR SHARE
+) AS locked
+"""
+
+
+def reading_cache_enabled() -> bool:
+    return getattr(settings, "SMART_VOTE_READING_CACHE_ENABLED", True)
+
+
+def _reading_keys(payload: dict[str, Any]) -> list[str]:
+    return [reading["reading_key"] for reading in payload["readings"]]
+
+
+def lens_set_hash(lens_hashes: list[str]) -> str:
+    """Cache key of a lens set; a single lens keeps its own hash."""
+    if len(lens_hashes) == 1:
+        return lens_hashes[0]
+    return "sha256:" + hashlib.sha256("\n".join(lens_hashes).encode()).hexdigest()
+
+
+def _lens_set_hash(payload: dict[str, Any]) -> str:
+    return lens_set_hash([reading["lens_hash"] for reading in payload["readings"]])
+
+
+def get_cached_reading(
+    source_type: str, source_id, *, reading_keys: list[str] | None = None
+) -> dict[str, Any] | None:
+    """Return the current materialized payload for a source, if any.
+
+    With ``reading_keys``, only a payload publishing exactly those lenses,
+    in that order, is returned.
+    """
+    rows = (
+        ReadingSnapshot.objects.filter(
+            source_type=source_type,
+            source_id=str(source_id),
+            invalidated_at__isnull=True,
+        )
+        .order_by("-computed_at")
+        .values_list("payload_json", flat=True)
+    )
+    for payload in rows.iterator():
+        if reading_keys is None or _reading_keys(payload) == reading_keys:
+            return payload
+    return None
+
+
+def current_version(
+    source_type: str, source_id, lens_set: str
+) -> tuple[str, datetime] | None:
+    """``(snapshot_ref, computed_at)`` of the current reading for a lens set.
+
+    Reads two columns only, for conditional requests that must not load or
+    recompute the payload.
+    """
+    return (
+        ReadingSnapshot.objects.filter(
+            source_type=source_type,
+            source_id=str(source_id),
+            lens_hash=lens_set,
+            invalidated_at__isnull=True,
+        )
+        .order_by("-computed_at")
+        .values_list("snapshot_ref", "computed_at")
+        .first()
+    )
+
+
+def _generation_params(source_type: str, source_id) -> dict[str, Any]:
+    return {"source_type": source_type, "source_ids": [ALL_SOURCES, str(source_id)]}
+
+
+def source_generation(source_type: str, source_id) -> int:
+    """Invalidation count of a source; read it before computing its reading."""
+    with connection.cursor() as cursor:
+        cursor.execute(GENERATION_SQL, _generation_params(source_type, source_id))
+        return cursor.fetchone()[0]
+
+
+def store_reading(
+    source_type: str,
+    source_id,
+    payload: dict[str, Any],
+    *,
+    started_at: datetime,
+    generation: int,
+) -> bool:
+    """Persist ``payload`` as the current reading for a source.
+
+    ``started_at`` is when the computation began and ``generation`` the
+    ``source_generation`` read before it.  If the source was invalidated
+    since, the payload may already be stale: it is not stored and the next
+    request recomputes.  Returns whether it was stored.
+    """
+    source_id = str(source_id)
+    params = _generation_params(source_type, source_id)
+    with connection.cursor() as cursor:
+        cursor.execute(ENSURE_GENERATIONS_SQL, params)
+        cursor.execute(LOCK_GENERATION_SQL, params)
+        current = cursor.fetchone()[0]
+    if current != generation:
+        LOGGER.debug("Skip storing stale reading %s:%s", source_type, source_id)
+        return False
+
+    reading = payload["readings"][0]
+    ReadingSnapshot.objects.filter(
+        source_type=source_type,
+        source_id=source_id,
+        invalidated_at__isnull=False,
+    ).delete()
+    ReadingSnapshot.objects.update_or_create(
+        source_type=source_type,
+        source_id=source_id,
+        lens_hash=_lens_set_hash(payload),
+        snapshot_ref=reading["snapshot_ref"],
+        defaults={
+            "payload_json": payload,
+            "computed_at": started_at,
+            "invalidated_at": None,
+        },
+    )
+    return True
+
+
+def invalidate_sources(source_type: str, source_ids: Iterable | None) -> int:
+    """Mark every current reading of ``source_ids`` (``None``: all) as stale.
+
+    Bumps the sources' generations first, so readings being computed are not
+    stored either.
+    """
+    readings = ReadingSnapshot.objects.filter(
+        source_type=source_type, invalidated_at__isnull=True
+    )
+    if source_ids is None:
+        bumped = [ALL_SOURCES]
+    else:
+        source_ids = {str(source_id) for source_id in source_ids}
+        if not source_ids:
+            return 0
+        bumped = sorted(source_ids)
+        readings = readings.filter(source_id__in=source_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            BUMP_GENERATIONS_SQL, {"source_type": source_type, "source_ids": bumped}
+        )
+    return readings.update(invalidated_at=timezone.now())
+
+
+def invalidate_topic(topic_id) -> int:
+    return invalidate_sources(SOURCE_TYPE_ETHIKOS_TOPIC, [topic_id])
+
+
+def topics_for_consultation(consultation_id) -> list[str]:
+    return list(
+        SourceConsultationBinding.objects.filter(
+            consultation_id=consultation_id,
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+        ).values_list("source_id", flat=True)
+    )
+
+
+def invalidate_consultation(consultation_id) -> int:
+    """Invalidate the source bound to a consultation (relevance changes)."""
+    return invalidate_sources(
+        SOURCE_TYPE_ETHIKOS_TOPIC, topics_for_consultation(consultation_id)
+    )
+
+
+def topics_affected_by_user_scores(
+    user_id: int, *, category_id: int | None = None
+) -> list[str]:
+    """Return topic ids whose reading depends on ``user_id``'s EkoH scores.
+
+    When ``category_id`` is given (an expertise change) only topics whose
+    consultation declares relevance for that category are affected; ethics
+    changes pass ``None`` and affect every topic the user took a stance on.
+    """
+    topic_ids = [
+        str(topic_id)
+        for topic_id in EthikosStance.objects.filter(user_id=user_id).values_list(
+            "topic_id", flat=True
+        )
+    ]
+    if not topic_ids or category_id is None:
+        return topic_ids
+
+    relevant_consultations = ConsultationRelevance.objects.filter(
+        category_id=category_id
+    ).values("consultation_id")
+    return list(
+        SourceConsultationBinding.objects.filter(
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+            source_id__in=topic_ids,
+            consultation_id__in=relevant_consultations,
+        ).values_list("source_id", flat=True)
+    )
+
+
+def topics_affected_by_expertise(
+    categories_by_user: Mapping[int, Iterable[int]],
+) -> dict[int, list[str]]:
+    """Batch form of ``topics_affected_by_user_scores`` for expertise changes.
+
+    Returns, per user, the topics they took a stance on whose consultation
+    declares relevance for one of the user's changed categories.  Runs three
+    queries whatever the number of users.
+    """
+    topics_by_user: dict[int, list[str]] = defaultdict(list)
+    for user_id, topic_id in EthikosStance.objects.filter(
+        user_id__in=list(categories_by_user)
+    ).values_list("user_id", "topic_id"):
+        topics_by_user[user_id].append(str(topic_id))
+    if not topics_by_user:
+        return {}
+
+    consultation_by_topic = dict(
+        SourceConsultationBinding.objects.filter(
+            source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+            source_id__in={topic for topics in topics_by_user.values() for topic in topics},
+        ).values_list("source_id", "consultation_id")
+    )
+    categories_by_consultation: dict[Any, set[int]] = defaultdict(set)
+    for consultation_id, category_id in ConsultationRelevance.objects.filter(
+        consultation_id__in=set(consultation_by_topic.values()),
+        category_id__in={
+            category_id
+            for category_ids in categories_by_user.values()
+            for category_id in category_ids
+        },
+    ).values_list("consultation_id", "category_id"):
+        categories_by_consultation[consultation_id].add(category_id)
+
+    affected: dict[int, list[str]] = {}
+    for user_id, topic_ids in topics_by_user.items():
+        changed = set(categories_by_user[user_id])
+        topics = [
+            topic_id
+            for topic_id in topic_ids
+            if changed & categories_by_consultation[consultation_by_topic.get(topic_id)]
+        ]
+        if topics:
+            affected[user_id] = topics
+    return affected
+
+
+def invalidate_user_scores(user_id: int, *, category_id: int | None = None) -> int:
+    """Invalidate topics where ``user_id``'s scores feed the reading."""
+    return invalidate_sources(
+        SOURCE_TYPE_ETHIKOS_TOPIC,
+        topics_affected_by_user_scores(user_id, category_id=category_id),
+    )
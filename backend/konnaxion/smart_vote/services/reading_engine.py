@@ -0,0 +1,473 @@
+"""Reading engines: per-participant advisory weights and reading totals.
+
+Three interchangeable engines compute the same declared readings, one set of
+totals per lens from a single pass over the participants:
+
+``decimal``
+    Exact ``Decimal`` arithmetic, one participant at a time.  This is the
+    reference implementation.
+
+``fixed``
+    The same formula on scaled integers (see ``fixed_point``), converted back
+    to ``Decimal`` once per total.  Results are identical to the Decimal
+    engine, value for value; inputs that do not fit the fixed-point slots
+    are handed to it instead.  This is the default for ordinary topics.
+
+``numpy``
+    Loads stance values, the relevance vector, the expertise matrix and the
+    ethics vector into arrays and computes the dot-product alignment, capped
+    bonus, ethics multiplier, weights and bucket sums in vectorised form.
+    Alignment and weight are rounded to the same 4 decimals as the Decimal
+    path, so results agree to that quantisation.  The rounding relies on the
+    fixed-point places of the inputs; inputs with more places are handed to
+    the Decimal engine.
+
+NumPy is optional.  When installed, it is used by default once a topic has
+at least ``SMART_VOTE_ARRAY_ENGINE_THRESHOLD`` participants; callers may also
+request an engine explicitly.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Mapping, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from konnaxion.smart_vote.services import fixed_point
+from konnaxion.smart_vote.services.weight_calculator import ONE, QUANTUM, ZERO
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+ENGINE_DECIMAL = "decimal"
+ENGINE_FIXED = "fixed"
+ENGINE_NUMPY = "numpy"
+ENGINES = (ENGINE_DECIMAL, ENGINE_FIXED, ENGINE_NUMPY)
+DEFAULT_ARRAY_ENGINE_THRESHOLD = 5_000
+
+
+@dataclass(frozen=True)
+class LensWeights:
+    """Weight parameters of one lens, resolved against a consultation."""
+
+    key: str
+    category_ids: tuple[int, ...]
+    cap: Decimal
+    use_ethics: bool = True
+
+
+@dataclass
+class ReadingTotals:
+    """Per-participant weights plus the sums a declared reading needs.
+
+    ``alignments``/``weights`` follow the order of the input participants.
+    Excluded participants carry weight 0 and do not enter the sums.
+    """
+
+    alignments: Sequence[Any]
+    weights: Sequence[Any]
+    weighted_sum: Any = ZERO
+    total_weight: Any = ZERO
+    alignment_sum: Any = ZERO
+    covered_participants: int = 0
+    advisory_participant_count: int = 0
+    bucket_weights: dict[str, Any] = field(
+        default_factory=lambda: {"support": ZERO, "neutral": ZERO, "oppose": ZERO}
+    )
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def array_engine_threshold() -> int:
+    return int(
+        getattr(
+            settings,
+            "SMART_VOTE_ARRAY_ENGINE_THRESHOLD",
+            DEFAULT_ARRAY_ENGINE_THRESHOLD,
+        )
+    )
+
+
+def select_engine(requested: str | None, participant_count: int) -> str:
+    """Resolve the engine for one reading.
+
+    ``None`` picks NumPy when it is installed and the topic reaches the
+    configured participant threshold, and fixed-point otherwise.
+    """
+    if requested is None:
+        if numpy_available() and participant_count >= array_engine_threshold():
+            return ENGINE_NUMPY
+        return ENGINE_FIXED
+    if requested not in ENGINES:
+        raise ValueError(f"Unknown reading engine {requested!r}; expected one of {ENGINES}.")
+    if requested == ENGINE_NUMPY and not numpy_available():
+        raise ImproperlyConfigured("The numpy reading engine requires NumPy to be installed.")
+    return requested
+
+
+def _quantize(values, exact_places: int):
+    """Round ``values`` to 4 decimals, half-even, like ``Decimal.quantize``.
+
+    The inputs are exact decimals with at most ``exact_places`` places that
+    picked up binary floating-point noise.  Snapping to that integer grid
+    first makes ties (``...5`` at the fifth place) round the same way the
+    Decimal path does instead of depending on the float representation.
+    """
+    exact = np.rint(values * 10.0**exact_places).astype(np.int64)
+    step = 10 ** (exact_places - 4)
+    quotient, remainder = np.divmod(exact, step)
+    half = step // 2
+    quotient += (remainder > half) | ((remainder == half) & (quotient % 2 == 1))
+    return quotient / 1e4
+
+
+def _bucket(value) -> str:
+    if value > 0:
+        return "support"
+    if value < 0:
+        return "oppose"
+    return "neutral"
+
+
+def _accumulate(
+    totals: ReadingTotals, value: Decimal, alignment: Decimal, weight: Decimal
+) -> None:
+    totals.weighted_sum += value * weight
+    totals.total_weight += weight
+    totals.alignment_sum += alignment
+    totals.advisory_participant_count += 1
+    if alignment > 0:
+        totals.covered_participants += 1
+    totals.bucket_weights[_bucket(value)] += weight
+
+
+def compute_totals_decimal(
+    *,
+    user_ids: Sequence[int],
+    values: Sequence[Decimal],
+    relevance: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    excluded_user_ids: set[int],
+    lenses: Sequence[LensWeights],
+) -> dict[str, ReadingTotals]:
+    """Reference engine: exact Decimal arithmetic, every lens in one pass.
+
+    Per lens this is the same computation as ``get_weights_bulk`` restricted
+    to the lens' domains, cap and ethics setting.
+    """
+    relevance = {cid: max(ZERO, min(ONE, weight)) for cid, weight in relevance.items()}
+    results = {lens.key: ReadingTotals(alignments=[], weights=[]) for lens in lenses}
+    for user_id, value in zip(user_ids, values):
+        expertise = expertise_by_user.get(user_id, {})
+        ethics = max(ZERO, ethics_by_user.get(user_id, ONE))
+        excluded = user_id in excluded_user_ids
+        for lens in lenses:
+            totals = results[lens.key]
+            dot = sum(
+                relevance[category_id] * expertise.get(category_id, ZERO)
+                for category_id in lens.category_ids
+            )
+            alignment = max(ZERO, Decimal(dot)).quantize(QUANTUM)
+            multiplier = ethics if lens.use_ethics else ONE
+            weight = (
+                ZERO
+                if excluded
+                else (ONE + min(alignment, lens.cap) * multiplier).quantize(QUANTUM)
+            )
+            totals.alignments.append(alignment)
+            totals.weights.append(weight)
+            if not excluded:
+                _accumulate(totals, value, alignment, weight)
+    return results
+
+
+def compute_totals_fixed(
+    *,
+    user_ids: Sequence[int],
+    values: Sequence[Decimal],
+    relevance: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    excluded_user_ids: set[int],
+    lenses: Sequence[LensWeights],
+) -> dict[str, ReadingTotals]:
+    """Fixed-point engine: ``compute_totals_decimal`` on scaled integers.
+
+    Every input is scaled once; per-lens dot products, weights and sums are
+    int arithmetic, and the totals are unscaled to ``Decimal`` at the end.
+    Falls back to the Decimal engine when an input has more decimal places
+    than its fixed-point slot.
+    """
+    try:
+        return _compute_totals_fixed(
+            user_ids=user_ids,
+            values=values,
+            relevance=relevance,
+            expertise_by_user=expertise_by_user,
+            ethics_by_user=ethics_by_user,
+            excluded_user_ids=excluded_user_ids,
+            lenses=lenses,
+        )
+    except fixed_point.NotRepresentable:
+        return compute_totals_decimal(
+            user_ids=user_ids,
+            values=values,
+            relevance=relevance,
+            expertise_by_user=expertise_by_user,
+            ethics_by_user=ethics_by_user,
+            excluded_user_ids=excluded_user_ids,
+            lenses=lenses,
+        )
+
+
+class _FixedLens:
+    """Scaled parameters and running integer sums of one lens."""
+
+    __slots__ = (
+        "terms",
+        "cap",
+        "use_ethics",
+        "alignments",
+        "weights",
+        "weighted_sum",
+        "total_weight",
+        "alignment_sum",
+        "covered",
+        "buckets",
+    )
+
+    def __init__(self, lens: LensWeights, relevance: Mapping[int, int]):
+        self.terms = [(cid, relevance[cid]) for cid in lens.category_ids]
+        self.cap = fixed_point.scale(lens.cap, fixed_point.WEIGHT_PLACES)
+        self.use_ethics = lens.use_ethics
+        self.alignments: list[int] = []
+        self.weights: list[int] = []
+        self.weighted_sum = self.total_weight = self.alignment_sum = 0
+        self.covered = 0
+        self.buckets = {"support": 0, "neutral": 0, "oppose": 0}
+
+
+def _compute_totals_fixed(
+    *,
+    user_ids: Sequence[int],
+    values: Sequence[Decimal],
+    relevance: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    excluded_user_ids: set[int],
+    lenses: Sequence[LensWeights],
+) -> dict[str, ReadingTotals]:
+    scores = fixed_point.Scaled(fixed_point.SCORE_PLACES)
+    ethics_values = fixed_point.Scaled(fixed_point.ETHICS_PLACES)
+    stance_values = fixed_point.Scaled(fixed_point.VALUE_PLACES)
+    relevance_fixed = {
+        cid: fixed_point.clamp_relevance(weight) for cid, weight in relevance.items()
+    }
+    states = [_FixedLens(lens, relevance_fixed) for lens in lenses]
+
+    # Half-even rounding of alignment (10 -> 4 places) and weight (7 -> 4),
+    # inlined: this loop runs once per participant and lens.
+    align_step = 10 ** (
+        fixed_point.RELEVANCE_PLACES
+        + fixed_point.SCORE_PLACES
+        - fixed_point.WEIGHT_PLACES
+    )
+    align_half = align_step // 2
+    weight_step = fixed_point.ONE_ETHICS
+    weight_half = weight_step // 2
+    baseline = fixed_point.ONE_WEIGHT * fixed_point.ONE_ETHICS
+    advisory_count = 0
+
+    for user_id, value in zip(user_ids, values):
+        expertise = {
+            cid: scores[score]
+            for cid, score in expertise_by_user.get(user_id, {}).items()
+            if cid in relevance_fixed
+        }
+        excluded = user_id in excluded_user_ids
+        if not excluded:
+            advisory_count += 1
+            ethics = max(0, ethics_values[ethics_by_user.get(user_id, ONE)])
+            value_fixed = stance_values[value]
+            bucket = _bucket(value_fixed)
+        for state in states:
+            alignment = 0
+            if expertise:
+                dot = 0
+                for cid, rel in state.terms:
+                    if cid in expertise:
+                        dot += rel * expertise[cid]
+                if dot > 0:
+                    alignment, rest = divmod(dot, align_step)
+                    if rest > align_half or (rest == align_half and alignment & 1):
+                        alignment += 1
+            state.alignments.append(alignment)
+            if excluded:
+                state.weights.append(0)
+                continue
+
+            multiplier = ethics if state.use_ethics else weight_step
+            weight, rest = divmod(
+                baseline + min(alignment, state.cap) * multiplier, weight_step
+            )
+            if rest > weight_half or (rest == weight_half and weight & 1):
+                weight += 1
+            state.weights.append(weight)
+            state.weighted_sum += value_fixed * weight
+            state.total_weight += weight
+            state.alignment_sum += alignment
+            if alignment:
+                state.covered += 1
+            state.buckets[bucket] += weight
+
+    unscale = fixed_point.unscale
+    places = fixed_point.WEIGHT_PLACES
+    unscaled = fixed_point.Unscaled(places)
+    return {
+        lens.key: ReadingTotals(
+            alignments=[unscaled[value] for value in state.alignments],
+            weights=[unscaled[value] for value in state.weights],
+            weighted_sum=unscale(state.weighted_sum, places + fixed_point.VALUE_PLACES),
+            total_weight=unscale(state.total_weight, places),
+            alignment_sum=unscale(state.alignment_sum, places),
+            covered_participants=state.covered,
+            advisory_participant_count=advisory_count,
+            bucket_weights={
+                bucket: unscale(total, places) for bucket, total in state.buckets.items()
+            },
+        )
+        for lens, state in zip(lenses, states)
+    }
+
+
+def _fits_array_engine(
+    relevance: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    lenses: Sequence[LensWeights],
+) -> bool:
+    """True when every input has at most the places ``_quantize`` assumes."""
+    scores = fixed_point.Scaled(fixed_point.SCORE_PLACES)
+    ethics_values = fixed_point.Scaled(fixed_point.ETHICS_PLACES)
+    try:
+        for lens in lenses:
+            fixed_point.scale(lens.cap, fixed_point.WEIGHT_PLACES)
+        for weight in relevance.values():
+            fixed_point.clamp_relevance(weight)
+        for ethics in ethics_by_user.values():
+            ethics_values[ethics]
+        for expertise in expertise_by_user.values():
+            for score in expertise.values():
+                scores[score]
+    except fixed_point.NotRepresentable:
+        return False
+    return True
+
+
+def compute_totals_numpy(
+    *,
+    user_ids: Sequence[int],
+    values: Sequence[Decimal],
+    relevance: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    excluded_user_ids: set[int],
+    lenses: Sequence[LensWeights],
+) -> dict[str, ReadingTotals]:
+    """Vectorised engine over already-loaded relevance/expertise/ethics.
+
+    ``relevance`` and ``expertise_by_user`` must hold the same 0..1
+    normalised values the weight calculator uses.  The expertise matrix is
+    multiplied once by a (domains x lenses) relevance matrix, so every lens
+    comes out of the same product.  Falls back to the Decimal engine when an
+    input has more decimal places than its fixed-point slot.
+    """
+    if not _fits_array_engine(relevance, expertise_by_user, ethics_by_user, lenses):
+        return compute_totals_decimal(
+            user_ids=user_ids,
+            values=values,
+            relevance=relevance,
+            expertise_by_user=expertise_by_user,
+            ethics_by_user=ethics_by_user,
+            excluded_user_ids=excluded_user_ids,
+            lenses=lenses,
+        )
+
+    category_ids = list(relevance)
+    column = {category_id: idx for idx, category_id in enumerate(category_ids)}
+    n = len(user_ids)
+
+    stance_values = np.asarray([float(value) for value in values], dtype=np.float64)
+    rel = np.asarray(
+        [float(max(ZERO, min(ONE, relevance[cid]))) for cid in category_ids],
+        dtype=np.float64,
+    )
+    lens_relevance = np.zeros((len(category_ids), len(lenses)), dtype=np.float64)
+    for lens_idx, lens in enumerate(lenses):
+        rows = [column[category_id] for category_id in lens.category_ids]
+        lens_relevance[rows, lens_idx] = rel[rows]
+
+    row_idx: list[int] = []
+    col_idx: list[int] = []
+    scores: list[float] = []
+    for idx, user_id in enumerate(user_ids):
+        for category_id, score in expertise_by_user.get(user_id, {}).items():
+            if category_id in column:
+                row_idx.append(idx)
+                col_idx.append(column[category_id])
+                scores.append(float(score))
+    expertise = np.zeros((n, len(category_ids)), dtype=np.float64)
+    if scores:
+        expertise[row_idx, col_idx] = scores
+
+    ethics = np.asarray(
+        [float(max(ZERO, ethics_by_user.get(user_id, ONE))) for user_id in user_ids],
+        dtype=np.float64,
+    )
+    included = np.asarray(
+        [user_id not in excluded_user_ids for user_id in user_ids], dtype=bool
+    )
+    caps = np.asarray([float(lens.cap) for lens in lenses], dtype=np.float64)
+    multipliers = np.where(
+        np.asarray([lens.use_ethics for lens in lenses], dtype=bool),
+        ethics[:, None],
+        1.0,
+    )
+
+    # Relevance has 4 places and normalised scores at most 6 (legacy 0..100
+    # rows divided by 100); the cap has 4 and ethics 3, so the weight has at
+    # most 7 (checked by ``_fits_array_engine``).
+    alignment = _quantize(np.maximum(expertise @ lens_relevance, 0.0), 10)
+    bonus = np.minimum(alignment, caps)
+    weight = np.where(included[:, None], _quantize(1.0 + bonus * multipliers, 7), 0.0)
+
+    support = stance_values > 0
+    oppose = stance_values < 0
+    neutral = ~(support | oppose)
+    results = {}
+    for lens_idx, lens in enumerate(lenses):
+        lens_alignment = alignment[:, lens_idx]
+        lens_weight = weight[:, lens_idx]
+        results[lens.key] = ReadingTotals(
+            alignments=lens_alignment.tolist(),
+            weights=lens_weight.tolist(),
+            weighted_sum=float(stance_values @ lens_weight),
+            total_weight=float(lens_weight.sum()),
+            alignment_sum=float(lens_alignment[included].sum()),
+            covered_participants=int(np.count_nonzero(included & (lens_alignment > 0))),
+            advisory_participant_count=int(np.count_nonzero(included)),
+            bucket_weights={
+                "support": float(lens_weight[support].sum()),
+                "neutral": float(lens_weight[neutral].sum()),
+                "oppose": float(lens_weight[oppose].sum()),
+            },
+        )
+    return results
@@ -0,0 +1,110 @@
+"""Registry of declared Smart Vote reading lenses.
+
+A lens fixes how the advisory weight of a reading is derived from EkoH
+scores.  Every lens applies the same bounded formula
+
+    W[u,c] = 1 + min(sum_d R[c,d] * S[u,d], cap) * E[u]
+
+and may change three parameters:
+
+``cap``
+    Maximum expertise bonus; ``None`` uses the ``EKOH_MULTIPLIER_CAP``
+    score configuration.
+``use_ethics``
+    When false, the ethics multiplier ``E[u]`` is fixed at 1.
+``domain_codes``
+    Restricts ``d`` to relevance domains whose ISCED code starts with one of
+    the given prefixes; ``None`` keeps every relevant domain.
+
+The parameters are part of the lens declaration, so each lens has its own
+``lens_hash``.  The default lens declares no parameters and keeps the hash it
+had before lenses became configurable.
+
+``SMART_VOTE_READING_LENSES`` lists the lenses published for every topic.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_LENS_KEY = "ekoh_weighted_v1"
+
+
+@dataclass(frozen=True)
+class Lens:
+    key: str
+    cap: Decimal | None = None
+    use_ethics: bool = True
+    domain_codes: tuple[str, ...] | None = None
+
+    @property
+    def formula(self) -> str:
+        if self.use_ethics:
+            return "1 + min(dot(topic_relevance, expertise), cap) * ethics"
+        return "1 + min(dot(topic_relevance, expertise), cap)"
+
+    def parameters(self) -> dict[str, Any]:
+        """Declared deviations from the default lens (hashed with the lens)."""
+        parameters: dict[str, Any] = {}
+        if self.cap is not None:
+            parameters["cap"] = str(self.cap)
+        if not self.use_ethics:
+            parameters["ethics"] = False
+        if self.domain_codes is not None:
+            parameters["domain_codes"] = sorted(self.domain_codes)
+        return parameters
+
+    def covers_domain(self, code: str) -> bool:
+        if self.domain_codes is None:
+            return True
+        return any(code.startswith(prefix) for prefix in self.domain_codes)
+
+
+_REGISTRY: dict[str, Lens] = {}
+
+
+def register_lens(lens: Lens) -> Lens:
+    """Add ``lens`` to the registry; re-registering a key must not change it."""
+    existing = _REGISTRY.get(lens.key)
+    if existing is not None and existing != lens:
+        raise ValueError(f"Lens {lens.key!r} is already registered differently.")
+    _REGISTRY[lens.key] = lens
+    return lens
+
+
+def get_lens(key: str) -> Lens:
+    try:
+        return _REGISTRY[key]
+    except KeyError:
+        raise ValueError(f"Unknown reading lens {key!r}.") from None
+
+
+def registered_lenses() -> list[Lens]:
+    return list(_REGISTRY.values())
+
+
+def configured_lens_keys() -> list[str]:
+    keys = getattr(settings, "SMART_VOTE_READING_LENSES", None) or [DEFAULT_LENS_KEY]
+    unknown = [key for key in keys if key not in _REGISTRY]
+    if unknown:
+        raise ImproperlyConfigured(
+            f"SMART_VOTE_READING_LENSES names unknown lenses: {', '.join(unknown)}."
+        )
+    return list(keys)
+
+
+def resolve_lenses(keys: Iterable[str] | None = None) -> list[Lens]:
+    """Lenses for ``keys`` (default: the configured ones), duplicates removed."""
+    if keys is None:
+        keys = configured_lens_keys()
+    return [get_lens(key) for key in dict.fromkeys(keys)]
+
+
+register_lens(Lens(DEFAULT_LENS_KEY))
+register_lens(Lens("ekoh_expertise_only_v1", use_ethics=False))
+register_lens(Lens("ekoh_weighted_cap050_v1", cap=Decimal("0.50")))
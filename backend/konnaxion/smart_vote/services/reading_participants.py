@@ -0,0 +1,168 @@
+"""Participant detail of a declared reading, separate from the aggregate.
+
+Rows follow ``user_id`` order and are computed a keyset chunk at a time:
+only the stances and EkoH scores of the chunk are loaded, since a
+participant's alignment and advisory weight depend on nobody else's.
+
+``participant_page`` serves one page (``after`` = last ``user_id`` seen);
+``iter_participants`` yields every row, chunk by chunk, for NDJSON streaming.
+Rows hidden by EkoH rating disclosure are left out, so a page can hold fewer
+rows than ``limit`` while ``next_after`` still points further on.
+
+Topics of finalised consultations are paged from their final reading.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from django.conf import settings
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.services.reading_lenses import (
+    DEFAULT_LENS_KEY,
+    Lens,
+    get_lens,
+)
+from konnaxion.smart_vote.services.reading_service import (
+    SOURCE_TYPE_ETHIKOS_TOPIC,
+    ReadingInputs,
+    _decimal,
+    _declared_lens,
+    _lens_totals,
+    _load_topic_inputs,
+    final_reading,
+    participant_rows,
+    visible_participants,
+)
+
+
+def page_size(requested: int | None = None) -> int:
+    """``requested`` bounded by ``SMART_VOTE_PARTICIPANT_PAGE_MAX``."""
+    default = int(getattr(settings, "SMART_VOTE_PARTICIPANT_PAGE_SIZE", 100))
+    maximum = int(getattr(settings, "SMART_VOTE_PARTICIPANT_PAGE_MAX", 1000))
+    if requested is None:
+        return default
+    if requested < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(requested, maximum)
+
+
+def stream_chunk_size() -> int:
+    return int(getattr(settings, "SMART_VOTE_PARTICIPANT_STREAM_CHUNK", 2000))
+
+
+def _lens(key: str | None) -> Lens:
+    return get_lens(key or DEFAULT_LENS_KEY)
+
+
+def _chunk(
+    topic_id: int,
+    lens: Lens,
+    *,
+    after: int | None,
+    limit: int,
+) -> tuple[ReadingInputs, list[dict[str, Any]]] | None:
+    inputs = _load_topic_inputs(topic_id, after_user_id=after, limit=limit)
+    if inputs is None:
+        return None
+    values = [_decimal(value) for value in inputs.stance_values]
+    _engine, totals_by_lens = _lens_totals(inputs, values, engine=None, lenses=[lens])
+    return inputs, participant_rows(inputs, totals_by_lens[lens.key])
+
+
+def _final_rows(topic_id: int, lens: Lens) -> tuple[str, list[dict[str, Any]]] | None:
+    """Lens hash and participant rows of the final reading, if finalised."""
+    payload = final_reading(topic_id, [lens])
+    if payload is None:
+        return None
+    reading = payload["readings"][0]
+    return reading["lens_hash"], reading["results_payload"]["participants"]
+
+
+def participant_page(
+    topic_id: int,
+    *,
+    viewer=None,
+    lens_key: str | None = None,
+    after: int | None = None,
+    limit: int | None = None,
+) -> dict[str, Any] | None:
+    """One keyset page of participant detail; ``None`` for an unbound topic."""
+    lens = _lens(lens_key)
+    limit = page_size(limit)
+    with ekoh_smartvote_db_scope():
+        final = _final_rows(topic_id, lens)
+        if final is not None:
+            lens_hash, rows = final
+            rows = [row for row in rows if after is None or row["user_id"] > after]
+            has_more = len(rows) > limit
+        else:
+            chunk = _chunk(topic_id, lens, after=after, limit=limit + 1)
+            if chunk is None:
+                return None
+            inputs, rows = chunk
+            has_more = len(inputs.user_ids) > limit
+            _relevance, lens_hash = _declared_lens(
+                topic_id, inputs.relevance, inputs.advisory_exclusions, lens
+            )
+        rows = rows[:limit]
+        participants = visible_participants(rows, viewer)
+
+    return {
+        "target_type": SOURCE_TYPE_ETHIKOS_TOPIC,
+        "target_id": str(topic_id),
+        "reading_key": lens.key,
+        "lens_hash": lens_hash,
+        "participants": participants,
+        "next_after": rows[-1]["user_id"] if has_more else None,
+    }
+
+
+def topic_is_bound(topic_id: int) -> bool:
+    with ekoh_smartvote_db_scope():
+        return _load_topic_inputs(topic_id, limit=0) is not None
+
+
+def iter_participants(
+    topic_id: int,
+    *,
+    viewer=None,
+    lens_key: str | None = None,
+    after: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield every visible participant row after ``after``, chunk by chunk.
+
+    Each chunk runs in its own DB scope, so a slow consumer holds no
+    transaction open between chunks.  An unknown lens raises ``ValueError``
+    here, before the first row.
+    """
+    return _iter_chunks(
+        topic_id, _lens(lens_key), viewer, after, chunk_size or stream_chunk_size()
+    )
+
+
+def _iter_chunks(
+    topic_id: int, lens: Lens, viewer, after: int | None, chunk_size: int
+) -> Iterator[dict[str, Any]]:
+    with ekoh_smartvote_db_scope():
+        final = _final_rows(topic_id, lens)
+    if final is not None:
+        rows = [row for row in final[1] if after is None or row["user_id"] > after]
+        for start in range(0, len(rows), chunk_size):
+            with ekoh_smartvote_db_scope():
+                visible = visible_participants(rows[start : start + chunk_size], viewer)
+            yield from visible
+        return
+    while True:
+        with ekoh_smartvote_db_scope():
+            chunk = _chunk(topic_id, lens, after=after, limit=chunk_size)
+            if chunk is None:
+                return
+            inputs, rows = chunk
+            rows = visible_participants(rows, viewer)
+        yield from rows
+        if len(inputs.user_ids) < chunk_size:
+            return
+        after = inputs.user_ids[-1]
@@ -1,28 +1,54 @@
-"""Declared Smart Vote readings over canonical Ethikos topic stances."""
+"""Declared Smart Vote readings over canonical Ethikos topic stances.
+
+One reading is published per lens (see ``reading_lenses``).
+"""
 
 from __future__ import annotations
 
-import hashlib
-import json
+import copy
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from functools import cached_property
+from typing import Any, Sequence
 
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max
 from django.utils import timezone
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
-from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
-from konnaxion.ekoh.services.rating_access import resolve_rating_access
+from konnaxion.ekoh.models.scores import UserEthicsScore
+from konnaxion.ekoh.services.rating_access import resolve_rating_access_many
+from konnaxion.ekoh.services.rollups import effective_scores
+from konnaxion.ekoh.services.score_revisions import ethics_scores_as_of
 from konnaxion.ethikos.models import EthikosStance
 from konnaxion.smart_vote.models import (
     ConsultationRelevance,
+    ConsultationResult,
     SourceConsultationBinding,
 )
-from konnaxion.smart_vote.services.weight_calculator import (
-    get_expertise_alignment,
-    get_weight,
+from konnaxion.smart_vote.services import reading_cache, snapshot_store, stance_revisions
+from konnaxion.smart_vote.services.reading_engine import (
+    ENGINE_DECIMAL,
+    ENGINE_FIXED,
+    ENGINE_NUMPY,
+    LensWeights,
+    ReadingTotals,
+    compute_totals_decimal,
+    compute_totals_fixed,
+    compute_totals_numpy,
+    select_engine,
+)
+from konnaxion.smart_vote.services.reading_lenses import (
+    DEFAULT_LENS_KEY,
+    Lens,
+    get_lens,
+    resolve_lenses,
 )
+from konnaxion.smart_vote.services.weight_calculator import expertise_bonus_cap
+from konnaxion.utils.http import make_etag
 
-READING_KEY = "ekoh_weighted_v1"
+READING_KEY = DEFAULT_LENS_KEY
 SOURCE_TYPE_ETHIKOS_TOPIC = "ethikos_topic"
 
 
@@ -30,22 +56,7 @@ def _decimal(value: Any) -> Decimal:
     return Decimal(str(value))
 
 
-def _normalise_score(value: Decimal) -> Decimal:
-    value = max(Decimal("0"), _decimal(value))
-    if value > 1:
-        value = value / Decimal("100")
-    return min(Decimal("1"), value)
-
-
-def _hash_payload(payload: Any) -> str:
-    canonical = json.dumps(
-        payload,
-        ensure_ascii=False,
-        sort_keys=True,
-        separators=(",", ":"),
-        default=str,
-    ).encode("utf-8")
-    return "sha256:" + hashlib.sha256(canonical).hexdigest()
+_hash_payload = snapshot_store.content_hash
 
 
 def _stance_bucket(value: Decimal) -> str:
@@ -117,207 +128,664 @@ def _normalise_advisory_exclusions(binding) -> list[dict[str, Any]]:
     return rows
 
 
-def build_ethikos_topic_reading(topic_id: int, *, viewer=None) -> dict[str, Any] | None:
-    """Compute a declared reading inside the EkoH/Smart Vote DB schema scope."""
-    with ekoh_smartvote_db_scope():
-        return _build_ethikos_topic_reading(topic_id, viewer=viewer)
+@dataclass(frozen=True)
+class RelevanceEntry:
+    """One relevant EkoH domain of a consultation, as a reading sees it."""
 
+    category_id: int
+    code: str
+    name: str
+    weight: Decimal
+    criteria: Any
 
-def _build_ethikos_topic_reading(topic_id: int, *, viewer=None) -> dict[str, Any] | None:
-    """Compute baseline + one declared EkoH advisory reading for a topic.
+    def as_document(self) -> dict[str, Any]:
+        return {
+            "category_id": self.category_id,
+            "code": self.code,
+            "name": self.name,
+            "weight": str(self.weight),
+            "criteria": self.criteria,
+        }
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> "RelevanceEntry":
+        return cls(
+            category_id=int(document["category_id"]),
+            code=document["code"],
+            name=document["name"],
+            weight=_decimal(document["weight"]),
+            criteria=document["criteria"],
+        )
 
-    Source stances remain canonical and are always included in the baseline.
-    Explicit advisory-only exclusions (for example a voluntary recusal) are
-    lens configuration stored on the source binding. They do not delete or
-    mutate the underlying EthikosStance.
-    """
-    binding = (
-        SourceConsultationBinding.objects.select_related("consultation")
-        .filter(source_type=SOURCE_TYPE_ETHIKOS_TOPIC, source_id=str(topic_id))
-        .first()
-    )
-    if binding is None:
-        return None
 
-    consultation = binding.consultation
-    relevance_rows = list(
-        ConsultationRelevance.objects.select_related("category")
+def _relevance_rows(consultation) -> list[RelevanceEntry]:
+    return [
+        RelevanceEntry(
+            category_id=row.category_id,
+            code=row.category.code,
+            name=row.category.name,
+            weight=_decimal(row.weight),
+            criteria=row.criteria_json,
+        )
+        for row in ConsultationRelevance.objects.select_related("category")
         .filter(consultation=consultation)
         .order_by("category__code")
-    )
-    stances = list(
-        EthikosStance.objects.select_related("user")
-        .filter(topic_id=topic_id)
-        .order_by("user_id")
-    )
-    advisory_exclusions = _normalise_advisory_exclusions(binding)
-    exclusion_by_user_id = {
-        row["user_id"]: row for row in advisory_exclusions
-    }
+    ]
 
+
+def _declared_lens(
+    topic_id: int,
+    relevance_rows: list[RelevanceEntry],
+    advisory_exclusions: list[dict[str, Any]],
+    lens: Lens | None = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """Return the public relevance payload and the lens hash it declares.
+
+    Only the relevance domains covered by ``lens`` (default: the default
+    lens) are declared.
+    """
+    lens = lens or get_lens(DEFAULT_LENS_KEY)
     relevance_payload = [
         {
-            "domain_code": row.category.code,
-            "domain_name": row.category.name,
+            "domain_code": row.code,
+            "domain_name": row.name,
             "weight": float(row.weight),
-            "criteria": row.criteria_json,
+            "criteria": row.criteria,
         }
         for row in relevance_rows
+        if lens.covers_domain(row.code)
     ]
     lens_payload = {
-        "reading_key": READING_KEY,
-        "formula": "1 + min(dot(topic_relevance, expertise), cap) * ethics",
+        "reading_key": lens.key,
+        "formula": lens.formula,
         "source_type": SOURCE_TYPE_ETHIKOS_TOPIC,
         "source_id": str(topic_id),
         "domains": relevance_payload,
         "advisory_exclusions": advisory_exclusions,
     }
-    lens_hash = _hash_payload(lens_payload)
+    parameters = lens.parameters()
+    if parameters:
+        lens_payload["parameters"] = parameters
+    return relevance_payload, _hash_payload(lens_payload)
+
+
+def _lens_weights(
+    lens: Lens, relevance_rows: list[RelevanceEntry], default_cap: Decimal
+) -> LensWeights:
+    return LensWeights(
+        key=lens.key,
+        category_ids=tuple(
+            row.category_id for row in relevance_rows if lens.covers_domain(row.code)
+        ),
+        cap=default_cap if lens.cap is None else max(Decimal("0"), lens.cap),
+        use_ethics=lens.use_ethics,
+    )
 
-    values = [_decimal(stance.value) for stance in stances]
-    baseline_score = (
-        sum(values, Decimal("0")) / Decimal(len(values)) if values else Decimal("0")
+
+def _display_name(user) -> str:
+    display_name = (getattr(user, "name", "") or "").strip()
+    if not display_name:
+        full_name = (user.get_full_name() or "").strip()
+        # Konnaxion's custom User disables first_name/last_name. Django's
+        # inherited get_full_name() can therefore yield the literal "None None".
+        if full_name and all(part.casefold() != "none" for part in full_name.split()):
+            display_name = full_name
+    return display_name or user.username
+
+
+def build_ethikos_topic_reading(
+    topic_id: int,
+    *,
+    viewer=None,
+    use_cache: bool | None = None,
+    engine: str | None = None,
+    lenses: Sequence[str] | None = None,
+    include_participants: bool = True,
+) -> dict[str, Any] | None:
+    """Compute declared readings inside the EkoH/Smart Vote DB schema scope.
+
+    The viewer-independent payload is served from the materialized reading
+    cache when its inputs are unchanged; rating disclosure is then applied to
+    participant rows for ``viewer``.  ``engine`` selects the reading engine
+    (``"decimal"``, ``"fixed"`` or ``"numpy"``); ``None`` lets
+    ``select_engine`` decide from the participant count.  ``lenses`` lists
+    the registered lens keys to publish, in order (default:
+    ``SMART_VOTE_READING_LENSES``).
+
+    With ``include_participants=False`` the readings carry aggregates only;
+    participant detail is then served page by page by ``reading_participants``.
+
+    Once the bound consultation is finalised, the final result is served
+    instead (see ``final_reading``).
+    """
+    if use_cache is None:
+        use_cache = reading_cache.reading_cache_enabled()
+    lenses = resolve_lenses(lenses)
+
+    with ekoh_smartvote_db_scope():
+        payload = final_reading(topic_id, lenses)
+        if payload is None and use_cache:
+            payload = reading_cache.get_cached_reading(
+                SOURCE_TYPE_ETHIKOS_TOPIC,
+                topic_id,
+                reading_keys=[lens.key for lens in lenses],
+            )
+        if payload is None:
+            started_at = timezone.now()
+            generation = reading_cache.source_generation(
+                SOURCE_TYPE_ETHIKOS_TOPIC, topic_id
+            )
+            payload = _build_ethikos_topic_reading(
+                topic_id, engine=engine, lenses=lenses
+            )
+            if payload is None:
+                return None
+            if use_cache:
+                reading_cache.store_reading(
+                    SOURCE_TYPE_ETHIKOS_TOPIC,
+                    topic_id,
+                    payload,
+                    started_at=started_at,
+                    generation=generation,
+                )
+        if not include_participants:
+            return _without_participants(payload)
+        return _apply_viewer_access(payload, viewer=viewer)
+
+
+def visible_participants(
+    participants: list[dict[str, Any]], viewer=None
+) -> list[dict[str, Any]]:
+    """Participant rows ``viewer`` may see, each with its ``rating_access``."""
+    access_by_user = resolve_rating_access_many(
+        viewer, [row["user_id"] for row in participants]
     )
-    baseline_distribution = _count_distribution(values)
+    visible = []
+    for row in participants:
+        rating_access = access_by_user[row["user_id"]]
+        if rating_access.allowed:
+            visible.append({**row, "rating_access": rating_access.as_dict()})
+    return visible
 
-    relevant_category_ids = [row.category_id for row in relevance_rows]
-    expertise_rows = UserExpertiseScore.objects.filter(
-        user_id__in=[stance.user_id for stance in stances],
-        category_id__in=relevant_category_ids,
-    ).values_list("user_id", "category_id", "weighted_score")
-    expertise_by_user: dict[int, dict[int, Decimal]] = {}
-    for user_id, category_id, score in expertise_rows:
-        expertise_by_user.setdefault(user_id, {})[category_id] = _normalise_score(
-            _decimal(score)
+
+def reading_validators(
+    topic_id: int, *, lenses: Sequence[str] | None = None
+) -> tuple[str, datetime] | None:
+    """ETag and Last-Modified of the aggregate readings, without computing them.
+
+    Derived from the declared lens hashes, the current materialized reading
+    (whose ``snapshot_ref``/``computed_at`` change whenever scores, relevance
+    or the binding change) and the topic's latest stance.  ``None`` while no
+    current reading is materialized (cache disabled, or inputs changed since
+    the last computation).  A finalised topic's validators never change.
+    """
+    lenses = resolve_lenses(lenses)
+    with ekoh_smartvote_db_scope():
+        final = _final_results(topic_id).values_list("pk", "created_at").first()
+    if final is not None:
+        result_id, created_at = final
+        return make_etag("final", result_id, *[lens.key for lens in lenses]), created_at
+    if not reading_cache.reading_cache_enabled():
+        return None
+    with ekoh_smartvote_db_scope():
+        binding = _topic_binding(topic_id)
+        if binding is None:
+            return None
+        relevance_rows = _relevance_rows(binding.consultation)
+        advisory_exclusions = _normalise_advisory_exclusions(binding)
+        lens_set = reading_cache.lens_set_hash(
+            [
+                _declared_lens(topic_id, relevance_rows, advisory_exclusions, lens)[1]
+                for lens in lenses
+            ]
+        )
+        current = reading_cache.current_version(
+            SOURCE_TYPE_ETHIKOS_TOPIC, topic_id, lens_set
+        )
+        if current is None:
+            return None
+        stances = EthikosStance.objects.filter(topic_id=topic_id).aggregate(
+            count=Count("pk"), latest=Max("timestamp")
         )
 
-    ethics_rows = UserEthicsScore.objects.filter(
-        user_id__in=[stance.user_id for stance in stances]
-    ).values_list("user_id", "ethical_score")
-    ethics_by_user = {user_id: _decimal(score) for user_id, score in ethics_rows}
-
-    snapshot_payload = []
-    participant_payload = []
-    weighted_sum = Decimal("0")
-    total_weight = Decimal("0")
-    alignment_sum = Decimal("0")
-    covered_participants = 0
-    advisory_participant_count = 0
-    bucket_weights = {
-        "support": Decimal("0"),
-        "neutral": Decimal("0"),
-        "oppose": Decimal("0"),
-    }
+    snapshot_ref, computed_at = current
+    etag = make_etag(
+        "reading",
+        lens_set,
+        snapshot_ref,
+        computed_at.isoformat(),
+        stances["count"],
+        stances["latest"],
+    )
+    return etag, max(filter(None, [computed_at, stances["latest"]]))
+
+
+def _apply_viewer_access(payload: dict[str, Any], *, viewer=None) -> dict[str, Any]:
+    """Filter participant detail by EkoH rating disclosure for ``viewer``."""
+    payload = copy.deepcopy(payload)
+    for reading in payload["readings"]:
+        results = reading["results_payload"]
+        visible = visible_participants(results.get("participants", []), viewer)
+        results["participants"] = visible
+        results["participant_detail_visible_count"] = len(visible)
+    return payload
+
+
+def _without_participants(payload: dict[str, Any]) -> dict[str, Any]:
+    """``payload`` with the aggregate readings only (no per-participant rows)."""
+    readings = []
+    for reading in payload["readings"]:
+        results = {
+            key: value
+            for key, value in reading["results_payload"].items()
+            if key not in ("participants", "participant_detail_visible_count")
+        }
+        readings.append({**reading, "results_payload": results})
+    return copy.deepcopy({**payload, "readings": readings})
 
-    for stance in stances:
-        alignment = get_expertise_alignment(stance.user_id, consultation.pk)
-        excluded = stance.user_id in exclusion_by_user_id
-        source_weight = get_weight(stance.user_id, consultation.pk)
-        reading_weight = Decimal("0") if excluded else source_weight
-        stance_value = _decimal(stance.value)
-        ethics = ethics_by_user.get(stance.user_id, Decimal("1.0"))
-
-        if not excluded:
-            weighted_sum += stance_value * reading_weight
-            total_weight += reading_weight
-            alignment_sum += alignment
-            advisory_participant_count += 1
-            if alignment > 0:
-                covered_participants += 1
-            bucket_weights[_stance_bucket(stance_value)] += reading_weight
-
-        domain_scores = expertise_by_user.get(stance.user_id, {})
-        exclusion = exclusion_by_user_id.get(stance.user_id)
-        display_name = (getattr(stance.user, "name", "") or "").strip()
-        if not display_name:
-            full_name = (stance.user.get_full_name() or "").strip()
-            # Konnaxion's custom User disables first_name/last_name. Django's
-            # inherited get_full_name() can therefore yield the literal "None None".
-            if full_name and all(part.casefold() != "none" for part in full_name.split()):
-                display_name = full_name
-        if not display_name:
-            display_name = stance.user.username
-
-        rating_access = resolve_rating_access(viewer=viewer, subject=stance.user)
-        if rating_access.allowed:
-            participant_payload.append(
+
+@dataclass
+class ReadingInputs:
+    """Everything a topic's readings are computed from.
+
+    ``document()`` is the replayable form stored in the snapshot store: the
+    stances, the relevance declaration, the advisory exclusions, the default
+    expertise cap in force, and the ``snapshot_ref`` of the EkoH score rows.
+    Display names are presentation only and are not part of it.
+    """
+
+    topic_id: int
+    consultation_id: str
+    relevance: list[RelevanceEntry]
+    advisory_exclusions: list[dict[str, Any]]
+    user_ids: list[int]
+    stance_values: list[int]
+    expertise_by_user: dict[int, dict[int, Decimal]]
+    ethics_by_user: dict[int, Decimal]
+    default_cap: Decimal
+    display_names: dict[int, str]
+
+    @cached_property
+    def exclusion_by_user_id(self) -> dict[int, dict[str, Any]]:
+        return {row["user_id"]: row for row in self.advisory_exclusions}
+
+    @cached_property
+    def score_rows(self) -> list[dict[str, Any]]:
+        """The EkoH scores the readings used, one row per participant."""
+        rows = []
+        for user_id in self.user_ids:
+            exclusion = self.exclusion_by_user_id.get(user_id)
+            domain_scores = self.expertise_by_user.get(user_id, {})
+            rows.append(
                 {
-                    "user_id": stance.user_id,
-                    "display_name": display_name,
-                    "stance_value": int(stance.value),
-                    "expertise_alignment": float(alignment),
-                    "advisory_weight": float(reading_weight),
-                    "included_in_advisory": not excluded,
+                    "user_id": user_id,
+                    "ethics": str(self.ethics_by_user.get(user_id, Decimal("1.0"))),
+                    "expertise": {
+                        str(row.category_id): str(
+                            domain_scores.get(row.category_id, Decimal("0"))
+                        )
+                        for row in self.relevance
+                    },
+                    "included_in_advisory": exclusion is None,
                     "exclusion_reason": exclusion["reason"] if exclusion else None,
-                    "rating_access": rating_access.as_dict(),
                 }
             )
+        return rows
 
-        snapshot_payload.append(
-            {
-                "user_id": stance.user_id,
-                "ethics": str(ethics),
-                "expertise": {
-                    str(category_id): str(domain_scores.get(category_id, Decimal("0")))
-                    for category_id in relevant_category_ids
-                },
-                "included_in_advisory": not excluded,
-                "exclusion_reason": exclusion["reason"] if exclusion else None,
+    @cached_property
+    def snapshot_ref(self) -> str:
+        return snapshot_store.snapshot_ref(self.score_rows)
+
+    @cached_property
+    def document(self) -> dict[str, Any]:
+        return {
+            "source_type": SOURCE_TYPE_ETHIKOS_TOPIC,
+            "source_id": str(self.topic_id),
+            "consultation_id": self.consultation_id,
+            "relevance": [row.as_document() for row in self.relevance],
+            "advisory_exclusions": self.advisory_exclusions,
+            "stances": {"user_id": self.user_ids, "value": self.stance_values},
+            "default_cap": str(self.default_cap),
+            "snapshot_ref": self.snapshot_ref,
+        }
+
+    @cached_property
+    def input_ref(self) -> str:
+        return snapshot_store.input_ref(self.document)
+
+    @classmethod
+    def from_document(
+        cls,
+        document: dict[str, Any],
+        score_rows: list[dict[str, Any]],
+        display_names: dict[int, str],
+    ) -> "ReadingInputs":
+        expertise_by_user: dict[int, dict[int, Decimal]] = {}
+        ethics_by_user: dict[int, Decimal] = {}
+        for row in score_rows:
+            expertise_by_user[row["user_id"]] = {
+                int(category_id): _decimal(score)
+                for category_id, score in row["expertise"].items()
             }
+            ethics_by_user[row["user_id"]] = _decimal(row["ethics"])
+        return cls(
+            topic_id=int(document["source_id"]),
+            consultation_id=document["consultation_id"],
+            relevance=[RelevanceEntry.from_document(row) for row in document["relevance"]],
+            advisory_exclusions=document["advisory_exclusions"],
+            user_ids=list(document["stances"]["user_id"]),
+            stance_values=list(document["stances"]["value"]),
+            expertise_by_user=expertise_by_user,
+            ethics_by_user=ethics_by_user,
+            default_cap=_decimal(document["default_cap"]),
+            display_names=display_names,
         )
 
-    reading_score = (
-        weighted_sum / total_weight if total_weight > 0 else baseline_score
+
+def _build_ethikos_topic_reading(
+    topic_id: int,
+    *,
+    engine: str | None = None,
+    lenses: Sequence[Lens] | None = None,
+) -> dict[str, Any] | None:
+    """Compute baseline + the declared EkoH advisory readings for a topic.
+
+    The inputs are stored in the snapshot store, so the payload's
+    ``input_ref`` can be replayed later by ``replay_reading``.
+    """
+    inputs = _load_topic_inputs(topic_id)
+    if inputs is None:
+        return None
+    payload = _compute_readings(inputs, engine=engine, lenses=lenses)
+    snapshot_store.store_score_snapshot(inputs.score_rows)
+    snapshot_store.store_reading_inputs(inputs.document)
+    return payload
+
+
+def _topic_binding(topic_id: int):
+    return (
+        SourceConsultationBinding.objects.select_related("consultation")
+        .filter(source_type=SOURCE_TYPE_ETHIKOS_TOPIC, source_id=str(topic_id))
+        .first()
+    )
+
+
+def _load_topic_inputs(
+    topic_id: int,
+    *,
+    after_user_id: int | None = None,
+    limit: int | None = None,
+    as_of: datetime | None = None,
+) -> ReadingInputs | None:
+    """Load the stances, relevance and EkoH scores of a topic's readings.
+
+    ``after_user_id`` / ``limit`` restrict the stances to one keyset page in
+    ``user_id`` order (participant detail); readings need them all.
+    ``as_of`` reads the stances and EkoH scores in force at that time
+    (finaliser; see ``stance_revisions`` and ``ekoh.services.score_revisions``).
+
+    Source stances remain canonical and are always included in the baseline.
+    Explicit advisory-only exclusions (for example a voluntary recusal) are
+    lens configuration stored on the source binding. They do not delete or
+    mutate the underlying EthikosStance.
+    """
+    binding = _topic_binding(topic_id)
+    if binding is None:
+        return None
+
+    relevance_rows = _relevance_rows(binding.consultation)
+    if as_of is None:
+        stances = EthikosStance.objects.filter(topic_id=topic_id).order_by("user_id")
+        if after_user_id is not None:
+            stances = stances.filter(user_id__gt=after_user_id)
+        stances = stances.values_list("user_id", "value")
+        if limit is not None:
+            stances = stances[:limit]
+        stance_by_user = dict(stances)
+    else:
+        stance_by_user = {
+            user_id: value
+            for user_id, value in sorted(
+                stance_revisions.stances_as_of(topic_id, as_of).items()
+            )
+            if after_user_id is None or user_id > after_user_id
+        }
+        if limit is not None:
+            stance_by_user = dict(list(stance_by_user.items())[:limit])
+    users = get_user_model().objects.in_bulk(list(stance_by_user))
+    user_ids = [user_id for user_id in sorted(stance_by_user) if user_id in users]
+
+    # Relevance may name broad or narrow fields: read them as roll-ups.
+    expertise_by_user = effective_scores(
+        user_ids, [row.category_id for row in relevance_rows], as_of=as_of
     )
-    average_alignment = (
-        alignment_sum / Decimal(advisory_participant_count)
-        if advisory_participant_count
-        else Decimal("0")
+
+    if as_of is None:
+        ethics_rows = UserEthicsScore.objects.filter(user_id__in=user_ids).values_list(
+            "user_id", "ethical_score"
+        )
+    else:
+        ethics_rows = ethics_scores_as_of(user_ids, as_of).items()
+
+    return ReadingInputs(
+        topic_id=topic_id,
+        consultation_id=str(binding.consultation_id),
+        relevance=relevance_rows,
+        advisory_exclusions=_normalise_advisory_exclusions(binding),
+        user_ids=user_ids,
+        stance_values=[int(stance_by_user[user_id]) for user_id in user_ids],
+        expertise_by_user=expertise_by_user,
+        ethics_by_user={user_id: _decimal(score) for user_id, score in ethics_rows},
+        default_cap=expertise_bonus_cap(),
+        display_names={user_id: _display_name(users[user_id]) for user_id in user_ids},
     )
-    expertise_coverage = (
-        Decimal(covered_participants) / Decimal(advisory_participant_count)
-        if advisory_participant_count
-        else Decimal("0")
+
+
+def _compute_readings(
+    inputs: ReadingInputs,
+    *,
+    engine: str | None = None,
+    lenses: Sequence[Lens] | None = None,
+) -> dict[str, Any]:
+    """Baseline and one reading per lens from ``inputs``.
+
+    The engine computes every lens in the same pass.  The payload lists every
+    participant; viewer-specific disclosure is applied afterwards by
+    ``_apply_viewer_access``.
+    """
+    if lenses is None:
+        lenses = resolve_lenses()
+    topic_id = inputs.topic_id
+    relevance_rows = inputs.relevance
+    advisory_exclusions = inputs.advisory_exclusions
+    participant_count = len(inputs.user_ids)
+
+    values = [_decimal(value) for value in inputs.stance_values]
+    baseline_score = (
+        sum(values, Decimal("0")) / Decimal(len(values)) if values else Decimal("0")
     )
+    baseline_distribution = _count_distribution(values)
+
+    engine, totals_by_lens = _lens_totals(inputs, values, engine=engine, lenses=lenses)
 
-    snapshot_ref = "ekoh_snapshot:" + _hash_payload(snapshot_payload).split(":", 1)[1]
+    snapshot_ref = inputs.snapshot_ref
     computed_at = timezone.now().isoformat()
 
-    return {
-        "target_type": SOURCE_TYPE_ETHIKOS_TOPIC,
-        "target_id": str(topic_id),
-        "smart_vote_consultation_id": str(consultation.pk),
-        "baseline": {
-            "reading_key": "baseline",
-            "lens_hash": None,
-            "snapshot_ref": None,
-            "computed_at": computed_at,
-            "results_payload": {
-                "score": float(baseline_score),
-                "participant_count": len(stances),
-                **baseline_distribution,
-            },
-        },
-        "readings": [
+    readings = []
+    for lens in lenses:
+        totals = totals_by_lens[lens.key]
+        relevance_payload, lens_hash = _declared_lens(
+            topic_id, relevance_rows, advisory_exclusions, lens
+        )
+        participant_payload = participant_rows(inputs, totals)
+        advisory_participant_count = totals.advisory_participant_count
+        reading_score = (
+            totals.weighted_sum / totals.total_weight
+            if totals.total_weight > 0
+            else baseline_score
+        )
+        average_alignment = (
+            totals.alignment_sum / advisory_participant_count
+            if advisory_participant_count
+            else 0
+        )
+        expertise_coverage = (
+            totals.covered_participants / advisory_participant_count
+            if advisory_participant_count
+            else 0
+        )
+        readings.append(
             {
-                "reading_key": READING_KEY,
+                "reading_key": lens.key,
                 "lens_hash": lens_hash,
                 "snapshot_ref": snapshot_ref,
                 "computed_at": computed_at,
+                "engine": engine,
                 "results_payload": {
                     "score": float(reading_score),
-                    "participant_count": len(stances),
+                    "participant_count": participant_count,
                     "advisory_participant_count": advisory_participant_count,
-                    "excluded_participant_count": len(stances)
+                    "excluded_participant_count": participant_count
                     - advisory_participant_count,
-                    "total_advisory_weight": float(total_weight),
+                    "total_advisory_weight": float(totals.total_weight),
                     "average_expertise_alignment": float(average_alignment),
                     "expertise_coverage": float(expertise_coverage),
                     "domains": relevance_payload,
                     "participant_detail_visible_count": len(participant_payload),
                     "participants": participant_payload,
-                    **_weighted_distribution(bucket_weights, total_weight),
+                    **_weighted_distribution(
+                        totals.bucket_weights, totals.total_weight
+                    ),
                 },
             }
-        ],
+        )
+
+    return {
+        "target_type": SOURCE_TYPE_ETHIKOS_TOPIC,
+        "target_id": str(topic_id),
+        "smart_vote_consultation_id": inputs.consultation_id,
+        "input_ref": inputs.input_ref,
+        "baseline": {
+            "reading_key": "baseline",
+            "lens_hash": None,
+            "snapshot_ref": None,
+            "computed_at": computed_at,
+            "results_payload": {
+                "score": float(baseline_score),
+                "participant_count": participant_count,
+                **baseline_distribution,
+            },
+        },
+        "readings": readings,
     }
+
+
+def _lens_totals(
+    inputs: ReadingInputs,
+    values: list[Decimal],
+    *,
+    engine: str | None,
+    lenses: Sequence[Lens],
+) -> tuple[str, dict[str, ReadingTotals]]:
+    """Run the selected engine over ``inputs``; return it and the lens totals."""
+    engine = select_engine(engine, len(inputs.user_ids))
+    compute_totals = {
+        ENGINE_DECIMAL: compute_totals_decimal,
+        ENGINE_FIXED: compute_totals_fixed,
+        ENGINE_NUMPY: compute_totals_numpy,
+    }[engine]
+    totals_by_lens = compute_totals(
+        user_ids=inputs.user_ids,
+        values=values,
+        relevance={row.category_id: row.weight for row in inputs.relevance},
+        expertise_by_user=inputs.expertise_by_user,
+        ethics_by_user=inputs.ethics_by_user,
+        excluded_user_ids=set(inputs.exclusion_by_user_id),
+        lenses=[
+            _lens_weights(lens, inputs.relevance, inputs.default_cap) for lens in lenses
+        ],
+    )
+    return engine, totals_by_lens
+
+
+def participant_rows(inputs: ReadingInputs, totals: ReadingTotals) -> list[dict[str, Any]]:
+    """Per-participant detail of one lens, in ``inputs.user_ids`` order."""
+    rows = []
+    for user_id, stance_value, alignment, reading_weight in zip(
+        inputs.user_ids, inputs.stance_values, totals.alignments, totals.weights
+    ):
+        exclusion = inputs.exclusion_by_user_id.get(user_id)
+        rows.append(
+            {
+                "user_id": user_id,
+                "display_name": inputs.display_names.get(user_id, ""),
+                "stance_value": stance_value,
+                "expertise_alignment": float(alignment),
+                "advisory_weight": float(reading_weight),
+                "included_in_advisory": exclusion is None,
+                "exclusion_reason": exclusion["reason"] if exclusion else None,
+            }
+        )
+    return rows
+
+
+def replay_reading(
+    input_ref: str,
+    *,
+    viewer=None,
+    engine: str | None = None,
+    lenses: Sequence[str] | None = None,
+) -> dict[str, Any]:
+    """Recompute the readings stored under ``input_ref``.
+
+    Stances, relevance, exclusions, the default cap and the EkoH scores all
+    come from the snapshot store, so the result matches the original reading
+    whatever has changed since; only display names are current.  Lenses
+    other than the original ones may be requested.  Raises
+    ``snapshot_store.SnapshotNotFound`` / ``SnapshotCorrupt``.
+    """
+    payload = _replay_payload(input_ref, engine=engine, lenses=resolve_lenses(lenses))
+    payload["replay"] = True
+    return _apply_viewer_access(payload, viewer=viewer)
+
+
+def _replay_payload(
+    input_ref: str, *, engine: str | None = None, lenses: Sequence[Lens]
+) -> dict[str, Any]:
+    with ekoh_smartvote_db_scope():
+        document = snapshot_store.load_reading_inputs(input_ref)
+        score_rows = snapshot_store.load_score_snapshot(document["snapshot_ref"])
+    users = get_user_model().objects.filter(pk__in=document["stances"]["user_id"])
+    inputs = ReadingInputs.from_document(
+        document, score_rows, {user.pk: _display_name(user) for user in users}
+    )
+    return _compute_readings(inputs, engine=engine, lenses=lenses)
+
+
+# ------------------------------------------------------------------ #
+# Finalised consultations                                            #
+# ------------------------------------------------------------------ #
+def _final_results(topic_id: int):
+    return ConsultationResult.objects.filter(
+        kind=ConsultationResult.KIND_READING,
+        source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+        source_id=str(topic_id),
+    )
+
+
+def final_reading(topic_id: int, lenses: Sequence[Lens]) -> dict[str, Any] | None:
+    """Viewer-independent final reading of a topic; ``None`` until finalised.
+
+    Lenses published at close are served as stored.  Others are replayed
+    from the stored inputs of the final reading, never from live stances.
+    """
+    result = _final_results(topic_id).only("payload_json").first()
+    if result is None:
+        return None
+    payload = result.payload_json
+    stored = {reading["reading_key"]: reading for reading in payload["readings"]}
+    if all(lens.key in stored for lens in lenses):
+        return {**payload, "readings": [stored[lens.key] for lens in lenses]}
+    replayed = _replay_payload(payload["input_ref"], lenses=lenses)
+    replayed.update(final=True, closes_at=payload["closes_at"])
+    return replayed
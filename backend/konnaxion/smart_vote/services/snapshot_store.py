@@ -0,0 +1,150 @@
+"""Persist and load the content-addressed reading blobs (``SnapshotBlob``).
+
+Score snapshots are stored column-wise (one list per field and one per
+relevant domain) as canonical JSON compressed with zlib: repeated ethics and
+expertise values compress far better in columns than in per-participant
+objects.  Loading rebuilds the original rows and checks them against their
+ref, so a blob can never silently answer for different content.
+
+Callers must already be inside ``ekoh_smartvote_db_scope()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from typing import Any
+
+from konnaxion.smart_vote.models.snapshot_blob import SnapshotBlob
+
+ENCODING = "columnar-json+zlib/1"
+SNAPSHOT_PREFIX = "ekoh_snapshot:"
+INPUT_PREFIX = "reading_input:"
+COMPRESSION_LEVEL = 6
+
+
+class SnapshotNotFound(LookupError):
+    pass
+
+
+class SnapshotCorrupt(ValueError):
+    pass
+
+
+def _canonical(document: Any) -> bytes:
+    return json.dumps(
+        document,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+def content_hash(document: Any) -> str:
+    """``sha256:<hex>`` of the canonical JSON form of ``document``."""
+    return "sha256:" + hashlib.sha256(_canonical(document)).hexdigest()
+
+
+def _ref(prefix: str, document: Any) -> str:
+    return prefix + content_hash(document).split(":", 1)[1]
+
+
+def snapshot_ref(score_rows: list[dict[str, Any]]) -> str:
+    return _ref(SNAPSHOT_PREFIX, score_rows)
+
+
+def input_ref(inputs: dict[str, Any]) -> str:
+    return _ref(INPUT_PREFIX, inputs)
+
+
+# ------------------------------------------------------------------ #
+# Columnar encoding of score rows                                    #
+# ------------------------------------------------------------------ #
+def _score_columns(score_rows: list[dict[str, Any]]) -> dict[str, Any]:
+    domains = list(score_rows[0]["expertise"]) if score_rows else []
+    return {
+        "user_id": [row["user_id"] for row in score_rows],
+        "ethics": [row["ethics"] for row in score_rows],
+        "domains": domains,
+        "expertise": [[row["expertise"][domain] for row in score_rows] for domain in domains],
+        "included_in_advisory": [row["included_in_advisory"] for row in score_rows],
+        "exclusion_reason": [row["exclusion_reason"] for row in score_rows],
+    }
+
+
+def _score_rows(columns: dict[str, Any]) -> list[dict[str, Any]]:
+    domains = columns["domains"]
+    return [
+        {
+            "user_id": user_id,
+            "ethics": columns["ethics"][index],
+            "expertise": {
+                domain: columns["expertise"][position][index]
+                for position, domain in enumerate(domains)
+            },
+            "included_in_advisory": columns["included_in_advisory"][index],
+            "exclusion_reason": columns["exclusion_reason"][index],
+        }
+        for index, user_id in enumerate(columns["user_id"])
+    ]
+
+
+# ------------------------------------------------------------------ #
+# Blob I/O                                                           #
+# ------------------------------------------------------------------ #
+def _put(ref: str, kind: str, document: Any, row_count: int) -> bool:
+    """Store ``document`` under ``ref`` unless present; True when written."""
+    if SnapshotBlob.objects.filter(pk=ref).exists():
+        return False
+    raw = _canonical(document)
+    created = SnapshotBlob.objects.bulk_create(
+        [
+            SnapshotBlob(
+                ref=ref,
+                kind=kind,
+                encoding=ENCODING,
+                data=zlib.compress(raw, COMPRESSION_LEVEL),
+                row_count=row_count,
+                raw_size=len(raw),
+            )
+        ],
+        ignore_conflicts=True,
+    )
+    return bool(created)
+
+
+def _get(ref: str, kind: str) -> Any:
+    blob = SnapshotBlob.objects.filter(pk=ref, kind=kind).first()
+    if blob is None:
+        raise SnapshotNotFound(ref)
+    if blob.encoding != ENCODING:
+        raise SnapshotCorrupt(f"{ref}: unsupported encoding {blob.encoding!r}")
+    return json.loads(zlib.decompress(bytes(blob.data)))
+
+
+def store_score_snapshot(score_rows: list[dict[str, Any]]) -> str:
+    ref = snapshot_ref(score_rows)
+    _put(ref, SnapshotBlob.KIND_SCORES, _score_columns(score_rows), len(score_rows))
+    return ref
+
+
+def load_score_snapshot(ref: str) -> list[dict[str, Any]]:
+    rows = _score_rows(_get(ref, SnapshotBlob.KIND_SCORES))
+    if snapshot_ref(rows) != ref:
+        raise SnapshotCorrupt(f"{ref}: content does not match its ref")
+    return rows
+
+
+def store_reading_inputs(inputs: dict[str, Any]) -> str:
+    ref = input_ref(inputs)
+    _put(ref, SnapshotBlob.KIND_INPUTS, inputs, len(inputs["stances"]["user_id"]))
+    return ref
+
+
+def load_reading_inputs(ref: str) -> dict[str, Any]:
+    inputs = _get(ref, SnapshotBlob.KIND_INPUTS)
+    if input_ref(inputs) != ref:
+        raise SnapshotCorrupt(f"{ref}: content does not match its ref")
+    return inputs
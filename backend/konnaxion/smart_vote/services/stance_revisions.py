@@ -0,0 +1,82 @@
+"""Ethikos stances as they were when a consultation closed.
+
+A stance may still change between its consultation's ``closes_at`` and the
+finaliser run.  While a consultation bound to the topic is closed but not
+finalised, every change of one of its stances first keeps the previous value
+as a ``StanceRevision`` (``record_previous``, from the stance signals).
+``stances_as_of`` then rebuilds the stances in force at ``closes_at``: the
+value of the earliest revision after it or, without one, the current stance
+if it was last changed by then.  A stance changed after ``closes_at``
+without a revision (before revisions were recorded) is left out.
+
+All functions must run inside ``ekoh_smartvote_db_scope()``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.utils import timezone
+
+from konnaxion.ethikos.models import EthikosStance
+from konnaxion.smart_vote.models import SourceConsultationBinding, StanceRevision
+from konnaxion.smart_vote.services.reading_cache import SOURCE_TYPE_ETHIKOS_TOPIC
+
+
+def _awaiting_finalisation(topic_id: int, now: datetime) -> bool:
+    return SourceConsultationBinding.objects.filter(
+        source_type=SOURCE_TYPE_ETHIKOS_TOPIC,
+        source_id=str(topic_id),
+        consultation__closes_at__lte=now,
+        consultation__finalised_at__isnull=True,
+    ).exists()
+
+
+def record_previous(stance: EthikosStance, *, deleting: bool = False) -> None:
+    """Keep the stored value of ``stance`` before it is saved or deleted."""
+    now = timezone.now()
+    if not _awaiting_finalisation(stance.topic_id, now):
+        return
+    previous = None
+    if stance.pk is not None:
+        previous = (
+            EthikosStance.objects.filter(pk=stance.pk)
+            .values_list("value", flat=True)
+            .first()
+        )
+    if deleting and previous is None:
+        return
+    StanceRevision.objects.create(
+        topic_id=stance.topic_id,
+        user_id=stance.user_id,
+        value=previous,
+        replaced_at=now,
+    )
+
+
+def stances_as_of(topic_id: int, as_of: datetime) -> dict[int, int]:
+    """Stance value by user of ``topic_id`` in force at ``as_of``."""
+    values = dict(
+        EthikosStance.objects.filter(topic_id=topic_id, timestamp__lte=as_of).values_list(
+            "user_id", "value"
+        )
+    )
+    revisions = StanceRevision.objects.filter(
+        topic_id=topic_id, replaced_at__gt=as_of
+    ).order_by("-replaced_at", "-pk")
+    revised: dict[int, int | None] = {}
+    # The earliest revision of each stance comes last and wins.
+    for user_id, value in revisions.values_list("user_id", "value").iterator():
+        revised[user_id] = value
+    for user_id, value in revised.items():
+        if value is None:
+            values.pop(user_id, None)
+        else:
+            values[user_id] = value
+    return values
+
+
+def prune_revisions(before: datetime) -> int:
+    """Drop the revisions of changes made before ``before``; return how many."""
+    deleted, _ = StanceRevision.objects.filter(replaced_at__lt=before).delete()
+    return deleted
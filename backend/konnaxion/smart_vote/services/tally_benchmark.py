@@ -0,0 +1,85 @@
+"""Synthetic ballots and timings for the tally engines.
+
+Used by the ``benchmark_tally`` command; the generators are seeded so runs
+are comparable across machines and commits.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from konnaxion.smart_vote.models.core import VoteModality
+from konnaxion.smart_vote.services import tally_engine
+from konnaxion.smart_vote.services.tally_engine import (
+    RANKED_MODALITIES,
+    RankedBallots,
+    ScoredBallots,
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkRun:
+    modality: str
+    ballots: int
+    options: int
+    seconds: float
+
+    @property
+    def ballots_per_second(self) -> float:
+        return self.ballots / self.seconds if self.seconds else float("inf")
+
+
+def _rng(seed: int):
+    return np.random.default_rng(seed)
+
+
+def _weights(rng, count: int):
+    # Advisory weights are 1 + bonus; most voters carry no bonus.
+    bonus = rng.exponential(0.5, count) * (rng.random(count) < 0.3)
+    return 1.0 + bonus
+
+
+def synthetic_ranked(ballots: int, options: int, seed: int = 0) -> RankedBallots:
+    """Random partial rankings with a popularity skew, 1..options deep."""
+    rng = _rng(seed)
+    popularity = rng.gumbel(size=(ballots, options)) + np.linspace(1.0, 0.0, options)
+    rankings = np.argsort(-popularity, axis=1).astype(np.int32)
+    depth = rng.integers(1, options + 1, ballots)
+    rankings[np.arange(options) >= depth[:, None]] = -1
+    labels = [f"option-{index}" for index in range(options)]
+    return RankedBallots(options=labels, rankings=rankings, weights=_weights(rng, ballots))
+
+
+def synthetic_scored(modality: str, ballots: int, options: int, seed: int = 0) -> ScoredBallots:
+    rng = _rng(seed)
+    if modality == VoteModality.APPROVAL:
+        scores = (rng.random((ballots, options)) < 0.3).astype(np.float64)
+    elif modality == VoteModality.RATING:
+        scores = rng.integers(1, 6, (ballots, options)).astype(np.float64)
+        scores[rng.random((ballots, options)) < 0.2] = np.nan
+    else:
+        scores = rng.dirichlet(np.ones(options), ballots) * 1_000
+    labels = [f"option-{index}" for index in range(options)]
+    return ScoredBallots(options=labels, scores=scores, weights=_weights(rng, ballots))
+
+
+def synthetic_ballots(modality: str, ballots: int, options: int, seed: int = 0):
+    if modality in RANKED_MODALITIES:
+        return synthetic_ranked(ballots, options, seed)
+    return synthetic_scored(modality, ballots, options, seed)
+
+
+def run_benchmark(
+    modality: str, ballots: int, options: int, *, repeat: int = 3, seed: int = 0
+) -> list[BenchmarkRun]:
+    """Time ``repeat`` tallies of one synthetic election (generation excluded)."""
+    election = synthetic_ballots(modality, ballots, options, seed)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        tally_engine.tally(modality, election)
+        runs.append(BenchmarkRun(modality, ballots, options, time.perf_counter() - started))
+    return runs
@@ -0,0 +1,444 @@
+"""Columnar tally engines for the Smart-Vote modalities.
+
+Ballots are held as NumPy arrays, one row per ballot, with one weight per
+ballot (the voter's EkoH advisory weight, see ``advisory_weights``):
+
+``RankedBallots``
+    ``rankings[i, r]`` is the option index ballot ``i`` ranks at position
+    ``r``; ``-1`` pads the unused trailing positions.  Used by the
+    ``preferential`` (instant-runoff) and ``ranking`` (Borda/Condorcet)
+    modalities.
+``ScoredBallots``
+    ``scores[i, j]`` is ballot ``i``'s value for option ``j``; ``NaN`` means
+    "not scored".  Used by ``approval`` (0/1), ``rating`` (1-5) and
+    ``budget_split`` (amounts).
+
+Engines:
+
+``instant_runoff``
+    Weighted IRV.  Tallies are updated incrementally: an elimination only
+    moves the ballots currently sitting on the eliminated option to their
+    next continuing preference.
+``pairwise``
+    Pairwise preference matrix and Borda scores, built together in one pass
+    over the ballots (in chunks), plus the Condorcet winner if any.
+``budget_allocation``
+    Each ballot's split is normalised to shares; the weighted share sums,
+    scaled to the budget, give the allocation.
+``score_totals``
+    Weighted sums and weighted means for approval and rating.
+
+``consultation_ballots`` loads the ballots of a multi-option consultation
+from its ``Vote`` rows (see ``ConsultationOption`` for the storage layout),
+one container per modality; ``tally_consultation`` runs the matching engine
+on each.  A ballot's weight is the advisory weight it was cast with, read
+back from ``weighted_value / raw_value``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from konnaxion.smart_vote.models import ConsultationOption, Vote, VoteModality
+from konnaxion.smart_vote.services.consultation_weights import lookup_weights
+
+PAIRWISE_CHUNK_SIZE = 8_192
+RANKED_MODALITIES = frozenset({VoteModality.PREFERENTIAL, VoteModality.RANKING})
+TARGET_TYPE = "consultation"
+
+
+def _weights(weights, count: int):
+    if weights is None:
+        return np.ones(count)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (count,):
+        raise ValueError(f"Expected {count} ballot weights, got shape {weights.shape}.")
+    return weights
+
+
+def advisory_weights(user_ids: Sequence[int], consultation_id):
+    """Current EkoH advisory weights of ``user_ids`` (one per ballot) as an array."""
+    found = lookup_weights(user_ids, consultation_id)
+    return np.array([float(found[user_id].weight) for user_id in user_ids])
+
+
+# ------------------------------------------------------------------ #
+# Ballot containers                                                  #
+# ------------------------------------------------------------------ #
+@dataclass
+class RankedBallots:
+    options: Sequence[str]
+    rankings: Any  # (ballots, max rank) int array, -1 padded
+    weights: Any  # (ballots,) float array
+
+    def __post_init__(self):
+        self.rankings = np.asarray(self.rankings, dtype=np.int32)
+        if self.rankings.ndim != 2:
+            raise ValueError("rankings must be a 2-D array.")
+        if self.rankings.size and self.rankings.max() >= len(self.options):
+            raise ValueError("rankings reference an unknown option.")
+        self.weights = _weights(self.weights, len(self.rankings))
+
+    @classmethod
+    def from_rankings(
+        cls,
+        options: Sequence[str],
+        rankings: Iterable[Sequence[str]],
+        weights=None,
+    ) -> "RankedBallots":
+        """Build from per-ballot lists of option labels, most preferred first.
+
+        Repeated options keep their first position.
+        """
+        index = {option: position for position, option in enumerate(options)}
+        rows = [list(dict.fromkeys(index[option] for option in ranking)) for ranking in rankings]
+        width = max((len(row) for row in rows), default=0)
+        matrix = np.full((len(rows), width), -1, dtype=np.int32)
+        for row_index, row in enumerate(rows):
+            matrix[row_index, : len(row)] = row
+        return cls(options=list(options), rankings=matrix, weights=weights)
+
+    def __len__(self) -> int:
+        return len(self.rankings)
+
+
+@dataclass
+class ScoredBallots:
+    options: Sequence[str]
+    scores: Any  # (ballots, options) float array, NaN = not scored
+    weights: Any  # (ballots,) float array
+
+    def __post_init__(self):
+        self.scores = np.asarray(self.scores, dtype=np.float64)
+        if self.scores.ndim != 2 or self.scores.shape[1] != len(self.options):
+            raise ValueError("scores must have one column per option.")
+        self.weights = _weights(self.weights, len(self.scores))
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+# ------------------------------------------------------------------ #
+# Results                                                            #
+# ------------------------------------------------------------------ #
+def _by_option(options, values) -> dict[str, float]:
+    return {option: float(value) for option, value in zip(options, values)}
+
+
+@dataclass
+class RunoffResult:
+    options: Sequence[str]
+    winner: int | None
+    eliminated: list[int]
+    rounds: list[Any]  # per round: (options,) tallies, eliminated options at 0
+    exhausted_weight: float
+
+    def as_dict(self) -> dict[str, Any]:
+        removed: set[int] = set()
+        rounds = []
+        for tallies, loser in zip(self.rounds, self.eliminated + [None]):
+            rounds.append(
+                {
+                    self.options[index]: float(tallies[index])
+                    for index in range(len(self.options))
+                    if index not in removed
+                }
+            )
+            if loser is not None:
+                removed.add(loser)
+        return {
+            "winner": None if self.winner is None else self.options[self.winner],
+            "eliminated": [self.options[index] for index in self.eliminated],
+            "rounds": rounds,
+            "exhausted_weight": self.exhausted_weight,
+        }
+
+
+@dataclass
+class PairwiseResult:
+    options: Sequence[str]
+    matrix: Any  # matrix[a, b] = weight preferring a over b
+    borda: Any
+    condorcet_winner: int | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "condorcet_winner": (
+                None if self.condorcet_winner is None else self.options[self.condorcet_winner]
+            ),
+            "borda": _by_option(self.options, self.borda),
+            "pairwise": {
+                option: _by_option(self.options, row)
+                for option, row in zip(self.options, self.matrix)
+            },
+        }
+
+
+@dataclass
+class BudgetResult:
+    options: Sequence[str]
+    allocation: Any
+    shares: Any
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "allocation": _by_option(self.options, self.allocation),
+            "shares": _by_option(self.options, self.shares),
+        }
+
+
+@dataclass
+class ScoreResult:
+    options: Sequence[str]
+    totals: Any  # weighted sum of scores
+    weight: Any  # weight of the ballots scoring each option
+    means: Any  # totals / weight, NaN when unscored
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "totals": _by_option(self.options, self.totals),
+            "weight": _by_option(self.options, self.weight),
+            "means": {
+                option: None if np.isnan(mean) else float(mean)
+                for option, mean in zip(self.options, self.means)
+            },
+        }
+
+
+# ------------------------------------------------------------------ #
+# Engines                                                            #
+# ------------------------------------------------------------------ #
+def instant_runoff(ballots: RankedBallots) -> RunoffResult:
+    """Weighted instant-runoff count.
+
+    A continuing option wins with more than half of the weight of the
+    non-exhausted ballots.  Otherwise the option with the lowest tally is
+    eliminated; ties go against the lower first-round tally, then the
+    higher option index.
+    """
+    rankings, weights = ballots.rankings, ballots.weights
+    count, depth = rankings.shape
+    option_count = len(ballots.options)
+    if option_count == 0:
+        return RunoffResult(ballots.options, None, [], [], float(weights.sum()))
+
+    continuing = np.ones(option_count, dtype=bool)
+    pointer = np.zeros(count, dtype=np.int64)
+    current = rankings[:, 0].copy() if depth else np.full(count, -1, dtype=np.int32)
+    placed = current >= 0
+    tallies = np.bincount(current[placed], weights[placed], minlength=option_count)
+    first_round = tallies.copy()
+
+    rounds: list[Any] = []
+    eliminated: list[int] = []
+    while True:
+        rounds.append(tallies.copy())
+        candidates = np.flatnonzero(continuing)
+        leader = candidates[np.argmax(tallies[candidates])]
+        if len(candidates) == 1 or tallies[leader] * 2 > tallies[candidates].sum():
+            break
+
+        order = np.lexsort((-candidates, first_round[candidates], tallies[candidates]))
+        loser = int(candidates[order[0]])
+        continuing[loser] = False
+        eliminated.append(loser)
+        tallies[loser] = 0.0
+
+        # Move only the ballots sitting on the loser to their next
+        # continuing preference (or exhaust them).
+        moved = np.flatnonzero(current == loser)
+        pending = moved
+        while pending.size:
+            pointer[pending] += 1
+            choice = np.full(pending.size, -1, dtype=np.int32)
+            inside = pointer[pending] < depth
+            choice[inside] = rankings[pending[inside], pointer[pending[inside]]]
+            skip = (choice >= 0) & ~continuing[np.maximum(choice, 0)]
+            current[pending[~skip]] = choice[~skip]
+            pending = pending[skip]
+        landed = current[moved]
+        placed = landed >= 0
+        tallies += np.bincount(landed[placed], weights[moved][placed], minlength=option_count)
+
+    exhausted = float(weights[current < 0].sum())
+    return RunoffResult(ballots.options, int(leader), eliminated, rounds, exhausted)
+
+
+def pairwise(ballots: RankedBallots, *, chunk_size: int = PAIRWISE_CHUNK_SIZE) -> PairwiseResult:
+    """Pairwise matrix, Borda scores and Condorcet winner in one pass.
+
+    A ranked option beats every unranked one; two unranked options tie.
+    Borda gives ``options - 1 - position`` points to each ranked option.
+    """
+    rankings, weights = ballots.rankings, ballots.weights
+    depth = rankings.shape[1]
+    option_count = len(ballots.options)
+    matrix = np.zeros((option_count, option_count))
+    borda = np.zeros(option_count)
+
+    for start in range(0, len(rankings), chunk_size):
+        chunk = rankings[start : start + chunk_size]
+        chunk_weights = weights[start : start + chunk_size]
+        position = np.full((len(chunk), option_count), depth, dtype=np.int32)
+        rows, ranks = np.nonzero(chunk >= 0)
+        position[rows, chunk[rows, ranks]] = ranks
+        borda += chunk_weights @ np.where(
+            position < depth, option_count - 1 - position, 0
+        )
+        preferred = position[:, :, None] < position[:, None, :]
+        matrix += np.tensordot(chunk_weights, preferred, axes=1)
+
+    beats = (matrix > matrix.T).sum(axis=1)
+    winners = np.flatnonzero(beats == option_count - 1)
+    condorcet = int(winners[0]) if len(winners) else None
+    return PairwiseResult(ballots.options, matrix, borda, condorcet)
+
+
+def budget_allocation(ballots: ScoredBallots, budget: float | None = None) -> BudgetResult:
+    """Weighted mean of the ballots' budget shares, scaled to ``budget``.
+
+    Without ``budget`` the allocation is expressed in shares (summing to 1).
+    Ballots allocating nothing are ignored.
+    """
+    amounts = np.nan_to_num(ballots.scores, nan=0.0).clip(min=0.0)
+    spent = amounts.sum(axis=1)
+    valid = spent > 0
+    shares = np.zeros(len(ballots.options))
+    total_weight = ballots.weights[valid].sum()
+    if total_weight > 0:
+        shares = (ballots.weights[valid] @ (amounts[valid] / spent[valid, None])) / total_weight
+    allocation = shares * (1.0 if budget is None else budget)
+    return BudgetResult(ballots.options, allocation, shares)
+
+
+def score_totals(ballots: ScoredBallots) -> ScoreResult:
+    """Weighted sums and means per option (approval, rating)."""
+    scored = ~np.isnan(ballots.scores)
+    totals = ballots.weights @ np.where(scored, ballots.scores, 0.0)
+    weight = ballots.weights @ scored
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(weight > 0, totals / weight, np.nan)
+    return ScoreResult(ballots.options, totals, weight, means)
+
+
+TALLY_ENGINES: dict[str, Callable[..., Any]] = {
+    VoteModality.APPROVAL: score_totals,
+    VoteModality.RATING: score_totals,
+    VoteModality.RANKING: pairwise,
+    VoteModality.PREFERENTIAL: instant_runoff,
+    VoteModality.BUDGET: budget_allocation,
+}
+
+
+def tally(modality: str, ballots, **options):
+    """Run the engine of ``modality`` on ``ballots``."""
+    try:
+        engine = TALLY_ENGINES[modality]
+    except KeyError:
+        raise ValueError(f"No tally engine for modality {modality!r}.") from None
+    return engine(ballots, **options)
+
+
+# ------------------------------------------------------------------ #
+# Ballots from votes                                                 #
+# ------------------------------------------------------------------ #
+def _cast_weights(user_index, raw, weighted, user_ids: list[int], consultation_id):
+    """The advisory weight each ballot was cast with.
+
+    Read from the ballot's row with the largest ``|raw_value|``, where the
+    rounding of ``weighted_value`` matters least; ballots whose rows are all
+    zero fall back to the voter's current advisory weight.
+    """
+    weights = np.full(len(user_ids), np.nan)
+    order = np.lexsort((np.abs(raw), user_index))
+    last = np.append(user_index[order][1:] != user_index[order][:-1], True)
+    rows = order[last]
+    rows = rows[raw[rows] != 0]
+    weights[user_index[rows]] = np.round(weighted[rows] / raw[rows], 4)
+    missing = np.flatnonzero(np.isnan(weights))
+    if missing.size:
+        weights[missing] = advisory_weights([user_ids[index] for index in missing], consultation_id)
+    return weights
+
+
+def _ballots(modality: str, labels: list[str], rows: list[tuple], consultation_id):
+    users, option, raw, weighted = (np.array(column) for column in zip(*rows))
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    weights = _cast_weights(user_index, raw, weighted, user_ids.tolist(), consultation_id)
+
+    if modality in RANKED_MODALITIES:
+        ranked = raw > 0
+        order = np.lexsort((option[ranked], raw[ranked], user_index[ranked]))
+        ballot = user_index[ranked][order]
+        position = np.arange(len(ballot)) - np.searchsorted(ballot, ballot)
+        rankings = np.full((len(user_ids), position.max(initial=-1) + 1), -1, dtype=np.int32)
+        rankings[ballot, position] = option[ranked][order]
+        return RankedBallots(options=labels, rankings=rankings, weights=weights)
+
+    scores = np.full((len(user_ids), len(labels)), np.nan)
+    scores[user_index, option] = raw
+    return ScoredBallots(options=labels, scores=scores, weights=weights)
+
+
+def consultation_ballots(
+    consultation_id, *, until: datetime | None = None
+) -> dict[str, RankedBallots | ScoredBallots]:
+    """Ballots cast on the options of ``consultation_id``, by modality.
+
+    ``until`` leaves out votes created after it.  Must run inside
+    ``ekoh_smartvote_db_scope()``.
+    """
+    options = list(
+        ConsultationOption.objects.filter(consultation_id=consultation_id).values_list(
+            "target_id", "label"
+        )
+    )
+    if not options:
+        return {}
+    labels = [label for _target_id, label in options]
+    option_index = {target_id: index for index, (target_id, _label) in enumerate(options)}
+
+    votes = Vote.objects.filter(target_type=TARGET_TYPE, target_id__in=list(option_index))
+    if until is not None:
+        votes = votes.filter(created_at__lte=until)
+    rows_by_modality: dict[str, list[tuple]] = defaultdict(list)
+    for modality, user_id, target_id, raw, weighted in votes.values_list(
+        "modality_id", "user_id", "target_id", "raw_value", "weighted_value"
+    ).iterator(chunk_size=10_000):
+        rows_by_modality[modality].append(
+            (user_id, option_index[target_id], float(raw), float(weighted))
+        )
+    return {
+        modality: _ballots(modality, labels, rows, consultation_id)
+        for modality, rows in sorted(rows_by_modality.items())
+    }
+
+
+def tally_consultation(consultation_id, *, until: datetime | None = None) -> dict[str, Any]:
+    """Run the engine of each modality on the option ballots of a consultation.
+
+    ``budget_split`` is scaled to the ``budget`` parameter of its modality,
+    when set.  Must run inside ``ekoh_smartvote_db_scope()``.
+    """
+    ballots_by_modality = consultation_ballots(consultation_id, until=until)
+    parameters = dict(
+        VoteModality.objects.filter(name__in=list(ballots_by_modality)).values_list(
+            "name", "parameters"
+        )
+    )
+    results = {}
+    for modality, ballots in ballots_by_modality.items():
+        options = {}
+        budget = (parameters.get(modality) or {}).get("budget")
+        if modality == VoteModality.BUDGET and budget is not None:
+            options["budget"] = float(budget)
+        results[modality] = {
+            "ballot_count": len(ballots),
+            **tally(modality, ballots, **options).as_dict(),
+        }
+    return results
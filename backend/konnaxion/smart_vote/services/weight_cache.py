@@ -0,0 +1,179 @@
+"""Cross-process cache of EkoH weight inputs, versioned by generation counters.
+
+``weight_calculator`` caches three kinds of inputs here:
+
+``param``
+    ``ScoreConfiguration`` values by name.
+``relevance``
+    A consultation's relevance vector, by consultation id.
+``expertise``
+    A user's normalised expertise vector, by user id.
+
+Entries live in the Django cache named by ``SMART_VOTE_WEIGHT_CACHE_ALIAS``:
+Redis in production (shared by every gunicorn and Celery worker), local
+memory in tests and development.  Each entry's key embeds three generation
+counters: a global one (``clear_weight_caches``), one per kind and one per
+entity.  A write bumps the narrowest counter that covers it, so stale entries
+become unreachable everywhere at once and simply expire; nothing is deleted.
+
+Counters are bumped immediately and again when the writing transaction
+commits.  The second bump drops any value another worker read from the
+database between the first bump and the commit.  A counter missing from the
+cache restarts from the current time in nanoseconds, never from a value it
+may already have had.
+
+Hits and misses are counted per process and added to shared counters every
+``STATS_FLUSH_EVERY`` lookups; ``stats()`` reports both.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+PREFIX = "sv_weight"
+KINDS = ("param", "relevance", "expertise")
+STATS_FLUSH_EVERY = 100
+
+T = TypeVar("T")
+_MISSING = object()
+_local_stats: Counter = Counter()
+_pending_stats: Counter = Counter()
+
+
+def _cache():
+    return caches[getattr(settings, "SMART_VOTE_WEIGHT_CACHE_ALIAS", "default")]
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "SMART_VOTE_WEIGHT_CACHE_TIMEOUT", 86_400))
+
+
+def _generation_keys(kind: str, entity) -> list[str]:
+    return [
+        f"{PREFIX}:gen",
+        f"{PREFIX}:gen:{kind}",
+        f"{PREFIX}:gen:{kind}:{entity}",
+    ]
+
+
+def _generations(cache, keys: list[str]) -> list[int] | None:
+    """Current counters for ``keys``, starting missing ones; ``None`` if unavailable."""
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    values = [found[key] for key in keys]
+    return None if None in values else values
+
+
+def _record(kind: str, outcome: str) -> None:
+    _local_stats[(kind, outcome)] += 1
+    _pending_stats[(kind, outcome)] += 1
+    if sum(_pending_stats.values()) >= STATS_FLUSH_EVERY:
+        flush_stats()
+
+
+def cached(kind: str, entity, loader: Callable[[], T]) -> T:
+    """Return the cached ``kind`` input of ``entity``, loading it on a miss."""
+    cache = _cache()
+    generations = _generations(cache, _generation_keys(kind, entity))
+    if generations is None:
+        # Cache unreachable (IGNORE_EXCEPTIONS): read through.
+        _record(kind, "miss")
+        return loader()
+
+    key = f"{PREFIX}:{kind}:{entity}:" + ".".join(str(value) for value in generations)
+    boxed = cache.get(key, _MISSING)
+    if boxed is not _MISSING:
+        _record(kind, "hit")
+        return boxed[0]
+
+    _record(kind, "miss")
+    value = loader()
+    # Boxed so that a cached ``None`` is told apart from a miss.
+    cache.set(key, (value,), timeout=_timeout())
+    return value
+
+
+def _bump(key: str) -> None:
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate(kind: str | None = None, entity=None) -> None:
+    """Retire cached inputs: one entity, a whole kind, or (no args) everything."""
+    if kind is None:
+        key = f"{PREFIX}:gen"
+    elif entity is None:
+        key = f"{PREFIX}:gen:{kind}"
+    else:
+        key = f"{PREFIX}:gen:{kind}:{entity}"
+    _bump(key)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(key))
+
+
+# ------------------------------------------------------------------ #
+# Metrics                                                            #
+# ------------------------------------------------------------------ #
+def flush_stats() -> None:
+    """Add this process's pending hit/miss counts to the shared counters."""
+    cache = _cache()
+    pending = dict(_pending_stats)
+    _pending_stats.clear()
+    for (kind, outcome), count in pending.items():
+        key = f"{PREFIX}:stats:{kind}:{outcome}"
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+
+
+def stats() -> dict[str, Any]:
+    """Hit/miss counts per kind, for this process and across all of them."""
+    flush_stats()
+    shared_keys = {
+        (kind, outcome): f"{PREFIX}:stats:{kind}:{outcome}"
+        for kind in KINDS
+        for outcome in ("hit", "miss")
+    }
+    shared = _cache().get_many(list(shared_keys.values()))
+
+    def summary(counts) -> dict[str, dict[str, float]]:
+        result = {}
+        for kind in KINDS:
+            hits, misses = counts(kind, "hit"), counts(kind, "miss")
+            total = hits + misses
+            result[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / total if total else 0.0,
+            }
+        return result
+
+    return {
+        "process": summary(lambda kind, outcome: _local_stats[(kind, outcome)]),
+        "shared": summary(
+            lambda kind, outcome: shared.get(shared_keys[(kind, outcome)], 0)
+        ),
+    }
+
+
+def reset_stats() -> None:
+    """Zero the per-process and shared counters."""
+    _local_stats.clear()
+    _pending_stats.clear()
+    _cache().delete_many(
+        [f"{PREFIX}:stats:{kind}:{outcome}" for kind in KINDS for outcome in ("hit", "miss")]
+    )
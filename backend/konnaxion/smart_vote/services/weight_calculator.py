@@ -12,35 +12,57 @@ this reading and receives only a bounded contextual bonus:
     W[u,c] = 1 + min(sum_d R[c,d] * S[u,d], cap) * E[u]
 
 New EkoH scores are normalized to 0..1.  Legacy 0..100 values are normalized
-at read time so old rows do not create extreme multipliers.
+at read time so old rows do not create extreme multipliers.  Relevance may
+name a category at any ISCED depth; ``S[u,d]`` is then the user's roll-up of
+that subtree (``konnaxion.ekoh.services.rollups``).
+
+Bulk weights are computed on scaled integers (``fixed_point``) and returned
+as ``Decimal``; ``advisory_weights_decimal`` is the reference they match.
+
+Configuration values, relevance vectors and expertise vectors are cached
+across processes by ``weight_cache``; writes to their models bump the
+matching generation (see ``konnaxion.smart_vote.signals``).
 """
 
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from decimal import Decimal
-from functools import lru_cache
-from typing import Dict
+from typing import Dict, Iterable, Mapping
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
 from konnaxion.ekoh.models.config import ScoreConfiguration
-from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.models.scores import UserEthicsScore
+from konnaxion.ekoh.services.rollups import effective_scores
 from konnaxion.smart_vote.models.consultation_relevance import ConsultationRelevance
+from konnaxion.smart_vote.services import fixed_point, weight_cache
 
 LOGGER = logging.getLogger(__name__)
 
 ONE = Decimal("1.0")
 ZERO = Decimal("0.0")
 HUNDRED = Decimal("100.0")
+QUANTUM = Decimal("0.0001")
+
+
+@dataclass(frozen=True)
+class AdvisoryWeight:
+    """Alignment and advisory reading weight for one user/consultation pair."""
+
+    alignment: Decimal
+    weight: Decimal
+
+
+def _load_param(name: str) -> Decimal | None:
+    obj = ScoreConfiguration.objects.filter(weight_name=name).first()
+    return None if obj is None else Decimal(obj.weight_value)
 
 
-@lru_cache(maxsize=32)
 def _fetch_param(name: str, default: Decimal = ONE) -> Decimal:
     """Read a numeric runtime parameter without hitting DB at import time."""
-    obj = ScoreConfiguration.objects.filter(weight_name=name).first()
-    if obj is None:
-        return default
-    return Decimal(obj.weight_value)
+    value = weight_cache.cached("param", name, lambda: _load_param(name))
+    return default if value is None else value
 
 
 def expertise_bonus_cap() -> Decimal:
@@ -49,8 +71,7 @@ def expertise_bonus_cap() -> Decimal:
     return max(ZERO, value)
 
 
-@lru_cache(maxsize=512)
-def _relevance_vector(consultation_id) -> Dict[int, Decimal]:
+def _load_relevance_vector(consultation_id) -> Dict[int, Decimal]:
     rows = ConsultationRelevance.objects.filter(
         consultation_id=consultation_id
     ).values_list("category_id", "weight")
@@ -60,6 +81,12 @@ def _relevance_vector(consultation_id) -> Dict[int, Decimal]:
     }
 
 
+def _relevance_vector(consultation_id) -> Dict[int, Decimal]:
+    return weight_cache.cached(
+        "relevance", consultation_id, lambda: _load_relevance_vector(consultation_id)
+    )
+
+
 def _normalise_expertise_score(value: Decimal) -> Decimal:
     """Accept current 0..1 scores and safely read legacy 0..100 rows."""
     value = max(ZERO, Decimal(value))
@@ -68,16 +95,14 @@ def _normalise_expertise_score(value: Decimal) -> Decimal:
     return min(ONE, value)
 
 
-@lru_cache(maxsize=5_000)
+def _load_expertise_vector(user_id: int) -> Dict[int, Decimal]:
+    return effective_scores([user_id]).get(user_id, {})
+
+
 def _expertise_vector(user_id: int) -> Dict[int, Decimal]:
-    rows = UserExpertiseScore.objects.filter(user_id=user_id).values_list(
-        "category_id",
-        "weighted_score",
+    return weight_cache.cached(
+        "expertise", user_id, lambda: _load_expertise_vector(user_id)
     )
-    return {
-        cid: _normalise_expertise_score(Decimal(score))
-        for cid, score in rows
-    }
 
 
 def _ethics_multiplier(user_id: int) -> Decimal:
@@ -95,7 +120,7 @@ def _get_expertise_alignment_core(user_id: int, consultation_id) -> Decimal:
         rel_vec.get(category_id, ZERO) * exp_vec.get(category_id, ZERO)
         for category_id in rel_vec
     )
-    return max(ZERO, Decimal(dot)).quantize(Decimal("0.0001"))
+    return max(ZERO, Decimal(dot)).quantize(QUANTUM)
 
 
 def get_expertise_alignment(user_id: int, consultation_id) -> Decimal:
@@ -114,7 +139,7 @@ def get_weight(user_id: int, consultation_id) -> Decimal:
         alignment = _get_expertise_alignment_core(user_id, consultation_id)
         bonus = min(alignment, expertise_bonus_cap())
         ethics = _ethics_multiplier(user_id)
-        weight = (ONE + bonus * ethics).quantize(Decimal("0.0001"))
+        weight = (ONE + bonus * ethics).quantize(QUANTUM)
 
     LOGGER.debug(
         "Smart Vote advisory weight u=%s c=%s alignment=%s bonus=%s ethics=%s => %s",
@@ -128,8 +153,117 @@ def get_weight(user_id: int, consultation_id) -> Decimal:
     return weight
 
 
+def get_weights_bulk(
+    user_ids: Iterable[int],
+    consultation_id,
+) -> Dict[int, AdvisoryWeight]:
+    """Return alignment and advisory weight for a whole population.
+
+    Equivalent to calling ``get_expertise_alignment`` and ``get_weight`` for
+    every user, but with a constant number of queries: the relevance vector,
+    expertise and roll-up queries restricted to the relevant categories and
+    one ethics query, all inside a single schema scope.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+
+    with ekoh_smartvote_db_scope():
+        rel_vec = _relevance_vector(consultation_id)
+        cap = expertise_bonus_cap()
+
+        expertise_by_user: Dict[int, Dict[int, Decimal]] = {}
+        if rel_vec:
+            expertise_by_user = effective_scores(user_ids, list(rel_vec))
+
+        ethics_by_user = {
+            user_id: max(ZERO, Decimal(score))
+            for user_id, score in UserEthicsScore.objects.filter(
+                user_id__in=user_ids
+            ).values_list("user_id", "ethical_score")
+        }
+
+    weights = advisory_weights(user_ids, rel_vec, expertise_by_user, ethics_by_user, cap)
+
+    LOGGER.debug(
+        "Smart Vote bulk advisory weights c=%s users=%s",
+        consultation_id,
+        len(weights),
+    )
+    return weights
+
+
+def advisory_weights_decimal(
+    user_ids: Iterable[int],
+    rel_vec: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    cap: Decimal,
+) -> Dict[int, AdvisoryWeight]:
+    """Reference ``Decimal`` computation of ``W[u,c]`` over loaded vectors."""
+    weights: Dict[int, AdvisoryWeight] = {}
+    for user_id in user_ids:
+        exp_vec = expertise_by_user.get(user_id, {})
+        dot = sum(
+            rel_vec[category_id] * exp_vec.get(category_id, ZERO)
+            for category_id in rel_vec
+        )
+        alignment = max(ZERO, Decimal(dot)).quantize(QUANTUM)
+        bonus = min(alignment, cap)
+        ethics = ethics_by_user.get(user_id, ONE)
+        weights[user_id] = AdvisoryWeight(
+            alignment=alignment,
+            weight=(ONE + bonus * ethics).quantize(QUANTUM),
+        )
+    return weights
+
+
+def advisory_weights(
+    user_ids: Iterable[int],
+    rel_vec: Mapping[int, Decimal],
+    expertise_by_user: Mapping[int, Mapping[int, Decimal]],
+    ethics_by_user: Mapping[int, Decimal],
+    cap: Decimal,
+) -> Dict[int, AdvisoryWeight]:
+    """``advisory_weights_decimal`` on scaled integers; identical results.
+
+    Inputs that do not fit the ``fixed_point`` slots are computed by the
+    Decimal reference instead.
+    """
+    user_ids = list(user_ids)
+    scores = fixed_point.Scaled(fixed_point.SCORE_PLACES)
+    ethics_values = fixed_point.Scaled(fixed_point.ETHICS_PLACES)
+    try:
+        rel_fixed = [
+            (category_id, fixed_point.scale(weight, fixed_point.RELEVANCE_PLACES))
+            for category_id, weight in rel_vec.items()
+        ]
+        cap_fixed = fixed_point.scale(cap, fixed_point.WEIGHT_PLACES)
+        scaled = []
+        for user_id in user_ids:
+            exp_vec = expertise_by_user.get(user_id, {})
+            dot = sum(
+                rel * scores[exp_vec[category_id]]
+                for category_id, rel in rel_fixed
+                if category_id in exp_vec
+            )
+            ethics = ethics_values[ethics_by_user.get(user_id, ONE)]
+            alignment = fixed_point.alignment(dot)
+            scaled.append(
+                (user_id, alignment, fixed_point.weight(alignment, cap_fixed, ethics))
+            )
+    except fixed_point.NotRepresentable:
+        return advisory_weights_decimal(
+            user_ids, rel_vec, expertise_by_user, ethics_by_user, cap
+        )
+
+    unscaled = fixed_point.Unscaled(fixed_point.WEIGHT_PLACES)
+    return {
+        user_id: AdvisoryWeight(alignment=unscaled[alignment], weight=unscaled[weight])
+        for user_id, alignment, weight in scaled
+    }
+
+
 def clear_weight_caches() -> None:
-    """Clear cached relevance/expertise/config values after profile changes."""
-    _fetch_param.cache_clear()
-    _relevance_vector.cache_clear()
-    _expertise_vector.cache_clear()
+    """Retire every cached relevance/expertise/config value, in all processes."""
+    weight_cache.invalidate()
@@ -0,0 +1,139 @@
+"""Keep derived Smart Vote readings in step with their inputs.
+
+* materialized readings (``reading_cache``) are invalidated;
+* running topic aggregates (``reading_aggregates``) are adjusted in the same
+  transaction as the write that changed them;
+* materialised consultation weights (``consultation_weights``) are refreshed
+  per user, or marked for rebuild when every row is affected;
+* cached weight inputs (``weight_cache``) move to a new generation;
+* a stance changed after its consultation closed keeps its previous value
+  for the finaliser (``stance_revisions``).
+
+Queryset ``update()``/``bulk_create()`` bypass model signals; bulk writers of
+these models must call the services directly or run
+``reconcile_reading_aggregates`` afterwards.  The EkoH score rebuild sends
+``expertise_scores_changed`` for the pairs it changed.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.config import ScoreConfiguration
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.signals import expertise_scores_changed
+from konnaxion.ethikos.models import EthikosStance
+from konnaxion.smart_vote.models import ConsultationRelevance, SourceConsultationBinding
+from konnaxion.smart_vote.services import (
+    consultation_weights,
+    reading_aggregates,
+    reading_cache,
+    stance_revisions,
+    weight_cache,
+)
+
+
+@receiver(pre_save, sender=EthikosStance)
+@receiver(pre_delete, sender=EthikosStance)
+def _stance_replaced(sender, instance, signal, **kwargs) -> None:
+    with ekoh_smartvote_db_scope():
+        stance_revisions.record_previous(instance, deleting=signal is pre_delete)
+
+
+@receiver(post_save, sender=EthikosStance)
+def _stance_saved(sender, instance, **kwargs) -> None:
+    with ekoh_smartvote_db_scope():
+        reading_cache.invalidate_topic(instance.topic_id)
+        reading_aggregates.apply_stance_change(
+            instance.topic_id, instance.user_id, instance.value
+        )
+
+
+@receiver(post_delete, sender=EthikosStance)
+def _stance_deleted(sender, instance, **kwargs) -> None:
+    with ekoh_smartvote_db_scope():
+        reading_cache.invalidate_topic(instance.topic_id)
+        reading_aggregates.apply_stance_change(instance.topic_id, instance.user_id, None)
+
+
+def _user_scores_changed(user_id: int, *, category_id: int | None = None) -> None:
+    with ekoh_smartvote_db_scope():
+        topic_ids = reading_cache.topics_affected_by_user_scores(
+            user_id, category_id=category_id
+        )
+        reading_cache.invalidate_sources(
+            reading_cache.SOURCE_TYPE_ETHIKOS_TOPIC, topic_ids
+        )
+        reading_aggregates.refresh_user_contributions(user_id, topic_ids)
+        consultation_weights.refresh_user_weights(user_id, category_id=category_id)
+
+
+@receiver(post_save, sender=UserExpertiseScore)
+@receiver(post_delete, sender=UserExpertiseScore)
+def _expertise_changed(sender, instance, **kwargs) -> None:
+    weight_cache.invalidate("expertise", instance.user_id)
+    _user_scores_changed(instance.user_id, category_id=instance.category_id)
+
+
+@receiver(expertise_scores_changed)
+def _expertise_bulk_changed(sender, pairs, **kwargs) -> None:
+    # One lookup, invalidation and weight refresh for the whole batch rather
+    # than per (user, category) pair.
+    categories_by_user: dict[int, set[int]] = defaultdict(set)
+    for user_id, category_id in pairs:
+        categories_by_user[user_id].add(category_id)
+    for user_id in categories_by_user:
+        weight_cache.invalidate("expertise", user_id)
+    with ekoh_smartvote_db_scope():
+        topics_by_user = reading_cache.topics_affected_by_expertise(categories_by_user)
+        reading_cache.invalidate_sources(
+            reading_cache.SOURCE_TYPE_ETHIKOS_TOPIC,
+            {topic_id for topic_ids in topics_by_user.values() for topic_id in topic_ids},
+        )
+        for user_id, topic_ids in topics_by_user.items():
+            reading_aggregates.refresh_user_contributions(user_id, topic_ids)
+        consultation_weights.refresh_expertise_weights(categories_by_user)
+
+
+@receiver(post_save, sender=UserEthicsScore)
+@receiver(post_delete, sender=UserEthicsScore)
+def _ethics_changed(sender, instance, **kwargs) -> None:
+    _user_scores_changed(instance.user_id)
+
+
+@receiver(post_save, sender=ConsultationRelevance)
+@receiver(post_delete, sender=ConsultationRelevance)
+def _relevance_changed(sender, instance, **kwargs) -> None:
+    weight_cache.invalidate("relevance", instance.consultation_id)
+    with ekoh_smartvote_db_scope():
+        source_ids = reading_cache.topics_for_consultation(instance.consultation_id)
+        reading_cache.invalidate_sources(
+            reading_cache.SOURCE_TYPE_ETHIKOS_TOPIC, source_ids
+        )
+        reading_aggregates.mark_stale(source_ids)
+        consultation_weights.invalidate_consultation_weights([instance.consultation_id])
+
+
+@receiver(post_save, sender=ScoreConfiguration)
+@receiver(post_delete, sender=ScoreConfiguration)
+def _score_configuration_changed(sender, instance, **kwargs) -> None:
+    # EKOH_MULTIPLIER_CAP and friends apply to every weight, so to every
+    # materialised weight, reading and running aggregate.
+    weight_cache.invalidate("param")
+    with ekoh_smartvote_db_scope():
+        consultation_weights.invalidate_consultation_weights()
+        reading_cache.invalidate_sources(reading_cache.SOURCE_TYPE_ETHIKOS_TOPIC, None)
+        reading_aggregates.mark_stale()
+
+
+@receiver(post_save, sender=SourceConsultationBinding)
+def _binding_changed(sender, instance, **kwargs) -> None:
+    # ``metadata_json`` carries lens configuration such as advisory exclusions.
+    with ekoh_smartvote_db_scope():
+        reading_cache.invalidate_sources(instance.source_type, [instance.source_id])
+        if instance.source_type == reading_cache.SOURCE_TYPE_ETHIKOS_TOPIC:
+            reading_aggregates.mark_stale([instance.source_id])
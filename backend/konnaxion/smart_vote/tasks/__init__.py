@@ -9,22 +9,100 @@ from __future__ import annotations
 
 from celery import shared_task
 
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote import events as _events
+from konnaxion.smart_vote.events import consumer as _events_consumer
+from konnaxion.smart_vote.services import consultation_weights as _consultation_weights
+from konnaxion.smart_vote.services import finaliser as _finaliser
+from konnaxion.smart_vote.services import ledger as _ledger
+from konnaxion.smart_vote.services import partitions as _partitions
+
 from .aggregator import aggregate_votes as _aggregate_votes
 
 
 @shared_task(name="vote_aggregate")
-def vote_aggregate(batch_size: int = 5_000) -> None:
+def vote_aggregate(batch_size: int = 50_000, max_batches: int = 100) -> int:
     """
     Periodic Smart-Vote aggregation task.
 
     Delegates to `aggregator.aggregate_votes`, which:
-      1. Reads new votes since last cursor.
-      2. Aggregates weighted scores per (target_type, target_id).
-      3. Upserts into `vote_result`.
+      1. Claims a `vote` partition checkpoint no other worker holds.
+      2. Aggregates weighted scores of newer votes per (target_type, target_id).
+      3. Adds them to `vote_result` with one set-based upsert per batch and
+         advances the checkpoint in the same transaction.
+
+    Several workers may run it concurrently; they process disjoint partitions.
 
     Parameters
     ----------
     batch_size : int
-        Maximum number of votes to process per run.
+        Number of votes folded per statement.
+    max_batches : int
+        Maximum number of batches per run.
+    """
+    return _aggregate_votes(batch_size=batch_size, max_batches=max_batches)
+
+
+@shared_task(name="vote_events_consume")
+def vote_events_consume(max_events: int = 10_000) -> int:
+    """
+    Relay the vote-event outbox, then fold published events into `vote_result`.
+
+    Runs only while `SMART_VOTE_EVENT_BUS` is set; the relay republishes
+    events missed after commit, and offsets are committed with the upsert
+    (see events.outbox and events.consumer).  Deployments wanting sub-second
+    latency run the `consume_vote_events` command instead.
+    """
+    if not _events.event_bus_enabled():
+        return 0
+    _events.relay_outbox()
+    return _events_consumer.consume_once(max_events=max_events)
+
+
+@shared_task(name="vote_ledger_write")
+def vote_ledger_write(batch_size: int = 10_000, max_batches: int = 100) -> int:
+    """
+    Hash settled votes into `vote_ledger` as chained Merkle batches.
+
+    One `LedgerBatch` anchor row per batch (see services.ledger).  Returns
+    the number of votes ledgered.
+    """
+    return _ledger.write_ledger(batch_size=batch_size, max_batches=max_batches)
+
+
+@shared_task(name="vote_partition_maintenance")
+def vote_partition_maintenance() -> dict[str, int]:
+    """
+    Daily partition upkeep for `vote` and `vote_ledger`.
+
+    Pre-creates the next `SMART_VOTE_PARTITION_MONTHS_AHEAD` monthly
+    partitions and archives those older than
+    `SMART_VOTE_PARTITION_RETENTION_MONTHS` (see services.partitions).
+    """
+    with ekoh_smartvote_db_scope():
+        created = _partitions.ensure_future_partitions()
+    archived = _partitions.archive_expired_partitions()
+    return {"created": len(created), "archived": len(archived)}
+
+
+@shared_task(name="consultation_weights_build")
+def consultation_weights_build() -> int:
+    """
+    Materialise advisory weights for consultations that have opened.
+
+    Also rebuilds consultations whose weights were invalidated by a relevance
+    or score-configuration change.  Returns the number of consultations built.
+    """
+    return _consultation_weights.build_pending_consultation_weights()
+
+
+@shared_task(name="consultation_finalise")
+def consultation_finalise(limit: int = 100) -> int:
+    """
+    Write the final results of consultations that have closed.
+
+    Snapshots each due consultation at `closes_at` and stores its modality
+    tallies and readings as immutable `ConsultationResult` rows (see
+    services.finaliser).  Returns the number of consultations finalised.
     """
-    _aggregate_votes(batch_size=batch_size)
+    return _finaliser.finalise_due_consultations(limit=limit)
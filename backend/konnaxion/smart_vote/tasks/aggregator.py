@@ -2,9 +2,25 @@
 """
 Aggregator logic:
 
-1. Pulls Vote rows created since the last run (uses id > cursor).
-2. Sums their weighted values per (target_type, target_id) combination.
-3. UPSERTs into vote_result (sum_weighted_value, vote_count).
+1. Claims a monthly ``vote`` partition whose checkpoint no other worker holds
+   (``SELECT ... FOR UPDATE SKIP LOCKED`` on ``AggregationCheckpoint``).
+2. Sums the weighted values of the partition's votes past the checkpoint per
+   (target_type, target_id) combination.
+3. UPSERTs into vote_result, adding to the existing sums and counts, and
+   advances the checkpoint in the same transaction.
+
+Steps 2-3 run as a single ``INSERT ... SELECT ... GROUP BY ... ON CONFLICT``
+statement per batch, so the vote rows never leave PostgreSQL.  Several
+workers can run the task concurrently; each works on different partitions.
+
+Vote ids come from a sequence, so a vote can commit after a higher id has
+already been aggregated.  Votes are therefore walked in ``(xact_id, id)``
+order and only up to the oldest transaction that may still be running
+(``SETTLED_HORIZON_SQL``, see ``models.checkpoint``), so a vote cannot
+commit behind the checkpoint whatever the length of its transaction.
+
+While a vote-event bus is configured (``SMART_VOTE_EVENT_BUS``) the events
+consumer owns ``vote_result`` and this routine does nothing.
 
 This module contains plain Python logic (no Celery task here).
 The Celery task wrapper lives in konnaxion.smart_vote.tasks.__init__.
@@ -13,71 +29,150 @@ The Celery task wrapper lives in konnaxion.smart_vote.tasks.__init__.
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
-from decimal import Decimal
 
 from django.db import transaction, connection
 
-from konnaxion.smart_vote.models.core import Vote, VoteResult
+from konnaxion.ekoh.db import set_local_ekoh_smartvote_search_path
+from konnaxion.smart_vote.events import event_bus_enabled
+from konnaxion.smart_vote.models.checkpoint import (
+    SETTLED_HORIZON_SQL,
+    AggregationCheckpoint,
+)
 
 LOGGER = logging.getLogger(__name__)
-CURSOR_KEY = "ekoh_smartvote.last_vote_id"
+STREAM = "vote_aggregate"
+
+# One batch: the next ``batch_size`` settled votes of one partition after the
+# checkpoint, folded into vote_result.  ``batch`` is referenced three times,
+# so PostgreSQL materialises it once; the outer SELECT reports the batch size,
+# its last ``(xact_id, id)`` and the number of targets.
+AGGREGATE_BATCH_SQL = """
+WITH horizon AS ({horizon}),
+batch AS (
+    SELECT vote.id, vote.xact_id, vote.target_type, vote.target_id, vote.weighted_value
+    FROM {partition} AS vote, horizon
+    WHERE (vote.xact_id, vote.id) > (%(last_xact_id)s, %(last_id)s)
+      AND vote.xact_id < horizon.xmin
+    ORDER BY vote.xact_id, vote.id
+    LIMIT %(batch_size)s
+),
+upserted AS (
+    INSERT INTO vote_result (target_type, target_id, sum_weighted_value, vote_count)
+    SELECT target_type, target_id, SUM(weighted_value), COUNT(*)
+    FROM batch
+    GROUP BY target_type, target_id
+    ON CONFLICT (target_type, target_id) DO UPDATE
+    SET sum_weighted_value = vote_result.sum_weighted_value
+                             + EXCLUDED.sum_weighted_value,
+        vote_count = vote_result.vote_count + EXCLUDED.vote_count
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM batch), last.xact_id, last.id,
+       (SELECT COUNT(*) FROM upserted)
+FROM (SELECT 1) AS one
+LEFT JOIN (
+    SELECT xact_id, id FROM batch ORDER BY xact_id DESC, id DESC LIMIT 1
+) AS last ON TRUE;
+"""
 
 
-def _load_cursor() -> int:
-    """Fetch last processed vote id from pg_settings (simple key-value)."""
+def vote_partitions() -> list[str]:
+    """Names of the partitions currently attached to ``vote``."""
     with connection.cursor() as cur:
         cur.execute(
-            "SELECT current_setting(%s, true);",
-            (CURSOR_KEY,),
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'vote'::regclass
+            ORDER BY child.relname
+            """
         )
-        row = cur.fetchone()
-    return int(row[0]) if row and row[0] else 0
+        return [row[0] for row in cur.fetchall()]
+
+
+def _claim_checkpoint(partitions: list[str], skip: set[int]):
+    """Lock the least recently advanced checkpoint no other worker holds."""
+    return (
+        AggregationCheckpoint.objects.select_for_update(skip_locked=True)
+        .filter(stream=STREAM, shard__in=partitions)
+        .exclude(pk__in=skip)
+        .order_by("updated_at")
+        .first()
+    )
+
 
+def _aggregate_batch(checkpoint: AggregationCheckpoint, batch_size: int) -> tuple[int, int]:
+    """Fold one batch of the checkpoint's partition into vote_result.
 
-def _save_cursor(vote_id: int) -> None:
+    Advances ``checkpoint`` without saving it; returns (votes, targets).
+    """
+    sql = AGGREGATE_BATCH_SQL.format(
+        horizon=SETTLED_HORIZON_SQL,
+        partition=connection.ops.quote_name(checkpoint.shard),
+    )
     with connection.cursor() as cur:
-        cur.execute("SELECT set_config(%s, %s, true);", (CURSOR_KEY, str(vote_id)))
+        cur.execute(
+            sql,
+            {
+                "last_xact_id": checkpoint.xact_id,
+                "last_id": checkpoint.position,
+                "batch_size": batch_size,
+            },
+        )
+        count, last_xact_id, last_id, targets = cur.fetchone()
+    if count:
+        checkpoint.xact_id, checkpoint.position = last_xact_id, last_id
+    return count, targets
 
 
-def aggregate_votes(batch_size: int = 5_000) -> None:
+def aggregate_votes(batch_size: int = 50_000, max_batches: int = 100) -> int:
     """
     Core aggregation routine.
 
     This is NOT a Celery task. It is invoked by the Celery task
     `vote_aggregate` defined in konnaxion.smart_vote.tasks.__init__.
-    """
-    last_id = _load_cursor()
-    LOGGER.debug("Vote aggregate start (cursor=%s)", last_id)
-
-    qs = Vote.objects.filter(id__gt=last_id).order_by("id")[:batch_size]
-    if not qs.exists():
-        LOGGER.debug("No new votes")
-        return
-
-    # 1) group by target
-    totals: dict[tuple[str, str], dict[str, Decimal | int]] = defaultdict(
-        lambda: {"sum": Decimal(0), "count": 0}
-    )
 
-    highest_id = last_id
-    for v in qs:
-        key = (v.target_type, str(v.target_id))
-        totals[key]["sum"] += v.weighted_value
-        totals[key]["count"] += 1
-        highest_id = max(highest_id, v.id)
+    Processes up to ``max_batches`` batches of ``batch_size`` votes, each in
+    its own transaction together with its checkpoint update, and returns the
+    number of votes aggregated.
+    """
+    if event_bus_enabled():
+        return 0
 
-    # 2) upsert
     with transaction.atomic():
-        for (t_type, t_id), agg in totals.items():
-            VoteResult.objects.update_or_create(
-                target_type=t_type,
-                target_id=t_id,
-                defaults={
-                    "sum_weighted_value": agg["sum"],
-                    "vote_count": agg["count"],
-                },
+        set_local_ekoh_smartvote_search_path()
+        partitions = vote_partitions()
+        AggregationCheckpoint.objects.bulk_create(
+            [AggregationCheckpoint(stream=STREAM, shard=name) for name in partitions],
+            ignore_conflicts=True,
+        )
+
+    processed = 0
+    drained: set[int] = set()
+    for _ in range(max_batches):
+        with transaction.atomic():
+            set_local_ekoh_smartvote_search_path()
+            checkpoint = _claim_checkpoint(partitions, drained)
+            if checkpoint is None:
+                break
+            count, targets = _aggregate_batch(checkpoint, batch_size)
+            checkpoint.save(update_fields=["position", "xact_id", "updated_at"])
+
+        if count < batch_size:
+            drained.add(checkpoint.pk)
+        if count:
+            processed += count
+            LOGGER.debug(
+                "Aggregated %s votes of %s into %s targets (checkpoint=%s)",
+                count,
+                checkpoint.shard,
+                targets,
+                checkpoint.position,
             )
-        _save_cursor(highest_id)
 
-    LOGGER.info("Aggregated %s votes up to id %s", len(qs), highest_id)
+    if processed:
+        LOGGER.info("Aggregated %s votes", processed)
+    else:
+        LOGGER.debug("No new votes")
+    return processed
@@ -0,0 +1,78 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.models import AggregationCheckpoint, VoteModality, VoteResult
+from konnaxion.smart_vote.tasks.aggregator import aggregate_votes
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def _insert_vote(user, target_id, weighted_value: str) -> None:
+    # ``vote`` is a partitioned table created by raw DDL in 0001.
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO vote (user_id, target_type, target_id, modality_name,
+                              raw_value, weighted_value, created_at)
+            VALUES (%s, 'consultation', %s, %s, 1, %s, clock_timestamp())
+            """,
+            (user.pk, target_id, VoteModality.APPROVAL, Decimal(weighted_value)),
+        )
+
+
+def _result(target_id):
+    with ekoh_smartvote_db_scope():
+        return VoteResult.objects.get(target_type="consultation", target_id=target_id)
+
+
+def test_aggregate_votes_accumulates_across_batches_and_runs():
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+    users = [User.objects.create_user(username=f"aggregate_vote_{idx}") for idx in range(4)]
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    for user, value in zip(users[:3], ("1.5000", "2.0000", "1.2500")):
+        _insert_vote(user, first, value)
+    _insert_vote(users[3], second, "1.0000")
+
+    assert aggregate_votes(batch_size=3) == 4
+    assert _result(first).sum_weighted_value == Decimal("4.7500")
+    assert _result(first).vote_count == 3
+    assert _result(second).vote_count == 1
+
+    _insert_vote(users[3], first, "1.1000")
+    assert aggregate_votes(batch_size=3) == 1
+    assert _result(first).sum_weighted_value == Decimal("5.8500")
+    assert _result(first).vote_count == 4
+
+    assert aggregate_votes(batch_size=3) == 0
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute("SELECT MAX(id) FROM vote")
+        (highest_id,) = cur.fetchone()
+        checkpoint = AggregationCheckpoint.objects.get(stream="vote_aggregate")
+    assert checkpoint.position == highest_id
+
+
+def test_aggregate_votes_waits_for_running_transactions():
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+    voter = User.objects.create_user(username="aggregate_running")
+    target = uuid.uuid4()
+    _insert_vote(voter, target, "1.0000")
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        # Attribute the vote to a newer transaction, still running.
+        cur.execute(
+            "UPDATE vote SET xact_id = pg_current_xact_id()::text::bigint + 1 "
+            "WHERE target_id = %s",
+            [target],
+        )
+
+    assert aggregate_votes() == 0
+    with ekoh_smartvote_db_scope():
+        assert not VoteResult.objects.filter(target_id=target).exists()
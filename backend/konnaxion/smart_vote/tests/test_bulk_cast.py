@@ -0,0 +1,152 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APIClient
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    Vote,
+    VoteModality,
+)
+from konnaxion.smart_vote.services.ballot_ingest import weighted_value
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+URL = "/api/v1/smart-vote/cast/bulk/"
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def consultation():
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        domain = ExpertiseCategory.objects.create(
+            code="0612", name="Databases", depth=0, path="0612"
+        )
+        consultation = Consultation.objects.create(title="Bulk cast")
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("1.0")
+        )
+    return consultation, domain
+
+
+def _ballot(consultation, **extra):
+    return {
+        "consultation": str(consultation.pk),
+        "target_id": str(consultation.pk),
+        "modality": "approval",
+        "raw_value": "1",
+        **extra,
+    }
+
+
+def test_kiosk_bulk_cast_reports_per_ballot_outcomes(api_client, consultation):
+    consultation, domain = consultation
+    kiosk = User.objects.create_user(username="kiosk", is_staff=True)
+    expert, citizen, earlier = (
+        User.objects.create_user(username=name)
+        for name in ("bulk_expert", "bulk_citizen", "bulk_earlier")
+    )
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.create(
+            user=expert,
+            category=domain,
+            raw_score=Decimal("0.5"),
+            weighted_score=Decimal("0.5"),
+        )
+        Vote.objects.create(
+            user=earlier,
+            target_type="consultation",
+            target_id=consultation.pk,
+            modality_id="approval",
+            raw_value=Decimal("1"),
+            weighted_value=Decimal("1"),
+        )
+
+    api_client.force_authenticate(kiosk)
+    response = api_client.post(
+        URL,
+        {
+            "ballots": [
+                _ballot(consultation, user_id=expert.pk),
+                _ballot(consultation, user_id=citizen.pk),
+                _ballot(consultation, user_id=expert.pk),
+                _ballot(consultation, user_id=earlier.pk),
+                _ballot(consultation, user_id=citizen.pk, modality="coin_toss"),
+                _ballot(consultation, user_id=999_999),
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["created"] == 2
+    assert [row["status"] for row in payload["results"]] == [
+        "created",
+        "created",
+        "duplicate_in_request",
+        "already_voted",
+        "invalid",
+        "invalid",
+    ]
+    assert payload["results"][0]["weighted_value"] == "1.5000"
+    assert payload["results"][1]["weighted_value"] == "1.0000"
+    with ekoh_smartvote_db_scope():
+        assert Vote.objects.filter(target_id=consultation.pk).count() == 3
+
+
+def test_regular_user_cannot_cast_for_others(api_client, consultation):
+    consultation, _domain = consultation
+    voter = User.objects.create_user(username="bulk_self")
+    other = User.objects.create_user(username="bulk_other")
+
+    api_client.force_authenticate(voter)
+    response = api_client.post(
+        URL,
+        {
+            "ballots": [
+                _ballot(consultation),
+                _ballot(consultation, user_id=other.pk),
+            ]
+        },
+        format="json",
+    )
+
+    statuses = [row["status"] for row in response.json()["results"]]
+    assert statuses == ["created", "invalid"]
+
+
+def test_weighted_value_rounds_half_even():
+    assert weighted_value("0.5", Decimal("1.0001")) == Decimal("0.5000")
+    assert weighted_value("0.5", Decimal("1.0003")) == Decimal("0.5002")
+    assert weighted_value("-0.5", Decimal("1.0001")) == Decimal("-0.5000")
+
+
+def test_casts_hold_the_ballot_lock_until_commit(api_client, consultation):
+    consultation, _domain = consultation
+    voter = User.objects.create_user(username="single_cast")
+    api_client.force_authenticate(voter)
+
+    first = api_client.post("/api/v1/smart-vote/cast/", _ballot(consultation), format="json")
+    assert first.status_code == 201
+    # The test transaction is still open: the cast's advisory lock is held.
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM pg_locks "
+            "WHERE locktype = 'advisory' AND pid = pg_backend_pid()"
+        )
+        assert cur.fetchone()[0] == 1
+
+    repeat = api_client.post(URL, {"ballots": [_ballot(consultation)]}, format="json")
+    assert [row["status"] for row in repeat.json()["results"]] == ["already_voted"]
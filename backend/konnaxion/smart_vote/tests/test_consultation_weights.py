@@ -0,0 +1,140 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ekoh.signals import expertise_scores_changed
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    ConsultationWeight,
+)
+from konnaxion.smart_vote.services.consultation_weights import (
+    build_pending_consultation_weights,
+    lookup_weight,
+    lookup_weights,
+)
+from konnaxion.smart_vote.services.weight_calculator import get_weight
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def consultation_with_experts():
+    expert = User.objects.create_user(username="weights_expert")
+    citizen = User.objects.create_user(username="weights_citizen")
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code="0712", name="Energy", depth=0, path="0712"
+        )
+        consultation = Consultation.objects.create(title="Materialised weights")
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("0.8")
+        )
+        UserExpertiseScore.objects.create(
+            user=expert,
+            category=domain,
+            raw_score=Decimal("0.5"),
+            weighted_score=Decimal("0.5"),
+        )
+        UserEthicsScore.objects.create(user=expert, ethical_score=Decimal("1.5"))
+    return consultation, domain, expert, citizen
+
+
+def test_build_materialises_live_weights(consultation_with_experts):
+    consultation, _domain, expert, citizen = consultation_with_experts
+
+    assert build_pending_consultation_weights() == 1
+    with ekoh_smartvote_db_scope():
+        consultation.refresh_from_db()
+        rows = list(ConsultationWeight.objects.filter(consultation=consultation))
+    assert consultation.weights_built_at is not None
+    assert [row.user_id for row in rows] == [expert.pk]
+    assert rows[0].weight == get_weight(expert.pk, consultation.pk) == Decimal("1.6000")
+
+    assert lookup_weight(citizen.pk, consultation.pk).weight == Decimal("1.0000")
+    assert lookup_weights([expert.pk, citizen.pk], consultation.pk) == {
+        expert.pk: lookup_weight(expert.pk, consultation.pk),
+        citizen.pk: lookup_weight(citizen.pk, consultation.pk),
+    }
+
+
+def test_lookup_is_a_single_query_once_built(
+    consultation_with_experts, django_assert_max_num_queries
+):
+    consultation, _domain, expert, _citizen = consultation_with_experts
+    build_pending_consultation_weights()
+
+    # savepoint + SET LOCAL search_path + lookup + release
+    with django_assert_max_num_queries(4):
+        assert lookup_weight(expert.pk, consultation.pk).weight == Decimal("1.6000")
+
+
+def test_score_and_relevance_changes_keep_weights_current(consultation_with_experts):
+    consultation, domain, expert, citizen = consultation_with_experts
+    build_pending_consultation_weights()
+
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.create(
+            user=citizen,
+            category=domain,
+            raw_score=Decimal("0.25"),
+            weighted_score=Decimal("0.25"),
+        )
+        ethics = UserEthicsScore.objects.get(user=expert)
+        ethics.ethical_score = Decimal("0.5")
+        ethics.save()
+    assert lookup_weight(citizen.pk, consultation.pk).weight == Decimal("1.2000")
+    assert lookup_weight(expert.pk, consultation.pk).weight == Decimal("1.2000")
+
+    with ekoh_smartvote_db_scope():
+        relevance = ConsultationRelevance.objects.get(consultation=consultation)
+        relevance.weight = Decimal("1.0")
+        relevance.save()
+        consultation.refresh_from_db()
+    assert consultation.weights_built_at is None
+    # Not built: the live calculator answers until the next build.
+    assert lookup_weight(expert.pk, consultation.pk).weight == Decimal("1.2500")
+
+    build_pending_consultation_weights()
+    with ekoh_smartvote_db_scope():
+        stored = ConsultationWeight.objects.get(consultation=consultation, user=expert)
+    assert stored.weight == Decimal("1.2500")
+
+
+def test_bulk_rescore_refreshes_every_changed_user(consultation_with_experts):
+    consultation, domain, expert, citizen = consultation_with_experts
+    build_pending_consultation_weights()
+
+    # Set-based writes, as the nightly rebuild does: no model signals.
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.filter(user=expert).update(weighted_score=Decimal("0.25"))
+        UserExpertiseScore.objects.bulk_create(
+            [
+                UserExpertiseScore(
+                    user=citizen,
+                    category=domain,
+                    raw_score=Decimal("0.25"),
+                    weighted_score=Decimal("0.25"),
+                )
+            ]
+        )
+    expertise_scores_changed.send(
+        sender=UserExpertiseScore, pairs=[(expert.pk, domain.pk), (citizen.pk, domain.pk)]
+    )
+
+    with ekoh_smartvote_db_scope():
+        stored = dict(
+            ConsultationWeight.objects.filter(consultation=consultation).values_list(
+                "user_id", "weight"
+            )
+        )
+    assert stored == {
+        expert.pk: get_weight(expert.pk, consultation.pk),
+        citizen.pk: get_weight(citizen.pk, consultation.pk),
+    }
+    assert stored[expert.pk] < Decimal("1.6000")
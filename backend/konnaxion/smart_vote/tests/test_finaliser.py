@@ -0,0 +1,203 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.access import RatingVisibilitySetting
+from konnaxion.ekoh.models.audit import ScoreRevision
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopic
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    ConsultationOption,
+    ConsultationResult,
+    SourceConsultationBinding,
+    StanceRevision,
+    VoteModality,
+)
+from konnaxion.smart_vote.services.finaliser import finalise_due_consultations
+from konnaxion.smart_vote.services.reading_lenses import registered_lenses
+from konnaxion.smart_vote.services.reading_participants import participant_page
+from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def _insert_vote(
+    user, consultation, raw_value: str, created_at, *, target_id=None, modality=None
+) -> None:
+    # ``vote`` is a partitioned table created by raw DDL in 0001.
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO vote (user_id, target_type, target_id, modality_name,
+                              raw_value, weighted_value, created_at)
+            VALUES (%s, 'consultation', %s, %s, %s, %s, %s)
+            """,
+            (
+                user.pk,
+                target_id or consultation.pk,
+                modality or VoteModality.RATING,
+                Decimal(raw_value),
+                Decimal(raw_value),
+                created_at,
+            ),
+        )
+
+
+@pytest.fixture
+def closed_topic():
+    users = [User.objects.create_user(username=f"final_{index}") for index in range(3)]
+    category = EthikosCategory.objects.create(name="Budget", description="")
+    topic = EthikosTopic.objects.create(
+        title="Closed consultation",
+        description="",
+        category=category,
+        created_by=users[0],
+        status="open",
+    )
+    for index, user in enumerate(users):
+        EthikosStance.objects.create(topic=topic, user=user, value=index - 1)
+    closes_at = timezone.now() - timedelta(minutes=5)
+    EthikosStance.objects.filter(topic=topic).update(
+        timestamp=closes_at - timedelta(minutes=2)
+    )
+
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.RATING)
+        for user in users:
+            RatingVisibilitySetting.objects.create(user=user, visibility="public")
+        domain = ExpertiseCategory.objects.create(
+            code="0411", name="Accounting", depth=0, path="0411"
+        )
+        UserExpertiseScore.objects.create(
+            user=users[2],
+            category=domain,
+            raw_score=Decimal("0.8"),
+            weighted_score=Decimal("0.8"),
+        )
+        ScoreRevision.objects.update(replaced_at=closes_at - timedelta(minutes=2))
+        consultation = Consultation.objects.create(
+            title=topic.title, closes_at=closes_at
+        )
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key="closed_consultation",
+            consultation=consultation,
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("1.0")
+        )
+    _insert_vote(users[0], consultation, "4", closes_at - timedelta(minutes=1))
+    _insert_vote(users[1], consultation, "2", closes_at - timedelta(minutes=1))
+    _insert_vote(users[2], consultation, "5", closes_at + timedelta(minutes=1))
+    return topic, consultation
+
+
+def test_finaliser_writes_results_once_and_serves_them(closed_topic):
+    topic, consultation = closed_topic
+    live = build_ethikos_topic_reading(topic.pk, use_cache=False)
+
+    assert finalise_due_consultations() == 1
+    assert finalise_due_consultations() == 0
+
+    with ekoh_smartvote_db_scope():
+        consultation.refresh_from_db()
+        tallies = ConsultationResult.objects.get(
+            consultation=consultation, kind=ConsultationResult.KIND_TALLIES
+        )
+        reading = ConsultationResult.objects.get(
+            consultation=consultation, kind=ConsultationResult.KIND_READING
+        )
+    assert consultation.finalised_at is not None
+    assert tallies.payload_json["modalities"][VoteModality.RATING]["vote_count"] == 2
+    assert tallies.payload_json["modalities"][VoteModality.RATING]["mean_raw_value"] == 3.0
+    assert [row["reading_key"] for row in reading.payload_json["readings"]] == [
+        lens.key for lens in registered_lenses()
+    ]
+    with pytest.raises(ValueError):
+        reading.save()
+
+    # Stances changed after close no longer move the reading.
+    EthikosStance.objects.filter(topic=topic).update(value=3)
+    final = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    assert final["final"] is True
+    assert final["readings"][0]["results_payload"]["score"] == (
+        live["readings"][0]["results_payload"]["score"]
+    )
+    page = participant_page(topic.pk, limit=2)
+    assert [row["stance_value"] for row in page["participants"]] == [-1, 0]
+    assert page["next_after"] is not None
+
+
+def test_finaliser_reads_stances_and_scores_in_force_at_close(closed_topic):
+    topic, consultation = closed_topic
+    live = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    users = [stance.user for stance in topic.stances.order_by("user_id")]
+
+    # Changes made between close and finalisation.
+    stance = EthikosStance.objects.get(topic=topic, user=users[0])
+    stance.value = 3
+    stance.save()
+    EthikosStance.objects.get(topic=topic, user=users[1]).delete()
+    with ekoh_smartvote_db_scope():
+        score = UserExpertiseScore.objects.get(user=users[2])
+        score.weighted_score = Decimal("0.1")
+        score.save()
+
+    assert finalise_due_consultations() == 1
+
+    final = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    assert final["readings"][0]["results_payload"]["score"] == (
+        live["readings"][0]["results_payload"]["score"]
+    )
+    page = participant_page(topic.pk, limit=3)
+    assert [row["stance_value"] for row in page["participants"]] == [-1, 0, 1]
+    # Nothing awaits finalisation any more: the revisions are pruned.
+    with ekoh_smartvote_db_scope():
+        assert not StanceRevision.objects.exists()
+        assert not ScoreRevision.objects.exists()
+
+
+def test_finaliser_tallies_option_ballots_with_their_engine(closed_topic):
+    _topic, consultation = closed_topic
+    voters = [User.objects.create_user(username=f"option_{index}") for index in range(3)]
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        yes, no = (
+            ConsultationOption.objects.create(
+                consultation=consultation, label=label, position=position
+            )
+            for position, label in enumerate(["yes", "no"])
+        )
+    cast = consultation.closes_at - timedelta(minutes=1)
+    for voter, option in zip(voters, [yes, yes, no]):
+        _insert_vote(
+            voter,
+            consultation,
+            "1",
+            cast,
+            target_id=option.target_id,
+            modality=VoteModality.APPROVAL,
+        )
+
+    assert finalise_due_consultations() == 1
+
+    with ekoh_smartvote_db_scope():
+        tallies = ConsultationResult.objects.get(
+            consultation=consultation, kind=ConsultationResult.KIND_TALLIES
+        )
+    assert tallies.payload_json["options"][VoteModality.APPROVAL]["ballot_count"] == 3
+    assert tallies.payload_json["options"][VoteModality.APPROVAL]["totals"] == {
+        "yes": 2.0,
+        "no": 1.0,
+    }
+    assert VoteModality.APPROVAL not in tallies.payload_json["modalities"]
@@ -0,0 +1,106 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from konnaxion.smart_vote.services import fixed_point
+from konnaxion.smart_vote.services.reading_engine import (
+    LensWeights,
+    compute_totals_decimal,
+    compute_totals_fixed,
+)
+from konnaxion.smart_vote.services.weight_calculator import (
+    _normalise_expertise_score,
+    advisory_weights,
+    advisory_weights_decimal,
+)
+
+CATEGORY_IDS = (11, 12, 13, 14)
+
+
+def _population(seed: int, size: int = 60):
+    """Random inputs with the precision the database columns allow."""
+    rng = random.Random(seed)
+    relevance = {
+        cid: Decimal(rng.randint(-500, 12_000)) / Decimal("10000")
+        for cid in rng.sample(CATEGORY_IDS, rng.randint(1, len(CATEGORY_IDS)))
+    }
+    user_ids = list(range(1, size + 1))
+    expertise_by_user, ethics_by_user = {}, {}
+    for user_id in user_ids:
+        scores = {}
+        for cid in rng.sample(CATEGORY_IDS, rng.randint(0, len(CATEGORY_IDS))):
+            # Current 0..1 rows mixed with legacy 0..100 rows.
+            raw = Decimal(rng.randint(0, 1_000_000)) / Decimal("10000")
+            if rng.random() < 0.6:
+                raw = Decimal(rng.randint(0, 10_000)) / Decimal("10000")
+            scores[cid] = _normalise_expertise_score(raw)
+        expertise_by_user[user_id] = scores
+        if rng.random() < 0.5:
+            ethics_by_user[user_id] = max(
+                Decimal("0"), Decimal(rng.randint(-500, 2_500)) / Decimal("1000")
+            )
+    values = [Decimal(rng.randint(-3, 3)) for _ in user_ids]
+    excluded = set(rng.sample(user_ids, rng.randint(0, 5)))
+    cap = Decimal(rng.randint(0, 1_500)) / Decimal("1000")
+    return rng, relevance, user_ids, values, expertise_by_user, ethics_by_user, excluded, cap
+
+
+def test_round_half_even_matches_decimal_quantize():
+    for value in range(-40_000, 40_000, 7):
+        expected = (Decimal(value) / 1000).quantize(Decimal("1"))
+        assert fixed_point.round_half_even(value, 3) == int(expected)
+    with pytest.raises(fixed_point.NotRepresentable):
+        fixed_point.scale(Decimal("0.33333"), 4)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_fixed_weights_equal_decimal_reference(seed):
+    _, relevance, user_ids, _, expertise, ethics, _, cap = _population(seed)
+    relevance = {cid: max(Decimal("0"), min(Decimal("1"), w)) for cid, w in relevance.items()}
+
+    assert advisory_weights(user_ids, relevance, expertise, ethics, cap) == (
+        advisory_weights_decimal(user_ids, relevance, expertise, ethics, cap)
+    )
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_fixed_engine_equals_decimal_engine(seed):
+    rng, relevance, user_ids, values, expertise, ethics, excluded, cap = _population(seed)
+    category_ids = list(relevance)
+    lenses = [
+        LensWeights(key="default", category_ids=tuple(category_ids), cap=cap),
+        LensWeights(
+            key="subset",
+            category_ids=tuple(rng.sample(category_ids, max(1, len(category_ids) // 2))),
+            cap=Decimal("0.5"),
+            use_ethics=False,
+        ),
+        LensWeights(key="uncapped", category_ids=tuple(category_ids), cap=Decimal("10")),
+    ]
+    kwargs = dict(
+        user_ids=user_ids,
+        values=values,
+        relevance=relevance,
+        expertise_by_user=expertise,
+        ethics_by_user=ethics,
+        excluded_user_ids=excluded,
+        lenses=lenses,
+    )
+
+    assert compute_totals_fixed(**kwargs) == compute_totals_decimal(**kwargs)
+
+
+def test_fixed_engine_falls_back_on_extra_precision():
+    lenses = [LensWeights(key="default", category_ids=(1,), cap=Decimal("0.33333"))]
+    kwargs = dict(
+        user_ids=[1, 2],
+        values=[Decimal("1"), Decimal("-1")],
+        relevance={1: Decimal("1")},
+        expertise_by_user={1: {1: Decimal("0.9")}},
+        ethics_by_user={},
+        excluded_user_ids=set(),
+        lenses=lenses,
+    )
+
+    assert compute_totals_fixed(**kwargs) == compute_totals_decimal(**kwargs)
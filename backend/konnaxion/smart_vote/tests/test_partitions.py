@@ -0,0 +1,121 @@
+import datetime as dt
+import gzip
+import uuid
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models import PartitionInfo
+from konnaxion.smart_vote.models import VoteModality
+from konnaxion.smart_vote.services import partitions
+from konnaxion.smart_vote.services.ledger import write_ledger
+from konnaxion.smart_vote.tasks.aggregator import aggregate_votes
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def test_ensure_future_partitions_is_idempotent():
+    today = dt.date(2031, 11, 20)
+    with ekoh_smartvote_db_scope():
+        created = partitions.ensure_future_partitions(ahead=2, today=today)
+        assert {"vote_2031_11", "vote_2032_01", "vote_ledger_2031_12"} <= set(created)
+        assert partitions.ensure_future_partitions(ahead=2, today=today) == []
+        assert "vote_2032_01" in partitions.list_partitions("vote")
+        info = PartitionInfo.objects.get(table_name="vote_2032_01")
+    assert info.parent_table == "vote"
+    assert "2032-01-01" in info.bounds
+
+
+def test_partition_months_follow_utc(monkeypatch):
+    # Still 30 November on hosts west of UTC.
+    monkeypatch.setattr(
+        partitions.timezone,
+        "now",
+        lambda: dt.datetime(2031, 12, 1, 0, 30, tzinfo=dt.timezone.utc),
+    )
+    with ekoh_smartvote_db_scope():
+        missing = partitions.missing_partitions(ahead=0)
+    assert ("vote", dt.date(2031, 12, 1)) in missing
+    assert ("vote", dt.date(2031, 11, 1)) not in missing
+
+
+def test_expired_vote_partition_is_archived_once_aggregated_and_ledgered(tmp_path):
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        partitions.create_partition("vote", dt.date(2001, 1, 1))
+        partitions.create_partition("vote_ledger", dt.date(2001, 1, 1))
+    voter = User.objects.create_user(username="archived_voter")
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO vote (user_id, target_type, target_id, modality_name,
+                              raw_value, weighted_value, created_at)
+            VALUES (%s, 'consultation', %s, 'approval', 1, 1, '2001-01-15')
+            """,
+            (voter.pk, uuid.uuid4()),
+        )
+
+    archived = partitions.archive_expired_partitions(
+        retention=12, directory=tmp_path
+    )
+    assert [result.table_name for result in archived] == ["vote_ledger_2001_01"]
+
+    # Aggregated but not ledgered yet.
+    aggregate_votes()
+    assert partitions.archive_expired_partitions(retention=12, directory=tmp_path) == []
+
+    # Ledgered into the current month, which is not expired.
+    write_ledger()
+    assert partitions.archive_expired_partitions(retention=12, directory=tmp_path) == []
+
+    # Once its ledger month expires too, both go, the ledger month first.
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        partitions.create_partition("vote_ledger", dt.date(2001, 2, 1))
+        cur.execute("UPDATE vote_ledger SET logged_at = '2001-02-03'")
+    archived = partitions.archive_expired_partitions(
+        retention=12, directory=tmp_path
+    )
+    assert [(result.table_name, result.rows) for result in archived] == [
+        ("vote_ledger_2001_02", 1),
+        ("vote_2001_01", 1),
+    ]
+    with gzip.open(tmp_path / "vote_2001_01.csv.gz", "rt") as dump:
+        lines = dump.read().splitlines()
+    assert lines[0].startswith("id,user_id,target_type")
+    assert len(lines) == 2
+    with ekoh_smartvote_db_scope():
+        assert "vote_2001_01" not in partitions.list_partitions("vote")
+
+
+def test_command_without_archive_dir_keeps_expired_partitions(settings):
+    settings.SMART_VOTE_PARTITION_ARCHIVE_DIR = ""
+    with ekoh_smartvote_db_scope():
+        partitions.create_partition("vote_ledger", dt.date(2001, 2, 1))
+
+    out = StringIO()
+    call_command("manage_vote_partitions", "--retention-months", "12", stdout=out)
+    assert "archived 0" in out.getvalue()
+    with ekoh_smartvote_db_scope():
+        assert "vote_ledger_2001_02" in partitions.list_partitions("vote_ledger")
+
+
+def test_dry_run_lists_partitions_and_indexes_to_create():
+    with ekoh_smartvote_db_scope():
+        missing = partitions.missing_partitions(ahead=1)
+    assert missing
+
+    out = StringIO()
+    call_command("manage_vote_partitions", "--dry-run", "--months-ahead", "1", stdout=out)
+
+    output = out.getvalue()
+    for table, month in missing:
+        name = partitions.partition_name(table, month)
+        assert f"would create {name} ({table}) with BRIN index {name}_" in output
+    assert f"{len(missing)} partition(s) to create" in output
+    with ekoh_smartvote_db_scope():
+        assert partitions.missing_partitions(ahead=1) == missing
@@ -0,0 +1,158 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.config import ScoreConfiguration
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopic
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    ReadingSnapshot,
+    SourceConsultationBinding,
+    TopicReadingAggregate,
+)
+from konnaxion.smart_vote.services.reading_aggregates import (
+    build_ethikos_topic_reading_summary,
+)
+from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+COMPARED_KEYS = (
+    "score",
+    "participant_count",
+    "advisory_participant_count",
+    "excluded_participant_count",
+    "total_advisory_weight",
+    "average_expertise_alignment",
+    "expertise_coverage",
+    "support_share",
+    "neutral_share",
+    "oppose_share",
+)
+
+
+@pytest.fixture
+def bound_topic():
+    author = User.objects.create_user(username="aggregate_author")
+    category = EthikosCategory.objects.create(name="Aggregates", description="")
+    topic = EthikosTopic.objects.create(
+        title="[DEMO] Aggregate question",
+        description="Demo",
+        category=category,
+        created_by=author,
+        status="open",
+    )
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code="0521", name="Environment", depth=0, path="0521"
+        )
+        consultation = Consultation.objects.create(title=topic.title)
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key="aggregate_question",
+            consultation=consultation,
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("0.8")
+        )
+    return topic, domain
+
+
+def _assert_summary_matches_full_reading(topic):
+    summary = build_ethikos_topic_reading_summary(topic.pk)
+    full = build_ethikos_topic_reading(topic.pk, use_cache=False)
+
+    assert summary["baseline"]["results_payload"] == full["baseline"]["results_payload"]
+    summary_reading = summary["readings"][0]
+    full_reading = full["readings"][0]
+    assert summary_reading["lens_hash"] == full_reading["lens_hash"]
+    for key in COMPARED_KEYS:
+        assert summary_reading["results_payload"][key] == pytest.approx(
+            full_reading["results_payload"][key]
+        ), key
+    assert "participants" not in summary_reading["results_payload"]
+
+
+def test_stance_upserts_keep_running_aggregate_exact(bound_topic):
+    topic, domain = bound_topic
+    users = [User.objects.create_user(username=f"aggregate_{idx}") for idx in range(4)]
+    with ekoh_smartvote_db_scope():
+        for user, score in zip(users, ("1.0", "0.4")):
+            UserExpertiseScore.objects.create(
+                user=user,
+                category=domain,
+                raw_score=Decimal(score),
+                weighted_score=Decimal(score),
+            )
+
+    for user, value in zip(users, (3, -2, 0, 1)):
+        EthikosStance.objects.create(topic=topic, user=user, value=value)
+    _assert_summary_matches_full_reading(topic)
+
+    stance = EthikosStance.objects.get(topic=topic, user=users[0])
+    stance.value = -3
+    stance.save()
+    EthikosStance.objects.get(topic=topic, user=users[2]).delete()
+    _assert_summary_matches_full_reading(topic)
+
+    with ekoh_smartvote_db_scope():
+        score = UserExpertiseScore.objects.get(user=users[1], category=domain)
+        score.weighted_score = Decimal("0.9")
+        score.save()
+    _assert_summary_matches_full_reading(topic)
+
+
+def test_score_configuration_change_invalidates_readings(bound_topic):
+    topic, domain = bound_topic
+    expert = User.objects.create_user(username="aggregate_capped")
+    with ekoh_smartvote_db_scope():
+        UserExpertiseScore.objects.create(
+            user=expert,
+            category=domain,
+            raw_score=Decimal("1.0"),
+            weighted_score=Decimal("1.0"),
+        )
+    EthikosStance.objects.create(topic=topic, user=expert, value=3)
+    build_ethikos_topic_reading(topic.pk, use_cache=True)
+    _assert_summary_matches_full_reading(topic)
+
+    current = ReadingSnapshot.objects.filter(
+        source_id=str(topic.pk), invalidated_at__isnull=True
+    )
+    with ekoh_smartvote_db_scope():
+        assert current.exists()
+        ScoreConfiguration.objects.create(
+            weight_name="EKOH_MULTIPLIER_CAP", weight_value=Decimal("0.25")
+        )
+        assert not current.exists()
+        assert TopicReadingAggregate.objects.get(source_id=str(topic.pk)).stale
+    _assert_summary_matches_full_reading(topic)
+
+
+def test_reconcile_command_reports_and_repairs_drift(bound_topic):
+    topic, _domain = bound_topic
+    voter = User.objects.create_user(username="aggregate_drift")
+    EthikosStance.objects.create(topic=topic, user=voter, value=2)
+
+    with ekoh_smartvote_db_scope():
+        TopicReadingAggregate.objects.filter(source_id=str(topic.pk)).update(
+            weighted_sum=Decimal("99")
+        )
+
+    out = StringIO()
+    call_command("reconcile_reading_aggregates", "--topic", str(topic.pk), stdout=out)
+    assert "weighted_sum: 99.0000 -> 2.0000" in out.getvalue()
+    assert "1 drifted" in out.getvalue()
+
+    with ekoh_smartvote_db_scope():
+        aggregate = TopicReadingAggregate.objects.get(source_id=str(topic.pk))
+    assert aggregate.weighted_sum == Decimal("2")
@@ -0,0 +1,145 @@
+import random
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopic
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    SourceConsultationBinding,
+)
+from konnaxion.smart_vote.services.reading_engine import (
+    ENGINE_DECIMAL,
+    ENGINE_FIXED,
+    ENGINE_NUMPY,
+    LensWeights,
+    compute_totals_decimal,
+    compute_totals_numpy,
+    select_engine,
+)
+from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
+
+User = get_user_model()
+
+COMPARED_KEYS = (
+    "score",
+    "advisory_participant_count",
+    "excluded_participant_count",
+    "total_advisory_weight",
+    "average_expertise_alignment",
+    "expertise_coverage",
+    "support_share",
+    "neutral_share",
+    "oppose_share",
+)
+
+
+def test_select_engine_uses_threshold(settings):
+    pytest.importorskip("numpy")
+    settings.SMART_VOTE_ARRAY_ENGINE_THRESHOLD = 10
+
+    assert select_engine(None, 9) == ENGINE_FIXED
+    assert select_engine(None, 10) == ENGINE_NUMPY
+    assert select_engine(ENGINE_DECIMAL, 10_000) == ENGINE_DECIMAL
+    with pytest.raises(ValueError):
+        select_engine("float", 1)
+
+
+def test_numpy_engine_falls_back_on_extra_precision():
+    pytest.importorskip("numpy")
+    lenses = [LensWeights(key="default", category_ids=(1,), cap=Decimal("0.33333"))]
+    kwargs = dict(
+        user_ids=[1, 2],
+        values=[Decimal("1"), Decimal("-1")],
+        relevance={1: Decimal("1")},
+        expertise_by_user={1: {1: Decimal("0.9")}},
+        ethics_by_user={},
+        excluded_user_ids=set(),
+        lenses=lenses,
+    )
+
+    totals = compute_totals_numpy(**kwargs)["default"]
+    assert totals == compute_totals_decimal(**kwargs)["default"]
+    assert totals.weights == [Decimal("1.3333"), Decimal("1.0000")]
+
+
+@pytest.mark.django_db
+def test_numpy_engine_matches_decimal_engine():
+    pytest.importorskip("numpy")
+    rng = random.Random(20240501)
+    author = User.objects.create_user(username="engine_author")
+    category = EthikosCategory.objects.create(name="Engines", description="")
+    topic = EthikosTopic.objects.create(
+        title="[DEMO] Engine parity",
+        description="Demo",
+        category=category,
+        created_by=author,
+        status="open",
+    )
+    users = [User.objects.create_user(username=f"engine_{idx}") for idx in range(40)]
+    for user in users:
+        EthikosStance.objects.create(topic=topic, user=user, value=rng.randint(-3, 3))
+
+    with ekoh_smartvote_db_scope():
+        domains = [
+            ExpertiseCategory.objects.create(
+                code=code, name=f"Domain {code}", depth=0, path=code
+            )
+            for code in ("0411", "0521", "0731")
+        ]
+        consultation = Consultation.objects.create(title=topic.title)
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key="engine_parity",
+            consultation=consultation,
+            metadata_json={"advisory_exclusions": [{"user_id": users[0].pk}]},
+        )
+        for domain, weight in zip(domains, ("0.7", "0.35", "0.15")):
+            ConsultationRelevance.objects.create(
+                consultation=consultation, category=domain, weight=Decimal(weight)
+            )
+        for user in users[1:]:
+            for domain in rng.sample(domains, rng.randint(0, len(domains))):
+                # Mix current 0..1 rows with legacy 0..100 rows.
+                score = Decimal(rng.randint(0, 10_000)) / Decimal(
+                    "10000" if rng.random() < 0.7 else "100"
+                )
+                UserExpertiseScore.objects.create(
+                    user=user, category=domain, raw_score=score, weighted_score=score
+                )
+            if rng.random() < 0.5:
+                UserEthicsScore.objects.create(
+                    user=user,
+                    ethical_score=Decimal(rng.randint(-50, 150)) / Decimal("100"),
+                )
+
+    exact = build_ethikos_topic_reading(
+        topic.pk, use_cache=False, engine=ENGINE_DECIMAL
+    )["readings"][0]
+    vectorised = build_ethikos_topic_reading(
+        topic.pk, use_cache=False, engine=ENGINE_NUMPY
+    )["readings"][0]
+
+    assert exact["engine"] == ENGINE_DECIMAL
+    assert vectorised["engine"] == ENGINE_NUMPY
+    assert vectorised["lens_hash"] == exact["lens_hash"]
+    assert vectorised["snapshot_ref"] == exact["snapshot_ref"]
+    for key in COMPARED_KEYS:
+        assert vectorised["results_payload"][key] == pytest.approx(
+            exact["results_payload"][key], abs=1e-4
+        ), key
+
+    exact_rows = exact["results_payload"]["participants"]
+    vectorised_rows = vectorised["results_payload"]["participants"]
+    assert [row["user_id"] for row in vectorised_rows] == [
+        row["user_id"] for row in exact_rows
+    ]
+    for exact_row, vectorised_row in zip(exact_rows, vectorised_rows):
+        for key in ("expertise_alignment", "advisory_weight"):
+            assert vectorised_row[key] == pytest.approx(exact_row[key], abs=1e-4)
@@ -0,0 +1,135 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.access import RatingVisibilitySetting
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopic
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    SourceConsultationBinding,
+)
+from konnaxion.smart_vote.services.reading_participants import (
+    iter_participants,
+    participant_page,
+)
+from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def topic():
+    users = [User.objects.create_user(username=f"participant_{index}") for index in range(5)]
+    category = EthikosCategory.objects.create(name="Transport", description="")
+    topic = EthikosTopic.objects.create(
+        title="Paged participants",
+        description="",
+        category=category,
+        created_by=users[0],
+        status="open",
+    )
+    for index, user in enumerate(users):
+        EthikosStance.objects.create(topic=topic, user=user, value=index - 2)
+
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code="1041", name="Transport services", depth=0, path="1041"
+        )
+        for index, user in enumerate(users):
+            RatingVisibilitySetting.objects.create(user=user, visibility="public")
+            UserExpertiseScore.objects.create(
+                user=user,
+                category=domain,
+                raw_score=Decimal(index) / 4,
+                weighted_score=Decimal(index) / 4,
+            )
+        consultation = Consultation.objects.create(title=topic.title)
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key="paged_participants",
+            consultation=consultation,
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("1.0")
+        )
+    return topic
+
+
+def _strip_access(rows):
+    return [{key: value for key, value in row.items() if key != "rating_access"} for row in rows]
+
+
+def test_pages_and_stream_match_the_inline_participants(topic):
+    inline = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    expected = _strip_access(inline["readings"][0]["results_payload"]["participants"])
+
+    paged, after = [], None
+    while True:
+        page = participant_page(topic.pk, after=after, limit=2)
+        assert page["lens_hash"] == inline["readings"][0]["lens_hash"]
+        paged.extend(page["participants"])
+        after = page["next_after"]
+        if after is None:
+            break
+
+    assert _strip_access(paged) == expected
+    assert _strip_access(iter_participants(topic.pk, chunk_size=2)) == expected
+
+
+def test_reading_endpoint_splits_participants_unless_inline(topic):
+    client = APIClient()
+    url = f"/api/v1/smart-vote/readings/ethikos-topic/{topic.pk}/"
+
+    aggregate = client.get(url).json()["readings"][0]["results_payload"]
+    inline = client.get(url, {"participants": "inline"}).json()["readings"][0]
+
+    assert "participants" not in aggregate
+    assert aggregate["participant_count"] == 5
+    assert len(inline["results_payload"]["participants"]) == 5
+
+    response = client.get(f"{url}participants/", {"stream": "ndjson"})
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["user_id"] for line in lines] == [
+        row["user_id"] for row in inline["results_payload"]["participants"]
+    ]
+    assert client.get(f"{url}participants/", {"lens": "unknown"}).status_code == 400
+
+
+def test_aggregate_reading_answers_304_until_a_stance_changes(topic):
+    client = APIClient()
+    url = f"/api/v1/smart-vote/readings/ethikos-topic/{topic.pk}/"
+
+    first = client.get(url)
+    etag = first["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    other_lens = client.get(url, {"lens": "ekoh_expertise_only_v1"}, HTTP_IF_NONE_MATCH=etag)
+    assert other_lens.status_code == 200
+
+    stance = EthikosStance.objects.filter(topic=topic).first()
+    stance.value = 3
+    stance.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_paged_reading_is_validated_even_when_inline_is_the_default(topic, settings):
+    settings.SMART_VOTE_READING_INLINE_PARTICIPANTS = True
+    client = APIClient()
+    url = f"/api/v1/smart-vote/readings/ethikos-topic/{topic.pk}/"
+
+    assert "participants" in client.get(url).json()["readings"][0]["results_payload"]
+    paged = client.get(url, {"participants": "paged"})
+    assert "participants" not in paged.json()["readings"][0]["results_payload"]
+    unchanged = client.get(url, {"participants": "paged"}, HTTP_IF_NONE_MATCH=paged["ETag"])
+    assert unchanged.status_code == 304
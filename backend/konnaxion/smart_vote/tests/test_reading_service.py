@@ -2,6 +2,8 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from konnaxion.ekoh.db import ekoh_smartvote_db_scope
 from konnaxion.ekoh.models.access import RatingVisibilitySetting
@@ -11,8 +13,11 @@ from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopi
 from konnaxion.smart_vote.models import (
     Consultation,
     ConsultationRelevance,
+    ReadingSnapshot,
     SourceConsultationBinding,
 )
+from konnaxion.smart_vote.services import reading_service
+from konnaxion.smart_vote.services.reading_lenses import Lens, register_lens
 from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
 
 pytestmark = pytest.mark.django_db
@@ -190,3 +195,165 @@ def test_participant_breakdown_respects_ekoh_rating_disclosure():
     assert result["participant_count"] == 2
     assert result["participant_detail_visible_count"] == 1
     assert [row["user_id"] for row in result["participants"]] == [visible.pk]
+
+
+def _bound_topic(username_prefix: str, code: str):
+    expert = User.objects.create_user(username=f"{username_prefix}_expert")
+    citizen = User.objects.create_user(username=f"{username_prefix}_citizen")
+    category = EthikosCategory.objects.create(name=f"Cache {code}", description="")
+    topic = EthikosTopic.objects.create(
+        title=f"[DEMO] Cache question {code}",
+        description="Demo",
+        category=category,
+        created_by=expert,
+        status="open",
+    )
+    EthikosStance.objects.create(topic=topic, user=expert, value=3)
+    EthikosStance.objects.create(topic=topic, user=citizen, value=-3)
+
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code=code, name=f"Domain {code}", depth=0, path=code
+        )
+        UserExpertiseScore.objects.create(
+            user=expert,
+            category=domain,
+            raw_score=Decimal("1.0"),
+            weighted_score=Decimal("1.0"),
+        )
+        consultation = Consultation.objects.create(title=topic.title)
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key=f"cache_{code}",
+            consultation=consultation,
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("1.0")
+        )
+    return topic, expert, citizen, domain
+
+
+def test_reading_is_materialized_and_served_from_snapshot():
+    topic, _expert, _citizen, _domain = _bound_topic("materialized", "0411")
+
+    first = build_ethikos_topic_reading(topic.pk)
+    with ekoh_smartvote_db_scope():
+        snapshot = ReadingSnapshot.objects.get(
+            source_type="ethikos_topic", source_id=str(topic.pk)
+        )
+    assert snapshot.lens_hash == first["readings"][0]["lens_hash"]
+    assert snapshot.snapshot_ref == first["readings"][0]["snapshot_ref"]
+    assert snapshot.invalidated_at is None
+
+    second = build_ethikos_topic_reading(topic.pk)
+    assert second == first
+
+
+def test_stance_change_invalidates_materialized_reading():
+    topic, _expert, citizen, _domain = _bound_topic("stance_inval", "0412")
+    before = build_ethikos_topic_reading(topic.pk)
+
+    EthikosStance.objects.filter(topic=topic, user=citizen).get().delete()
+    after = build_ethikos_topic_reading(topic.pk)
+
+    assert before["baseline"]["results_payload"]["participant_count"] == 2
+    assert after["baseline"]["results_payload"]["participant_count"] == 1
+    assert after["readings"][0]["results_payload"]["score"] == pytest.approx(3.0)
+
+
+def test_score_change_invalidates_materialized_reading():
+    topic, expert, _citizen, domain = _bound_topic("score_inval", "0413")
+    before = build_ethikos_topic_reading(topic.pk)
+
+    with ekoh_smartvote_db_scope():
+        score = UserExpertiseScore.objects.get(user=expert, category=domain)
+        score.weighted_score = Decimal("0.0")
+        score.save()
+    after = build_ethikos_topic_reading(topic.pk)
+
+    assert before["readings"][0]["snapshot_ref"] != after["readings"][0]["snapshot_ref"]
+    assert after["readings"][0]["results_payload"]["score"] == pytest.approx(0.0)
+
+
+def _change_while_computing(monkeypatch, change):
+    compute = reading_service._build_ethikos_topic_reading
+
+    def compute_then_change(*args, **kwargs):
+        payload = compute(*args, **kwargs)
+        change()
+        return payload
+
+    monkeypatch.setattr(
+        reading_service, "_build_ethikos_topic_reading", compute_then_change
+    )
+
+
+def _stored_readings(topic):
+    with ekoh_smartvote_db_scope():
+        return ReadingSnapshot.objects.filter(
+            source_type="ethikos_topic", source_id=str(topic.pk)
+        ).count()
+
+
+def test_score_change_while_computing_is_not_stored(monkeypatch):
+    topic, expert, _citizen, domain = _bound_topic("score_race", "0415")
+
+    def change_score():
+        UserExpertiseScore.objects.filter(user=expert, category=domain).get().save()
+
+    _change_while_computing(monkeypatch, change_score)
+    build_ethikos_topic_reading(topic.pk)
+
+    assert _stored_readings(topic) == 0
+
+
+def test_stance_delete_while_computing_is_not_stored(monkeypatch):
+    topic, _expert, citizen, _domain = _bound_topic("delete_race", "0416")
+    _change_while_computing(
+        monkeypatch,
+        lambda: EthikosStance.objects.filter(topic=topic, user=citizen).delete(),
+    )
+    build_ethikos_topic_reading(topic.pk)
+    monkeypatch.undo()
+
+    assert _stored_readings(topic) == 0
+    assert (
+        build_ethikos_topic_reading(topic.pk)["baseline"]["results_payload"][
+            "participant_count"
+        ]
+        == 1
+    )
+    assert _stored_readings(topic) == 1
+
+
+def test_lenses_share_one_pass_and_keep_their_own_hashes():
+    topic, expert, _citizen, _domain = _bound_topic("lenses", "0414")
+    register_lens(Lens("test_health_domains_v1", domain_codes=("09",)))
+    lenses = ["ekoh_weighted_v1", "ekoh_weighted_cap050_v1", "test_health_domains_v1"]
+
+    with CaptureQueriesContext(connection) as single_lens:
+        single = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    with CaptureQueriesContext(connection) as three_lenses:
+        payload = build_ethikos_topic_reading(topic.pk, use_cache=False, lenses=lenses)
+
+    assert len(three_lenses) <= len(single_lens)
+    assert [reading["reading_key"] for reading in payload["readings"]] == lenses
+    default, capped, health = payload["readings"]
+    assert default == {**single["readings"][0], "computed_at": default["computed_at"]}
+    assert len({reading["lens_hash"] for reading in payload["readings"]}) == 3
+
+    def expert_weight(reading):
+        (row,) = [
+            row
+            for row in reading["results_payload"]["participants"]
+            if row["user_id"] == expert.pk
+        ]
+        return row["advisory_weight"]
+
+    assert expert_weight(default) == pytest.approx(2.0)
+    assert expert_weight(capped) == pytest.approx(1.5)
+    # No relevance domain falls under ISCED 09: plain one-person-one-vote.
+    assert expert_weight(health) == pytest.approx(1.0)
+    assert health["results_payload"]["domains"] == []
+    assert health["results_payload"]["score"] == pytest.approx(0.0)
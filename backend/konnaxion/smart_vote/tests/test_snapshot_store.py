@@ -0,0 +1,135 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.ethikos.models import EthikosCategory, EthikosStance, EthikosTopic
+from konnaxion.smart_vote.models import (
+    Consultation,
+    ConsultationRelevance,
+    SnapshotBlob,
+    SourceConsultationBinding,
+)
+from konnaxion.smart_vote.services import snapshot_store
+from konnaxion.smart_vote.services.reading_service import (
+    build_ethikos_topic_reading,
+    replay_reading,
+)
+
+User = get_user_model()
+
+SCORE_ROWS = [
+    {
+        "user_id": 3,
+        "ethics": "1.0",
+        "expertise": {"7": "0.5", "9": "0"},
+        "included_in_advisory": True,
+        "exclusion_reason": None,
+    },
+    {
+        "user_id": 5,
+        "ethics": "0.8",
+        "expertise": {"7": "0", "9": "1.0"},
+        "included_in_advisory": False,
+        "exclusion_reason": "Recused.",
+    },
+]
+
+
+def test_score_columns_round_trip_keeps_the_ref():
+    columns = snapshot_store._score_columns(SCORE_ROWS)
+
+    assert columns["domains"] == ["7", "9"]
+    assert columns["expertise"] == [["0.5", "0"], ["0", "1.0"]]
+    rows = snapshot_store._score_rows(columns)
+    assert rows == SCORE_ROWS
+    assert snapshot_store.snapshot_ref(rows) == snapshot_store.snapshot_ref(SCORE_ROWS)
+
+
+@pytest.fixture
+def scored_topic():
+    expert = User.objects.create_user(username="replay_expert")
+    citizen = User.objects.create_user(username="replay_citizen")
+    category = EthikosCategory.objects.create(name="Energy", description="")
+    topic = EthikosTopic.objects.create(
+        title="Replay question",
+        description="",
+        category=category,
+        created_by=expert,
+        status="open",
+    )
+    EthikosStance.objects.create(topic=topic, user=expert, value=3)
+    EthikosStance.objects.create(topic=topic, user=citizen, value=-1)
+
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code="0713", name="Electricity", depth=0, path="0713"
+        )
+        score = UserExpertiseScore.objects.create(
+            user=expert,
+            category=domain,
+            raw_score=Decimal("0.9"),
+            weighted_score=Decimal("0.9"),
+        )
+        consultation = Consultation.objects.create(title=topic.title)
+        SourceConsultationBinding.objects.create(
+            source_type="ethikos_topic",
+            source_id=str(topic.pk),
+            source_key="replay_question",
+            consultation=consultation,
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("1.0")
+        )
+    return topic, expert, score
+
+
+@pytest.mark.django_db
+def test_repeated_builds_store_each_blob_once(scored_topic):
+    topic, _expert, _score = scored_topic
+
+    first = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    second = build_ethikos_topic_reading(topic.pk, use_cache=False)
+
+    assert first["input_ref"] == second["input_ref"]
+    assert first["input_ref"].startswith("reading_input:")
+    with ekoh_smartvote_db_scope():
+        kinds = sorted(SnapshotBlob.objects.values_list("kind", flat=True))
+        blob = SnapshotBlob.objects.get(pk=first["readings"][0]["snapshot_ref"])
+    assert kinds == [SnapshotBlob.KIND_INPUTS, SnapshotBlob.KIND_SCORES]
+    assert blob.row_count == 2
+
+
+@pytest.mark.django_db
+def test_replay_reproduces_the_reading_after_scores_change(scored_topic):
+    topic, expert, score = scored_topic
+    original = build_ethikos_topic_reading(topic.pk, use_cache=False)
+
+    with ekoh_smartvote_db_scope():
+        score.weighted_score = Decimal("0.1")
+        score.save()
+        UserEthicsScore.objects.create(user=expert, ethical_score=Decimal("0.2"))
+    current = build_ethikos_topic_reading(topic.pk, use_cache=False)
+    replayed = replay_reading(original["input_ref"])
+
+    assert current["input_ref"] != original["input_ref"]
+    assert replayed["replay"] is True
+    assert replayed["input_ref"] == original["input_ref"]
+    for before, after in zip(original["readings"], replayed["readings"]):
+        assert after["snapshot_ref"] == before["snapshot_ref"]
+        assert after["lens_hash"] == before["lens_hash"]
+        assert after["results_payload"] == before["results_payload"]
+
+
+@pytest.mark.django_db
+def test_replay_endpoint_answers_404_for_unknown_inputs():
+    response = APIClient().get(
+        reverse("smart_vote:reading-replay", args=["reading_input:missing"])
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,175 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.models import Consultation, ConsultationOption, VoteModality
+from konnaxion.smart_vote.services.tally_benchmark import (
+    synthetic_ranked,
+    synthetic_scored,
+)
+from konnaxion.smart_vote.services.tally_engine import (
+    RankedBallots,
+    ScoredBallots,
+    budget_allocation,
+    consultation_ballots,
+    instant_runoff,
+    pairwise,
+    score_totals,
+    tally_consultation,
+)
+
+User = get_user_model()
+
+
+def _naive_runoff(ballots: RankedBallots):
+    continuing = set(range(len(ballots.options)))
+    first = None
+    while True:
+        tallies = dict.fromkeys(continuing, 0.0)
+        for ranking, weight in zip(ballots.rankings.tolist(), ballots.weights.tolist()):
+            choice = next((option for option in ranking if option in continuing), None)
+            if choice is not None:
+                tallies[choice] += weight
+        first = first or dict(tallies)
+        leader = max(sorted(tallies), key=lambda option: tallies[option])
+        if len(continuing) == 1 or tallies[leader] * 2 > sum(tallies.values()):
+            return leader
+        loser = min(tallies, key=lambda option: (tallies[option], first[option], -option))
+        continuing.remove(loser)
+
+
+def test_weighted_runoff_transfers_preferences():
+    ballots = RankedBallots.from_rankings(
+        ["a", "b", "c"],
+        [["a", "b"], ["b", "c"], ["c", "b"], ["c"]],
+        weights=[2.0, 1.5, 1.0, 0.4],
+    )
+    result = instant_runoff(ballots).as_dict()
+
+    # Round 1: a 2.0, b 1.5, c 1.4 -> c out; its first ballot moves to b.
+    assert result["eliminated"] == ["c"]
+    assert result["winner"] == "b"
+    assert result["rounds"][1] == {"a": 2.0, "b": 2.5}
+    assert result["exhausted_weight"] == pytest.approx(0.4)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_runoff_matches_a_naive_recount(seed):
+    ballots = synthetic_ranked(400, 6, seed=seed)
+    assert instant_runoff(ballots).winner == _naive_runoff(ballots)
+
+
+def test_pairwise_matrix_and_borda_match_per_ballot_counts():
+    ballots = synthetic_ranked(300, 5, seed=7)
+    result = pairwise(ballots, chunk_size=64)
+
+    matrix = np.zeros((5, 5))
+    borda = np.zeros(5)
+    for ranking, weight in zip(ballots.rankings.tolist(), ballots.weights.tolist()):
+        ranked = [option for option in ranking if option >= 0]
+        for position, option in enumerate(ranked):
+            borda[option] += weight * (4 - position)
+            for other in range(5):
+                if other != option and (other not in ranked or ranked.index(other) > position):
+                    matrix[option, other] += weight
+    np.testing.assert_allclose(result.matrix, matrix)
+    np.testing.assert_allclose(result.borda, borda)
+
+
+def test_condorcet_winner_and_cycle():
+    winner = RankedBallots.from_rankings(
+        ["a", "b", "c"], [["a", "b", "c"], ["b", "a", "c"], ["a", "c", "b"]], weights=None
+    )
+    assert pairwise(winner).as_dict()["condorcet_winner"] == "a"
+
+    cycle = RankedBallots.from_rankings(
+        ["a", "b", "c"], [["a", "b", "c"], ["b", "c", "a"], ["c", "a", "b"]], weights=None
+    )
+    assert pairwise(cycle).condorcet_winner is None
+
+
+def test_budget_allocation_weights_each_ballots_shares():
+    ballots = ScoredBallots(
+        ["parks", "transit"],
+        [[100, 0], [50, 150], [0, 0]],
+        weights=[1.0, 3.0, 5.0],
+    )
+    result = budget_allocation(ballots, budget=1_000)
+    # (1 * 1.0 + 3 * 0.25) / 4 = 0.4375 of the budget to parks.
+    np.testing.assert_allclose(result.allocation, [437.5, 562.5])
+
+
+def test_rating_means_ignore_unscored_options():
+    ballots = ScoredBallots(["a", "b"], [[5, np.nan], [2, 4]], weights=[2.0, 1.0])
+    result = score_totals(ballots).as_dict()
+    assert result["means"] == {"a": 4.0, "b": 4.0}
+    assert result["weight"] == {"a": 3.0, "b": 1.0}
+
+    approvals = synthetic_scored("approval", 50, 4, seed=1)
+    np.testing.assert_allclose(
+        score_totals(approvals).totals, approvals.weights @ approvals.scores
+    )
+
+
+def _insert_option_vote(user, option, modality, raw_value, weight, created_at) -> None:
+    # ``vote`` is a partitioned table created by raw DDL in 0001.
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO vote (user_id, target_type, target_id, modality_name,
+                              raw_value, weighted_value, created_at)
+            VALUES (%s, 'consultation', %s, %s, %s, %s, %s)
+            """,
+            (
+                user.pk,
+                option.target_id,
+                modality,
+                Decimal(raw_value),
+                Decimal(raw_value) * Decimal(weight),
+                created_at,
+            ),
+        )
+
+
+@pytest.mark.django_db
+def test_option_votes_are_tallied_with_their_cast_weights():
+    voters = [User.objects.create_user(username=f"tally_{index}") for index in range(4)]
+    closes_at = timezone.now() - timedelta(minutes=1)
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.PREFERENTIAL)
+        consultation = Consultation.objects.create(title="Ranked", closes_at=closes_at)
+        a, b, c = (
+            ConsultationOption.objects.create(
+                consultation=consultation, label=label, position=position
+            )
+            for position, label in enumerate("abc")
+        )
+
+    cast = closes_at - timedelta(minutes=5)
+    ballots = [
+        (voters[0], "2.0", [a, b]),
+        (voters[1], "1.5", [b, c]),
+        (voters[2], "1.0", [c, b]),
+    ]
+    for voter, weight, ranking in ballots:
+        for rank, option in enumerate(ranking, start=1):
+            _insert_option_vote(voter, option, VoteModality.PREFERENTIAL, rank, weight, cast)
+    # Cast after close: left out.
+    _insert_option_vote(
+        voters[3], a, VoteModality.PREFERENTIAL, 1, "1.0", closes_at + timedelta(seconds=1)
+    )
+
+    with ekoh_smartvote_db_scope():
+        (ranked,) = consultation_ballots(consultation.pk, until=closes_at).values()
+        result = tally_consultation(consultation.pk, until=closes_at)
+    assert ranked.rankings.tolist() == [[0, 1], [1, 2], [2, 1]]
+    assert ranked.weights.tolist() == [2.0, 1.5, 1.0]
+    assert result[VoteModality.PREFERENTIAL]["ballot_count"] == 3
+    assert result[VoteModality.PREFERENTIAL]["winner"] == "b"
+    assert result[VoteModality.PREFERENTIAL]["rounds"][1] == {"a": 2.0, "b": 2.5}
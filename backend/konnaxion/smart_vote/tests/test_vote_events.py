@@ -0,0 +1,155 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.events import get_bus, relay_outbox, reset_bus
+from konnaxion.smart_vote.events.backends import (
+    RedisStreamVoteEventBus,
+    decode_stream_id,
+    encode_stream_id,
+)
+from konnaxion.smart_vote.events.consumer import consume_once
+from konnaxion.smart_vote.models import (
+    AggregationCheckpoint,
+    Consultation,
+    VoteEventOutbox,
+    VoteModality,
+    VoteResult,
+)
+from konnaxion.smart_vote.services import partitions
+from konnaxion.smart_vote.services.ballot_ingest import cast_ballots
+from konnaxion.smart_vote.tasks.aggregator import aggregate_votes
+
+User = get_user_model()
+
+
+@pytest.fixture
+def memory_bus(settings):
+    settings.SMART_VOTE_EVENT_BUS = "memory"
+    reset_bus()
+    yield get_bus()
+    reset_bus()
+
+
+def _ballot(consultation, user):
+    return {
+        "user_id": user.pk,
+        "consultation": consultation.pk,
+        "target_id": consultation.pk,
+        "modality": VoteModality.APPROVAL,
+        "raw_value": Decimal("1"),
+    }
+
+
+@pytest.mark.django_db
+def test_committed_ballots_are_applied_exactly_once(
+    memory_bus, django_capture_on_commit_callbacks
+):
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        consultation = Consultation.objects.create(title="Streamed")
+    voters = [User.objects.create_user(username=f"stream_{idx}") for idx in range(3)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cast_ballots(
+            [(0, _ballot(consultation, voters[0])), (1, _ballot(consultation, voters[1]))]
+        )
+    assert len(memory_bus.read("0", 0, 100)) == 2
+
+    # The poller stands down while the bus owns vote_result.
+    assert aggregate_votes() == 0
+    with mock.patch.object(memory_bus, "trim") as trim:
+        assert consume_once() == 2
+    trim.assert_called_once_with("0", 2)
+    assert consume_once() == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cast_ballots([(0, _ballot(consultation, voters[2]))])
+    assert consume_once() == 1
+
+    with ekoh_smartvote_db_scope():
+        result = VoteResult.objects.get(target_type="consultation", target_id=consultation.pk)
+        checkpoint = AggregationCheckpoint.objects.get(stream="vote_events", shard="0")
+    assert result.vote_count == 3
+    assert result.sum_weighted_value == Decimal("3.0000")
+    assert checkpoint.position == 3
+
+
+@pytest.mark.django_db
+def test_ballots_are_published_only_on_commit(
+    memory_bus, django_capture_on_commit_callbacks
+):
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        consultation = Consultation.objects.create(title="Rolled back")
+    voter = User.objects.create_user(username="stream_rollback")
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        cast_ballots([(0, _ballot(consultation, voter))])
+    assert len(callbacks) == 1
+    assert memory_bus.read("0", 0, 100) == []
+    with ekoh_smartvote_db_scope():
+        assert VoteEventOutbox.objects.filter(published_at__isnull=True).count() == 1
+
+
+@pytest.mark.django_db
+def test_outbox_redelivery_is_applied_once(
+    memory_bus, settings, django_capture_on_commit_callbacks
+):
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+        consultation = Consultation.objects.create(title="Redelivered")
+    voter = User.objects.create_user(username="stream_redelivered")
+
+    # The post-commit publish is lost (crash, bus outage): the relay sends it.
+    with django_capture_on_commit_callbacks(execute=False):
+        (outcome,) = cast_ballots([(0, _ballot(consultation, voter))])
+    with ekoh_smartvote_db_scope():
+        vote_partition = partitions.list_partitions("vote")[-1]
+        assert partitions._pending_aggregation(vote_partition)
+    assert relay_outbox() == 1
+    assert relay_outbox() == 0
+    settings.SMART_VOTE_EVENT_REDELIVER_SECONDS = -1
+    assert relay_outbox() == 1
+    assert len(memory_bus.read("0", 0, 100)) == 2
+
+    assert consume_once() == 1
+    with ekoh_smartvote_db_scope():
+        result = VoteResult.objects.get(target_type="consultation", target_id=consultation.pk)
+        assert not VoteEventOutbox.objects.filter(vote_id=outcome.vote_id).exists()
+        assert not partitions._pending_aggregation(vote_partition)
+    assert result.vote_count == 1
+
+
+def test_memory_bus_is_refused_across_processes(settings):
+    settings.SMART_VOTE_EVENT_BUS = "memory"
+    settings.SMART_VOTE_EVENT_BUS_SINGLE_PROCESS = False
+    reset_bus()
+    with pytest.raises(ImproperlyConfigured):
+        get_bus()
+    reset_bus()
+
+
+def test_redis_stream_ids_round_trip_in_order():
+    ids = ["1700000000000-0", "1700000000000-1", "1700000000001-0"]
+    offsets = [encode_stream_id(stream_id) for stream_id in ids]
+    assert offsets == sorted(offsets)
+    assert [decode_stream_id(offset) for offset in offsets] == ids
+    assert encode_stream_id(b"5-7") == encode_stream_id("5-7")
+
+
+def test_redis_stream_is_trimmed_up_to_the_committed_position():
+    bus = RedisStreamVoteEventBus.__new__(RedisStreamVoteEventBus)
+    bus._client = mock.Mock()
+    bus._stream = "smart_vote.votes"
+    position = encode_stream_id("1700000000000-3") + 1
+
+    bus.trim("0", position)
+
+    bus._client.xtrim.assert_called_once_with(
+        "smart_vote.votes", minid="1700000000000-4", approximate=True
+    )
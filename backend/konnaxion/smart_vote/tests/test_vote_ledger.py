@@ -0,0 +1,80 @@
+import hashlib
+import uuid
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.smart_vote.models import LedgerBatch, VoteLedger, VoteModality
+from konnaxion.smart_vote.services.ledger import (
+    GENESIS,
+    chain_hash,
+    merkle_levels,
+    merkle_proof,
+    root_from_proof,
+    write_ledger,
+)
+
+User = get_user_model()
+
+
+@pytest.mark.parametrize("leaf_count", [1, 2, 3, 5, 8, 13])
+def test_every_proof_reaches_the_root(leaf_count):
+    leaves = [hashlib.sha256(bytes([index])).digest() for index in range(leaf_count)]
+    levels = merkle_levels(leaves)
+    root = levels[-1][0]
+
+    for index, leaf in enumerate(leaves):
+        proof = merkle_proof(levels, index)
+        assert len(proof) % 32 == 0
+        assert root_from_proof(leaf, index, leaf_count, proof) == root
+        assert root_from_proof(b"\x00" * 32, index, leaf_count, proof) != root
+
+
+@pytest.mark.django_db
+def test_ledger_batches_are_chained_and_verifiable():
+    with ekoh_smartvote_db_scope():
+        VoteModality.objects.get_or_create(name=VoteModality.APPROVAL)
+    voter_ids = [
+        User.objects.create_user(username=f"ledger_{index}").pk for index in range(3)
+    ]
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        for user_id in voter_ids:
+            cur.execute(
+                """
+                INSERT INTO vote (user_id, target_type, target_id, modality_name,
+                                  raw_value, weighted_value, created_at)
+                VALUES (%s, 'consultation', %s, 'approval', 1, 1.5, clock_timestamp())
+                """,
+                (user_id, uuid.uuid4()),
+            )
+
+    assert write_ledger(batch_size=2) == 3
+    assert write_ledger(batch_size=2) == 0
+
+    with ekoh_smartvote_db_scope():
+        first, second = LedgerBatch.objects.all()
+        assert VoteLedger.objects.count() == 3
+    assert (first.leaf_count, second.leaf_count) == (2, 1)
+    assert bytes(first.chain_hash) == chain_hash(GENESIS, bytes(first.merkle_root))
+    assert bytes(second.chain_hash) == chain_hash(
+        bytes(first.chain_hash), bytes(second.merkle_root)
+    )
+
+    month = f"{timezone.now():%Y-%m}"
+    out = StringIO()
+    call_command("verify_vote_ledger", month, stdout=out)
+    assert "3 row(s) in 2 batch(es) verified" in out.getvalue()
+
+    with ekoh_smartvote_db_scope(), connection.cursor() as cur:
+        cur.execute(
+            "UPDATE vote SET weighted_value = %s WHERE user_id = %s",
+            (Decimal("9"), voter_ids[0]),
+        )
+    with pytest.raises(CommandError, match="1 problem"):
+        call_command("verify_vote_ledger", month, stdout=StringIO(), stderr=StringIO())
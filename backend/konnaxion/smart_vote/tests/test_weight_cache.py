@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.config import ScoreConfiguration
+from konnaxion.ekoh.models.scores import UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.smart_vote.models import Consultation, ConsultationRelevance
+from konnaxion.smart_vote.services import weight_cache
+from konnaxion.smart_vote.services.weight_calculator import (
+    expertise_bonus_cap,
+    get_expertise_alignment,
+)
+
+User = get_user_model()
+
+
+def _counting_loader(value):
+    calls = []
+
+    def load():
+        calls.append(value)
+        return value
+
+    return load, calls
+
+
+def test_generations_retire_only_the_touched_entries():
+    weight_cache.reset_stats()
+    load_a, calls_a = _counting_loader({1: Decimal("0.5")})
+    load_b, calls_b = _counting_loader(None)
+
+    for _ in range(3):
+        assert weight_cache.cached("expertise", 1, load_a) == {1: Decimal("0.5")}
+        assert weight_cache.cached("expertise", 2, load_b) is None
+    assert len(calls_a) == len(calls_b) == 1
+
+    weight_cache.invalidate("expertise", 1)
+    weight_cache.cached("expertise", 1, load_a)
+    weight_cache.cached("expertise", 2, load_b)
+    assert (len(calls_a), len(calls_b)) == (2, 1)
+
+    weight_cache.invalidate()
+    weight_cache.cached("expertise", 2, load_b)
+    assert len(calls_b) == 2
+
+    counts = weight_cache.stats()
+    assert counts["process"]["expertise"] == {
+        "hits": 5,
+        "misses": 4,
+        "hit_ratio": pytest.approx(5 / 9),
+    }
+    assert counts["shared"]["expertise"]["hits"] == 5
+
+
+@pytest.mark.django_db
+def test_model_writes_bump_the_matching_generation():
+    user = User.objects.create_user(username="cached_expert")
+    with ekoh_smartvote_db_scope():
+        domain = ExpertiseCategory.objects.create(
+            code="0532", name="Earth sciences", depth=0, path="0532"
+        )
+        consultation = Consultation.objects.create(title="Cached inputs")
+        relevance = ConsultationRelevance.objects.create(
+            consultation=consultation, category=domain, weight=Decimal("0.5")
+        )
+        score = UserExpertiseScore.objects.create(
+            user=user,
+            category=domain,
+            raw_score=Decimal("0.8"),
+            weighted_score=Decimal("0.8"),
+        )
+    assert get_expertise_alignment(user.pk, consultation.pk) == Decimal("0.4000")
+    assert expertise_bonus_cap() == Decimal("1.0")
+
+    with ekoh_smartvote_db_scope():
+        score.weighted_score = Decimal("0.6")
+        score.save()
+    assert get_expertise_alignment(user.pk, consultation.pk) == Decimal("0.3000")
+
+    with ekoh_smartvote_db_scope():
+        relevance.weight = Decimal("1.0")
+        relevance.save()
+        ScoreConfiguration.objects.create(
+            weight_name="EKOH_MULTIPLIER_CAP", weight_value=Decimal("0.25")
+        )
+    assert get_expertise_alignment(user.pk, consultation.pk) == Decimal("0.6000")
+    with ekoh_smartvote_db_scope():
+        assert expertise_bonus_cap() == Decimal("0.25")
@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from konnaxion.ekoh.db import ekoh_smartvote_db_scope
+from konnaxion.ekoh.models.scores import UserEthicsScore, UserExpertiseScore
+from konnaxion.ekoh.models.taxonomy import ExpertiseCategory
+from konnaxion.smart_vote.models import Consultation, ConsultationRelevance
+from konnaxion.smart_vote.services.weight_calculator import (
+    clear_weight_caches,
+    get_expertise_alignment,
+    get_weight,
+    get_weights_bulk,
+)
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def population():
+    clear_weight_caches()
+    users = [User.objects.create_user(username=f"bulk_{idx}") for idx in range(6)]
+    with ekoh_smartvote_db_scope():
+        economics = ExpertiseCategory.objects.create(
+            code="0311", name="Economics", depth=0, path="0311"
+        )
+        politics = ExpertiseCategory.objects.create(
+            code="0312", name="Politics", depth=0, path="0312"
+        )
+        consultation = Consultation.objects.create(title="Bulk weights")
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=economics, weight=Decimal("0.7")
+        )
+        ConsultationRelevance.objects.create(
+            consultation=consultation, category=politics, weight=Decimal("0.3")
+        )
+        scores = [
+            (economics, "1.0"),
+            (politics, "0.5"),
+            (economics, "80"),  # legacy 0..100 row
+        ]
+        for user, (category, score) in zip(users, scores):
+            UserExpertiseScore.objects.create(
+                user=user,
+                category=category,
+                raw_score=Decimal(score),
+                weighted_score=Decimal(score),
+            )
+        UserEthicsScore.objects.create(user=users[0], ethical_score=Decimal("0.5"))
+        UserEthicsScore.objects.create(user=users[3], ethical_score=Decimal("1.2"))
+    clear_weight_caches()
+    return users, consultation
+
+
+def test_bulk_weights_match_single_user_calls(population):
+    users, consultation = population
+
+    bulk = get_weights_bulk([user.pk for user in users], consultation.pk)
+
+    assert set(bulk) == {user.pk for user in users}
+    for user in users:
+        assert bulk[user.pk].alignment == get_expertise_alignment(
+            user.pk, consultation.pk
+        )
+        assert bulk[user.pk].weight == get_weight(user.pk, consultation.pk)
+
+
+def test_bulk_weights_use_constant_query_count(
+    population, django_assert_max_num_queries
+):
+    users, consultation = population
+    clear_weight_caches()
+
+    # savepoint + search_path + config + relevance + expertise + ethics
+    with django_assert_max_num_queries(8):
+        get_weights_bulk([user.pk for user in users], consultation.pk)
+
+
+def test_bulk_weights_without_users_is_empty(population):
+    _users, consultation = population
+    assert get_weights_bulk([], consultation.pk) == {}
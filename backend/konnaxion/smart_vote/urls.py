@@ -7,16 +7,31 @@ Add to project urls.py:
 """
 
 from django.urls import path
-from konnaxion.smart_vote.views.cast import CastBallotView
-from konnaxion.smart_vote.views.reading import EthikosTopicReadingView
+from konnaxion.smart_vote.views.cast import BulkCastBallotView, CastBallotView
+from konnaxion.smart_vote.views.reading import (
+    EthikosTopicReadingParticipantsView,
+    EthikosTopicReadingView,
+    ReadingReplayView,
+)
 
 app_name = "smart_vote"
 
 urlpatterns = [
     path("cast/", CastBallotView.as_view(), name="cast"),
+    path("cast/bulk/", BulkCastBallotView.as_view(), name="cast-bulk"),
     path(
         "readings/ethikos-topic/<int:topic_id>/",
         EthikosTopicReadingView.as_view(),
         name="ethikos-topic-reading",
     ),
+    path(
+        "readings/ethikos-topic/<int:topic_id>/participants/",
+        EthikosTopicReadingParticipantsView.as_view(),
+        name="ethikos-topic-reading-participants",
+    ),
+    path(
+        "readings/replay/<str:input_ref>/",
+        ReadingReplayView.as_view(),
+        name="reading-replay",
+    ),
 ]
@@ -1,13 +1,84 @@
 """
-POST /smart-vote/cast   → creates one Vote row
+POST /smart-vote/cast        → creates one Vote row
+POST /smart-vote/cast/bulk/  → creates many Vote rows, one outcome per ballot
 """
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from konnaxion.smart_vote.serializers.ballot import BallotSerializer
+from konnaxion.smart_vote.serializers.ballot import BallotSerializer, BulkBallotSerializer
+from konnaxion.smart_vote.services.ballot_ingest import STATUS_CREATED, cast_ballots
+
+User = get_user_model()
 
 
 class CastBallotView(CreateAPIView):
     serializer_class = BallotSerializer
     permission_classes = [IsAuthenticated]
+
+
+class BulkCastBallotView(APIView):
+    """Cast up to ``SMART_VOTE_BULK_CAST_MAX_BALLOTS`` ballots in one request.
+
+    Invalid ballots are reported as ``invalid`` and do not prevent the valid
+    ones from being inserted.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ballots = request.data.get("ballots") if isinstance(request.data, dict) else None
+        if not isinstance(ballots, list):
+            return Response(
+                {"detail": "Expected a JSON object with a 'ballots' list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = getattr(settings, "SMART_VOTE_BULK_CAST_MAX_BALLOTS", 5_000)
+        if len(ballots) > limit:
+            return Response(
+                {"detail": f"At most {limit} ballots per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results: dict[int, dict] = {}
+        valid = []
+        for index, item in enumerate(ballots):
+            serializer = BulkBallotSerializer(data=item, context={"request": request})
+            if serializer.is_valid():
+                ballot = dict(serializer.validated_data)
+                ballot.setdefault("user_id", request.user.pk)
+                valid.append((index, ballot))
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": serializer.errors}
+
+        known_users = set(
+            User.objects.filter(
+                pk__in={ballot["user_id"] for _, ballot in valid}
+            ).values_list("pk", flat=True)
+        )
+        accepted = []
+        for index, ballot in valid:
+            if ballot["user_id"] in known_users:
+                accepted.append((index, ballot))
+            else:
+                results[index] = {
+                    "index": index,
+                    "status": "invalid",
+                    "errors": {"user_id": ["Unknown user."]},
+                }
+
+        for outcome in cast_ballots(accepted):
+            results[outcome.index] = outcome.as_dict()
+
+        rows = [results[index] for index in range(len(ballots))]
+        return Response(
+            {
+                "created": sum(row["status"] == STATUS_CREATED for row in rows),
+                "results": rows,
+            }
+        )
@@ -1,25 +1,174 @@
 """Read-only Smart Vote reading endpoints."""
 
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 
-from konnaxion.smart_vote.services.reading_service import build_ethikos_topic_reading
+from konnaxion.smart_vote.services.reading_aggregates import (
+    build_ethikos_topic_reading_summary,
+)
+from konnaxion.smart_vote.services.reading_participants import (
+    iter_participants,
+    participant_page,
+    topic_is_bound,
+)
+from konnaxion.smart_vote.services.reading_service import (
+    build_ethikos_topic_reading,
+    reading_validators,
+    replay_reading,
+)
+from konnaxion.smart_vote.services.snapshot_store import (
+    SnapshotCorrupt,
+    SnapshotNotFound,
+)
+from konnaxion.utils.http import not_modified, set_validators
 
 
 class EthikosTopicReadingView(APIView):
+    """Baseline + declared advisory reading for an Ethikos topic.
+
+    ``?participants=none`` returns only the aggregate portion, served from the
+    running per-topic aggregate without scanning stances.  ``?lens=<key>``
+    (repeatable) publishes the given registered lenses instead of the
+    configured ones.
+
+    Participant detail is served by ``EthikosTopicReadingParticipantsView``;
+    ``?participants=inline`` (or ``SMART_VOTE_READING_INLINE_PARTICIPANTS``)
+    keeps the former shape with every visible participant inlined.
+    ``?participants=paged`` asks for the aggregate shape whatever that
+    setting says; polling clients use it and page the detail separately.
+
+    The aggregate shape carries ``ETag``/``Last-Modified`` validators derived
+    from the materialized reading; a matching ``If-None-Match`` is answered
+    with 304 before anything is computed.  Inline participant detail depends
+    on the viewer's rating access and is not validated.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request, topic_id: int):
+        participants = request.query_params.get("participants")
+        validators = None
+        if participants == "none":
+            payload = build_ethikos_topic_reading_summary(topic_id)
+        else:
+            inline = participants == "inline" or (
+                participants is None
+                and getattr(settings, "SMART_VOTE_READING_INLINE_PARTICIPANTS", False)
+            )
+            lenses = request.query_params.getlist("lens") or None
+            try:
+                if not inline:
+                    validators = reading_validators(topic_id, lenses=lenses)
+                    if validators is not None:
+                        unchanged = not_modified(request, *validators)
+                        if unchanged is not None:
+                            return unchanged
+                payload = build_ethikos_topic_reading(
+                    topic_id,
+                    viewer=request.user,
+                    lenses=lenses,
+                    include_participants=inline,
+                )
+                if payload is not None and not inline and validators is None:
+                    # Freshly computed: validate against what was just stored.
+                    validators = reading_validators(topic_id, lenses=lenses)
+            except ValueError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if payload is None:
+            return _unbound_topic_response()
+        response = Response(payload)
+        if validators is not None:
+            set_validators(response, *validators)
+        return response
+
+
+def _unbound_topic_response() -> Response:
+    return Response(
+        {"detail": "No Smart Vote reading context is bound to this Ethikos topic."},
+        status=status.HTTP_404_NOT_FOUND,
+    )
+
+
+def _optional_int(value: str | None, name: str) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.") from None
+
+
+class EthikosTopicReadingParticipantsView(APIView):
+    """Participant detail of one reading lens, keyset-paginated by user id.
+
+    ``?lens=<key>`` (default lens otherwise), ``?after=<user_id>`` and
+    ``?limit=<n>`` select the page; follow ``next_after`` for the next one.
+    ``?stream=ndjson`` instead streams every row after ``after`` as
+    newline-delimited JSON while it is computed.
+    """
+
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request, topic_id: int):
-        payload = build_ethikos_topic_reading(topic_id, viewer=request.user)
+        params = request.query_params
+        try:
+            after = _optional_int(params.get("after"), "after")
+            limit = _optional_int(params.get("limit"), "limit")
+            if params.get("stream") == "ndjson":
+                return self._stream(request, topic_id, params.get("lens"), after)
+            payload = participant_page(
+                topic_id,
+                viewer=request.user,
+                lens_key=params.get("lens"),
+                after=after,
+                limit=limit,
+            )
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         if payload is None:
+            return _unbound_topic_response()
+        return Response(payload)
+
+    def _stream(self, request, topic_id: int, lens_key: str | None, after: int | None):
+        if not topic_is_bound(topic_id):
+            return _unbound_topic_response()
+        rows = iter_participants(
+            topic_id, viewer=request.user, lens_key=lens_key, after=after
+        )
+        return StreamingHttpResponse(
+            (json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+            content_type="application/x-ndjson",
+        )
+
+
+class ReadingReplayView(APIView):
+    """Recompute a reading from its stored inputs (``input_ref``).
+
+    Accepts the same ``?lens=<key>`` parameter as the topic reading.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request, input_ref: str):
+        try:
+            payload = replay_reading(
+                input_ref,
+                viewer=request.user,
+                lenses=request.query_params.getlist("lens") or None,
+            )
+        except SnapshotNotFound:
             return Response(
-                {
-                    "detail": (
-                        "No Smart Vote reading context is bound to this Ethikos topic."
-                    )
-                },
+                {"detail": "No stored reading inputs match this reference."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        except SnapshotCorrupt:
+            raise
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(payload)
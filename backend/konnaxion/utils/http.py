@@ -0,0 +1,34 @@
+# backend/konnaxion/utils/http.py
+"""Conditional GET helpers for API views whose validators are cheap to derive."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts) -> str:
+    """Strong entity tag over the string forms of ``parts``."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    return digest.hexdigest()[:40]
+
+
+def not_modified(request, etag: str, last_modified: datetime | None = None):
+    """``304 Not Modified`` when the request's validators still match, else ``None``."""
+    return get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def set_validators(response, etag: str, last_modified: datetime | None = None):
+    """Attach ``ETag``/``Last-Modified`` and ask clients to revalidate every time."""
+    response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, no_cache=True)
+    return response
@@ -1,5 +1,5 @@
 // FILE: frontend/services/readings.ts
-import { get } from './_request'
+import api, { get } from './_request'
 
 export interface SmartVoteReadingDomain {
   domain_code: string
@@ -67,6 +67,48 @@ export interface EthikosTopicReading {
   readings: SmartVoteReadingEnvelope<SmartVoteAdvisoryPayload>[]
 }
 
+export interface EthikosTopicReadingParticipantPage {
+  target_type: 'ethikos_topic' | string
+  target_id: string
+  reading_key: string
+  lens_hash: string | null
+  participants: SmartVoteReadingParticipant[]
+  next_after: number | null
+}
+
+export async function fetchEthikosTopicReadingParticipants(
+  topicId: string | number,
+  options: { lens?: string; after?: number | null; limit?: number } = {},
+): Promise<EthikosTopicReadingParticipantPage> {
+  const params: Record<string, string | number> = {}
+  if (options.lens) params.lens = options.lens
+  if (options.after != null) params.after = options.after
+  if (options.limit != null) params.limit = options.limit
+  return get<EthikosTopicReadingParticipantPage>(
+    `v1/smart-vote/readings/ethikos-topic/${encodeURIComponent(String(topicId))}/participants/`,
+    { params },
+  )
+}
+
+async function fetchAllParticipants(
+  topicId: string,
+  lens: string,
+): Promise<SmartVoteReadingParticipant[]> {
+  const participants: SmartVoteReadingParticipant[] = []
+  let after: number | null = null
+  do {
+    const page: EthikosTopicReadingParticipantPage =
+      await fetchEthikosTopicReadingParticipants(topicId, { lens, after })
+    participants.push(...page.participants)
+    after = page.next_after
+  } while (after != null)
+  return participants
+}
+
+// Last aggregate reading per topic with its ETag, so polling is answered
+// with 304 and participant detail is only reloaded when the reading changed.
+const readingCache = new Map<string, { etag: string; reading: EthikosTopicReading }>()
+
 export async function fetchEthikosTopicReading(
   topicId: string | number,
 ): Promise<EthikosTopicReading | null> {
@@ -74,9 +116,31 @@ export async function fetchEthikosTopicReading(
   if (!id) return null
 
   try {
-    return await get<EthikosTopicReading>(
-      `v1/smart-vote/readings/ethikos-topic/${encodeURIComponent(id)}/`,
-    )
+    const cached = readingCache.get(id)
+    const res = await api.request<EthikosTopicReading>({
+      url: `v1/smart-vote/readings/ethikos-topic/${encodeURIComponent(id)}/`,
+      method: 'get',
+      params: { participants: 'paged' },
+      headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+      validateStatus: (code) => (code >= 200 && code < 300) || code === 304,
+    })
+    if (res.status === 304 && cached) return cached.reading
+
+    const reading = res.data
+    const primary = reading.readings?.[0]
+    if (primary) {
+      primary.results_payload.participants = await fetchAllParticipants(
+        id,
+        primary.reading_key,
+      )
+    }
+    const etag = res.headers.etag
+    if (typeof etag === 'string' && etag) {
+      readingCache.set(id, { etag, reading })
+    } else {
+      readingCache.delete(id)
+    }
+    return reading
   } catch {
     return null
   }